@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response, Query, Header
+from typing import Literal, Optional
 import asyncio
-import base64
 from app.models.analysis import AnalysisStartRequest, AnalysisStartResponse, TaskStatusResponse, TaskResultResponse
 from app.services.analysis.analysis_service import AnalysisService
+from app.services.visualization.chart_image_store import ChartImageStore
 from app.dependencies import get_current_user
 from app.core.database import get_database
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -143,17 +144,20 @@ async def get_task_statistics(
 @router.get("/{task_id}/visualizations", summary="시각화 결과 조회")
 async def get_task_visualizations(
     task_id: str,
+    chart_format: Literal["png", "plotly", "data"] = Query("png", alias="format", description="차트 응답 형식 (png, plotly, data)"),
     current_user: dict = Depends(get_current_user),
     analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
-    """작업의 시각화 결과 조회"""
+    """작업의 시각화 결과 조회 (format: 차트 응답 형식, 기본값 png)"""
     try:
-        result = await analysis_service.get_task_visualizations(task_id, current_user['user_id'])
+        result = await analysis_service.get_task_visualizations(task_id, current_user['user_id'], chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="시각화 결과를 찾을 수 없습니다")
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -161,6 +165,7 @@ async def get_task_visualizations(
 async def get_task_visualization_image(
     task_id: str,
     visualization_id: str,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
     analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
@@ -173,6 +178,10 @@ async def get_task_visualization_image(
     - **visualization_id**: 시각화 ID
     
     브라우저에서 이 URL을 직접 열면 차트 이미지를 볼 수 있습니다.
+    처음 요청 시 저장된 figure 스펙을 PNG로 렌더링하여 이미지 저장소에 보관하고, 이후에는 저장된 파일을 반환합니다.
+    
+    **HTTP 캐시**: 응답의 `ETag`(이미지 내용 해시)를 `If-None-Match` 헤더로 보내면
+    이미지가 바뀌지 않은 경우 본문 없이 304 Not Modified를 반환합니다.
     """
     try:
         # 작업 소유권 확인
@@ -192,21 +201,23 @@ async def get_task_visualization_image(
         if viz.get('user_id') != current_user['user_id']:
             raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
         
-        # Base64 디코딩
-        chart_data = viz.get('chart_data', '')
-        if not chart_data:
+        # 이미지 저장소의 이미지 키 (없으면 렌더링 후 저장)
+        if not viz.get('image_key') and not viz.get('chart_spec') and not viz.get('chart_data'):
             raise HTTPException(status_code=404, detail="이미지 데이터가 없습니다")
         
-        image_bytes = base64.b64decode(chart_data)
+        image_key = await analysis_service.visualization_service.get_image_key(viz)
+        headers = {
+            "ETag": ChartImageStore.etag(image_key),
+            "Cache-Control": f"private, max-age={settings.CHART_IMAGE_MAX_AGE}",
+            "Content-Disposition": f"inline; filename=visualization_{visualization_id}.png"
+        }
+        # 클라이언트 캐시와 같은 이미지면 본문 없이 304 반환
+        if ChartImageStore.etag_matches(if_none_match, image_key):
+            return Response(status_code=304, headers=headers)
         
         # 이미지를 직접 반환
-        return Response(
-            content=image_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename=visualization_{visualization_id}.png"
-            }
-        )
+        image_bytes = await analysis_service.visualization_service.chart_image_store.read(image_key)
+        return Response(content=image_bytes, media_type="image/png", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -215,34 +226,40 @@ async def get_task_visualization_image(
 @router.get("/{task_id}/correlation", summary="상관관계 분석 결과 조회")
 async def get_task_correlation(
     task_id: str,
+    chart_format: Literal["png", "plotly", "data"] = Query("png", alias="format", description="차트 응답 형식 (png, plotly, data)"),
     current_user: dict = Depends(get_current_user),
     analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
-    """작업의 상관관계 분석 결과 조회"""
+    """작업의 상관관계 분석 결과 조회 (format: 차트 응답 형식, 기본값 png)"""
     try:
-        result = await analysis_service.get_task_correlation(task_id, current_user['user_id'])
+        result = await analysis_service.get_task_correlation(task_id, current_user['user_id'], chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="상관관계 결과를 찾을 수 없습니다")
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{task_id}/prediction", summary="예측 결과 조회")
 async def get_task_prediction(
     task_id: str,
+    chart_format: Literal["png", "plotly", "data"] = Query("png", alias="format", description="차트 응답 형식 (png, plotly, data)"),
     current_user: dict = Depends(get_current_user),
     analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
-    """작업의 예측 결과 조회"""
+    """작업의 예측 결과 조회 (format: 차트 응답 형식, 기본값 png)"""
     try:
-        result = await analysis_service.get_task_prediction(task_id, current_user['user_id'])
+        result = await analysis_service.get_task_prediction(task_id, current_user['user_id'], chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다")
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -266,16 +283,19 @@ async def get_task_solution(
 @router.get("/file/{file_id}/latest", summary="파일의 최신 분석 결과 조회")
 async def get_latest_analysis_by_file(
     file_id: str,
+    chart_format: Literal["png", "plotly", "data"] = Query("png", alias="format", description="차트 응답 형식 (png, plotly, data)"),
     current_user: dict = Depends(get_current_user),
     analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
-    """특정 파일의 최신 분석 작업 결과 조회"""
+    """특정 파일의 최신 분석 작업 결과 조회 (format: 차트 응답 형식, 기본값 png)"""
     try:
-        result = await analysis_service.get_latest_analysis_by_file(file_id, current_user['user_id'])
+        result = await analysis_service.get_latest_analysis_by_file(file_id, current_user['user_id'], chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="분석 결과를 찾을 수 없습니다")
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
 from app.models.correlation import CorrelationAnalysisRequest, CorrelationAnalysisResponse
 from app.services.correlation.correlation_service import CorrelationService
 from app.dependencies import get_current_user
@@ -22,6 +23,10 @@ async def analyze_correlations(
     
     - **file_id**: 분석할 파일의 고유 ID (파일 업로드 시 지정한 target_column이 자동으로 사용됩니다)
     - **features**: 분석할 피처 리스트. None이면 저장된 valid_columns가 자동으로 사용됩니다.
+    - **streaming**: 스트리밍 모드 여부. 데이터를 배치 단위로 읽어 계산하므로 행 수 제한 없이 분석할 수 있습니다.
+      None이면 데이터가 10,000행을 넘을 때 자동으로 사용됩니다 (범주형 피처는 라벨 코드로 변환, 코드는 등장 순서).
+    - **format**: 차트 응답 형식 (기본값 png). png: Base64 PNG 이미지, plotly: plotly figure JSON, data: 데이터 시리즈.
+      plotly/data는 서버에서 이미지를 렌더링하지 않으므로 프런트엔드에서 직접 차트를 그릴 때 사용합니다.
     
     **사용 예시**:
     ```json
@@ -34,7 +39,8 @@ async def analyze_correlations(
     분석 결과:
     - 각 피처와 목표 변수 간의 상관계수 (피어슨 상관계수)
     - 피처별 가중치 (상관관계 기반)
-    - 상관관계 히트맵 차트 (Base64 인코딩된 이미지)
+    - 상관관계 차트 (format에 따라 Base64 인코딩된 이미지, plotly figure JSON 또는 데이터 시리즈)
+    - 상관계수를 계산하지 못해 제외된 피처 (excluded_features)
     
     상관계수는 -1부터 1까지의 값을 가지며, 1에 가까울수록 강한 양의 상관관계, 
     -1에 가까울수록 강한 음의 상관관계를 의미합니다. 0에 가까우면 상관관계가 약합니다.
@@ -45,7 +51,9 @@ async def analyze_correlations(
         result = await correlation_service.analyze_correlations(
             file_id=request.file_id,
             features=request.features,
-            user_id=current_user['user_id']
+            user_id=current_user['user_id'],
+            streaming=request.streaming,
+            chart_format=request.format
         )
         return result
     except Exception as e:
@@ -54,6 +62,7 @@ async def analyze_correlations(
 @router.get("/{file_id}", response_model=CorrelationAnalysisResponse, summary="상관관계 분석 결과 조회")
 async def get_correlations(
     file_id: str,
+    chart_format: Literal["png", "plotly", "data"] = Query("png", alias="format", description="차트 응답 형식 (png, plotly, data)"),
     current_user: dict = Depends(get_current_user),
     correlation_service: CorrelationService = Depends(get_correlation_service)
 ):
@@ -63,15 +72,21 @@ async def get_correlations(
     특정 파일에 대해 이전에 수행한 상관관계 분석 결과를 조회합니다.
     
     - **file_id**: 분석 결과를 조회할 파일의 고유 ID
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
     
     이전에 분석을 수행한 경우 저장된 분석 결과(상관계수, 가중치, 차트 등)를 반환합니다.
     아직 분석을 수행하지 않은 파일인 경우 404 에러가 반환됩니다.
+    이전 버전에서 저장된 결과는 png 형식만 지원합니다 (다른 형식 요청 시 400 에러).
     """
     try:
-        result = await correlation_service.get_correlations(file_id)
+        result = await correlation_service.get_correlations(file_id, chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="결과를 찾을 수 없습니다")
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from typing import List, Optional
-from app.models.file import FileUploadResponse, FileInfoResponse, FileListResponse, CSVDataRequest, CSVDataResponse, ColumnsResponse
+from app.models.file import FileUploadResponse, FileAppendResponse, FileInfoResponse, FileListResponse, CSVDataRequest, CSVDataResponse, ColumnsResponse
 from app.services.file.file_service import FileService
 from app.dependencies import get_current_user
 
@@ -43,6 +43,40 @@ async def upload_file(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/{file_id}/append", response_model=FileAppendResponse, status_code=201, summary="기존 파일에 데이터 추가")
+async def append_file(
+    file_id: str,
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
+    file_service: FileService = Depends(get_file_service)
+):
+    """
+    기존 파일에 데이터 추가
+    
+    업로드한 파일에 새 기간(예: 최근 1주)의 데이터를 추가합니다.
+    
+    - **file_id**: 데이터를 추가할 파일의 고유 ID
+    - **파일 형식**: 기존 파일과 같은 컬럼을 가진 CSV 파일
+    
+    추가 후 데이터 버전이 증가하며, 같은 설정으로 예측을 다시 요청하면 등록된 모델을 새 데이터로
+    증분 업데이트합니다 (오차가 기준보다 크게 늘어난 경우에만 전체 재학습).
+    """
+    try:
+        if not file.filename.endswith('.csv'):
+            raise HTTPException(status_code=400, detail="CSV 파일만 업로드 가능합니다")
+        
+        return await file_service.append_file(
+            file=file,
+            file_id=file_id,
+            user_id=current_user['user_id']
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/", response_model=FileListResponse, summary="파일 목록 조회")
 async def list_files(
     current_user: dict = Depends(get_current_user),
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.models.prediction import PredictionRequest, PredictionResponse
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.models.prediction import PredictionRequest, PredictionResponse, PredictionGroupsResponse, ScenarioRequest, ScenarioResponse, BacktestRequest, BacktestResponse
 from app.services.prediction.prediction_service import PredictionService
+from app.services.prediction.scenario_service import ScenarioService
 from app.dependencies import get_current_user
 
 router = APIRouter()
@@ -9,6 +11,10 @@ def get_prediction_service() -> PredictionService:
     """예측 서비스 의존성"""
     return PredictionService()
 
+def get_scenario_service() -> ScenarioService:
+    """시나리오 예측 서비스 의존성"""
+    return ScenarioService()
+
 @router.post("/predict", response_model=PredictionResponse, status_code=201, summary="수요 예측 모델 생성 및 예측 수행")
 async def create_prediction(
     request: PredictionRequest,
@@ -22,8 +28,16 @@ async def create_prediction(
     
     - **file_id**: 학습 및 예측에 사용할 파일의 고유 ID (파일 업로드 시 지정한 target_column이 자동으로 사용됩니다)
     - **features**: 모델 학습에 사용할 피처 컬럼 목록
-    - **model_type**: 사용할 머신러닝 모델 유형 (linear, random_forest 등)
+    - **model_type**: 사용할 머신러닝 모델 유형 (linear, random_forest, hist_gradient_boosting, xgboost, rf_ar, sgd, auto). auto는 후보 모델을 시계열 교차검증으로 비교해 선택, sgd는 그룹 모드가 아니면 파일 전체를 배치 단위로 스트리밍 학습
     - **forecast_periods**: 예측할 기간 수 (예: 30일 후까지 예측)
+    - **group_mode**: (선택사항) 그룹별 예측 모드 (컬럼 추천 설정의 grouping_columns 값별 예측)
+      - `global`: 그룹 인코딩을 포함한 하나의 모델로 모든 그룹 예측
+      - `per_group`: 그룹마다 별도 모델을 여러 코어에서 병렬 학습
+      - 그룹별 예측값은 `GET /predictions/{prediction_id}/groups`로 페이지 단위 조회
+    - **tune**: (선택사항) 하이퍼파라미터 튜닝 (successive halving, 같은 데이터의 결과는 저장 후 재사용)
+    - **interval_coverage**: (선택사항) 예측 구간 포함 확률 (예: 0.9). 지정하면 forecast_data 항목에 lower/upper 추가
+    - **format**: (선택사항) 차트 응답 형식 (기본값 png). png: Base64 PNG 이미지, plotly: plotly figure JSON, data: 데이터 시리즈.
+      plotly/data는 서버에서 이미지를 렌더링하지 않으므로 프런트엔드에서 직접 차트를 그릴 때 사용합니다.
     
     처리 과정:
     1. 파일 정보에서 target_column 자동 가져오기
@@ -40,6 +54,8 @@ async def create_prediction(
     - 예측 결과 시각화 차트
     
     상관관계 분석 결과가 있다면 자동으로 가중치가 적용되어 더 정확한 예측이 가능합니다.
+    
+    잘못된 요청(지원하지 않는 모델/모드 조합, 데이터 부족, xgboost 패키지 미설치 등)은 400을 반환합니다.
     """
     try:
         result = await prediction_service.create_prediction(
@@ -47,15 +63,100 @@ async def create_prediction(
             features=request.features,
             model_type=request.model_type,
             forecast_periods=request.forecast_periods,
-            user_id=current_user['user_id']
+            user_id=current_user['user_id'],
+            group_mode=request.group_mode,
+            interval_coverage=request.interval_coverage,
+            tune=request.tune,
+            chart_format=request.format
+        )
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/backtest", response_model=BacktestResponse, summary="rolling-origin 백테스트")
+async def run_backtest(
+    request: BacktestRequest,
+    current_user: dict = Depends(get_current_user),
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    """
+    rolling-origin 백테스트
+    
+    과거 여러 시점(origin)마다 그 이전 데이터로만 모델을 학습하고 이후 horizon 시점을 예측하여
+    실제값과 비교합니다. 학습 데이터로 계산한 model_metrics와 달리 실제 예측 성능을 보여줍니다.
+    
+    - **file_id**: 파일의 고유 ID
+    - **features**, **model_type**: 예측 요청과 동일
+    - **horizon**: origin마다 예측할 시점 수
+    - **n_origins**: (선택사항) origin 수
+    - **fast**: origin 일부만 평가하여 빠르게 결과 반환
+    - **group_limit**: 그룹별 오차 반환 개수 (RMSE가 큰 그룹부터)
+    
+    반환 정보:
+    - 전체 out-of-sample 지표
+    - 예측 시점(horizon)별 RMSE/MAE
+    - 그룹(상품)별 RMSE/MAE
+    """
+    try:
+        return await prediction_service.backtest(
+            file_id=request.file_id,
+            features=request.features,
+            model_type=request.model_type,
+            user_id=current_user['user_id'],
+            horizon=request.horizon,
+            n_origins=request.n_origins,
+            fast=request.fast,
+            group_limit=request.group_limit
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/scenario", response_model=ScenarioResponse, summary="what-if 시나리오 예측")
+async def run_scenario(
+    request: ScenarioRequest,
+    current_user: dict = Depends(get_current_user),
+    scenario_service: ScenarioService = Depends(get_scenario_service)
+):
+    """
+    what-if 시나리오 예측
+    
+    등록된 모델로 재학습 없이 피처 변경에 따른 예측을 계산합니다.
+    (예: "다음 4주 동안 이 상품들의 가격을 10% 내리면?")
+    
+    - **model_id**: 예측 결과(`POST /predictions/predict`)의 model_id
+    - **group_keys**: (선택사항) 예측할 그룹 값 목록 (None이면 전체 그룹)
+    - **periods**: 예측 기간 (시점 수)
+    - **overrides**: 피처 변경 목록
+      - `column`: 변경할 숫자형 피처 (예: 가격)
+      - `operation`, `value`: `multiply` 0.9 = 10% 인하, `add`, `set`
+      - `group_keys`, `periods`: (선택사항) 적용할 그룹과 시점 (1부터 시작)
+    
+    반환 정보:
+    - 그룹별 변경 전(baseline)/변경 후(scenario) 시점별 예측값과 시점별 합계
+    - 같은 입력의 결과는 캐시에서 반환 (`cached`)
+    """
+    try:
+        result = await scenario_service.run_scenario(request, current_user['user_id'])
+        if not result:
+            raise HTTPException(status_code=404, detail="모델을 찾을 수 없습니다")
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{prediction_id}", response_model=PredictionResponse, summary="예측 결과 조회")
 async def get_prediction(
     prediction_id: str,
+    chart_format: Literal["png", "plotly", "data"] = Query("png", alias="format", description="차트 응답 형식 (png, plotly, data)"),
     current_user: dict = Depends(get_current_user),
     prediction_service: PredictionService = Depends(get_prediction_service)
 ):
@@ -65,15 +166,62 @@ async def get_prediction(
     이전에 수행한 예측 결과를 조회합니다.
     
     - **prediction_id**: 조회할 예측 결과의 고유 ID
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
     
     저장된 예측 결과, 모델 성능 지표, 예측값, 시각화 차트 등을 반환합니다.
     존재하지 않는 예측 ID인 경우 404 에러가 반환됩니다.
+    이전 버전에서 저장된 결과는 png 형식만 지원합니다 (다른 형식 요청 시 400 에러).
     """
     try:
-        result = await prediction_service.get_prediction(prediction_id)
+        result = await prediction_service.get_prediction(prediction_id, chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다")
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.get("/{prediction_id}/groups", response_model=PredictionGroupsResponse, summary="그룹별 예측 결과 조회")
+async def get_prediction_groups(
+    prediction_id: str,
+    skip: int = Query(0, ge=0, description="건너뛸 그룹 수"),
+    limit: int = Query(100, ge=1, le=1000, description="조회할 그룹 수"),
+    group_key: Optional[str] = Query(None, description="특정 그룹 값만 조회"),
+    current_user: dict = Depends(get_current_user),
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    """
+    그룹별 예측 결과 조회
+    
+    group_mode를 지정하여 생성한 예측의 그룹(상품)별 예측값을 페이지 단위로 조회합니다.
+    
+    - **prediction_id**: 조회할 예측 결과의 고유 ID
+    - **skip**, **limit**: 페이지 범위 (그룹 순서 기준)
+    - **group_key**: (선택사항) 특정 그룹 값만 조회
+    
+    반환 정보:
+    - 예측 시점별 날짜 (`dates`)
+    - 전체 그룹 수 (`total`)
+    - 그룹별 시점별 예측값 및 기간 합계
+    """
+    try:
+        result = await prediction_service.get_prediction_groups(
+            prediction_id=prediction_id,
+            user_id=current_user['user_id'],
+            skip=skip,
+            limit=limit,
+            group_key=group_key
+        )
+        if not result:
+            raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다")
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
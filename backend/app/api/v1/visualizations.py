@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, Query, Header
 from app.models.visualization import VisualizationRequest, VisualizationResponse, ProductListResponse, VisualizationDetailResponse
 from app.services.visualization.visualization_service import VisualizationService
+from app.services.visualization.chart_image_store import ChartImageStore
 from app.dependencies import get_current_user
 from app.core.database import get_database
+from app.core.config import settings
 from app.utils.constants import CHART_TYPES
-from typing import List
+from typing import List, Literal, Optional
 from datetime import datetime
-import base64
 
 router = APIRouter()
 
+# 차트 응답 형식 쿼리 파라미터
+ChartFormatQuery = Query(
+    "png",
+    alias="format",
+    description="차트 응답 형식. png: Base64 PNG 이미지, plotly: plotly figure JSON, data: 데이터 시리즈"
+)
+
 def get_visualization_service() -> VisualizationService:
     """시각화 서비스 의존성"""
     return VisualizationService()
@@ -63,7 +71,11 @@ async def create_visualization(
     - target_column이 None이면 파일 업로드 시 지정한 target_column이 자동으로 사용됩니다.
     - target_column이 지정되면 LLM이 자동으로 적절한 x_column, y_column, columns를 추천합니다.
     
-    생성된 차트는 Base64 인코딩된 이미지로 반환되며, 웹 페이지나 리포트에 바로 사용할 수 있습니다.
+    - **format**: (선택사항) 차트 응답 형식 (기본값 png)
+        - png: Base64 인코딩된 PNG 이미지 (웹 페이지나 리포트에 바로 사용)
+        - plotly: plotly figure JSON (프런트엔드에서 Plotly로 직접 렌더링, 서버 렌더링 없음)
+        - data: 제목/축 이름과 trace별 값만 담은 데이터 시리즈
+    
     시각화 결과는 데이터베이스에 저장되어 나중에 다시 조회할 수 있습니다.
     """
     try:
@@ -83,7 +95,8 @@ async def create_visualization(
             x_column=request.x_column,
             y_column=request.y_column,
             columns=request.columns,
-            user_id=current_user['user_id']
+            user_id=current_user['user_id'],
+            chart_format=request.format
         )
         return result
     except Exception as e:
@@ -92,6 +105,7 @@ async def create_visualization(
 @router.get("/{visualization_id}", response_model=VisualizationResponse, summary="시각화 결과 조회")
 async def get_visualization(
     visualization_id: str,
+    chart_format: Literal["png", "plotly", "data"] = ChartFormatQuery,
     current_user: dict = Depends(get_current_user),
     visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
@@ -101,22 +115,30 @@ async def get_visualization(
     이전에 생성한 시각화 결과를 조회합니다.
     
     - **visualization_id**: 조회할 시각화의 고유 ID
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
     
-    저장된 차트 이미지와 시각화 메타데이터(차트 타입, 사용된 컬럼 등)를 반환합니다.
+    저장된 차트와 시각화 메타데이터(차트 타입, 사용된 컬럼 등)를 반환합니다.
     존재하지 않는 시각화 ID인 경우 404 에러가 반환됩니다.
+    이전 버전에서 생성된 시각화는 png 형식만 지원합니다 (다른 형식 요청 시 400 에러).
     """
     try:
-        result = await visualization_service.get_visualization(visualization_id)
+        result = await visualization_service.get_visualization(visualization_id, chart_format)
         if not result:
             raise HTTPException(status_code=404, detail="시각화를 찾을 수 없습니다")
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{visualization_id}/image", summary="시각화 이미지 직접 조회 (Swagger UI에서 확인용)")
 async def get_visualization_image(
     visualization_id: str,
-    current_user: dict = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
     """
     시각화 이미지를 직접 반환 (PNG 형식)
@@ -126,6 +148,10 @@ async def get_visualization_image(
     - **visualization_id**: 조회할 시각화의 고유 ID
     
     브라우저에서 이 URL을 직접 열면 차트 이미지를 볼 수 있습니다.
+    처음 요청 시 저장된 figure 스펙을 PNG로 렌더링하여 이미지 저장소에 보관하고, 이후에는 저장된 파일을 반환합니다.
+    
+    **HTTP 캐시**: 응답의 `ETag`(이미지 내용 해시)를 `If-None-Match` 헤더로 보내면
+    이미지가 바뀌지 않은 경우 본문 없이 304 Not Modified를 반환합니다.
     """
     try:
         db = await get_database()
@@ -139,21 +165,23 @@ async def get_visualization_image(
         if viz.get('user_id') != current_user['user_id']:
             raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
         
-        # Base64 디코딩
-        chart_data = viz.get('chart_data', '')
-        if not chart_data:
+        # 이미지 저장소의 이미지 키 (없으면 렌더링 후 저장)
+        if not viz.get('image_key') and not viz.get('chart_spec') and not viz.get('chart_data'):
             raise HTTPException(status_code=404, detail="이미지 데이터가 없습니다")
         
-        image_bytes = base64.b64decode(chart_data)
+        image_key = await visualization_service.get_image_key(viz)
+        headers = {
+            "ETag": ChartImageStore.etag(image_key),
+            "Cache-Control": f"private, max-age={settings.CHART_IMAGE_MAX_AGE}",
+            "Content-Disposition": f"inline; filename=visualization_{visualization_id}.png"
+        }
+        # 클라이언트 캐시와 같은 이미지면 본문 없이 304 반환
+        if ChartImageStore.etag_matches(if_none_match, image_key):
+            return Response(status_code=304, headers=headers)
         
         # 이미지를 직접 반환
-        return Response(
-            content=image_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename=visualization_{visualization_id}.png"
-            }
-        )
+        image_bytes = await visualization_service.chart_image_store.read(image_key)
+        return Response(content=image_bytes, media_type="image/png", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -162,6 +190,7 @@ async def get_visualization_image(
 @router.get("/{file_id}/products/count-bar", response_model=VisualizationDetailResponse, summary="전체 상품별 count 막대그래프 생성")
 async def get_product_count_bar_chart(
     file_id: str,
+    chart_format: Literal["png", "plotly", "data"] = ChartFormatQuery,
     current_user: dict = Depends(get_current_user),
     visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
@@ -172,13 +201,16 @@ async def get_product_count_bar_chart(
     
     - **file_id**: 시각화할 파일의 고유 ID
     
-    반환: Base64 인코딩된 PNG 이미지
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
+    
+    반환: 요청한 형식의 차트 (기본값: Base64 인코딩된 PNG 이미지)
     """
     try:
         result = await visualization_service.get_product_count_bar_chart(
             file_id=file_id,
             user_id=current_user['user_id'],
-            top_n=None
+            top_n=None,
+            chart_format=chart_format
         )
         return {
             "visualization_id": result["visualization_id"],
@@ -194,6 +226,7 @@ async def get_product_count_bar_chart(
 @router.get("/{file_id}/products/sum-bar", response_model=VisualizationDetailResponse, summary="전체 상품별 합계 막대그래프 생성")
 async def get_product_sum_bar_chart(
     file_id: str,
+    chart_format: Literal["png", "plotly", "data"] = ChartFormatQuery,
     current_user: dict = Depends(get_current_user),
     visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
@@ -204,14 +237,17 @@ async def get_product_sum_bar_chart(
     
     - **file_id**: 시각화할 파일의 고유 ID
     
-    반환: Base64 인코딩된 PNG 이미지
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
+    
+    반환: 요청한 형식의 차트 (기본값: Base64 인코딩된 PNG 이미지)
     """
     try:
         result = await visualization_service.get_product_count_bar_chart(
             file_id=file_id,
             user_id=current_user['user_id'],
             top_n=None,
-            use_sum=True
+            use_sum=True,
+            chart_format=chart_format
         )
         return {
             "visualization_id": result["visualization_id"],
@@ -227,6 +263,7 @@ async def get_product_sum_bar_chart(
 @router.get("/{file_id}/products/count-bar/top10", response_model=VisualizationDetailResponse, summary="상위 10개 상품별 합계 막대그래프 생성")
 async def get_top10_product_sum_bar_chart(
     file_id: str,
+    chart_format: Literal["png", "plotly", "data"] = ChartFormatQuery,
     current_user: dict = Depends(get_current_user),
     visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
@@ -237,14 +274,17 @@ async def get_top10_product_sum_bar_chart(
     
     - **file_id**: 시각화할 파일의 고유 ID
     
-    반환: Base64 인코딩된 PNG 이미지
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
+    
+    반환: 요청한 형식의 차트 (기본값: Base64 인코딩된 PNG 이미지)
     """
     try:
         result = await visualization_service.get_product_count_bar_chart(
             file_id=file_id,
             user_id=current_user['user_id'],
             top_n=10,
-            use_sum=True
+            use_sum=True,
+            chart_format=chart_format
         )
         return {
             "visualization_id": result["visualization_id"],
@@ -289,6 +329,7 @@ async def get_product_list(
 async def get_product_quantity_trend(
     file_id: str,
     product_name: str,
+    chart_format: Literal["png", "plotly", "data"] = ChartFormatQuery,
     current_user: dict = Depends(get_current_user),
     visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
@@ -300,7 +341,9 @@ async def get_product_quantity_trend(
     - **file_id**: 시각화할 파일의 고유 ID
     - **product_name**: 조회할 상품명 (URL 인코딩 필요)
     
-    반환: Base64 인코딩된 PNG 이미지
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
+    
+    반환: 요청한 형식의 차트 (기본값: Base64 인코딩된 PNG 이미지)
     
     **참고**: 상품명에 특수문자가 포함된 경우 URL 인코딩이 필요합니다.
     예: "상품 A" → "상품%20A"
@@ -313,7 +356,8 @@ async def get_product_quantity_trend(
         result = await visualization_service.get_product_quantity_trend(
             file_id=file_id,
             product_name=decoded_product_name,
-            user_id=current_user['user_id']
+            user_id=current_user['user_id'],
+            chart_format=chart_format
         )
         return {
             "visualization_id": result["visualization_id"],
@@ -330,6 +374,7 @@ async def get_product_quantity_trend(
 @router.get("/{file_id}/correlation/heatmap", response_model=VisualizationDetailResponse, summary="상관관계 분석 결과 히트맵 생성")
 async def get_correlation_heatmap(
     file_id: str,
+    chart_format: Literal["png", "plotly", "data"] = ChartFormatQuery,
     current_user: dict = Depends(get_current_user),
     visualization_service: VisualizationService = Depends(get_visualization_service)
 ):
@@ -341,14 +386,19 @@ async def get_correlation_heatmap(
     - **file_id**: 시각화할 파일의 고유 ID
     - 상관관계 분석이 먼저 수행되어야 합니다 (`/correlations/analyze` 엔드포인트)
     
-    반환: Base64 인코딩된 PNG 이미지 및 visualization_id
+    - **format**: (선택사항) 차트 응답 형식 (png, plotly, data. 기본값 png)
+    
+    반환: 요청한 형식의 차트 (기본값: Base64 인코딩된 PNG 이미지), visualization_id 및 상관관계 행렬 (`matrix`)
+    
+    히트맵은 상관관계 분석 시 저장된 전체 행렬(타겟 + 피처)로 그리므로 데이터를 다시 읽거나 계산하지 않습니다.
     
     **참고**: 상관관계 분석을 먼저 수행하지 않으면 오류가 발생합니다.
     """
     try:
         result = await visualization_service.get_correlation_heatmap(
             file_id=file_id,
-            user_id=current_user['user_id']
+            user_id=current_user['user_id'],
+            chart_format=chart_format
         )
         return {
             "visualization_id": result["visualization_id"],
@@ -356,6 +406,7 @@ async def get_correlation_heatmap(
             "chart_type": "heatmap",
             "chart_data": result["chart_data"],
             "description": "상관관계 분석 결과 히트맵",
+            "matrix": result.get("matrix"),
             "created_at": datetime.now()
         }
     except Exception as e:
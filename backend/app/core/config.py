@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic import field_validator
 
 class Settings(BaseSettings):
@@ -30,6 +30,53 @@ class Settings(BaseSettings):
     OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
     OPENROUTER_MODEL: str = "openai/gpt-4o-mini"  # 기본 모델
     
+    # 상관관계 분석
+    CORRELATION_STREAMING_ROW_THRESHOLD: int = 10000  # 이 행 수를 넘으면 스트리밍 모드 자동 사용
+    CORRELATION_STREAMING_BATCH_SIZE: int = 5000  # 스트리밍 모드 배치 크기 (MongoDB 커서 배치)
+    CORRELATION_PARALLEL_MIN_ROWS: int = 5000  # 이 행 수 이상이면 그룹별 상관계수를 프로세스 풀로 병렬 계산 (스트리밍 기준 행 수를 넘으면 기준 행 수로 제한)
+    CORRELATION_MAX_WORKERS: Optional[int] = None  # 그룹별 상관계수 워커 수 (None이면 CPU 코어 수)
+    CORRELATION_MAX_LAG_WEEKS: int = 12  # 시차 교차상관 최대 시차 (주)
+    
+    # 차트 렌더링
+    CHART_RENDER_WORKERS: int = 2  # PNG 렌더링 워커 프로세스 수 (kaleido 렌더러를 미리 띄워 재사용)
+    CHART_CACHE_SIZE: int = 128  # 메모리에 유지할 렌더링 결과 수 (LRU, figure 스펙 해시 기준)
+    CHART_IMAGE_DIR: str = "chart_images"  # 렌더링한 차트 PNG 저장 디렉토리 (내용 해시 기반 파일명)
+    CHART_IMAGE_MAX_AGE: int = 3600  # 이미지 엔드포인트 Cache-Control max-age (초, 이후 ETag로 재검증)
+    CHART_MAX_POINTS: int = 1500  # 시계열 trace당 최대 점 수 (넘으면 LTTB 다운샘플링)
+    PRODUCT_SERIES_PERIOD: str = "D"  # 상품별 집계 시계열의 기간 단위 (pandas 기간 문자열: D, W, M)
+    ANALYSIS_TREND_TOP_PRODUCTS: int = 10  # 분석 추세 선그래프에 표시할 상품 수 (개수 상위 N개)
+    
+    # 예측 모델 레지스트리
+    MODEL_REGISTRY_DIR: str = "model_registry"  # 학습된 모델(joblib) 저장 디렉토리
+    MODEL_CACHE_SIZE: int = 8  # 메모리에 유지할 모델 수 (LRU)
+    MODEL_REGISTRY_KEEP_VERSIONS: int = 2  # 모델 계보별로 보관할 최신 모델 수 (재학습/업데이트 시 이전 모델 파일 삭제)
+    PREDICTION_N_JOBS: int = -1  # 그룹별 모델 병렬 학습 워커 수 (-1이면 전체 코어)
+    PREDICTION_MIN_GROUP_ROWS: int = 5  # 그룹별 모델 최소 학습 행 수 (미만이면 전체 데이터 모델 사용)
+    MODEL_SELECTION_SPLITS: int = 5  # model_type=auto 모델 선택 시 TimeSeriesSplit fold 수
+    MODEL_SELECTION_TIME_BUDGET: float = 120.0  # 모델 선택 교차검증 시간 예산 (초)
+    MODEL_SELECTION_PRUNE_AFTER: int = 2  # 이 fold 수 이후부터 성능이 나쁜 후보 조기 제외
+    MODEL_SELECTION_PRUNE_RATIO: float = 1.5  # 평균 RMSE가 최고 후보의 이 배수를 넘으면 제외
+    TRAINING_THREAD_BUDGET: Optional[int] = None  # 워커 프로세스의 동시 학습 스레드 총량 (None이면 CPU 코어 수)
+    RANDOM_FOREST_MAX_SAMPLES: Optional[int] = 200000  # 랜덤 포레스트 트리당 최대 부트스트랩 표본 수 (None이면 전체 행)
+    PREDICTION_INCREMENTAL_UPDATE: bool = True  # 데이터 추가 후 예측 시 등록된 모델 증분 업데이트 (False면 항상 전체 재학습)
+    PREDICTION_DRIFT_THRESHOLD: float = 1.5  # 새 데이터 오차가 기준 오차의 이 배수를 넘으면 전체 재학습
+    PREDICTION_UPDATE_RECENT_ROWS: int = 5000  # 트리 추가 학습에 사용할 최근 행 수 (새 행이 더 많으면 새 행 전체)
+    PREDICTION_UPDATE_TREES: int = 20  # 증분 업데이트마다 추가할 랜덤 포레스트 트리 수
+    PREDICTION_UPDATE_ITERATIONS: int = 20  # 증분 업데이트마다 추가할 부스팅 반복 수
+    PREDICTION_MAX_TREE_RATIO: float = 2.0  # 최초 트리 수 대비 최대 트리 수 (넘으면 오래된 트리부터 제거)
+    SCENARIO_CACHE_SIZE: int = 256  # 메모리에 유지할 what-if 시나리오 결과 수 (LRU, 입력 해시 기준)
+    PREDICTION_INTERVAL_CALIBRATION_FRACTION: float = 0.2  # conformal 예측 구간 보정에 쓰는 마지막 시점 비율 (랜덤 포레스트 외 모델)
+    PREDICTION_INTERVAL_MIN_PERIODS: int = 10  # 보정 시점 수가 이보다 적으면 행 단위 잔차로 구간 폭 계산
+    BACKTEST_ORIGINS: int = 8  # rolling-origin 백테스트 기본 origin 수
+    BACKTEST_FAST_ORIGINS: int = 3  # fast 모드에서 균등 추출할 origin 수
+    BACKTEST_MIN_TRAIN_PERIODS: int = 8  # origin 이전 최소 학습 시점 수
+    TUNING_CANDIDATES: int = 27  # successive halving 첫 단계 후보 설정 수
+    TUNING_HALVING_FACTOR: int = 3  # 단계마다 상위 1/이 값만 승격, 학습 행 비율은 이 배수로 증가
+    TUNING_SPLITS: int = 3  # 튜닝 TimeSeriesSplit fold 수
+    TUNING_MIN_ROWS: int = 500  # 작은 단계의 최소 학습 행 수
+    TUNING_TIME_BUDGET: float = 300.0  # 하이퍼파라미터 튜닝 시간 예산 (초)
+    PREDICTION_STREAMING_BATCH_SIZE: int = 5000  # model_type=sgd 스트리밍 학습 배치 크기 (최대 메모리는 이 행 수에 비례)
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,25 @@
+"""
+마이그레이션 004: 상관관계 캐시 인덱스 생성
+캐시 키로 저장된 상관관계 분석 결과를 빠르게 조회하기 위한 인덱스를 생성합니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Correlations Collection 인덱스
+    correlations_collection = db["correlations"]
+    await correlations_collection.create_index([("file_id", 1), ("created_at", -1)])
+    await correlations_collection.create_index([("file_id", 1), ("cache_key", 1), ("created_at", -1)])
+    print("  ✓ Correlations Collection 캐시 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    collection = db["correlations"]
+    for index_name in ["file_id_1_created_at_-1", "file_id_1_cache_key_1_created_at_-1"]:
+        try:
+            await collection.drop_index(index_name)
+        except:
+            pass
@@ -0,0 +1,26 @@
+"""
+마이그레이션 005: 모델 레지스트리 인덱스 생성
+학습된 모델을 레지스트리 키/파일 단위로 빠르게 조회하기 위한 인덱스를 생성합니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Model Registry Collection 인덱스
+    model_registry_collection = db["model_registry"]
+    await model_registry_collection.create_index("model_id", unique=True)
+    await model_registry_collection.create_index([("registry_key", 1), ("created_at", -1)])
+    await model_registry_collection.create_index([("file_id", 1), ("created_at", -1)])
+    print("  ✓ Model Registry Collection 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    collection = db["model_registry"]
+    for index_name in ["model_id_1", "registry_key_1_created_at_-1", "file_id_1_created_at_-1"]:
+        try:
+            await collection.drop_index(index_name)
+        except:
+            pass
@@ -0,0 +1,25 @@
+"""
+마이그레이션 006: 그룹별 예측 결과 인덱스 생성
+예측 ID 기준으로 그룹별 예측 결과를 페이지 단위로 조회하기 위한 인덱스를 생성합니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Prediction Groups Collection 인덱스
+    prediction_groups_collection = db["prediction_groups"]
+    await prediction_groups_collection.create_index([("prediction_id", 1), ("group_index", 1)])
+    await prediction_groups_collection.create_index([("prediction_id", 1), ("group_key", 1)])
+    print("  ✓ Prediction Groups Collection 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    collection = db["prediction_groups"]
+    for index_name in ["prediction_id_1_group_index_1", "prediction_id_1_group_key_1"]:
+        try:
+            await collection.drop_index(index_name)
+        except:
+            pass
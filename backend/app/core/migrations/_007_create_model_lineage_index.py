@@ -0,0 +1,23 @@
+"""
+마이그레이션 007: 모델 계보 인덱스 생성
+데이터 추가 후 증분 업데이트할 기준 모델(같은 설정의 최신 모델)을 빠르게 조회하기 위한 인덱스를 생성합니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Model Registry Collection 계보 인덱스
+    model_registry_collection = db["model_registry"]
+    await model_registry_collection.create_index([("lineage_key", 1), ("created_at", -1)])
+    print("  ✓ Model Registry 계보 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    collection = db["model_registry"]
+    try:
+        await collection.drop_index("lineage_key_1_created_at_-1")
+    except:
+        pass
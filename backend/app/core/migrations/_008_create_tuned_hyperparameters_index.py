@@ -0,0 +1,23 @@
+"""
+마이그레이션 008: 튜닝된 하이퍼파라미터 인덱스 생성
+데이터셋 지문으로 튜닝 결과를 조회하기 위한 고유 인덱스를 생성합니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Tuned Hyperparameters Collection 인덱스
+    tuned_collection = db["tuned_hyperparameters"]
+    await tuned_collection.create_index("fingerprint", unique=True)
+    print("  ✓ Tuned Hyperparameters 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    collection = db["tuned_hyperparameters"]
+    try:
+        await collection.drop_index("fingerprint_1")
+    except:
+        pass
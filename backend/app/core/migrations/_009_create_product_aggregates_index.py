@@ -0,0 +1,59 @@
+"""
+마이그레이션 009: 상품별 집계 인덱스 생성
+업로드/추가 시 미리 계산한 상품별 요약과 상품-기간 시계열을 조회하기 위한 인덱스를 생성합니다.
+요약/시계열 인덱스에는 집계 세대(generation)를 포함하여 재계산 중인 새 세대와 현재 세대가 함께 저장될 수 있습니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Product Aggregates Collection 인덱스 (집계 상태)
+    aggregates_collection = db["product_aggregates"]
+    await aggregates_collection.create_index(
+        [("file_id", 1), ("group_column", 1), ("target_column", 1)],
+        unique=True
+    )
+    print("  ✓ Product Aggregates 인덱스 생성 완료")
+    
+    # Product Summaries Collection 인덱스 (상품 조회, 개수/합계 상위 N개 조회)
+    summaries_collection = db["product_summaries"]
+    await summaries_collection.create_index(
+        [("file_id", 1), ("group_column", 1), ("target_column", 1), ("generation", 1), ("product", 1)],
+        unique=True
+    )
+    await summaries_collection.create_index(
+        [("file_id", 1), ("group_column", 1), ("target_column", 1), ("generation", 1), ("count", -1)]
+    )
+    await summaries_collection.create_index(
+        [("file_id", 1), ("group_column", 1), ("target_column", 1), ("generation", 1), ("sum", -1)]
+    )
+    print("  ✓ Product Summaries 인덱스 생성 완료")
+    
+    # Product Series Collection 인덱스 (상품별 기간 순 조회)
+    series_collection = db["product_series"]
+    await series_collection.create_index(
+        [("file_id", 1), ("group_column", 1), ("target_column", 1), ("generation", 1), ("product", 1), ("period", 1)],
+        unique=True
+    )
+    print("  ✓ Product Series 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    indexes = {
+        "product_aggregates": ["file_id_1_group_column_1_target_column_1"],
+        "product_summaries": [
+            "file_id_1_group_column_1_target_column_1_generation_1_product_1",
+            "file_id_1_group_column_1_target_column_1_generation_1_count_-1",
+            "file_id_1_group_column_1_target_column_1_generation_1_sum_-1",
+        ],
+        "product_series": ["file_id_1_group_column_1_target_column_1_generation_1_product_1_period_1"],
+    }
+    for collection_name, index_names in indexes.items():
+        for index_name in index_names:
+            try:
+                await db[collection_name].drop_index(index_name)
+            except:
+                pass
@@ -0,0 +1,23 @@
+"""
+마이그레이션 010: 예측 결과 모델 참조 인덱스 생성
+이전 모델 정리 시 예측 결과가 참조하는 모델(model_id)을 빠르게 조회하기 위한 인덱스를 생성합니다.
+"""
+from app.core.database import get_database
+
+async def up():
+    """마이그레이션 실행"""
+    db = await get_database()
+    
+    # Predictions Collection 모델 참조 인덱스
+    predictions_collection = db["predictions"]
+    await predictions_collection.create_index("model_id")
+    print("  ✓ Predictions 모델 참조 인덱스 생성 완료")
+
+async def down():
+    """마이그레이션 롤백 (인덱스 삭제)"""
+    db = await get_database()
+    collection = db["predictions"]
+    try:
+        await collection.drop_index("model_id_1")
+    except:
+        pass
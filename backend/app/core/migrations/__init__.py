@@ -2,6 +2,13 @@
 from app.core.migrations.migration_manager import MigrationManager
 from app.core.migrations import _001_create_indexes
 from app.core.migrations import _003_migrate_email_to_username
+from app.core.migrations import _004_create_correlation_cache_index
+from app.core.migrations import _005_create_model_registry_index
+from app.core.migrations import _006_create_prediction_groups_index
+from app.core.migrations import _007_create_model_lineage_index
+from app.core.migrations import _008_create_tuned_hyperparameters_index
+from app.core.migrations import _009_create_product_aggregates_index
+from app.core.migrations import _010_create_prediction_model_index
 # from app.core.migrations import _002_add_default_admin  # 선택적
 
 # 마이그레이션 목록 (버전 순서대로)
@@ -16,6 +23,41 @@ migrations_list = [
         "description": "email 필드를 username으로 마이그레이션",
         "up": _003_migrate_email_to_username.up,
     },
+    {
+        "version": "004",
+        "description": "상관관계 캐시 인덱스 생성",
+        "up": _004_create_correlation_cache_index.up,
+    },
+    {
+        "version": "005",
+        "description": "모델 레지스트리 인덱스 생성",
+        "up": _005_create_model_registry_index.up,
+    },
+    {
+        "version": "006",
+        "description": "그룹별 예측 결과 인덱스 생성",
+        "up": _006_create_prediction_groups_index.up,
+    },
+    {
+        "version": "007",
+        "description": "모델 계보 인덱스 생성",
+        "up": _007_create_model_lineage_index.up,
+    },
+    {
+        "version": "008",
+        "description": "튜닝된 하이퍼파라미터 인덱스 생성",
+        "up": _008_create_tuned_hyperparameters_index.up,
+    },
+    {
+        "version": "009",
+        "description": "상품별 집계 인덱스 생성",
+        "up": _009_create_product_aggregates_index.up,
+    },
+    {
+        "version": "010",
+        "description": "예측 결과 모델 참조 인덱스 생성",
+        "up": _010_create_prediction_model_index.up,
+    },
     # 기본 관리자 계정은 선택적이므로 주석 처리
     # {
     #     "version": "002",
@@ -3,6 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import auth, users, files, analysis, predictions, correlations, solutions, visualizations, features, statistics
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.services.correlation.group_correlation import GroupCorrelationPool
+from app.services.visualization.chart_renderer import ChartRenderer
 
 app = FastAPI(
     title="ForeCastly Analytics API",
@@ -37,9 +39,12 @@ app.include_router(visualizations.router, prefix="/visualizations", tags=["시
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    ChartRenderer.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    GroupCorrelationPool.shutdown()
+    ChartRenderer.shutdown()
     await close_db()
 
 @app.get("/")
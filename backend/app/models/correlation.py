@@ -1,11 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Literal, Union
 from datetime import datetime
 
 class CorrelationAnalysisRequest(BaseModel):
     """상관관계 분석 요청"""
     file_id: str = Field(..., description="파일 ID (파일 업로드 시 지정한 target_column이 자동으로 사용됩니다)")
     features: Optional[List[str]] = Field(None, description="분석할 피처 리스트. None이면 저장된 valid_columns 자동 사용")
+    streaming: Optional[bool] = Field(None, description="스트리밍 모드 (배치 단위 계산, 행 수 제한 없음). None이면 행 수에 따라 자동 선택")
+    format: Literal["png", "plotly", "data"] = Field("png", description="차트 응답 형식. png: Base64 PNG 이미지, plotly: plotly figure JSON, data: 데이터 시리즈 (plotly/data는 서버 렌더링 없음)")
     
     class Config:
         json_schema_extra = {
@@ -25,8 +27,9 @@ class CorrelationAnalysisResponse(BaseModel):
     """상관관계 분석 응답"""
     correlation_matrix: Dict[str, Any] = Field(..., description="상관관계 행렬 (전체 + 그룹별)")
     top_correlations: List[TopCorrelationItem] = Field(..., description="상위 상관관계")
-    chart: str = Field(..., description="차트 이미지 (Base64)")
+    chart: Union[str, Dict[str, Any]] = Field(..., description="차트 (format에 따라 Base64 이미지, plotly figure JSON 또는 데이터 시리즈)")
     weights: Dict[str, float] = Field(..., description="피처 가중치")
+    excluded_features: List[str] = Field(default_factory=list, description="상관계수를 계산하지 못해 제외된 피처 (데이터에 없거나 값이 모두 같은 컬럼)")
     correlation_id: Optional[str] = Field(None, description="저장된 분석 ID")
     created_at: Optional[datetime] = None
 
@@ -21,6 +21,13 @@ class FileUploadResponse(BaseModel):
     final_columns: Optional[List[str]] = Field(None, description="최종 컬럼 목록 (target_column + valid_columns)")
     lag_feature_columns: Optional[List[str]] = Field(None, description="생성된 Lag 피처 컬럼 목록")
 
+class FileAppendResponse(BaseModel):
+    """파일 데이터 추가 응답"""
+    file_id: str
+    appended_rows: int = Field(..., description="추가된 행 수")
+    total_rows: int = Field(..., description="추가 후 전체 행 수")
+    data_version: int = Field(..., description="추가 후 데이터 버전")
+
 class FileInfoResponse(BaseModel):
     """파일 정보 응답"""
     file_id: str
@@ -1,21 +1,124 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any, Literal, Union
 from datetime import datetime
 
 class PredictionRequest(BaseModel):
     """예측 요청"""
     file_id: str = Field(..., description="파일 ID (파일 업로드 시 지정한 target_column이 자동으로 사용됩니다)")
     features: List[str] = Field(..., description="사용할 피처 리스트")
-    model_type: str = Field("linear", description="모델 타입 (linear, random_forest, xgboost)")
+    model_type: str = Field("linear", description="모델 타입 (linear, random_forest, hist_gradient_boosting, xgboost, rf_ar, sgd: 파일 전체를 배치 단위로 스트리밍 학습, auto: 후보 모델 시계열 교차검증 후 자동 선택)")
     forecast_periods: int = Field(7, ge=1, le=365, description="예측 기간 (일)")
+    group_mode: Optional[Literal["global", "per_group"]] = Field(
+        None,
+        description="그룹별 예측 모드. None: 전체 예측, global: 그룹 인코딩을 포함한 단일 모델, per_group: 그룹별 모델 병렬 학습"
+    )
+    tune: bool = Field(
+        False,
+        description="하이퍼파라미터 튜닝 (successive halving, random_forest/rf_ar/hist_gradient_boosting/xgboost). 같은 데이터의 튜닝 결과는 저장 후 재사용"
+    )
+    interval_coverage: Optional[float] = Field(
+        None,
+        gt=0,
+        lt=1,
+        description="예측 구간 포함 확률 (예: 0.9). 지정하면 forecast_data 항목에 lower/upper 추가 (랜덤 포레스트: 트리별 예측 분위수, 그 외: conformal 잔차)"
+    )
+    format: Literal["png", "plotly", "data"] = Field("png", description="차트 응답 형식. png: Base64 PNG 이미지, plotly: plotly figure JSON, data: 데이터 시리즈 (plotly/data는 서버 렌더링 없음)")
 
 class PredictionResponse(BaseModel):
     """예측 응답"""
     prediction_id: str
     file_id: str
     target_column: str
-    forecast_data: List[Dict] = Field(..., description="예측 데이터")
+    forecast_data: List[Dict] = Field(..., description="예측 데이터 (interval_coverage 지정 시 lower/upper 포함)")
     model_metrics: Dict[str, float] = Field(..., description="모델 성능 지표")
-    chart: str = Field(..., description="예측 차트 (Base64)")
+    chart: Union[str, Dict[str, Any]] = Field(..., description="예측 차트 (format에 따라 Base64 이미지, plotly figure JSON 또는 데이터 시리즈)")
+    model_id: Optional[str] = Field(None, description="모델 레지스트리에 등록된 모델 ID")
+    group_mode: Optional[str] = Field(None, description="그룹별 예측 모드 (그룹별 결과는 /predictions/{prediction_id}/groups)")
+    group_count: Optional[int] = Field(None, description="예측한 그룹 수")
+    model_selection: Optional[Dict[str, Any]] = Field(
+        None,
+        description="model_type=auto 모델 선택 결과 (selected_model, 후보별 holdout 지표 leaderboard)"
+    )
+    model_update: Optional[Dict[str, Any]] = Field(
+        None,
+        description="데이터 추가 후 모델 갱신 방식 (mode: incremental/full, reason, backtest_rmse, reference_rmse). 등록된 모델 재사용 시 None"
+    )
+    interval_coverage: Optional[float] = Field(None, description="forecast_data lower/upper 예측 구간 포함 확률 (구간을 계산하지 않았으면 None)")
+    tuning: Optional[Dict[str, Any]] = Field(
+        None,
+        description="하이퍼파라미터 튜닝 결과 (best_params, best_rmse, 단계별 후보 수, cached: 저장된 결과 사용 여부). tune=false면 None"
+    )
     created_at: datetime
 
+class BacktestRequest(BaseModel):
+    """rolling-origin 백테스트 요청"""
+    file_id: str = Field(..., description="파일 ID")
+    features: List[str] = Field(..., description="사용할 피처 리스트 (컬럼 추천 설정의 valid_columns가 있으면 그 값 사용)")
+    model_type: str = Field("linear", description="모델 타입 (linear, random_forest, hist_gradient_boosting, xgboost, rf_ar, sgd)")
+    horizon: int = Field(4, ge=1, le=52, description="origin마다 예측할 시점 수")
+    n_origins: Optional[int] = Field(None, ge=1, le=52, description="origin 수 (마지막 시점부터 과거 방향, None이면 기본값)")
+    fast: bool = Field(False, description="origin을 일부만 균등 추출하여 빠르게 평가 (대화형 조회용)")
+    group_limit: int = Field(100, ge=1, le=1000, description="그룹별 오차를 RMSE가 큰 순으로 반환할 최대 그룹 수")
+
+class BacktestResponse(BaseModel):
+    """rolling-origin 백테스트 응답"""
+    file_id: str
+    target_column: str
+    model_type: str
+    horizon: int
+    fast: bool
+    origins: List[str] = Field(..., description="평가한 origin (각 origin 이전 데이터로 학습)")
+    overall: Dict[str, float] = Field(..., description="전체 out-of-sample 지표 (mse, rmse, mae, r2)")
+    by_horizon: List[Dict[str, Any]] = Field(..., description="예측 시점(horizon)별 지표 (points, rmse, mae)")
+    by_group: List[Dict[str, Any]] = Field(..., description="그룹별 지표 (RMSE가 큰 순, group_limit개)")
+    group_count: int = Field(..., description="평가된 그룹 수")
+    evaluated_points: int = Field(..., description="평가된 (origin, 그룹, horizon) 수")
+
+class PredictionGroupItem(BaseModel):
+    """그룹별 예측값"""
+    group_index: int
+    group_key: str = Field(..., description="그룹 값 (grouping_columns 값, 여러 컬럼이면 ' | '로 연결)")
+    forecast: List[float] = Field(..., description="시점별 예측값 (dates와 같은 순서)")
+    total: float = Field(..., description="예측 기간 합계")
+
+class PredictionGroupsResponse(BaseModel):
+    """그룹별 예측 결과 페이지 응답"""
+    prediction_id: str
+    group_mode: str
+    dates: List[Any] = Field(..., description="예측 시점별 날짜")
+    total: int = Field(..., description="전체 그룹 수")
+    skip: int
+    limit: int
+    groups: List[PredictionGroupItem]
+
+
+class FeatureOverride(BaseModel):
+    """시나리오 피처 변경"""
+    column: str = Field(..., description="변경할 숫자형 피처 컬럼 (4주 합산 피처의 원본 컬럼이면 합산값에도 반영)")
+    operation: Literal["set", "multiply", "add"] = Field("multiply", description="set: 값 지정, multiply: 배율 (예: 0.9 = 10% 인하), add: 가산")
+    value: float = Field(..., description="변경 값")
+    group_keys: Optional[List[str]] = Field(None, description="적용할 그룹 값 (None이면 요청한 전체 그룹)")
+    periods: Optional[List[int]] = Field(None, description="적용할 예측 시점 (1부터 시작, None이면 전체 시점)")
+
+class ScenarioRequest(BaseModel):
+    """what-if 시나리오 예측 요청"""
+    model_id: str = Field(..., description="예측 결과의 model_id (모델 레지스트리에 등록된 모델)")
+    group_keys: Optional[List[str]] = Field(None, description="예측할 그룹 값 목록 (None이면 전체 그룹)")
+    periods: int = Field(4, ge=1, le=365, description="예측 기간 (시점 수)")
+    overrides: List[FeatureOverride] = Field(default_factory=list, description="피처 변경 목록 (순서대로 적용)")
+
+class ScenarioGroupItem(BaseModel):
+    """그룹별 시나리오 예측값"""
+    group_key: str
+    baseline: List[float] = Field(..., description="변경 전 시점별 예측값")
+    scenario: List[float] = Field(..., description="변경 후 시점별 예측값")
+
+class ScenarioResponse(BaseModel):
+    """what-if 시나리오 예측 응답"""
+    model_id: str
+    dates: List[Any] = Field(..., description="예측 시점별 날짜")
+    groups: List[ScenarioGroupItem]
+    baseline_total: List[float] = Field(..., description="변경 전 시점별 합계")
+    scenario_total: List[float] = Field(..., description="변경 후 시점별 합계")
+    unknown_group_keys: List[str] = Field(default_factory=list, description="모델 학습 데이터에 없어 제외된 그룹 값")
+    cached: bool = Field(False, description="시나리오 결과 캐시 사용 여부")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Literal
+from typing import Optional, List, Dict, Literal, Any, Union
 from datetime import datetime
 from app.utils.constants import CHART_TYPES
 
@@ -17,6 +17,10 @@ class VisualizationRequest(BaseModel):
     x_column: Optional[str] = Field(None, description="X축에 사용할 컬럼명 (target_column이 없을 때 필수. 파일 정보 조회 시 받은 columns 목록에서 선택)")
     y_column: Optional[str] = Field(None, description="Y축에 사용할 컬럼명 (target_column이 없을 때 필수. 파일 정보 조회 시 받은 columns 목록에서 선택)")
     columns: Optional[List[str]] = Field(None, description="다중 컬럼 차트에 사용할 컬럼명 리스트 (heatmap 등에 사용)")
+    format: Literal["png", "plotly", "data"] = Field(
+        "png",
+        description="차트 응답 형식. png: Base64 PNG 이미지, plotly: plotly figure JSON, data: 데이터 시리즈 (plotly/data는 서버 렌더링 없음)"
+    )
     
     class Config:
         json_schema_extra = {
@@ -35,7 +39,7 @@ class VisualizationResponse(BaseModel):
     visualization_id: str
     file_id: str
     chart_type: str
-    chart_data: str = Field(..., description="차트 데이터 (JSON 또는 Base64 이미지)")
+    chart_data: Union[str, Dict[str, Any]] = Field(..., description="차트 데이터 (format에 따라 Base64 이미지, plotly figure JSON 또는 데이터 시리즈)")
     created_at: datetime
 
 class ProductListResponse(BaseModel):
@@ -49,8 +53,9 @@ class VisualizationDetailResponse(BaseModel):
     visualization_id: str
     file_id: str
     chart_type: str
-    chart_data: str = Field(..., description="차트 데이터 (Base64 이미지)")
+    chart_data: Union[str, Dict[str, Any]] = Field(..., description="차트 데이터 (format에 따라 Base64 이미지, plotly figure JSON 또는 데이터 시리즈)")
     description: Optional[str] = None
     product_name: Optional[str] = None
+    matrix: Optional[Dict[str, Any]] = Field(None, description="상관관계 행렬 {'columns': [...], 'values': [[...]]} (히트맵인 경우)")
     created_at: datetime
 
@@ -1,18 +1,21 @@
-from typing import Dict, Optional, List, Set
+from typing import Dict, Optional, List, Set, Tuple
 from datetime import datetime
 from fastapi import BackgroundTasks
+from app.core.config import settings
 from app.core.database import get_database
 from app.services.analysis.task_repository import TaskRepository
 from app.services.analysis.statistics_service import StatisticsService
 from app.services.file.file_service import FileService
 from app.services.file.file_analysis_config_repository import FileAnalysisConfigRepository
+from app.services.file.product_aggregator import ProductAggregator
 from app.services.correlation.correlation_service import CorrelationService
 from app.services.prediction.prediction_service import PredictionService
 from app.services.solution.solution_service import SolutionService
 from app.services.visualization.visualization_service import VisualizationService
+from app.services.visualization.chart_formatter import ChartFormatter
+from app.services.visualization.downsampling import lttb_indices
 import pandas as pd
 import plotly.graph_objects as go
-import base64
 import asyncio
 import weakref
 
@@ -89,11 +92,13 @@ class AnalysisService:
         self.task_repository = TaskRepository()
         self.file_service = FileService()
         self.config_repository = FileAnalysisConfigRepository()
+        self.product_aggregator = ProductAggregator()
         self.statistics_service = StatisticsService()
         self.correlation_service = CorrelationService()
         self.prediction_service = PredictionService()
         self.solution_service = SolutionService()
         self.visualization_service = VisualizationService()
+        self.chart_formatter = ChartFormatter()
     
     async def start_analysis(
         self,
@@ -218,7 +223,8 @@ class AnalysisService:
             correlation_result = await self.correlation_service.analyze_correlations(
                 file_id=file_id,
                 features=features,
-                user_id=user_id
+                user_id=user_id,
+                chart_format='data'  # 작업 결과에는 ID만 기록하므로 PNG 렌더링 생략
             )
             await self.task_repository.update_step_status(
                 task_id, 'correlation', 'completed',
@@ -230,9 +236,10 @@ class AnalysisService:
             prediction_result = await self.prediction_service.create_prediction(
                 file_id=file_id,
                 features=features,
-                model_type='random_forest',  # 기본값
+                model_type='auto',  # 후보 모델 시계열 교차검증 후 자동 선택
                 forecast_periods=30,  # 기본값
-                user_id=user_id
+                user_id=user_id,
+                chart_format='data'  # 작업 결과에는 ID만 기록하므로 PNG 렌더링 생략
             )
             await self.task_repository.update_step_status(
                 task_id, 'prediction', 'completed',
@@ -281,6 +288,17 @@ class AnalysisService:
         """시각화 생성 (상품별 선그래프, 막대그래프)"""
         visualization_ids = []
         
+        # 그룹화 컬럼과 날짜 컬럼이 정해져 있으면 원본 행 대신 상품별 집계 사용
+        if group_by_column and config and config.get('date_column'):
+            try:
+                result = await self._generate_visualizations_from_aggregates(
+                    file_id, user_id, target_column, group_by_column, config.get('date_column')
+                )
+                if result is not None:
+                    return result
+            except Exception as e:
+                print(f"⚠️ 상품별 집계로 시각화 생성 실패, 원본 데이터 사용: {str(e)}")
+        
         # 데이터 로드 (get_csv_data는 이미 data 필드만 반환)
         data = await self.file_service.repository.get_csv_data(file_id, 0, 10000)
         if not data:
@@ -345,9 +363,9 @@ class AnalysisService:
         
         if group_by_column and group_by_column in df.columns:
             
-            # 1. 상품별 시간별 추세 선그래프 (가장 개수가 많은 상품 10개)
+            # 1. 상품별 시간별 추세 선그래프 (가장 개수가 많은 상품 ANALYSIS_TREND_TOP_PRODUCTS개)
             if product_counts:
-                top_products = sorted(product_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                top_products = sorted(product_counts.items(), key=lambda x: x[1], reverse=True)[:settings.ANALYSIS_TREND_TOP_PRODUCTS]
                 top_product_names = [name for name, _ in top_products]
                 
                 line_chart_id = await self._create_product_trend_line_chart(
@@ -365,6 +383,55 @@ class AnalysisService:
         
         return {'visualization_ids': visualization_ids}
     
+    async def _generate_visualizations_from_aggregates(
+        self,
+        file_id: str,
+        user_id: str,
+        target_column: str,
+        group_by_column: str,
+        date_column: str
+    ) -> Optional[Dict]:
+        """상품별 집계로 시각화 생성 (개수 상위 상품 요약과 상품-기간 시계열만 조회)"""
+        await self.product_aggregator.ensure(file_id, target_column, group_by_column, date_column)
+        summaries = await self.product_aggregator.get_summaries(
+            file_id, target_column, group_by_column,
+            sort_by='count', limit=max(settings.ANALYSIS_TREND_TOP_PRODUCTS, 20)
+        )
+        if not summaries:
+            return None
+        
+        visualization_ids = []
+        
+        # 1. 상품별 시간별 추세 선그래프 (가장 개수가 많은 상품 ANALYSIS_TREND_TOP_PRODUCTS개)
+        top_product_names = [summary['product'] for summary in summaries[:settings.ANALYSIS_TREND_TOP_PRODUCTS]]
+        series_by_product = await self.product_aggregator.get_series(
+            file_id, target_column, group_by_column, top_product_names
+        )
+        series = [
+            (
+                product_name,
+                pd.Series(pd.to_datetime([point['period'] for point in points])),
+                pd.Series([point['sum'] for point in points], dtype=float)
+            )
+            for product_name, points in series_by_product.items()
+            if points
+        ]
+        line_chart_id = await self._save_product_trend_line_chart(
+            file_id, user_id, target_column, group_by_column, date_column, top_product_names, series
+        )
+        if line_chart_id:
+            visualization_ids.append(line_chart_id)
+        
+        # 2. 상품별 개수 막대그래프 (상위 20개)
+        product_counts = {summary['product']: summary['count'] for summary in summaries[:20]}
+        bar_chart_id = await self._create_product_count_bar_chart(
+            None, file_id, user_id, group_by_column, product_counts
+        )
+        if bar_chart_id:
+            visualization_ids.append(bar_chart_id)
+        
+        return {'visualization_ids': visualization_ids}
+    
     async def _create_product_trend_line_chart(
         self,
         df: pd.DataFrame,
@@ -383,41 +450,76 @@ class AnalysisService:
             if not date_column:
                 return None
             
+            series = self._prepare_product_trend_series(df, group_by_column, date_column, target_column, product_names)
+            
+            return await self._save_product_trend_line_chart(
+                file_id, user_id, target_column, group_by_column, date_column, product_names, series
+            )
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _prepare_product_trend_series(
+        df: pd.DataFrame,
+        group_by_column: str,
+        date_column: str,
+        target_column: str,
+        product_names: List[str]
+    ) -> List[Tuple[str, pd.Series, pd.Series]]:
+        """여러 상품의 (날짜, 값) 시계열을 한 번에 준비
+        
+        상품마다 전체 행을 필터링/날짜 변환/정렬하지 않고,
+        대상 상품 행을 isin으로 한 번에 고른 뒤 날짜 변환과 값 변환을 한 번만 수행하고
+        (상품 순서 코드, 날짜) 기준으로 한 번 정렬한 다음 groupby로 나눕니다.
+        날짜 또는 값이 없는 행은 함께 제외하므로 날짜와 값의 위치가 어긋나지 않습니다.
+        
+        Returns:
+            product_names 순서의 [(상품명, 날짜, 값)] (데이터가 없는 상품은 제외)
+        """
+        names = list(dict.fromkeys(str(name) for name in product_names))
+        products = df[group_by_column].astype(str)
+        mask = products.isin(names)
+        if not mask.any():
+            return []
+        
+        dates = df.loc[mask, date_column]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors='coerce', format='mixed')
+        frame = pd.DataFrame({
+            'code': pd.Categorical(products[mask], categories=names).codes,
+            'date': dates,
+            'value': pd.to_numeric(df.loc[mask, target_column], errors='coerce')
+        }).dropna(subset=['date', 'value'])
+        frame = frame.sort_values(['code', 'date'], kind='stable')
+        
+        return [
+            (names[code], group['date'].reset_index(drop=True), group['value'].reset_index(drop=True))
+            for code, group in frame.groupby('code', sort=False)
+        ]
+    
+    async def _save_product_trend_line_chart(
+        self,
+        file_id: str,
+        user_id: str,
+        target_column: str,
+        group_by_column: str,
+        date_column: str,
+        product_names: List[str],
+        series: List[Tuple[str, pd.Series, pd.Series]]
+    ) -> Optional[str]:
+        """상품별 (날짜, 값) 시계열로 추세 선그래프 생성 후 저장"""
+        try:
             fig = go.Figure()
             
             # 각 상품별로 선 그래프 추가
-            for product_name in product_names:
-                product_df = df[df[group_by_column] == product_name].copy()
-                if len(product_df) == 0:
-                    continue
-                
-                # 날짜 정렬 및 변환
-                try:
-                    if pd.api.types.is_datetime64_any_dtype(product_df[date_column]):
-                        product_df = product_df.sort_values(date_column)
-                        dates = product_df[date_column]
-                    else:
-                        # 문자열 날짜를 datetime으로 변환 시도
-                        try:
-                            product_df[date_column] = pd.to_datetime(product_df[date_column], errors='coerce')
-                            product_df = product_df.sort_values(date_column)
-                            dates = product_df[date_column]
-                        except:
-                            product_df = product_df.sort_values(date_column)
-                            dates = product_df[date_column].astype(str)
-                except Exception as e:
-                    pass  # 날짜 정렬 실패 시 해당 제품 건너뜀
-                    continue
-                
-                values = pd.to_numeric(product_df[target_column], errors='coerce').dropna()
-                if len(values) == 0:
-                    continue
-                
-                # 날짜와 값의 길이 맞추기
-                dates_clean = dates.iloc[:len(values)]
+            for product_name, dates, values in series:
+                # 점 수가 많으면 LTTB 다운샘플링 (봉우리/골짜기 유지)
+                keep = lttb_indices(dates, values.to_numpy())
+                if len(keep) < len(values):
+                    dates, values = dates.iloc[keep], values.iloc[keep]
                 
                 fig.add_trace(go.Scatter(
-                    x=dates_clean,
+                    x=dates,
                     y=values,
                     mode='lines+markers',
                     name=str(product_name),
@@ -425,16 +527,15 @@ class AnalysisService:
                 ))
             
             fig.update_layout(
-                title=f"{target_column} 상품별 시간별 추세 (상위 10개 상품)",
+                title=f"{target_column} 상품별 시간별 추세 (상위 {len(product_names)}개 상품)",
                 xaxis_title=date_column,
                 yaxis_title=target_column,
                 hovermode='closest',
                 height=500
             )
             
-            # Base64 인코딩
-            img_bytes = fig.to_image(format="png")
-            img_base64 = base64.b64encode(img_bytes).decode('utf-8')
+            # figure 스펙 (PNG 렌더링은 조회 시 요청한 형식이 png일 때만)
+            chart_spec = self.chart_formatter.to_spec(fig)
             
             # 저장
             visualization_id = f"viz_line_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -445,7 +546,7 @@ class AnalysisService:
                 'file_id': file_id,
                 'user_id': user_id,
                 'chart_type': 'line',
-                'chart_data': img_base64,
+                'chart_spec': chart_spec,
                 'metadata': {
                     'target_column': target_column,
                     'group_by_column': group_by_column,
@@ -461,7 +562,7 @@ class AnalysisService:
     
     async def _create_product_count_bar_chart(
         self,
-        df: pd.DataFrame,
+        df: Optional[pd.DataFrame],
         file_id: str,
         user_id: str,
         group_by_column: str,
@@ -491,9 +592,8 @@ class AnalysisService:
                 xaxis_tickangle=-45
             )
             
-            # Base64 인코딩
-            img_bytes = fig.to_image(format="png")
-            img_base64 = base64.b64encode(img_bytes).decode('utf-8')
+            # figure 스펙 (PNG 렌더링은 조회 시 요청한 형식이 png일 때만)
+            chart_spec = self.chart_formatter.to_spec(fig)
             
             # 저장
             visualization_id = f"viz_bar_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -504,7 +604,7 @@ class AnalysisService:
                 'file_id': file_id,
                 'user_id': user_id,
                 'chart_type': 'bar',
-                'chart_data': img_base64,
+                'chart_spec': chart_spec,
                 'metadata': {
                     'group_by_column': group_by_column,
                     'description': '상품별 개수 막대그래프'
@@ -564,8 +664,8 @@ class AnalysisService:
             stats.pop('_id', None)
         return stats
     
-    async def get_task_visualizations(self, task_id: str, user_id: str) -> Optional[Dict]:
-        """작업의 시각화 결과 조회"""
+    async def get_task_visualizations(self, task_id: str, user_id: str, chart_format: str = 'png') -> Optional[Dict]:
+        """작업의 시각화 결과 조회 (chart_data는 요청한 형식으로 변환)"""
         task = await self.task_repository.get_task(task_id)
         if not task or task['user_id'] != user_id:
             return None
@@ -581,11 +681,12 @@ class AnalysisService:
             viz = await collection.find_one({'visualization_id': viz_id})
             if viz:
                 viz.pop('_id', None)
+                viz['chart_data'] = await self.chart_formatter.format(viz.pop('chart_spec', None), chart_format, viz.get('chart_data'))
                 visualizations.append(viz)
         
         return {'visualizations': visualizations}
     
-    async def get_task_correlation(self, task_id: str, user_id: str) -> Optional[Dict]:
+    async def get_task_correlation(self, task_id: str, user_id: str, chart_format: str = 'png') -> Optional[Dict]:
         """작업의 상관관계 분석 결과 조회"""
         task = await self.task_repository.get_task(task_id)
         if not task or task['user_id'] != user_id:
@@ -595,7 +696,7 @@ class AnalysisService:
         if not correlation_id:
             return None
         
-        correlation_result = await self.correlation_service.get_correlations(task['file_id'])
+        correlation_result = await self.correlation_service.get_correlations(task['file_id'], chart_format)
         if correlation_result:
             return {
                 'correlation_id': correlation_id,
@@ -606,7 +707,7 @@ class AnalysisService:
             }
         return None
     
-    async def get_task_prediction(self, task_id: str, user_id: str) -> Optional[Dict]:
+    async def get_task_prediction(self, task_id: str, user_id: str, chart_format: str = 'png') -> Optional[Dict]:
         """작업의 예측 결과 조회"""
         task = await self.task_repository.get_task(task_id)
         if not task or task['user_id'] != user_id:
@@ -616,7 +717,7 @@ class AnalysisService:
         if not prediction_id:
             return None
         
-        prediction_result = await self.prediction_service.get_prediction(prediction_id)
+        prediction_result = await self.prediction_service.get_prediction(prediction_id, chart_format)
         if prediction_result:
             return {
                 'prediction_id': prediction_result.prediction_id,
@@ -647,8 +748,8 @@ class AnalysisService:
             }
         return None
     
-    async def get_latest_analysis_by_file(self, file_id: str, user_id: str) -> Optional[Dict]:
-        """파일의 최신 분석 작업 결과 조회"""
+    async def get_latest_analysis_by_file(self, file_id: str, user_id: str, chart_format: str = 'png') -> Optional[Dict]:
+        """파일의 최신 분석 작업 결과 조회 (차트는 요청한 형식으로 변환)"""
         db = await get_database()
         collection = db['analysis_tasks']
         task = await collection.find_one(
@@ -669,9 +770,9 @@ class AnalysisService:
             'target_column': task['target_column'],
             'status': task['status'],
             'statistics': await self.get_task_statistics(task_id, user_id),
-            'visualizations': await self.get_task_visualizations(task_id, user_id),
-            'correlation': await self.get_task_correlation(task_id, user_id),
-            'prediction': await self.get_task_prediction(task_id, user_id),
+            'visualizations': await self.get_task_visualizations(task_id, user_id, chart_format),
+            'correlation': await self.get_task_correlation(task_id, user_id, chart_format),
+            'prediction': await self.get_task_prediction(task_id, user_id, chart_format),
             'solution': await self.get_task_solution(task_id, user_id)
         }
         
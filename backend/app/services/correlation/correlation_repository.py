@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.core.database import get_database
 
@@ -12,7 +12,11 @@ class CorrelationRepository:
         target_column: str,
         correlations: Dict[str, float],
         weights: Dict[str, float],
-        chart: str
+        chart_spec: str,
+        cache_key: Optional[str] = None,
+        data_version: Optional[int] = None,
+        feature_matrix: Optional[Dict] = None,
+        excluded_features: Optional[List[str]] = None
     ) -> Dict:
         """상관관계 분석 결과 저장"""
         db = await get_database()
@@ -26,7 +30,11 @@ class CorrelationRepository:
             'target_column': target_column,
             'correlation_matrix': correlations,
             'weights': weights,
-            'chart': chart,
+            'chart_spec': chart_spec,  # plotly figure 스펙 (JSON 문자열, 이전 버전 문서는 'chart'에 Base64 PNG)
+            'cache_key': cache_key,  # 캐시 키 (file_id, 데이터 버전, 타겟, 피처, 그룹화 컬럼 기반 해시)
+            'data_version': data_version,
+            'feature_matrix': feature_matrix,  # 타겟 + 피처 전체 상관관계 행렬 {'columns': [...], 'values': [[...]]}
+            'excluded_features': excluded_features or [],  # 상관계수를 계산하지 못해 제외된 피처
             'created_at': datetime.now()
         }
         
@@ -44,4 +52,15 @@ class CorrelationRepository:
         if result:
             result.pop('_id', None)
         return result
-
+    
+    async def get_by_cache_key(self, file_id: str, cache_key: str) -> Optional[Dict]:
+        """캐시 키로 조회 (동일 조건의 분석 결과 재사용)"""
+        db = await get_database()
+        collection = db['correlations']
+        result = await collection.find_one(
+            {'file_id': file_id, 'cache_key': cache_key},
+            sort=[('created_at', -1)]
+        )
+        if result:
+            result.pop('_id', None)
+        return result
@@ -1,19 +1,26 @@
 from typing import Dict, List, Optional
 from datetime import datetime
+import hashlib
+import json
 import time
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from scipy.stats import chi2_contingency
+from app.core.config import settings
 from app.core.database import get_database
 from app.models.correlation import CorrelationAnalysisResponse, TopCorrelationItem
 from app.services.correlation.weight_calculator import WeightCalculator
 from app.services.correlation.correlation_repository import CorrelationRepository
+from app.services.correlation.streaming_correlation import StreamingCorrelationAccumulator
+from app.services.correlation.group_correlation import GroupCorrelationPool
+from app.services.correlation.lagged_correlation import WeeklySeriesAccumulator, lagged_cross_correlations, peak_lags
 from app.services.file.file_repository import FileRepository
 from app.services.file.file_service import FileService
 from app.services.weight.weight_repository import WeightRepository
 from app.services.file.file_analysis_config_repository import FileAnalysisConfigRepository
 from app.services.analysis.analysis_repository import AnalysisRepository
+from app.services.visualization.chart_formatter import ChartFormatter
 
 class CorrelationService:
     """상관관계 분석 서비스"""
@@ -26,14 +33,24 @@ class CorrelationService:
         self.weight_repository = WeightRepository()
         self.config_repository = FileAnalysisConfigRepository()
         self.analysis_repository = AnalysisRepository()
+        self.chart_formatter = ChartFormatter()
     
     async def analyze_correlations(
         self, 
         file_id: str,
         features: Optional[List[str]],
-        user_id: str
+        user_id: str,
+        streaming: Optional[bool] = None,
+        chart_format: str = 'png'
     ) -> CorrelationAnalysisResponse:
-        """상관관계 분석 및 가중치 계산"""
+        """상관관계 분석 및 가중치 계산
+        
+        Args:
+            streaming: True면 배치 단위 스트리밍 계산 (행 수 제한 없음, 범주형 피처는 라벨 코드로 변환).
+                None이면 행 수가 CORRELATION_STREAMING_ROW_THRESHOLD를 넘을 때 자동으로 사용
+            chart_format: 응답 차트 형식 (png, plotly, data). 저장은 항상 figure 스펙으로 합니다.
+        """
+        self.chart_formatter.validate(chart_format)
         # 1. 파일 소유권 확인 및 target_column 가져오기
         file_info = await self.file_repository.get_sales_info(file_id, user_id)
         if not file_info:
@@ -64,68 +81,109 @@ class CorrelationService:
             else:
                 raise ValueError("features를 지정하거나, 파일 업로드 시 target_column을 지정하여 컬럼 추천을 먼저 수행해야 합니다.")
         
-        # 3. 데이터 로드 및 Lag 피처 생성 (필요시)
-        data = await self._load_data(file_id)
+        # 2-1. 스트리밍 모드 결정 (메모리에 올릴 수 있는 행 수를 넘으면 자동 사용)
+        if streaming is None:
+            row_count = await self.file_repository.get_csv_row_count(file_id)
+            streaming = row_count > settings.CORRELATION_STREAMING_ROW_THRESHOLD
         
-        # Lag 피처가 필요한데 데이터에 없으면 실시간 생성
-        if lag_feature_columns and date_column:
-            from app.services.feature.lag_feature_generator import LagFeatureGenerator
-            lag_generator = LagFeatureGenerator()
+        # 2-2. 캐시 확인: 데이터 버전/설정/피처 조합이 같으면 저장된 결과와 차트를 그대로 반환
+        data_version = await self.file_repository.get_data_version(file_id)
+        cache_key = self._build_cache_key(
+            file_id=file_id,
+            data_version=data_version,
+            config_version=config.get('config_version', 0) if config else 0,
+            target_column=target_column,
+            features=features,
+            group_by_columns=group_by_columns,
+            streaming=streaming
+        )
+        cached = await self.repository.get_by_cache_key(file_id, cache_key)
+        if cached:
+            print(f"✅ 상관관계 캐시 사용: {cached.get('correlation_id')} (data_version={data_version})")
+            return await self._to_response(cached, chart_format)
+        
+        if streaming:
+            # 3~4. 스트리밍 계산: 배치 단위로 공동 적률을 누적 (전체 테이블을 메모리에 올리지 않음)
+            overall_correlations, group_correlations_dict, feature_matrix, lagged_correlations = await self._calculate_correlations_streaming(
+                file_id, target_column, features, group_by_columns, lag_feature_columns, date_column
+            )
+        else:
+            # 3. 데이터 로드 및 Lag 피처 생성 (필요시)
+            data = await self._load_data(file_id)
+        
+            # Lag 피처가 필요한데 데이터에 없으면 실시간 생성
+            if lag_feature_columns and date_column:
+                from app.services.feature.lag_feature_generator import LagFeatureGenerator
+                lag_generator = LagFeatureGenerator()
             
-            # Lag 피처가 데이터에 있는지 확인
-            sample_row = data[0] if data else {}
-            needs_lag_generation = any(lag_col not in sample_row for lag_col in lag_feature_columns[:3])  # 처음 3개만 체크
+                # Lag 피처가 데이터에 있는지 확인
+                sample_row = data[0] if data else {}
+                needs_lag_generation = any(lag_col not in sample_row for lag_col in lag_feature_columns[:3])  # 처음 3개만 체크
             
-            if needs_lag_generation:
-                print(f"📊 Lag 피처 실시간 생성 중...")
-                try:
-                    # Lag 피처 생성에 필요한 정보
-                    valid_base_columns = [col for col in valid_columns if not col.endswith('_lag_7d') and not col.endswith('_lag_14d') and not col.endswith('_lag_30d')]
-                    grouping_cols = config.get('grouping_columns', []) if config else []
+                if needs_lag_generation:
+                    print(f"📊 Lag 피처 실시간 생성 중...")
+                    try:
+                        # Lag 피처 생성에 필요한 정보
+                        valid_base_columns = [col for col in valid_columns if not col.endswith('_lag_7d') and not col.endswith('_lag_14d') and not col.endswith('_lag_30d')]
+                        grouping_cols = config.get('grouping_columns', []) if config else []
                     
-                    processed_df, _ = await lag_generator.generate_lag_features(
-                        data=data,
-                        date_column=date_column,
-                        target_column=target_column,
-                        numeric_columns=valid_base_columns,
-                        group_by_columns=grouping_cols,
-                        lag_periods=[7, 30]
-                    )
+                        processed_df, _ = await lag_generator.generate_lag_features(
+                            data=data,
+                            date_column=date_column,
+                            target_column=target_column,
+                            numeric_columns=valid_base_columns,
+                            group_by_columns=grouping_cols,
+                            lag_periods=[7, 30]
+                        )
                     
-                    # DataFrame을 다시 List[Dict]로 변환
-                    data = processed_df.to_dict('records')
-                    print(f"✅ Lag 피처 생성 완료: {len(lag_feature_columns)}개 컬럼")
-                except Exception as e:
-                    print(f"⚠️ Lag 피처 생성 실패: {str(e)}, 기존 데이터 사용")
-        
-        # 4. 상관계수 계산 (전체 + 그룹별)
-        # 4-1. 전체 상관계수 (그룹화 없이) - valid_columns만 사용 (그룹화 컬럼 제외)
-        overall_correlations = await self._calculate_correlations(
-            data, target_column, features, None
-        )
-        
-        # 4-2. 그룹별 상관계수 계산
-        group_correlations_dict = {}
-        if group_by_columns:
-            df_check = pd.DataFrame(data)
-            for group_col in group_by_columns:
-                if group_col in df_check.columns:
-                    print(f"📊 그룹별 상관계수 계산 시작: '{group_col}'")
-                    group_corr = await self._calculate_correlations_by_group(
-                        data, target_column, features, group_col
-                    )
-                    if group_corr:
-                        group_correlations_dict[f"by_{group_col}"] = group_corr
+                        # DataFrame을 다시 List[Dict]로 변환
+                        data = processed_df.to_dict('records')
+                        print(f"✅ Lag 피처 생성 완료: {len(lag_feature_columns)}개 컬럼")
+                    except Exception as e:
+                        print(f"⚠️ Lag 피처 생성 실패: {str(e)}, 기존 데이터 사용")
+        
+            # 4. 상관계수 계산 (전체 + 그룹별)
+            # 4-1. 전체 상관계수 (그룹화 없이) - valid_columns만 사용 (그룹화 컬럼 제외)
+            overall_correlations = await self._calculate_correlations(
+                data, target_column, features, None
+            )
+            
+            # 4-1-1. 타겟 + 피처 전체 상관관계 행렬 (히트맵 재사용용)
+            feature_matrix = self._calculate_feature_matrix(data, target_column, features)
+            
+            # 4-1-2. 시차 교차상관 (날짜 컬럼이 있을 때)
+            lagged_correlations = None
+            if date_column:
+                weekly = WeeklySeriesAccumulator(date_column, target_column, features, group_by_columns)
+                weekly.update(data)
+                lagged_correlations = self._calculate_lagged_correlations(weekly)
+        
+            # 4-2. 그룹별 상관계수 계산
+            group_correlations_dict = {}
+            if group_by_columns:
+                df_check = pd.DataFrame(data)
+                for group_col in group_by_columns:
+                    if group_col in df_check.columns:
+                        print(f"📊 그룹별 상관계수 계산 시작: '{group_col}'")
+                        group_corr = await self._calculate_correlations_by_group(
+                            data, target_column, features, group_col
+                        )
+                        if group_corr:
+                            group_correlations_dict[f"by_{group_col}"] = group_corr
         
         # 전체 상관계수를 기본값으로 사용 (하위 호환성)
         correlations = overall_correlations
+        # 상관계수를 계산하지 못한 피처 (데이터에 없거나 값이 모두 같은 컬럼)
+        excluded_features = [feature for feature in features if feature not in correlations]
+        if excluded_features:
+            print(f"⚠️ 상관계수 계산에서 제외된 피처: {excluded_features}")
         
         # 5. 가중치 계산
         start_time = time.time()
         weights = self.weight_calculator.calculate(correlations)
         
-        # 6. 시각화 생성
-        chart = await self._create_chart(correlations, target_column)
+        # 6. 시각화 생성 (figure 스펙)
+        chart_spec = self._create_chart(correlations, target_column)
         
         processing_time = time.time() - start_time
         
@@ -148,41 +206,79 @@ class CorrelationService:
             processing_time_seconds=processing_time,
             result={
                 'correlation_matrix': correlations,
-                'chart': chart
+                'chart_spec': chart_spec
             }
         )
         
-        # 9. 기존 방식 호환성을 위한 저장 (선택적)
+        # 상관관계 행렬 구성 (전체 + 그룹별)
+        correlation_matrix = {
+            'overall': correlations,  # 전체 상관계수
+            **group_correlations_dict  # 그룹별 상관계수 (예: {"by_상품_ID": {...}, "by_브랜드": {...}})
+        }
+        if lagged_correlations:
+            # 시차 교차상관 (피처별 최대 상관 시차, 전체 + 그룹별)
+            correlation_matrix['lagged'] = lagged_correlations
+        
+        # 9. 상관관계 결과 저장 (그룹별 결과 포함, 캐시 키와 함께 저장하여 재사용)
         result = await self.repository.save(
             file_id=file_id,
             user_id=user_id,
             target_column=target_column,
-            correlations=correlations,
+            correlations=correlation_matrix,
             weights=weights,
-            chart=chart
+            chart_spec=chart_spec,
+            cache_key=cache_key,
+            data_version=data_version,
+            feature_matrix=feature_matrix,
+            excluded_features=excluded_features
         )
         
-        # 상관관계 행렬 구성 (전체 + 그룹별)
-        correlation_matrix = {
-            'overall': correlations,  # 전체 상관계수
-            **group_correlations_dict  # 그룹별 상관계수 (예: {"by_상품_ID": {...}, "by_브랜드": {...}})
-        }
-        
         return CorrelationAnalysisResponse(
             correlation_matrix=correlation_matrix,
             top_correlations=self._get_top_correlations(correlations),
-            chart=chart,
+            chart=await self.chart_formatter.format(chart_spec, chart_format),
             weights=weights,
+            excluded_features=excluded_features,
             correlation_id=result['correlation_id'],
             created_at=result['created_at']
         )
     
-    async def get_correlations(self, file_id: str) -> Optional[CorrelationAnalysisResponse]:
-        """저장된 상관관계 분석 결과 조회"""
+    async def get_correlations(self, file_id: str, chart_format: str = 'png') -> Optional[CorrelationAnalysisResponse]:
+        """저장된 상관관계 분석 결과 조회 (차트는 요청한 형식으로 변환)"""
         result = await self.repository.get_by_file_id(file_id)
         if not result:
             return None
+        return await self._to_response(result, chart_format)
+    
+    def _build_cache_key(
+        self,
+        file_id: str,
+        data_version: int,
+        config_version: int,
+        target_column: str,
+        features: List[str],
+        group_by_columns: List[str],
+        streaming: bool = False
+    ) -> str:
+        """상관관계 캐시 키 생성
         
+        데이터 업로드/추가 시 data_version, 컬럼 설정 변경 시 config_version이 증가하므로
+        키가 바뀌어 이전 결과는 자동으로 무효화됩니다.
+        """
+        key_source = {
+            'file_id': file_id,
+            'data_version': data_version,
+            'config_version': config_version,
+            'target_column': target_column,
+            'features': sorted(features or []),
+            'group_by_columns': list(group_by_columns or []),
+            'streaming': bool(streaming)
+        }
+        key_json = json.dumps(key_source, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+    
+    async def _to_response(self, result: Dict, chart_format: str = 'png') -> CorrelationAnalysisResponse:
+        """저장된 상관관계 문서를 응답 모델로 변환 (스펙이 없는 이전 버전 문서는 저장된 PNG 사용)"""
         # correlation_matrix가 이미 딕셔너리인 경우와 문자열 키인 경우 처리
         correlation_matrix = result.get('correlation_matrix', {})
         if isinstance(correlation_matrix, dict) and 'overall' in correlation_matrix:
@@ -195,21 +291,138 @@ class CorrelationService:
         return CorrelationAnalysisResponse(
             correlation_matrix=matrix,
             top_correlations=self._get_top_correlations(matrix.get('overall', {})),
-            chart=result.get('chart', ''),
+            chart=await self.chart_formatter.format(result.get('chart_spec'), chart_format, result.get('chart')),
             weights=result.get('weights', {}),
+            excluded_features=result.get('excluded_features', []),
             correlation_id=result.get('correlation_id', ''),
             created_at=result.get('created_at', datetime.now())
         )
     
     async def _load_data(self, file_id: str) -> List[dict]:
-        """MongoDB에서 데이터 로드"""
-        data = await self.file_repository.get_csv_data(file_id, 0, 10000)
+        """MongoDB에서 데이터 로드 (스트리밍 기준 행 수까지)"""
+        data = await self.file_repository.get_csv_data(file_id, 0, settings.CORRELATION_STREAMING_ROW_THRESHOLD)
         # CSV Collection에서 가져온 데이터는 data 필드 안에 있음
         if data and 'data' in data[0]:
             # data 필드를 펼쳐서 사용
             return [row['data'] for row in data]
         return data
     
+    async def _calculate_correlations_streaming(
+        self,
+        file_id: str,
+        target: str,
+        features: List[str],
+        group_by_columns: List[str],
+        lag_feature_columns: List[str],
+        date_column: Optional[str] = None
+    ) -> tuple:
+        """스트리밍 상관계수 계산 (전체 + 그룹별)
+        
+        MongoDB 커서를 배치 단위로 순회하며 공동 적률을 누적하므로 메모리 사용량은
+        행 수와 무관하게 피처 수²(그룹별은 그룹 수 x 피처 수)에 비례합니다.
+        메모리 경로와 같이 범주형 컬럼은 라벨 코드로 변환해 사용하므로, 행 수가 늘어 스트리밍으로
+        바뀌어도 분석 대상 피처는 같습니다 (코드는 정렬 순서가 아닌 등장 순서).
+        
+        Returns:
+            (overall, group_correlations, feature_matrix, lagged): 전체 {feature: r}, 그룹별 {"by_<col>": {group: {feature: r}}},
+            타겟 + 피처 전체 상관관계 행렬 (압축 형식), 시차 교차상관 (날짜 컬럼이 없으면 None)
+        """
+        batch_size = settings.CORRELATION_STREAMING_BATCH_SIZE
+        accumulator = StreamingCorrelationAccumulator(target, features, group_by_columns)
+        
+        # Lag 피처가 필요하고, 전처리 데이터가 전체 행을 포함하면 전처리 데이터를 순회
+        use_preprocessed = False
+        if lag_feature_columns:
+            preprocessed_info = await self.file_repository.get_preprocessed_info(file_id, target)
+            if preprocessed_info:
+                csv_row_count = await self.file_repository.get_csv_row_count(file_id)
+                use_preprocessed = preprocessed_info['row_count'] >= csv_row_count
+        
+        if use_preprocessed:
+            batches = self.file_repository.iter_preprocessed_batches(file_id, target, batch_size)
+        else:
+            batches = self.file_repository.iter_csv_batches(file_id, batch_size)
+        
+        # 시차 교차상관용 주간 시계열도 같은 순회에서 누적
+        weekly = WeeklySeriesAccumulator(date_column, target, features, group_by_columns) if date_column else None
+        
+        async for batch in batches:
+            accumulator.update(batch)
+            if weekly is not None:
+                weekly.update(batch)
+        
+        print(f"📊 스트리밍 상관계수 계산 완료: {accumulator.row_count}행 (배치 크기 {batch_size})")
+        overall, group_correlations = accumulator.finalize()
+        feature_matrix = self._compact_matrix(accumulator.columns, accumulator.overall.pearson(min_count=2))
+        lagged = self._calculate_lagged_correlations(weekly) if weekly is not None else None
+        return overall, group_correlations, feature_matrix, lagged
+    
+    def _calculate_lagged_correlations(self, weekly: WeeklySeriesAccumulator) -> Optional[Dict]:
+        """시차 교차상관 계산 (lag 0 ~ CORRELATION_MAX_LAG_WEEKS 주)
+        
+        그룹별 주간 평균 시계열을 정렬한 뒤 모든 그룹/피처를 FFT로 한 번에 계산합니다.
+        전체(overall) 값은 첫 번째 그룹화 컬럼의 그룹 내 교차상관을 합산한 값입니다.
+        
+        Returns:
+            {'max_lag_weeks': int, 'overall': {feature: {'peak_lag', 'peak_correlation'}},
+             'by_<col>': {group: {feature: {...}}}}
+        """
+        max_lag = settings.CORRELATION_MAX_LAG_WEEKS
+        lagged = {'max_lag_weeks': max_lag}
+        try:
+            for i, group_col in enumerate(weekly.group_by_columns):
+                group_keys, values = weekly.series(group_col)
+                if not group_keys:
+                    continue
+                group_corr, pooled_corr = lagged_cross_correlations(values, max_lag=max_lag)
+                if i == 0:
+                    lagged['overall'] = peak_lags(pooled_corr, weekly.features)
+                if group_col is None:
+                    continue
+                by_group = {}
+                for group_idx, group_key in enumerate(group_keys):
+                    peaks = peak_lags(group_corr[group_idx], weekly.features)
+                    if peaks:
+                        by_group[group_key] = peaks
+                if by_group:
+                    lagged[f"by_{group_col}"] = by_group
+        except Exception as e:
+            print(f"⚠️ 시차 교차상관 계산 실패: {str(e)}")
+            return None
+        
+        return lagged if 'overall' in lagged else None
+    
+    def _calculate_feature_matrix(self, data: List[dict], target: str, features: List[str]) -> Dict:
+        """타겟 + 피처 전체 상관관계 행렬 계산 (범주형 컬럼은 라벨 코드, 결측값은 쌍별 제외)"""
+        df = pd.DataFrame(data)
+        columns = [col for col in [target] + list(features) if col in df.columns]
+        if not columns:
+            return {'columns': [], 'values': []}
+        numeric_df = pd.DataFrame({
+            col: pd.to_numeric(self._preprocess_column(df[col]), errors='coerce') for col in columns
+        }, index=df.index)
+        corr = numeric_df.corr(min_periods=2)
+        return self._compact_matrix(list(corr.columns), corr.to_numpy(dtype=float))
+    
+    def _compact_matrix(self, columns: List[str], matrix: np.ndarray) -> Dict:
+        """상관관계 행렬을 저장용 압축 형식으로 변환
+        
+        분산이 0이거나 숫자로 변환할 수 없는 컬럼(대각 원소가 NaN)은 제외하고,
+        나머지 NaN은 None으로 저장합니다.
+        
+        Returns:
+            {'columns': [컬럼명...], 'values': [[r, ...], ...]}
+        """
+        keep = [i for i in range(len(columns)) if not np.isnan(matrix[i, i])]
+        values = matrix[np.ix_(keep, keep)]
+        return {
+            'columns': [columns[i] for i in keep],
+            'values': [
+                [None if np.isnan(v) else round(float(v), 6) for v in row]
+                for row in values
+            ]
+        }
+    
     def _detect_group_column(self, data: List[dict], target_column: str, features: List[str]) -> Optional[str]:
         """제품별 그룹화 컬럼 자동 감지 (상품_ID, 상품명 등)"""
         if not data:
@@ -320,6 +533,9 @@ class CorrelationService:
     ) -> Dict[str, Dict[str, float]]:
         """그룹별 상관계수 계산
         
+        타겟/피처 전처리는 전체 데이터에 대해 한 번만 수행하고, 그룹별 상관계수는
+        GroupCorrelationPool이 그룹 구간 단위로 한 번에 계산합니다 (행 수가 많으면 프로세스 풀 병렬 처리).
+        
         Args:
             data: 분석할 데이터
             target: 타겟 컬럼명
@@ -331,51 +547,51 @@ class CorrelationService:
         """
         df = pd.DataFrame(data)
         
-        if group_by_column not in df.columns:
+        if group_by_column not in df.columns or target not in df.columns:
             return {}
         
-        group_correlations = {}
-        group_values = df[group_by_column].unique()
+        codes, group_values = pd.factorize(df[group_by_column])
+        if len(group_values) == 0:
+            return {}
         
-        for group_value in group_values:
-            group_df = df[df[group_by_column] == group_value]
-            if len(group_df) < 3:  # 데이터가 너무 적으면 스킵
+        # 전처리는 그룹마다 반복하지 않고 전체 컬럼에 한 번만 적용
+        target_series = self._preprocess_column(df[target], None)
+        columns = [pd.to_numeric(target_series, errors='coerce').to_numpy(dtype=float)]
+        valid_features = []
+        for feature in features:
+            if feature not in df.columns:
                 continue
-            
-            group_corr = {}
-            target_series = self._preprocess_column(group_df[target], None)
-            
-            for feature in features:
-                if feature not in group_df.columns:
-                    continue
-                
-                try:
-                    feature_series = self._preprocess_column(group_df[feature], None)
-                    
-                    if pd.api.types.is_numeric_dtype(target_series) and pd.api.types.is_numeric_dtype(feature_series):
-                        # 정규화 후 피어슨 상관계수
-                        valid_mask = ~(target_series.isna() | feature_series.isna())
-                        if valid_mask.sum() < 2:
-                            continue
-                        
-                        target_valid = target_series[valid_mask]
-                        feature_valid = feature_series[valid_mask]
-                        
-                        # 정규화 (StandardScaler: 평균 0, 표준편차 1)
-                        scaler = StandardScaler()
-                        target_normalized = scaler.fit_transform(target_valid.values.reshape(-1, 1)).flatten()
-                        feature_normalized = scaler.fit_transform(feature_valid.values.reshape(-1, 1)).flatten()
-                        
-                        # 정규화된 데이터로 상관계수 계산
-                        corr = np.corrcoef(target_normalized, feature_normalized)[0, 1]
-                    else:
-                        corr = self._calculate_categorical_correlation(target_series, feature_series)
-                    
-                    if not np.isnan(corr) and not pd.isna(corr):
-                        group_corr[feature] = float(corr)
-                except Exception as e:
-                    continue
-            
+            try:
+                feature_series = self._preprocess_column(df[feature], None)
+                columns.append(pd.to_numeric(feature_series, errors='coerce').to_numpy(dtype=float))
+                valid_features.append(feature)
+            except Exception as e:
+                print(f"⚠️ 피처 '{feature}' 전처리 실패: {str(e)}")
+                continue
+        
+        if not valid_features:
+            return {}
+        
+        values = np.column_stack(columns)
+        has_group = codes >= 0
+        # 메모리 경로는 최대 스트리밍 기준 행 수까지만 로드하므로 병렬 기준도 그 이하로 제한
+        parallel_min_rows = min(settings.CORRELATION_PARALLEL_MIN_ROWS, settings.CORRELATION_STREAMING_ROW_THRESHOLD)
+        matrix = await GroupCorrelationPool().correlate(
+            values[has_group],
+            codes[has_group],
+            len(group_values),
+            min_rows=3,
+            parallel_min_rows=parallel_min_rows,
+            max_workers=settings.CORRELATION_MAX_WORKERS
+        )
+        
+        group_correlations = {}
+        for group_idx, group_value in enumerate(group_values):
+            group_corr = {
+                feature: float(matrix[group_idx, i])
+                for i, feature in enumerate(valid_features)
+                if not np.isnan(matrix[group_idx, i])
+            }
             if group_corr:
                 group_correlations[str(group_value)] = group_corr
         
@@ -463,10 +679,9 @@ class CorrelationService:
                 corr = encoded1.corr(encoded2)
                 return corr if not pd.isna(corr) else 0.0
     
-    async def _create_chart(self, correlations: Dict, target: str) -> str:
-        """차트 생성"""
+    def _create_chart(self, correlations: Dict, target: str) -> str:
+        """차트 생성 (figure 스펙 반환)"""
         import plotly.graph_objects as go
-        import base64
         
         features = list(correlations.keys())
         values = list(correlations.values())
@@ -480,9 +695,7 @@ class CorrelationService:
             yaxis_title="상관계수"
         )
         
-        img_bytes = fig.to_image(format="png")
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-        return img_base64
+        return self.chart_formatter.to_spec(fig)
     
     def _get_top_correlations(self, correlations: Dict, top_n: int = 5) -> List[TopCorrelationItem]:
         """상위 상관관계 추출"""
@@ -0,0 +1,175 @@
+from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import asyncio
+import multiprocessing
+import os
+import sys
+import numpy as np
+
+def segment_correlations(values: np.ndarray, starts: np.ndarray, min_rows: int = 3) -> np.ndarray:
+    """그룹별(연속 구간별) 타겟-피처 피어슨 상관계수 계산
+    
+    values는 그룹 순서로 정렬된 (행 x (1 + 피처 수)) 배열이며 0번째 열이 타겟입니다.
+    starts는 각 그룹 구간의 시작 행 인덱스입니다. np.add.reduceat으로 모든 그룹의 합계를
+    한 번에 구하므로 그룹 수만큼 파이썬 루프를 돌지 않습니다. 결측값은 쌍별로 제외합니다.
+    
+    Returns:
+        (그룹 수 x 피처 수) 상관계수 배열 (계산 불가능한 값은 NaN)
+    """
+    num_groups = len(starts)
+    num_features = values.shape[1] - 1
+    result = np.full((num_groups, num_features), np.nan)
+    if num_groups == 0 or num_features == 0 or len(values) == 0:
+        return result
+    
+    sizes = np.diff(np.append(starts, len(values)))
+    target = values[:, :1]
+    feature = values[:, 1:]
+    pair_mask = ~np.isnan(target) & ~np.isnan(feature)
+    t = np.where(pair_mask, target, 0.0)
+    f = np.where(pair_mask, feature, 0.0)
+    
+    # 1차: 그룹/피처 쌍별 유효 개수와 평균
+    counts = np.add.reduceat(pair_mask.astype(float), starts, axis=0)
+    safe_counts = np.where(counts > 0, counts, 1)
+    mean_t = np.add.reduceat(t, starts, axis=0) / safe_counts
+    mean_f = np.add.reduceat(f, starts, axis=0) / safe_counts
+    
+    # 2차: 그룹 평균으로 중심화한 뒤 공분산/분산 합계 (수치 안정성)
+    dt = np.where(pair_mask, t - np.repeat(mean_t, sizes, axis=0), 0.0)
+    df = np.where(pair_mask, f - np.repeat(mean_f, sizes, axis=0), 0.0)
+    cov = np.add.reduceat(dt * df, starts, axis=0)
+    var_t = np.add.reduceat(dt * dt, starts, axis=0)
+    var_f = np.add.reduceat(df * df, starts, axis=0)
+    
+    denom = np.sqrt(var_t * var_f)
+    valid = (sizes[:, None] >= min_rows) & (counts >= 2) & (denom > 0)
+    np.divide(cov, denom, out=result, where=valid)
+    return result
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """워커에서 공유 메모리에 연결 (해제는 부모 프로세스가 담당)"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # spawn 워커는 부모와 같은 resource tracker를 공유하므로 부모의 unlink 한 번으로 정리됨
+    return shared_memory.SharedMemory(name=name)
+
+def _correlate_chunk(
+    shm_name: str,
+    shape: Tuple[int, int],
+    row_start: int,
+    row_end: int,
+    starts: np.ndarray,
+    min_rows: int
+) -> np.ndarray:
+    """프로세스 풀 워커: 공유 메모리의 [row_start, row_end) 구간 그룹 상관계수 계산"""
+    shm = _attach_shared_memory(shm_name)
+    try:
+        values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        return segment_correlations(values[row_start:row_end], starts - row_start, min_rows)
+    finally:
+        shm.close()
+
+class GroupCorrelationPool:
+    """그룹별 상관계수 병렬 계산기
+    
+    그룹을 행 수 기준으로 균등한 청크로 나누고, 정렬된 데이터를 공유 메모리에 올려
+    프로세스 풀 워커가 DataFrame 피클링 없이 자기 구간만 읽어 계산합니다.
+    프로세스 풀은 한 번 생성 후 재사용합니다.
+    """
+    
+    _executor: Optional[ProcessPoolExecutor] = None
+    _max_workers: int = 1
+    
+    @classmethod
+    def get_executor(cls, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """프로세스 풀 반환 (최초 호출 시 생성)"""
+        if cls._executor is None:
+            cls._max_workers = max_workers or os.cpu_count() or 1
+            # 이벤트 루프/DB 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+            cls._executor = ProcessPoolExecutor(
+                max_workers=cls._max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return cls._executor
+    
+    @classmethod
+    def shutdown(cls):
+        """프로세스 풀 종료"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+    
+    @staticmethod
+    def _balanced_chunks(starts: np.ndarray, total_rows: int, num_chunks: int) -> List[Tuple[int, int]]:
+        """연속된 그룹을 행 수가 비슷한 청크로 분할 (그룹 인덱스 구간 목록)"""
+        num_groups = len(starts)
+        num_chunks = max(1, min(num_chunks, num_groups))
+        targets = total_rows * np.arange(1, num_chunks) / num_chunks
+        cuts = np.searchsorted(starts, targets, side='right')
+        bounds = np.unique(np.concatenate([[0], cuts, [num_groups]]))
+        return [(int(bounds[i]), int(bounds[i + 1])) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+    
+    async def correlate(
+        self,
+        values: np.ndarray,
+        codes: np.ndarray,
+        num_groups: int,
+        min_rows: int = 3,
+        parallel_min_rows: int = 50000,
+        max_workers: Optional[int] = None
+    ) -> np.ndarray:
+        """그룹별 타겟-피처 상관계수 계산
+        
+        Args:
+            values: (행 x (1 + 피처 수)) 배열, 0번째 열이 타겟
+            codes: 행별 그룹 코드 (0 ~ num_groups-1)
+            num_groups: 그룹 수
+            min_rows: 그룹 최소 행 수 (미만이면 NaN)
+            parallel_min_rows: 이 행 수 미만이면 프로세스 풀 없이 현재 프로세스에서 계산
+        
+        Returns:
+            (num_groups x 피처 수) 상관계수 배열
+        """
+        result = np.full((num_groups, values.shape[1] - 1), np.nan)
+        if len(values) == 0 or num_groups == 0:
+            return result
+        
+        # 그룹 코드 순으로 정렬하여 그룹별 연속 구간 생성
+        order = np.argsort(codes, kind='stable')
+        sorted_values = np.ascontiguousarray(values[order], dtype=np.float64)
+        group_sizes = np.bincount(codes, minlength=num_groups)
+        present_groups = np.flatnonzero(group_sizes)
+        starts = np.concatenate([[0], np.cumsum(group_sizes[present_groups])[:-1]]).astype(np.int64)
+        
+        if len(sorted_values) < parallel_min_rows or len(present_groups) < 2:
+            result[present_groups] = segment_correlations(sorted_values, starts, min_rows)
+            return result
+        
+        executor = self.get_executor(max_workers)
+        chunks = self._balanced_chunks(starts, len(sorted_values), self._max_workers * 2)
+        shm = shared_memory.SharedMemory(create=True, size=sorted_values.nbytes)
+        try:
+            shared = np.ndarray(sorted_values.shape, dtype=np.float64, buffer=shm.buf)
+            shared[:] = sorted_values
+            del shared
+            
+            loop = asyncio.get_running_loop()
+            futures = []
+            for group_start, group_end in chunks:
+                row_start = int(starts[group_start])
+                row_end = int(starts[group_end]) if group_end < len(starts) else len(sorted_values)
+                futures.append(loop.run_in_executor(
+                    executor, _correlate_chunk,
+                    shm.name, sorted_values.shape, row_start, row_end,
+                    starts[group_start:group_end], min_rows
+                ))
+            chunk_results = await asyncio.gather(*futures)
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        for (group_start, group_end), chunk_result in zip(chunks, chunk_results):
+            result[present_groups[group_start:group_end]] = chunk_result
+        return result
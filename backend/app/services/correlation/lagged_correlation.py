@@ -0,0 +1,197 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from scipy import fft as sp_fft
+
+# 주 번호 기준일 (월요일 시작 주)
+_WEEK_ORIGIN = pd.Timestamp('1970-01-05')
+
+class WeeklySeriesAccumulator:
+    """그룹별 주간 시계열 누적기
+    
+    데이터를 배치 단위로 받아 (그룹, 주) 단위 합계/개수를 누적합니다.
+    그룹화 컬럼마다 별도 시계열을 만들고, 그룹화 컬럼이 없으면 전체를 하나의 시계열로 묶습니다.
+    메모리는 행 수가 아니라 그룹 수 x 주 수에 비례합니다.
+    """
+    
+    def __init__(
+        self,
+        date_column: str,
+        target: str,
+        features: List[str],
+        group_by_columns: Optional[List[str]] = None
+    ):
+        self.date_column = date_column
+        self.target = target
+        self.features = list(features)
+        self.columns = [target] + self.features
+        # None 키는 그룹화 없이 전체를 하나의 시계열로 묶은 경우
+        self.group_by_columns: List[Optional[str]] = list(group_by_columns or []) or [None]
+        self.sums: Dict[Optional[str], Optional[pd.DataFrame]] = {col: None for col in self.group_by_columns}
+        self.counts: Dict[Optional[str], Optional[pd.DataFrame]] = {col: None for col in self.group_by_columns}
+    
+    def update(self, rows: List[Dict]):
+        """배치 데이터 누적"""
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        if self.date_column not in df.columns:
+            return
+        
+        dates = pd.to_datetime(df[self.date_column], errors='coerce')
+        weeks = (dates.dt.normalize() - _WEEK_ORIGIN).dt.days // 7
+        values = pd.DataFrame({
+            col: pd.to_numeric(df[col], errors='coerce') if col in df.columns else np.nan
+            for col in self.columns
+        }, index=df.index)
+        values['__week__'] = weeks
+        
+        for group_col in self.group_by_columns:
+            if group_col is None:
+                keys = ['__week__']
+                batch = values
+            elif group_col in df.columns:
+                keys = ['__group__', '__week__']
+                batch = values.assign(__group__=df[group_col].astype(str))
+            else:
+                continue
+            batch = batch[batch['__week__'].notna()]
+            grouped = batch.groupby(keys)[self.columns]
+            batch_sums = grouped.sum()
+            batch_counts = grouped.count()
+            if self.sums[group_col] is None:
+                self.sums[group_col] = batch_sums
+                self.counts[group_col] = batch_counts
+            else:
+                self.sums[group_col] = self.sums[group_col].add(batch_sums, fill_value=0)
+                self.counts[group_col] = self.counts[group_col].add(batch_counts, fill_value=0)
+    
+    def series(self, group_col: Optional[str]) -> Tuple[List[str], np.ndarray]:
+        """그룹별로 정렬된 주간 평균 시계열
+        
+        Returns:
+            (group_keys, values): values는 (그룹 수 x 주 수 x (1 + 피처 수)) 배열이며
+            0번째 채널이 타겟, 관측이 없는 주는 NaN
+        """
+        sums = self.sums.get(group_col)
+        if sums is None or sums.empty:
+            return [], np.empty((0, 0, len(self.columns)))
+        counts = self.counts[group_col]
+        means = sums / counts.where(counts > 0)
+        
+        if group_col is None:
+            means = pd.concat({'__all__': means}, names=['__group__'])
+        group_codes, group_keys = pd.factorize(means.index.get_level_values(0))
+        week_values = means.index.get_level_values(-1).to_numpy(dtype=np.int64)
+        week_codes = week_values - week_values.min()
+        num_weeks = int(week_codes.max()) + 1
+        
+        values = np.full((len(group_keys), num_weeks, len(self.columns)), np.nan)
+        values[group_codes, week_codes] = means[self.columns].to_numpy(dtype=float)
+        return [str(key) for key in group_keys], values
+
+def lagged_cross_correlations(
+    values: np.ndarray,
+    max_lag: int = 12,
+    min_periods: int = 4,
+    max_chunk_bytes: int = 64 * 1024 * 1024
+) -> Tuple[np.ndarray, np.ndarray]:
+    """그룹별 피처-타겟 시차 교차상관 (FFT 일괄 계산)
+    
+    lag k의 상관계수는 corr(feature[t], target[t + k]) 이며, 피처가 k주 먼저 움직일 때의
+    관계를 의미합니다. 그룹/피처 전체를 한 번의 rfft 묶음으로 처리하고, 결측 주는 마스크로
+    제외합니다 (겹치는 구간의 쌍별 합계로 정규화).
+    
+    Args:
+        values: (그룹 수 x 주 수 x (1 + 피처 수)) 배열, 0번째 채널이 타겟
+        max_lag: 최대 시차 (주)
+        min_periods: lag별 최소 겹침 주 수 (미만이면 NaN)
+    
+    Returns:
+        (group_corr, pooled_corr): 그룹별 (그룹 수 x 피처 수 x (max_lag + 1)),
+        전체 그룹 합산 (피처 수 x (max_lag + 1)) 상관계수
+    """
+    num_groups, num_weeks, num_channels = values.shape
+    num_features = num_channels - 1
+    num_lags = max_lag + 1
+    group_corr = np.full((num_groups, num_features, num_lags), np.nan)
+    pooled_sums = np.zeros((4, num_features, num_lags))
+    if num_groups == 0 or num_features == 0 or num_weeks == 0:
+        return group_corr, np.full((num_features, num_lags), np.nan)
+    
+    # 선형 상관이 되도록 zero padding (순환 상관 방지)
+    nfft = sp_fft.next_fast_len(num_weeks + num_lags)
+    bytes_per_group = num_channels * (nfft // 2 + 1) * 16 * 8
+    chunk_size = max(1, int(max_chunk_bytes // bytes_per_group))
+    
+    for start in range(0, num_groups, chunk_size):
+        chunk = values[start:start + chunk_size]
+        mask = ~np.isnan(chunk)
+        counts = mask.sum(axis=1, keepdims=True)
+        means = np.where(mask, chunk, 0.0).sum(axis=1, keepdims=True) / np.maximum(counts, 1)
+        centered = np.where(mask, chunk - means, 0.0)
+        mask = mask.astype(float)
+        
+        # (그룹, 채널, 주) 축으로 바꿔 한 번에 변환
+        spec_x = sp_fft.rfft(centered.transpose(0, 2, 1), n=nfft, axis=-1)
+        spec_xx = sp_fft.rfft((centered * centered).transpose(0, 2, 1), n=nfft, axis=-1)
+        spec_m = sp_fft.rfft(mask.transpose(0, 2, 1), n=nfft, axis=-1)
+        
+        target_x, feature_x = spec_x[:, :1], spec_x[:, 1:]
+        target_xx, feature_xx = spec_xx[:, :1], spec_xx[:, 1:]
+        target_m, feature_m = spec_m[:, :1], spec_m[:, 1:]
+        
+        # sum_t a[t] * b[t + k] = irfft(conj(A) * B)[k]
+        def cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            return sp_fft.irfft(np.conj(a) * b, n=nfft, axis=-1)[..., :num_lags]
+        
+        s_xy = cross(feature_x, target_x)
+        s_xx = cross(feature_xx, target_m)
+        s_yy = cross(feature_m, target_xx)
+        n_overlap = np.rint(cross(feature_m, target_m))
+        
+        valid = n_overlap >= min_periods
+        denom = np.sqrt(np.maximum(s_xx, 0.0) * np.maximum(s_yy, 0.0))
+        np.divide(
+            s_xy, denom,
+            out=group_corr[start:start + chunk_size],
+            where=valid & (denom > 1e-12)
+        )
+        
+        pooled_sums += np.stack([
+            np.where(valid, s_xy, 0.0).sum(axis=0),
+            np.where(valid, s_xx, 0.0).sum(axis=0),
+            np.where(valid, s_yy, 0.0).sum(axis=0),
+            np.where(valid, n_overlap, 0.0).sum(axis=0)
+        ])
+    
+    # 전체: 그룹 내 중심화된 합계를 합산 (그룹 간 수준 차이는 섞지 않음)
+    s_xy, s_xx, s_yy, n_overlap = pooled_sums
+    denom = np.sqrt(s_xx * s_yy)
+    pooled_corr = np.divide(
+        s_xy, denom,
+        out=np.full((num_features, num_lags), np.nan),
+        where=(n_overlap >= min_periods) & (denom > 1e-12)
+    )
+    np.clip(group_corr, -1.0, 1.0, out=group_corr)
+    np.clip(pooled_corr, -1.0, 1.0, out=pooled_corr)
+    return group_corr, pooled_corr
+
+def peak_lags(corr: np.ndarray, features: List[str]) -> Dict[str, Dict[str, float]]:
+    """피처별 절댓값이 가장 큰 시차와 상관계수
+    
+    Args:
+        corr: (피처 수 x 시차 수) 상관계수 배열
+    
+    Returns:
+        {feature: {'peak_lag': 주, 'peak_correlation': r}}
+    """
+    result = {}
+    abs_corr = np.where(np.isnan(corr), -1.0, np.abs(corr))
+    best = abs_corr.argmax(axis=-1)
+    for i, feature in enumerate(features):
+        lag = int(best[i])
+        if np.isnan(corr[i, lag]):
+            continue
+        result[feature] = {'peak_lag': lag, 'peak_correlation': float(corr[i, lag])}
+    return result
@@ -0,0 +1,267 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 이 비율을 넘는 값이 숫자로 변환되면 숫자형, 아니면 범주형 컬럼 (CorrelationService._preprocess_column과 같은 기준)
+_NUMERIC_RATIO = 0.8
+
+class CoMomentStats:
+    """병합 가능한 공동 적률(co-moment) 통계
+
+    쌍(pair)마다 유효 개수, 평균, 2차 중심 적률, 공분산 합을 보관합니다.
+    배치 통계는 Chan 병합 공식으로 합쳐지므로 배치 순서나 워커 분할과 무관하게
+    같은 결과를 얻을 수 있고, 메모리는 쌍의 개수에만 비례합니다.
+    """
+
+    def __init__(self, shape: Tuple[int, ...]):
+        self.n = np.zeros(shape)
+        self.mean_x = np.zeros(shape)
+        self.mean_y = np.zeros(shape)
+        self.m2_x = np.zeros(shape)
+        self.m2_y = np.zeros(shape)
+        self.c_xy = np.zeros(shape)
+
+    @classmethod
+    def from_sums(
+        cls,
+        n: np.ndarray,
+        sum_x: np.ndarray,
+        sum_y: np.ndarray,
+        sum_xx: np.ndarray,
+        sum_yy: np.ndarray,
+        sum_xy: np.ndarray,
+        shift_x: np.ndarray = 0.0,
+        shift_y: np.ndarray = 0.0
+    ) -> 'CoMomentStats':
+        """배치 합계로부터 통계 생성 (합계는 shift만큼 이동된 값으로 계산된 것)"""
+        stats = cls(n.shape)
+        safe_n = np.where(n > 0, n, 1)
+        mean_x = sum_x / safe_n
+        mean_y = sum_y / safe_n
+        stats.n = n.astype(float)
+        stats.mean_x = np.where(n > 0, mean_x + shift_x, 0.0)
+        stats.mean_y = np.where(n > 0, mean_y + shift_y, 0.0)
+        stats.m2_x = np.maximum(sum_xx - sum_x * mean_x, 0.0)
+        stats.m2_y = np.maximum(sum_yy - sum_y * mean_y, 0.0)
+        stats.c_xy = sum_xy - sum_x * mean_y
+        return stats
+
+    def grow(self, shape: Tuple[int, ...]):
+        """첫 번째 축을 늘림 (새 그룹이 등장한 경우, 빈 통계로 채움)"""
+        extra = shape[0] - self.n.shape[0]
+        if extra <= 0:
+            return
+        pad = [(0, extra)] + [(0, 0)] * (self.n.ndim - 1)
+        for name in ('n', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy'):
+            setattr(self, name, np.pad(getattr(self, name), pad))
+
+    def merge(self, other: 'CoMomentStats'):
+        """다른 통계를 병합 (Chan et al. 병렬 분산 공식)"""
+        n1, n2 = self.n, other.n
+        n = n1 + n2
+        safe_n = np.where(n > 0, n, 1)
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        weight = n1 * n2 / safe_n
+
+        self.mean_x = self.mean_x + delta_x * n2 / safe_n
+        self.mean_y = self.mean_y + delta_y * n2 / safe_n
+        self.m2_x = self.m2_x + other.m2_x + delta_x * delta_x * weight
+        self.m2_y = self.m2_y + other.m2_y + delta_y * delta_y * weight
+        self.c_xy = self.c_xy + other.c_xy + delta_x * delta_y * weight
+        self.n = n
+
+    def pearson(self, min_count: int = 2) -> np.ndarray:
+        """피어슨 상관계수 (유효 개수가 부족하거나 분산이 0이면 NaN)"""
+        denom = np.sqrt(self.m2_x * self.m2_y)
+        valid = (self.n >= min_count) & (denom > 0)
+        return np.divide(self.c_xy, denom, out=np.full(self.n.shape, np.nan), where=valid)
+
+class StreamingCorrelationAccumulator:
+    """스트리밍 상관관계 누적기
+
+    데이터를 배치 단위로 받아 전체 피처 쌍(타겟 포함)과 그룹별(타겟-피처) 공동 적률을
+    누적합니다. 결측값은 쌍별로 제외합니다.
+    컬럼 변환 방식은 컬럼이 처음 등장한 배치로 정합니다 (메모리 경로와 같은 기준).
+        - 숫자형: 숫자/날짜 타입이거나 80%를 넘는 값이 숫자로 변환되는 컬럼
+        - 범주형: 그 외 컬럼은 라벨 코드로 변환 (등장 순서로 코드를 부여하고 한 번 부여한 코드는 바꾸지 않음)
+    여러 워커의 누적기는 merge()로 합칠 수 있습니다 (같은 배치 순서로 범주 코드가 정해진 누적기끼리).
+    """
+
+    def __init__(self, target: str, features: List[str], group_by_columns: Optional[List[str]] = None):
+        self.target = target
+        self.features = list(features)
+        self.columns = [target] + self.features
+        self.group_by_columns = list(group_by_columns or [])
+
+        size = len(self.columns)
+        self.overall = CoMomentStats((size, size))
+        # 그룹 컬럼별: {그룹값: 인덱스}, (그룹 수 x 피처 수) 통계
+        self.group_index: Dict[str, Dict[str, int]] = {col: {} for col in self.group_by_columns}
+        self.group_stats: Dict[str, CoMomentStats] = {
+            col: CoMomentStats((0, len(self.features))) for col in self.group_by_columns
+        }
+        self.row_count = 0
+        # 컬럼별 변환 방식 ('numeric' / 'categorical')과 범주형 컬럼의 {범주값: 코드}
+        self.kinds: Dict[str, str] = {}
+        self.category_index: Dict[str, Dict[str, int]] = {}
+
+    def update(self, rows: List[Dict]):
+        """배치 데이터 누적"""
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        values = np.column_stack([
+            self._encode(col, df[col]) if col in df.columns else np.full(len(df), np.nan)
+            for col in self.columns
+        ])
+        self.row_count += len(df)
+
+        valid = ~np.isnan(values)
+        # 수치 안정성을 위해 배치 평균만큼 이동한 값으로 합계 계산
+        counts = valid.sum(axis=0)
+        shift = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        centered = np.where(valid, values - shift, 0.0)
+        mask = valid.astype(float)
+
+        # 전체 쌍 통계: 행렬 곱으로 모든 쌍을 한 번에 계산
+        sum_x = centered.T @ mask
+        sum_xx = (centered * centered).T @ mask
+        batch_overall = CoMomentStats.from_sums(
+            n=mask.T @ mask,
+            sum_x=sum_x,
+            sum_y=sum_x.T,
+            sum_xx=sum_xx,
+            sum_yy=sum_xx.T,
+            sum_xy=centered.T @ centered,
+            shift_x=shift[:, None],
+            shift_y=shift[None, :]
+        )
+        self.overall.merge(batch_overall)
+
+        # 그룹별 타겟-피처 통계: 희소 지시 행렬(그룹 x 행)로 그룹 합계를 한 번에 계산
+        if not self.features:
+            return
+        target_centered = centered[:, :1]
+        feature_centered = centered[:, 1:]
+        pair_mask = mask[:, :1] * mask[:, 1:]
+        t = target_centered * pair_mask
+        f = feature_centered * pair_mask
+        for group_col in self.group_by_columns:
+            if group_col not in df.columns:
+                continue
+            codes = self._group_codes(group_col, df[group_col])
+            present = codes >= 0
+            if not present.any():
+                continue
+            num_groups = len(self.group_index[group_col])
+            indicator = sparse.csr_matrix(
+                (np.ones(present.sum()), (codes[present], np.flatnonzero(present))),
+                shape=(num_groups, len(df))
+            )
+            batch_group = CoMomentStats.from_sums(
+                n=indicator @ pair_mask,
+                sum_x=indicator @ t,
+                sum_y=indicator @ f,
+                sum_xx=indicator @ (t * target_centered),
+                sum_yy=indicator @ (f * feature_centered),
+                sum_xy=indicator @ (t * feature_centered),
+                shift_x=shift[0],
+                shift_y=shift[None, 1:]
+            )
+            stats = self.group_stats[group_col]
+            stats.grow(batch_group.n.shape)
+            stats.merge(batch_group)
+
+    def _encode(self, col: str, series: pd.Series) -> np.ndarray:
+        """컬럼 값을 숫자 배열로 변환 (범주형은 누적기 전역 라벨 코드, 결측도 하나의 범주)"""
+        kind = self.kinds.get(col)
+        if kind is None:
+            numeric = pd.to_numeric(series, errors='coerce')
+            is_numeric = (
+                pd.api.types.is_numeric_dtype(series)
+                or pd.api.types.is_datetime64_any_dtype(series)
+                or numeric.notna().sum() > len(series) * _NUMERIC_RATIO
+            )
+            kind = self.kinds[col] = 'numeric' if is_numeric else 'categorical'
+            if kind == 'categorical':
+                self.category_index[col] = {}
+        if kind == 'numeric':
+            return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+        return self._stable_codes(self.category_index[col], series.astype(str)).astype(float)
+
+    def _group_codes(self, group_col: str, series: pd.Series) -> np.ndarray:
+        """그룹값을 누적기 전역 인덱스로 변환 (새 그룹은 인덱스 추가)"""
+        return self._stable_codes(self.group_index[group_col], series)
+
+    @staticmethod
+    def _stable_codes(index: Dict[str, int], series: pd.Series) -> np.ndarray:
+        """값을 {값: 코드} 인덱스의 코드로 변환 (처음 보는 값은 끝에 추가하므로 기존 코드는 유지, 결측은 -1)"""
+        codes, uniques = pd.factorize(series)
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, value in enumerate(uniques):
+            key = str(value)
+            if key not in index:
+                index[key] = len(index)
+            mapping[i] = index[key]
+        return np.where(codes >= 0, mapping[codes] if len(mapping) else codes, -1)
+
+    def merge(self, other: 'StreamingCorrelationAccumulator'):
+        """다른 워커의 누적 결과 병합 (같은 타겟/피처 구성이어야 함)"""
+        if other.columns != self.columns:
+            raise ValueError("병합하려는 누적기의 컬럼 구성이 다릅니다")
+        if any(self.category_index.get(col, index) != index for col, index in other.category_index.items()):
+            raise ValueError("병합하려는 누적기의 범주 코드가 다릅니다")
+        self.overall.merge(other.overall)
+        self.row_count += other.row_count
+        for group_col in self.group_by_columns:
+            if group_col not in other.group_index:
+                continue
+            index = self.group_index[group_col]
+            other_stats = other.group_stats[group_col]
+            # 상대 누적기의 그룹 순서를 현재 인덱스로 재배치
+            for key in other.group_index[group_col]:
+                if key not in index:
+                    index[key] = len(index)
+            aligned = CoMomentStats((len(index), len(self.features)))
+            positions = np.array([index[key] for key in other.group_index[group_col]], dtype=np.int64)
+            for name in ('n', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy'):
+                getattr(aligned, name)[positions] = getattr(other_stats, name)
+            stats = self.group_stats[group_col]
+            stats.grow(aligned.n.shape)
+            stats.merge(aligned)
+
+    def finalize(self) -> Tuple[Dict[str, float], Dict[str, Dict[str, Dict[str, float]]]]:
+        """최종 상관계수 계산
+
+        Returns:
+            (overall, group_correlations): 전체 {feature: r}, 그룹별 {"by_<col>": {group: {feature: r}}}
+        """
+        matrix = self.overall.pearson(min_count=2)
+        overall = {
+            feature: float(matrix[0, i + 1])
+            for i, feature in enumerate(self.features)
+            if not np.isnan(matrix[0, i + 1])
+        }
+
+        group_correlations = {}
+        for group_col in self.group_by_columns:
+            stats = self.group_stats[group_col]
+            if stats.n.shape[0] == 0:
+                continue
+            # 기존 그룹별 계산과 동일하게 3행 미만 그룹은 제외
+            group_matrix = stats.pearson(min_count=3)
+            by_group = {}
+            for key, idx in self.group_index[group_col].items():
+                group_corr = {
+                    feature: float(group_matrix[idx, i])
+                    for i, feature in enumerate(self.features)
+                    if not np.isnan(group_matrix[idx, i])
+                }
+                if group_corr:
+                    by_group[key] = group_corr
+            if by_group:
+                group_correlations[f"by_{group_col}"] = by_group
+
+        return overall, group_correlations
@@ -6,6 +6,10 @@ from datetime import datetime, timedelta
 class LagFeatureGenerator:
     """시계열 Lag 피처 생성기"""
     
+    # 합산할 이전 주차 수와 생성 컬럼 접미사 (예측 시 재귀 갱신에도 사용)
+    ROLLING_WINDOW = 4
+    ROLLING_SUFFIX = "_rolling_4weeks"
+    
     def __init__(self):
         pass
     
@@ -68,105 +72,24 @@ class LagFeatureGenerator:
             df[col] = pd.to_numeric(df[col], errors='coerce')
             
             # 4주 합산 컬럼명
-            rolling_col_name = f"{col}_rolling_4weeks"
+            rolling_col_name = f"{col}{self.ROLLING_SUFFIX}"
             
+            # 1~4주 전 값을 시프트하여 합산 (이전 주차가 없거나 결측이면 0)
+            # df는 그룹/날짜 순으로 정렬되어 있으므로 그룹 내 시프트가 곧 이전 주차 값
+            values = df[col]
             if group_by_columns:
-                # 그룹별로 4주 합산 계산
-                rolling_values = []
-                
-                for group_key, group in df.groupby(group_by_columns):
-                    group = group.copy().sort_values(order_column)
-                    group_rolling_values = pd.Series(index=group.index, dtype=float)
-                    
-                    # 그룹을 리스트로 변환하여 인덱스로 접근
-                    group_list = group.reset_index(drop=True)
-                    original_indices = group.index.tolist()
-                    
-                    for i in range(len(group_list)):
-                        # 바로 전 주차(1주 전), 2주 전, 3주 전, 4주 전 값 가져오기
-                        values = []
-                        
-                        # 1주 전 (바로 전)
-                        if i >= 1:
-                            val_1 = group_list.loc[i-1, col]
-                            values.append(val_1 if not pd.isna(val_1) else 0.0)
-                        else:
-                            values.append(0.0)
-                        
-                        # 2주 전
-                        if i >= 2:
-                            val_2 = group_list.loc[i-2, col]
-                            values.append(val_2 if not pd.isna(val_2) else 0.0)
-                        else:
-                            values.append(0.0)
-                        
-                        # 3주 전
-                        if i >= 3:
-                            val_3 = group_list.loc[i-3, col]
-                            values.append(val_3 if not pd.isna(val_3) else 0.0)
-                        else:
-                            values.append(0.0)
-                        
-                        # 4주 전
-                        if i >= 4:
-                            val_4 = group_list.loc[i-4, col]
-                            values.append(val_4 if not pd.isna(val_4) else 0.0)
-                        else:
-                            values.append(0.0)
-                        
-                        # 4개 값의 합산
-                        rolling_sum = sum(values)
-                        group_rolling_values.loc[original_indices[i]] = rolling_sum
-                    
-                    rolling_values.append(group_rolling_values)
-                
-                # 모든 그룹의 결과를 합침
-                df[rolling_col_name] = pd.concat(rolling_values).reindex(df.index)
+                grouped = values.groupby([df[c] for c in group_by_columns], sort=False)
+                shifted = [grouped.shift(k) for k in range(1, self.ROLLING_WINDOW + 1)]
             else:
-                # 그룹화 없이 전체 데이터에서 4주 합산 계산
-                df_sorted = df.sort_values(order_column).copy()
-                original_indices = df_sorted.index.tolist()
-                df_sorted = df_sorted.reset_index(drop=True)
-                rolling_values = pd.Series(index=original_indices, dtype=float)
-                
-                for i in range(len(df_sorted)):
-                    # 바로 전 주차(1주 전), 2주 전, 3주 전, 4주 전 값 가져오기
-                    values = []
-                    
-                    # 1주 전 (바로 전)
-                    if i >= 1:
-                        val_1 = df_sorted.loc[i-1, col]
-                        values.append(val_1 if not pd.isna(val_1) else 0.0)
-                    else:
-                        values.append(0.0)
-                    
-                    # 2주 전
-                    if i >= 2:
-                        val_2 = df_sorted.loc[i-2, col]
-                        values.append(val_2 if not pd.isna(val_2) else 0.0)
-                    else:
-                        values.append(0.0)
-                    
-                    # 3주 전
-                    if i >= 3:
-                        val_3 = df_sorted.loc[i-3, col]
-                        values.append(val_3 if not pd.isna(val_3) else 0.0)
-                    else:
-                        values.append(0.0)
-                    
-                    # 4주 전
-                    if i >= 4:
-                        val_4 = df_sorted.loc[i-4, col]
-                        values.append(val_4 if not pd.isna(val_4) else 0.0)
-                    else:
-                        values.append(0.0)
-                    
-                    # 4개 값의 합산
-                    rolling_sum = sum(values)
-                    rolling_values.loc[original_indices[i]] = rolling_sum
-                
-                # 원래 인덱스로 재정렬
-                df[rolling_col_name] = rolling_values.reindex(df.index)
+                shifted = [values.shift(k) for k in range(1, self.ROLLING_WINDOW + 1)]
+            rolling_sum = sum(s.fillna(0.0) for s in shifted)
+            
+            if group_by_columns:
+                # 그룹 키가 결측인 행은 그룹에 속하지 않으므로 계산하지 않음
+                missing_group = df[group_by_columns].isna().any(axis=1)
+                rolling_sum = rolling_sum.mask(missing_group)
+            
+            df[rolling_col_name] = rolling_sum.astype(float)
             
             new_feature_columns.append(rolling_col_name)
         
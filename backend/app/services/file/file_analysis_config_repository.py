@@ -48,14 +48,20 @@ class FileAnalysisConfigRepository:
         }
         
         # 기존 설정이 있으면 업데이트, 없으면 생성
+        # config_version은 설정이 바뀔 때마다 증가 (상관관계 캐시 등 무효화 기준)
         existing = await collection.find_one({'file_id': file_id, 'target_column': target_column})
         if existing:
             await collection.update_one(
                 {'file_id': file_id, 'target_column': target_column},
-                {'$set': {**doc, 'updated_at': datetime.now()}}
+                {
+                    '$set': {**doc, 'updated_at': datetime.now()},
+                    '$inc': {'config_version': 1}
+                }
             )
             doc['config_id'] = existing.get('config_id', config_id)
+            doc['config_version'] = existing.get('config_version', 0) + 1
         else:
+            doc['config_version'] = 1
             await collection.insert_one(doc)
         
         return doc
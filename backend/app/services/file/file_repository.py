@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from datetime import datetime
 import pandas as pd
 from app.core.database import get_database
@@ -21,8 +21,12 @@ class FileRepository:
         await collection.insert_one(sales_data)
         return sales_data
     
-    async def save_csv_data(self, file_id: str, user_id: str, df: pd.DataFrame):
-        """CSV Collection에 데이터 저장"""
+    async def save_csv_data(self, file_id: str, user_id: str, df: pd.DataFrame, start_row_index: int = 0):
+        """CSV Collection에 데이터 저장
+        
+        Args:
+            start_row_index: 첫 행의 row_index (기존 데이터 뒤에 추가할 때 기존 행 수)
+        """
         db = await get_database()
         collection = db['csv']  # CSV Collection
         
@@ -42,13 +46,34 @@ class FileRepository:
                 'csv_id': csv_id + idx,  # 각 행마다 고유 csv_id
                 'file_id': file_id,
                 'user_id': user_id,
-                'row_index': int(idx),
+                'row_index': start_row_index + int(idx),
                 'data': row.to_dict(),
                 'csv_upload_time': csv_upload_time
             })
         
         if documents:
             await collection.insert_many(documents)
+        
+        # 데이터가 바뀌었으므로 데이터 버전 증가 (캐시 무효화 기준)
+        await self.bump_data_version(file_id)
+    
+    async def get_data_version(self, file_id: str) -> int:
+        """파일의 데이터 버전 조회 (CSV 데이터가 저장/추가될 때마다 증가)"""
+        db = await get_database()
+        collection = db['sales']
+        file_info = await collection.find_one({'file_id': file_id}, {'data_version': 1})
+        if not file_info:
+            return 0
+        return int(file_info.get('data_version', 0))
+    
+    async def bump_data_version(self, file_id: str):
+        """데이터 버전 증가 (업로드/추가 시 호출)"""
+        db = await get_database()
+        collection = db['sales']
+        await collection.update_one(
+            {'file_id': file_id},
+            {'$inc': {'data_version': 1}}
+        )
     
     async def get_sales_by_user(self, user_id: str) -> List[Dict]:
         """유저의 Sales 목록 조회"""
@@ -80,6 +105,36 @@ class FileRepository:
         rows = await cursor.to_list(length=limit)
         return [row['data'] for row in rows]
     
+    async def iter_csv_batches(self, file_id: str, batch_size: int = 5000) -> AsyncIterator[List[Dict]]:
+        """CSV 데이터를 배치 단위로 순회 (전체 데이터를 메모리에 올리지 않음)"""
+        async for batch in self._iter_batches('csv', {'file_id': file_id}, batch_size):
+            yield batch
+    
+    async def iter_preprocessed_batches(
+        self,
+        file_id: str,
+        target_column: str,
+        batch_size: int = 5000
+    ) -> AsyncIterator[List[Dict]]:
+        """전처리 데이터(Lag 피처 포함)를 배치 단위로 순회"""
+        query = {'file_id': file_id, 'target_column': target_column}
+        async for batch in self._iter_batches('preprocessed_data', query, batch_size):
+            yield batch
+    
+    async def _iter_batches(self, collection_name: str, query: Dict, batch_size: int) -> AsyncIterator[List[Dict]]:
+        """MongoDB 커서를 batch_size 단위로 끊어서 data 필드 목록을 반환"""
+        db = await get_database()
+        collection = db[collection_name]
+        cursor = collection.find(query, {'data': 1}).sort('row_index', 1).batch_size(batch_size)
+        batch = []
+        async for row in cursor:
+            batch.append(row['data'])
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
     async def get_csv_row_count(self, file_id: str) -> int:
         """CSV 컬렉션에서 특정 file_id의 행 수 조회"""
         db = await get_database()
@@ -4,9 +4,10 @@ from datetime import datetime
 import pandas as pd
 import io
 from app.core.database import get_database
-from app.models.file import FileUploadResponse, FileInfoResponse, CSVDataResponse, RelatedColumnsResponse, ColumnsResponse
+from app.models.file import FileUploadResponse, FileAppendResponse, FileInfoResponse, CSVDataResponse, RelatedColumnsResponse, ColumnsResponse
 from app.services.file.file_repository import FileRepository
 from app.services.file.file_analysis_config_repository import FileAnalysisConfigRepository
+from app.services.file.product_aggregator import ProductAggregator
 from app.services.solution.llm_service import LLMService
 from app.services.user.user_service import UserService
 from app.services.feature.lag_feature_generator import LagFeatureGenerator
@@ -17,6 +18,7 @@ class FileService:
     def __init__(self):
         self.repository = FileRepository()
         self.config_repository = FileAnalysisConfigRepository()
+        self.product_aggregator = ProductAggregator()
         self.user_service = UserService()
         self.llm_service = LLMService()
     
@@ -36,6 +38,35 @@ class FileService:
                 column_types[col] = 'string'
         return column_types
     
+    def _read_csv(self, contents: bytes) -> pd.DataFrame:
+        """CSV 바이트를 인코딩 자동 감지로 읽기"""
+        df = None
+        encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1', 'iso-8859-1']
+        
+        # chardet 라이브러리가 있으면 사용 (더 정확한 인코딩 감지)
+        try:
+            import chardet
+            detected = chardet.detect(contents)
+            if detected and detected.get('encoding'):
+                detected_encoding = detected['encoding'].lower()
+                # 감지된 인코딩을 우선 시도
+                if detected_encoding not in encodings:
+                    encodings.insert(0, detected_encoding)
+        except ImportError:
+            pass  # chardet이 없으면 기본 인코딩 리스트 사용
+        
+        for encoding in encodings:
+            try:
+                # BytesIO를 사용하여 인코딩 시도
+                df = pd.read_csv(io.BytesIO(contents), encoding=encoding)
+                break
+            except (UnicodeDecodeError, pd.errors.ParserError) as e:
+                continue
+        
+        if df is None:
+            raise ValueError("CSV 파일을 읽을 수 없습니다. 지원되는 인코딩 형식이 아닙니다. (시도한 인코딩: " + ", ".join(encodings) + ")")
+        return df
+    
     async def upload_file(self, file: UploadFile, user_id: str, target_column: Optional[str] = None) -> FileUploadResponse:
         """CSV 파일 업로드 및 파싱"""
         file_id = None
@@ -44,31 +75,7 @@ class FileService:
             contents = await file.read()
             
             # 인코딩 자동 감지 및 CSV 읽기
-            df = None
-            encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1', 'iso-8859-1']
-            
-            # chardet 라이브러리가 있으면 사용 (더 정확한 인코딩 감지)
-            try:
-                import chardet
-                detected = chardet.detect(contents)
-                if detected and detected.get('encoding'):
-                    detected_encoding = detected['encoding'].lower()
-                    # 감지된 인코딩을 우선 시도
-                    if detected_encoding not in encodings:
-                        encodings.insert(0, detected_encoding)
-            except ImportError:
-                pass  # chardet이 없으면 기본 인코딩 리스트 사용
-            
-            for encoding in encodings:
-                try:
-                    # BytesIO를 사용하여 인코딩 시도
-                    df = pd.read_csv(io.BytesIO(contents), encoding=encoding)
-                    break
-                except (UnicodeDecodeError, pd.errors.ParserError) as e:
-                    continue
-            
-            if df is None:
-                raise ValueError("CSV 파일을 읽을 수 없습니다. 지원되는 인코딩 형식이 아닙니다. (시도한 인코딩: " + ", ".join(encodings) + ")")
+            df = self._read_csv(contents)
             
             # 파일 정보 저장 (Sales Collection)
             file_id = f"file_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -147,6 +154,12 @@ class FileService:
                         detected_date_column = config.get('date_column')
                         logger.info(f"날짜 컬럼 감지: {detected_date_column}")
                     
+                    # 상품별 집계 미리 계산 (상품 목록/막대그래프/추세 조회용, 실패해도 조회 시 다시 계산)
+                    try:
+                        await self.product_aggregator.build_for_config(file_id, final_target_column, config, df)
+                    except Exception as aggregate_error:
+                        logger.warning(f"상품별 집계 실패 (조회 시 다시 계산): {str(aggregate_error)}")
+                    
                     # 예측 피처 생성 및 저장 (date_column이 있을 때만)
                     if detected_date_column:
                         logger.info(f"Lag 피처 생성 시작: date_column={detected_date_column}")
@@ -198,6 +211,43 @@ class FileService:
                 await self.repository.update_upload_status(file_id, 'failed')
             raise e
     
+    async def append_file(self, file: UploadFile, file_id: str, user_id: str) -> FileAppendResponse:
+        """기존 파일에 새 기간 데이터(CSV) 추가
+        
+        업로드된 파일과 같은 컬럼 구성의 CSV 행을 기존 데이터 뒤에 추가합니다.
+        상품별 집계에는 추가된 행의 집계만 누적합니다.
+        데이터 버전이 증가하므로 이후 예측은 등록된 모델을 증분 업데이트합니다.
+        """
+        file_info = await self.repository.get_sales_info(file_id, user_id)
+        if not file_info:
+            raise ValueError("파일을 찾을 수 없습니다")
+        
+        contents = await file.read()
+        df = self._read_csv(contents)
+        
+        columns = file_info.get('columns_list', [])
+        missing_columns = [col for col in columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"추가할 데이터에 기존 컬럼이 없습니다: {', '.join(missing_columns)}")
+        df = df[columns] if columns else df
+        
+        # 기존 행 뒤에 이어서 저장 (row_index 연속)
+        existing_rows = await self.repository.get_csv_row_count(file_id)
+        previous_version = await self.repository.get_data_version(file_id)
+        await self.repository.save_csv_data(file_id, user_id, df, start_row_index=existing_rows)
+        data_version = await self.repository.get_data_version(file_id)
+        
+        # 상품별 집계에 추가된 행만 누적
+        await self.product_aggregator.append(file_id, df, previous_version)
+        print(f"✅ 데이터 추가 완료: {file_id} (+{len(df)}행, data_version={data_version})")
+        
+        return FileAppendResponse(
+            file_id=file_id,
+            appended_rows=len(df),
+            total_rows=existing_rows + len(df),
+            data_version=data_version
+        )
+    
     async def list_files(self, user_id: str) -> List[FileInfoResponse]:
         """파일 목록 조회"""
         files = await self.repository.get_sales_by_user(user_id)
@@ -272,11 +322,25 @@ class FileService:
         )
     
     async def delete_file(self, file_id: str, user_id: str) -> bool:
-        """파일 삭제 (분석 설정도 함께 삭제)"""
+        """파일 삭제 (분석 설정, 상품별 집계, 등록된 예측 모델도 함께 삭제)
+        
+        파일 소유자만 삭제할 수 있으며, 파일 삭제가 성공한 뒤에 관련 데이터를 삭제합니다.
+        """
+        # 소유권 확인 (다른 유저의 파일이면 아무것도 삭제하지 않음)
+        file_info = await self.repository.get_sales_info(file_id, user_id)
+        if not file_info:
+            return False
+        # 파일 삭제
+        if not await self.repository.delete_file(file_id, user_id):
+            return False
         # 분석 설정 삭제
         await self.config_repository.delete_config(file_id)
-        # 파일 삭제
-        return await self.repository.delete_file(file_id, user_id)
+        # 상품별 집계 삭제
+        await self.product_aggregator.delete(file_id)
+        # 등록된 예측 모델 삭제
+        from app.services.prediction.model_registry import ModelRegistry
+        await ModelRegistry().delete_file_models(file_id)
+        return True
     
     async def get_columns(self, file_id: str, user_id: str) -> ColumnsResponse:
         """컬럼 목록 조회"""
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import time
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.core.database import get_database
+
+class ProductAggregateRepository:
+    """상품별 집계 데이터 접근 레이어
+    
+    - Product Aggregates Collection: (file_id, 그룹화 컬럼, 타겟 컬럼)별 집계 상태 (날짜 컬럼, 기간 단위, 반영된 데이터 버전, 현재 세대)
+    - Product Summaries Collection: 세대별 상품당 한 문서 (행 수, 타겟 합계, 첫/마지막 기간)
+    - Product Series Collection: 세대별 상품-기간당 한 문서 (행 수, 타겟 합계)
+    
+    전체 재계산은 새 세대(generation) 문서로 저장한 뒤 상태의 현재 세대를 바꾸므로,
+    조회는 항상 완성된 한 세대만 읽고 동시에 재계산해도 고유 인덱스가 충돌하지 않습니다.
+    세대 필드가 없는 이전 버전 집계는 generation이 None인 세대로 취급합니다.
+    """
+    
+    @staticmethod
+    def _key(file_id: str, group_column: str, target_column: str) -> Dict:
+        return {'file_id': file_id, 'group_column': group_column, 'target_column': target_column}
+    
+    async def _active_key(self, file_id: str, group_column: str, target_column: str) -> Dict:
+        """현재 세대 문서 조회 키"""
+        db = await get_database()
+        key = self._key(file_id, group_column, target_column)
+        state = await db['product_aggregates'].find_one(key, {'_id': 0, 'generation': 1})
+        return {**key, 'generation': (state or {}).get('generation')}
+    
+    async def get_state(self, file_id: str, group_column: str, target_column: str) -> Optional[Dict]:
+        """집계 상태 조회"""
+        db = await get_database()
+        collection = db['product_aggregates']
+        return await collection.find_one(self._key(file_id, group_column, target_column), {'_id': 0})
+    
+    async def get_states(self, file_id: str) -> List[Dict]:
+        """파일의 모든 집계 상태 조회"""
+        db = await get_database()
+        collection = db['product_aggregates']
+        cursor = collection.find({'file_id': file_id}, {'_id': 0})
+        return await cursor.to_list(length=None)
+    
+    async def save_state(
+        self,
+        file_id: str,
+        group_column: str,
+        target_column: str,
+        date_column: Optional[str],
+        period: str,
+        data_version: int
+    ):
+        """집계 상태 저장 (현재 세대는 유지)"""
+        db = await get_database()
+        collection = db['product_aggregates']
+        await collection.update_one(self._key(file_id, group_column, target_column), {'$set': {
+            'date_column': date_column,
+            'period': period,  # 기간 단위 (pandas 기간 문자열, 예: D, W, M)
+            'data_version': data_version,  # 집계에 반영된 데이터 버전
+            'updated_at': datetime.now()
+        }}, upsert=True)
+    
+    async def replace(
+        self,
+        file_id: str,
+        group_column: str,
+        target_column: str,
+        summaries: List[Dict],
+        series: List[Dict],
+        date_column: Optional[str],
+        period: str,
+        data_version: int,
+        batch_size: int = 1000
+    ) -> bool:
+        """집계 전체 교체 (새 세대로 저장 -> 상태의 현재 세대 전환 -> 이전 세대 삭제)
+        
+        세대는 계산 시작 시각(ns)이며, 더 나중에 시작한 재계산이 이미 상태를 전환했으면
+        이 계산 결과는 버립니다 (동시에 오래된 집계를 조회해 두 요청이 함께 재계산하는 경우).
+        
+        Returns:
+            상태 전환 여부
+        """
+        db = await get_database()
+        key = self._key(file_id, group_column, target_column)
+        generation = time.time_ns()
+        for name, docs in (('product_summaries', summaries), ('product_series', series)):
+            collection = db[name]
+            docs = [{**key, 'generation': generation, **doc} for doc in docs]
+            for start in range(0, len(docs), batch_size):
+                await collection.insert_many(docs[start:start + batch_size], ordered=False)
+        
+        # 현재 세대가 더 오래되었을 때만 전환 (더 새 세대가 있으면 upsert가 고유 인덱스에 걸림)
+        older = {'$or': [{'generation': {'$lt': generation}}, {'generation': None}]}
+        try:
+            await db['product_aggregates'].update_one({**key, **older}, {'$set': {
+                'date_column': date_column,
+                'period': period,
+                'data_version': data_version,
+                'generation': generation,  # 조회에 사용하는 현재 세대
+                'updated_at': datetime.now()
+            }}, upsert=True)
+            published = True
+        except DuplicateKeyError:
+            published = False
+        
+        # 전환했으면 이전 세대, 아니면 이 세대 문서 삭제
+        stale = {**key, **older} if published else {**key, 'generation': generation}
+        for name in ('product_summaries', 'product_series'):
+            await db[name].delete_many(stale)
+        return published
+    
+    async def increment(
+        self,
+        file_id: str,
+        group_column: str,
+        target_column: str,
+        summaries: List[Dict],
+        series: List[Dict],
+        batch_size: int = 1000
+    ):
+        """추가된 행의 집계를 현재 세대 집계에 누적 (행 수/합계는 $inc, 첫/마지막 기간은 $min/$max)"""
+        db = await get_database()
+        key = await self._active_key(file_id, group_column, target_column)
+        summary_ops = [
+            UpdateOne({**key, 'product': doc['product']}, self._summary_update(doc), upsert=True)
+            for doc in summaries
+        ]
+        series_ops = [
+            UpdateOne(
+                {**key, 'product': doc['product'], 'period': doc['period']},
+                {'$inc': {'count': doc['count'], 'sum': doc['sum']}},
+                upsert=True
+            )
+            for doc in series
+        ]
+        for name, ops in (('product_summaries', summary_ops), ('product_series', series_ops)):
+            collection = db[name]
+            for start in range(0, len(ops), batch_size):
+                await collection.bulk_write(ops[start:start + batch_size], ordered=False)
+    
+    @staticmethod
+    def _summary_update(doc: Dict) -> Dict:
+        """상품 요약 누적 업데이트 (날짜가 해석된 행이 없으면 첫/마지막 기간은 변경하지 않음)"""
+        update = {'$inc': {'count': doc['count'], 'sum': doc['sum']}}
+        if doc.get('first_period'):
+            update['$min'] = {'first_period': doc['first_period']}
+        if doc.get('last_period'):
+            update['$max'] = {'last_period': doc['last_period']}
+        return update
+    
+    async def get_summaries(
+        self,
+        file_id: str,
+        group_column: str,
+        target_column: str,
+        sort_by: str = 'count',
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """상품별 요약 조회 (sort_by 내림차순, 같으면 상품명 순)"""
+        db = await get_database()
+        collection = db['product_summaries']
+        cursor = collection.find(
+            await self._active_key(file_id, group_column, target_column),
+            {'_id': 0, 'product': 1, 'count': 1, 'sum': 1, 'first_period': 1, 'last_period': 1}
+        ).sort([(sort_by, -1), ('product', 1)])
+        if limit:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(length=limit)
+    
+    async def get_products(self, file_id: str, group_column: str, target_column: str) -> List[str]:
+        """상품명 목록 조회 (정렬)"""
+        db = await get_database()
+        collection = db['product_summaries']
+        cursor = collection.find(
+            await self._active_key(file_id, group_column, target_column),
+            {'_id': 0, 'product': 1}
+        ).sort('product', 1)
+        return [doc['product'] for doc in await cursor.to_list(length=None)]
+    
+    async def get_series(
+        self,
+        file_id: str,
+        group_column: str,
+        target_column: str,
+        products: List[str]
+    ) -> List[Dict]:
+        """상품별 기간 시계열 조회 (상품, 기간 순)"""
+        db = await get_database()
+        collection = db['product_series']
+        cursor = collection.find(
+            {**await self._active_key(file_id, group_column, target_column), 'product': {'$in': list(products)}},
+            {'_id': 0, 'product': 1, 'period': 1, 'count': 1, 'sum': 1}
+        ).sort([('product', 1), ('period', 1)])
+        return await cursor.to_list(length=None)
+    
+    async def delete_by_file_id(self, file_id: str):
+        """파일의 모든 집계 삭제"""
+        db = await get_database()
+        for name in ('product_aggregates', 'product_summaries', 'product_series'):
+            await db[name].delete_many({'file_id': file_id})
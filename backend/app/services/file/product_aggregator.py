@@ -0,0 +1,226 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import pandas as pd
+from app.core.config import settings
+from app.services.file.file_repository import FileRepository
+from app.services.file.product_aggregate_repository import ProductAggregateRepository
+
+class ProductAggregator:
+    """상품별 집계 서비스
+    
+    업로드/추가 시점에 원본 행을 한 번만 훑어 (그룹화 컬럼, 타겟 컬럼)별로
+    - 상품 요약: 행 수, 타겟 합계, 첫/마지막 기간
+    - 상품-기간 시계열: 기간(PRODUCT_SERIES_PERIOD 단위)별 행 수, 타겟 합계
+    을 미리 계산해 두고, 상품 목록/막대그래프/추세 조회는 원본 행 대신 인덱스가 있는 집계 컬렉션을 조회합니다.
+    
+    집계 상태에는 반영된 데이터 버전을 기록합니다.
+    데이터 추가 시 최신 상태의 집계에는 추가된 행의 집계만 누적하고,
+    날짜 컬럼/기간 단위가 바뀌었거나 버전이 맞지 않는 집계는 다음 조회 시(ensure) 다시 계산합니다.
+    """
+    
+    def __init__(self):
+        self.repository = ProductAggregateRepository()
+        self.file_repository = FileRepository()
+    
+    @staticmethod
+    def _periods(values: pd.Series, period: str) -> pd.Series:
+        """날짜 값을 기간 시작일 문자열(YYYY-MM-DD)로 변환 (날짜로 해석되지 않는 값은 빈 문자열)"""
+        dates = pd.to_datetime(values, errors='coerce', format='mixed')
+        return dates.dt.to_period(period).dt.start_time.dt.strftime('%Y-%m-%d').fillna('')
+    
+    @classmethod
+    def aggregate(
+        cls,
+        df: pd.DataFrame,
+        group_column: str,
+        target_column: str,
+        date_column: Optional[str] = None,
+        period: Optional[str] = None
+    ) -> pd.DataFrame:
+        """행 데이터를 상품-기간별 행 수/타겟 합계로 집계 (한 번의 groupby)
+        
+        Returns:
+            product, period, count, sum 컬럼의 DataFrame (날짜가 없거나 해석되지 않는 행의 period는 빈 문자열)
+        """
+        if group_column not in df.columns:
+            return pd.DataFrame(columns=['product', 'period', 'count', 'sum'])
+        
+        mask = df[group_column].notna()
+        rows = df.loc[mask]
+        if date_column and date_column in rows.columns:
+            periods = cls._periods(rows[date_column], period or settings.PRODUCT_SERIES_PERIOD)
+        else:
+            periods = ''
+        if target_column in rows.columns:
+            values = pd.to_numeric(rows[target_column], errors='coerce')
+        else:
+            values = float('nan')
+        frame = pd.DataFrame({
+            'product': rows[group_column].astype(str),
+            'period': periods,
+            'value': values
+        }, index=rows.index)
+        return frame.groupby(['product', 'period'], sort=False).agg(
+            count=('value', 'size'),
+            sum=('value', 'sum')
+        ).reset_index()
+    
+    @staticmethod
+    def combine(parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """배치별 집계 결과 합치기"""
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return pd.DataFrame(columns=['product', 'period', 'count', 'sum'])
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True).groupby(
+            ['product', 'period'], sort=False
+        )[['count', 'sum']].sum().reset_index()
+    
+    @staticmethod
+    def to_documents(series_df: pd.DataFrame, has_dates: bool) -> Tuple[List[Dict], List[Dict]]:
+        """상품-기간 집계를 (상품 요약 문서, 상품-기간 시계열 문서)로 변환
+        
+        행 수/합계는 모든 행을 반영하고, 첫/마지막 기간과 시계열은 날짜가 해석된 행만 반영합니다.
+        """
+        if series_df.empty:
+            return [], []
+        dated_df = series_df[series_df['period'] != ''] if has_dates else series_df.iloc[0:0]
+        summary_df = series_df.groupby('product', sort=False)[['count', 'sum']].sum()
+        periods = dated_df.groupby('product', sort=False)['period'].agg(['min', 'max'])
+        summary_df = summary_df.join(periods.rename(columns={'min': 'first_period', 'max': 'last_period'}))
+        summary_df = summary_df.reset_index()
+        summaries = [
+            {
+                'product': product,
+                'count': int(count),
+                'sum': float(total),
+                'first_period': first_period if isinstance(first_period, str) else None,
+                'last_period': last_period if isinstance(last_period, str) else None
+            }
+            for product, count, total, first_period, last_period in zip(
+                summary_df['product'], summary_df['count'], summary_df['sum'],
+                summary_df['first_period'], summary_df['last_period']
+            )
+        ]
+        series = [
+            {'product': product, 'period': period, 'count': int(count), 'sum': float(total)}
+            for product, period, count, total in zip(
+                dated_df['product'], dated_df['period'], dated_df['count'], dated_df['sum']
+            )
+        ]
+        return summaries, series
+    
+    async def build(
+        self,
+        file_id: str,
+        target_column: str,
+        group_column: str,
+        date_column: Optional[str] = None,
+        df: Optional[pd.DataFrame] = None
+    ):
+        """집계 전체 계산 후 저장
+        
+        df가 주어지면 (업로드 직후) 그대로 사용하고, 없으면 저장된 CSV 데이터를 배치 단위로 순회하며 집계합니다.
+        """
+        period = settings.PRODUCT_SERIES_PERIOD
+        data_version = await self.file_repository.get_data_version(file_id)
+        if df is not None:
+            series_df = await asyncio.to_thread(self.aggregate, df, group_column, target_column, date_column, period)
+        else:
+            parts = []
+            async for batch in self.file_repository.iter_csv_batches(file_id):
+                parts.append(self.aggregate(pd.DataFrame(batch), group_column, target_column, date_column, period))
+            series_df = self.combine(parts)
+        summaries, series = self.to_documents(series_df, bool(date_column))
+        published = await self.repository.replace(
+            file_id, group_column, target_column, summaries, series, date_column, period, data_version
+        )
+        if not published:
+            print(f"ℹ️ 상품별 집계: 더 최근에 시작한 계산이 먼저 반영되어 결과를 버립니다 ({file_id}, {group_column})")
+            return
+        print(f"✅ 상품별 집계 완료: {file_id} ({group_column}, 상품 {len(summaries)}개, 기간 {len(series)}개)")
+    
+    async def build_for_config(
+        self,
+        file_id: str,
+        target_column: str,
+        config: Optional[Dict],
+        df: Optional[pd.DataFrame] = None
+    ):
+        """분석 설정의 그룹화 컬럼(첫 번째 그룹화 컬럼, group_by_column)별 집계 계산"""
+        if not config:
+            return
+        group_columns = []
+        for column in [(config.get('grouping_columns') or [None])[0], config.get('group_by_column')]:
+            if column and column not in group_columns:
+                group_columns.append(column)
+        for group_column in group_columns:
+            await self.build(file_id, target_column, group_column, config.get('date_column'), df)
+    
+    async def append(self, file_id: str, df: pd.DataFrame, previous_version: int):
+        """추가된 행의 집계를 기존 집계에 누적
+        
+        추가 전 데이터 버전까지 반영된 집계만 누적하고 새 버전으로 표시합니다.
+        그 외 집계는 버전이 맞지 않으므로 다음 조회 시 다시 계산됩니다.
+        """
+        data_version = await self.file_repository.get_data_version(file_id)
+        for state in await self.repository.get_states(file_id):
+            if state.get('data_version') != previous_version:
+                continue
+            group_column = state['group_column']
+            target_column = state['target_column']
+            date_column = state.get('date_column')
+            series_df = await asyncio.to_thread(
+                self.aggregate, df, group_column, target_column, date_column, state.get('period')
+            )
+            summaries, series = self.to_documents(series_df, bool(date_column))
+            await self.repository.increment(file_id, group_column, target_column, summaries, series)
+            await self.repository.save_state(
+                file_id, group_column, target_column, date_column, state.get('period'), data_version
+            )
+    
+    async def ensure(self, file_id: str, target_column: str, group_column: str, date_column: Optional[str] = None):
+        """집계가 없거나 오래되었으면 (날짜 컬럼/기간 단위/데이터 버전 불일치) 다시 계산"""
+        state = await self.repository.get_state(file_id, group_column, target_column)
+        data_version = await self.file_repository.get_data_version(file_id)
+        if (
+            state
+            and state.get('date_column') == date_column
+            and state.get('period') == settings.PRODUCT_SERIES_PERIOD
+            and state.get('data_version') == data_version
+        ):
+            return
+        await self.build(file_id, target_column, group_column, date_column)
+    
+    async def get_summaries(
+        self,
+        file_id: str,
+        target_column: str,
+        group_column: str,
+        sort_by: str = 'count',
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """상품별 요약 조회 (sort_by 내림차순)"""
+        return await self.repository.get_summaries(file_id, group_column, target_column, sort_by, limit)
+    
+    async def get_products(self, file_id: str, target_column: str, group_column: str) -> List[str]:
+        """상품명 목록 조회 (정렬)"""
+        return await self.repository.get_products(file_id, group_column, target_column)
+    
+    async def get_series(
+        self,
+        file_id: str,
+        target_column: str,
+        group_column: str,
+        products: List[str]
+    ) -> Dict[str, List[Dict]]:
+        """상품별 기간 시계열 조회 ({상품명: [{'period', 'count', 'sum'}, ...]}, 기간 순)"""
+        result = {product: [] for product in products}
+        for doc in await self.repository.get_series(file_id, group_column, target_column, products):
+            result.setdefault(doc['product'], []).append(doc)
+        return result
+    
+    async def delete(self, file_id: str):
+        """파일의 모든 집계 삭제"""
+        await self.repository.delete_by_file_id(file_id)
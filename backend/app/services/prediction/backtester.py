@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from app.core.config import settings
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.forecast_generator import ForecastGenerator
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.hybrid_model import RandomForestARModel
+from app.services.prediction.thread_budget import ThreadBudget
+
+def _fit_origin(
+    model_type: str,
+    hyperparameters: Dict,
+    X: np.ndarray,
+    y: np.ndarray,
+    group_codes: np.ndarray,
+    group_keys: List[str],
+    order: np.ndarray
+) -> object:
+    """joblib 워커: 한 예측 시점(origin) 이전 데이터로 모델 학습"""
+    # 병렬화는 origin 단위로 하므로 모델은 단일 스레드로 학습
+    model = ModelTrainer().build_model(model_type, hyperparameters, n_jobs=1, n_samples=len(y))
+    if isinstance(model, RandomForestARModel):
+        model.fit(X, y, group_codes=group_codes, group_keys=group_keys, order=order)
+    else:
+        model.fit(X, y)
+    return model
+
+class Backtester:
+    """rolling-origin 백테스트
+    
+    시간 순으로 정렬한 데이터를 한 번만 변환하고, 예측 시점(origin)마다 그 이전 행의
+    행렬 슬라이스(view)로 모델을 학습한 뒤 실제 예측과 같은 재귀 다단계 예측
+    (ForecastGenerator.run_state)으로 이후 horizon 시점을 예측해 실제값과 비교합니다.
+    origin별 학습은 joblib으로 병렬 실행합니다.
+    타겟 외 피처는 실제 예측과 같이 origin 시점의 마지막 값이 유지된다고 가정합니다.
+    
+    범주 코드는 시간 순으로 처음 등장한 순서로 부여하므로, origin 이전 슬라이스의 코드는
+    그 행까지만으로 적합한 변환기의 코드와 같고 origin 이후 처음 등장하는 범주는 학습/예측 상태에 나타나지 않습니다
+    (실제 예측에서 처음 보는 범주가 -1이 되는 것과 같음). 그룹 인덱스도 한 번만 계산해 슬라이스합니다.
+    """
+    
+    def __init__(self):
+        self.forecast_generator = ForecastGenerator()
+        self.model_trainer = ModelTrainer()
+    
+    async def run(
+        self,
+        data: List[Dict],
+        target_column: str,
+        features: List[str],
+        model_type: str,
+        date_column: Optional[str],
+        grouping_columns: Optional[List[str]] = None,
+        hyperparameters: Optional[Dict] = None,
+        horizon: int = 4,
+        n_origins: Optional[int] = None,
+        step: int = 1,
+        fast: bool = False,
+        group_limit: int = 100,
+        n_jobs: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """백테스트 실행
+        
+        Args:
+            horizon: origin마다 예측할 시점 수
+            n_origins: origin 수 (마지막 시점부터 step 간격으로 과거 방향, 없으면 BACKTEST_ORIGINS)
+            fast: True면 origin을 BACKTEST_FAST_ORIGINS개로 균등 추출 (대화형 조회용)
+            group_limit: 그룹별 오차를 RMSE가 큰 순으로 반환할 최대 그룹 수
+        
+        Returns:
+            {'origins', 'overall', 'by_horizon', 'by_group', 'group_count', 'evaluated_points'}
+        """
+        if not date_column:
+            raise ValueError("백테스트를 하려면 컬럼 추천 설정에 date_column이 있어야 합니다")
+        n_origins = n_origins or settings.BACKTEST_ORIGINS
+        n_jobs = n_jobs if n_jobs is not None else settings.PREDICTION_N_JOBS
+        params = self.model_trainer.resolve_hyperparameters(model_type, hyperparameters)
+        
+        # 시간 순 정렬 후 한 번만 변환 (origin별 학습 데이터는 앞부분 슬라이스, 범주 코드는 등장 순서)
+        df = pd.DataFrame(data)
+        order = self.forecast_generator.order_values(df, date_column)
+        sort_index = np.lexsort((np.arange(len(df)), order))
+        df = df.iloc[sort_index].reset_index(drop=True)
+        order = order[sort_index]
+        X = FeatureTransformer(features).fit(df, category_order='appearance').transform(df)
+        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        group_codes, group_keys, order = self.forecast_generator.series_index(df, date_column, grouping_columns)
+        row_keys = np.asarray(group_keys, dtype=object)[group_codes]
+        
+        # origin: 학습은 periods[:cut], 평가는 periods[cut:cut + horizon]
+        periods = np.unique(order)
+        cuts = [len(periods) - horizon - k * step for k in range(n_origins)][::-1]
+        cuts = [cut for cut in cuts if cut >= settings.BACKTEST_MIN_TRAIN_PERIODS]
+        if not cuts:
+            raise ValueError(
+                f"백테스트를 위한 기간이 부족합니다 (시점 {len(periods)}개, 최소 학습 {settings.BACKTEST_MIN_TRAIN_PERIODS}개 + 예측 {horizon}개 필요)"
+            )
+        if fast and len(cuts) > settings.BACKTEST_FAST_ORIGINS:
+            picks = np.unique(np.linspace(0, len(cuts) - 1, settings.BACKTEST_FAST_ORIGINS).round().astype(int))
+            cuts = [cuts[i] for i in picks]
+        cut_rows = np.searchsorted(order, periods[cuts], side='left')
+        
+        # origin별 학습 데이터 그룹 인덱스 슬라이스 (rf_ar 잔차 시계열용)
+        # 그룹 코드도 시간 순 등장 순서이므로 origin 이전 행의 그룹은 앞쪽 코드 0..k-1
+        train_index = [
+            (group_codes[:rows], group_keys[:int(group_codes[:rows].max()) + 1], order[:rows])
+            for rows in cut_rows
+        ]
+        
+        def fit_all() -> List[object]:
+            # 병렬 워커 수만큼 학습 스레드 예산 예약
+            with ThreadBudget.reserve(effective_n_jobs(n_jobs)) as threads:
+                return Parallel(n_jobs=min(threads, len(cuts)))(
+                    delayed(_fit_origin)(model_type, params, X[:rows], y[:rows], codes, keys, origin_order)
+                    for rows, (codes, keys, origin_order) in zip(cut_rows, train_index)
+                )
+        
+        def evaluate_all(models: List[object]) -> pd.DataFrame:
+            frames = []
+            for model, cut, rows, index in zip(models, cuts, cut_rows, train_index):
+                # origin 시점 상태에서 재귀 예측 (실제 예측과 같은 경로)
+                state = self.forecast_generator.prepare_state(
+                    df.iloc[:rows], target_column, features, date_column, grouping_columns,
+                    matrix=X[:rows], index=index
+                )
+                predicted = self.forecast_generator.run_state(model, state, horizon)
+                
+                # 평가 구간 실제값: (그룹, horizon)별 평균 (같은 시점의 여러 행은 평균)
+                end = np.searchsorted(order, periods[cut + horizon], side='left') if cut + horizon < len(periods) else len(order)
+                test = pd.DataFrame({
+                    'group_key': row_keys[rows:end],
+                    'horizon': np.searchsorted(periods, order[rows:end]) - cut + 1,
+                    'actual': y[rows:end]
+                }).groupby(['group_key', 'horizon'], as_index=False)['actual'].mean()
+                
+                positions = test['group_key'].map(state['group_positions'])
+                known = positions.notna().to_numpy()
+                test = test[known].assign(
+                    predicted=predicted[positions[known].to_numpy(dtype=np.int64), test['horizon'].to_numpy()[known] - 1]
+                )
+                frames.append(test)
+            return pd.concat(frames, ignore_index=True)
+        
+        # 학습/예측은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        models = await asyncio.to_thread(fit_all)
+        results = await asyncio.to_thread(evaluate_all, models)
+        if results.empty:
+            raise ValueError("백테스트 평가 구간에 학습 데이터의 그룹이 없습니다")
+        
+        errors = results['actual'] - results['predicted']
+        results = results.assign(squared=errors ** 2, absolute=errors.abs())
+        by_horizon = results.groupby('horizon').agg(points=('actual', 'size'), mse=('squared', 'mean'), mae=('absolute', 'mean'))
+        by_group = results.groupby('group_key').agg(points=('actual', 'size'), mse=('squared', 'mean'), mae=('absolute', 'mean'))
+        by_group['rmse'] = np.sqrt(by_group['mse'])
+        by_group = by_group.sort_values('rmse', ascending=False).head(group_limit)
+        
+        print(f"✅ 백테스트 완료: {model_type}, origin {len(cuts)}개, 평가 {len(results)}건")
+        return {
+            'origins': [str(df[date_column].iloc[rows]) for rows in cut_rows],
+            'overall': self.model_trainer.evaluate(results['actual'], results['predicted']),
+            'by_horizon': [
+                {'horizon': int(h), 'points': int(row.points), 'rmse': float(np.sqrt(row.mse)), 'mae': float(row.mae)}
+                for h, row in by_horizon.iterrows()
+            ],
+            'by_group': [
+                {'group_key': str(key), 'points': int(row.points), 'rmse': float(row.rmse), 'mae': float(row.mae)}
+                for key, row in by_group.iterrows()
+            ],
+            'group_count': int(results['group_key'].nunique()),
+            'evaluated_points': int(len(results))
+        }
@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional
+import hashlib
+import numpy as np
+
+class DesignMatrixBuilder:
+    """교차검증/튜닝용 학습 행렬 생성기
+    
+    FeatureTransformer 출력에서 분산이 0인 컬럼(상수, 전부 결측이라 0으로 채워진 컬럼)과
+    다른 컬럼과 값이 완전히 같은 중복 컬럼을 제거한 C-contiguous float32 행렬을 만듭니다.
+    fold는 이 행렬의 행 슬라이스(view)로 학습하므로 fold마다 복사본을 만들지 않습니다.
+    제거한 컬럼은 어떤 모델에도 추가 정보를 주지 않으므로 후보 비교 결과에 영향이 없고,
+    예측 상태(ForecastGenerator)는 피처 위치를 사용하므로 최종 모델은 전체 피처로 학습합니다.
+    """
+    
+    def __init__(self, feature_names: List[str]):
+        self.feature_names = list(feature_names)
+        self.columns_: Optional[np.ndarray] = None
+        self.dropped_: Dict[str, str] = {}
+    
+    @property
+    def feature_names_(self) -> List[str]:
+        """남은 컬럼 이름"""
+        return [self.feature_names[j] for j in self.columns_]
+    
+    def fit(self, X: np.ndarray) -> 'DesignMatrixBuilder':
+        """제거할 컬럼 결정
+        
+        Returns:
+            self (dropped_는 {제거된 피처: 'constant' 또는 같은 값을 가진 피처 이름})
+        """
+        self.dropped_ = {}
+        if len(X) == 0:
+            self.columns_ = np.arange(X.shape[1])
+            return self
+        constant = (X.max(axis=0) - X.min(axis=0)) == 0
+        kept: List[int] = []
+        seen: Dict[bytes, List[int]] = {}
+        for j in range(X.shape[1]):
+            if constant[j]:
+                self.dropped_[self.feature_names[j]] = 'constant'
+                continue
+            column = np.ascontiguousarray(X[:, j])
+            digest = hashlib.blake2b(column.tobytes(), digest_size=16).digest()
+            # 해시가 같으면 값 비교로 확인 (충돌 대비)
+            duplicate_of = next((k for k in seen.get(digest, []) if np.array_equal(X[:, k], column)), None)
+            if duplicate_of is not None:
+                self.dropped_[self.feature_names[j]] = self.feature_names[duplicate_of]
+                continue
+            seen.setdefault(digest, []).append(j)
+            kept.append(j)
+        # 모든 컬럼이 상수면 추정기 입력이 비지 않도록 첫 컬럼 유지
+        self.columns_ = np.asarray(kept or [0], dtype=np.int64)
+        if not kept:
+            self.dropped_.pop(self.feature_names[0], None)
+        return self
+    
+    def transform(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """남은 컬럼만 C-contiguous float32 행렬로 반환
+        
+        Args:
+            out: 결과를 기록할 float32 배열 (같은 크기의 버퍼 재사용 시)
+        """
+        if self.columns_ is None:
+            raise ValueError("DesignMatrixBuilder가 학습되지 않았습니다. fit()을 먼저 호출하세요.")
+        # 제거할 컬럼이 없고 이미 float32 C-contiguous면 복사하지 않음
+        if len(self.columns_) == X.shape[1] and X.dtype == np.float32 and X.flags['C_CONTIGUOUS'] and out is None:
+            return X
+        X = X.astype(np.float32, copy=False)
+        shape = (len(X), len(self.columns_))
+        if out is None or out.shape != shape or out.dtype != np.float32:
+            out = np.empty(shape, dtype=np.float32)
+        np.take(X, self.columns_, axis=1, out=out)
+        return out
+    
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        """학습 후 변환"""
+        return self.fit(X).transform(X)
@@ -0,0 +1,116 @@
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+# 이름에 포함되면 날짜 컬럼으로 처리하는 키워드
+DATE_KEYWORDS = ['날짜', 'date']
+
+class FeatureTransformer:
+    """학습/추론 공용 피처 변환기
+    
+    학습 데이터로 한 번 적합(fit)하여 컬럼별 변환 방식과 범주 인코딩을 고정하고,
+    추론 시에는 같은 규칙으로 원본 행을 C-contiguous float32 행렬로 변환합니다.
+    모델과 함께 직렬화되어 학습/예측/시나리오 분석에서 동일한 인코딩을 보장합니다.
+    
+    컬럼 변환 규칙:
+        - date: datetime 타입이거나 이름에 날짜 키워드가 있는 문자열이면 1970-01-01 기준 일(day) 수
+        - numeric: 숫자형 컬럼(숫자형 날짜 포함) 또는 절반 이상이 숫자로 변환되는 문자열 컬럼
+        - categorical: 그 외 문자열 컬럼 (학습 시 등장한 값의 정렬 순서 코드, 처음 보는 값은 -1,
+          partial_fit으로 추가된 값은 기존 코드 뒤에 등장 순서대로 이어 붙임)
+        결측값은 모두 0으로 채웁니다.
+    """
+    
+    def __init__(self, features: List[str]):
+        self.features = list(features)
+        self.kinds_: Dict[str, str] = {}
+        self.categories_: Dict[str, pd.Index] = {}
+        self.fitted_ = False
+    
+    def fit(self, data: Union[pd.DataFrame, List[Dict]], category_order: str = 'sorted') -> 'FeatureTransformer':
+        """컬럼별 변환 방식과 범주 목록 학습
+        
+        Args:
+            category_order: 범주 코드 순서. 'sorted'는 정렬 순서, 'appearance'는 data에 처음 등장한 순서
+                (시간 순 데이터로 적합하면 앞부분 행의 범주 코드가 그 행까지만으로 적합한 코드와 같음)
+        """
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        for col in self.features:
+            if col not in df.columns:
+                self.kinds_[col] = 'missing'
+                continue
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                self.kinds_[col] = 'date'
+                continue
+            # 숫자형 날짜 컬럼(주차 번호 등)은 값 그대로 사용
+            if pd.api.types.is_numeric_dtype(series):
+                self.kinds_[col] = 'numeric'
+                continue
+            if any(keyword in col.lower() for keyword in DATE_KEYWORDS):
+                if pd.to_datetime(series, errors='coerce').notna().any():
+                    self.kinds_[col] = 'date'
+                    continue
+            numeric = pd.to_numeric(series, errors='coerce')
+            if numeric.isna().sum() <= len(series) * 0.5:
+                self.kinds_[col] = 'numeric'
+            else:
+                self.kinds_[col] = 'categorical'
+                categories = series.dropna().astype(str).unique()
+                self.categories_[col] = pd.Index(categories if category_order == 'appearance' else np.sort(categories))
+        self.fitted_ = True
+        return self
+    
+    def partial_fit(self, data: Union[pd.DataFrame, List[Dict]]) -> 'FeatureTransformer':
+        """배치 단위 적합 (스트리밍 학습용)
+        
+        변환 방식은 첫 배치로 정하고, 이후 배치에서는 범주형 컬럼의 범주 목록만 늘립니다.
+        처음 보는 범주는 목록 끝에 등장 순서대로 추가하므로 (다시 정렬하지 않음)
+        이전 배치로 변환한 행과 이미 학습한 모델의 범주 코드가 바뀌지 않습니다.
+        """
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if not self.fitted_:
+            return self.fit(df)
+        for col, categories in self.categories_.items():
+            if col in df.columns:
+                values = pd.Index(df[col].dropna().astype(str).unique())
+                unseen = values[categories.get_indexer(values) < 0]
+                if len(unseen):
+                    self.categories_[col] = categories.append(unseen)
+        return self
+    
+    def transform(self, data: Union[pd.DataFrame, List[Dict]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """원본 데이터를 (행 수 x 피처 수) float32 행렬로 변환
+        
+        Args:
+            out: 결과를 기록할 float32 배열 (같은 크기의 버퍼 재사용 시)
+        """
+        if not self.fitted_:
+            raise ValueError("FeatureTransformer가 학습되지 않았습니다. fit()을 먼저 호출하세요.")
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        shape = (len(df), len(self.features))
+        if out is None or out.shape != shape or out.dtype != np.float32:
+            out = np.empty(shape, dtype=np.float32)
+        
+        for j, col in enumerate(self.features):
+            kind = self.kinds_.get(col, 'missing')
+            if kind == 'missing' or col not in df.columns:
+                out[:, j] = 0.0
+                continue
+            series = df[col]
+            if kind == 'date':
+                dates = pd.to_datetime(series, errors='coerce')
+                values = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[s]').astype(np.float64) / 86400.0
+                values[dates.isna().to_numpy()] = np.nan
+            elif kind == 'categorical':
+                codes = self.categories_[col].get_indexer(series.astype(str))
+                values = codes.astype(np.float64)
+                values[series.isna().to_numpy()] = np.nan
+            else:
+                values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+            out[:, j] = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+        return out
+    
+    def fit_transform(self, data: Union[pd.DataFrame, List[Dict]]) -> np.ndarray:
+        """학습 후 변환"""
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        return self.fit(df).transform(df)
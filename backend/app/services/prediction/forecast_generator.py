@@ -1,51 +1,15 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
+from app.services.feature.lag_feature_generator import LagFeatureGenerator
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.prediction_intervals import PredictionIntervalEstimator
 
 class ForecastGenerator:
     """예측 생성기"""
     
-    def _preprocess_features(self, df: pd.DataFrame, features: List[str]) -> pd.DataFrame:
-        """피처 전처리 (model_trainer와 동일한 로직)"""
-        X_processed = df[features].copy()
-        
-        for col in features:
-            if col not in X_processed.columns:
-                continue
-            
-            # 날짜 컬럼 처리
-            if pd.api.types.is_datetime64_any_dtype(X_processed[col]) or any(keyword in col.lower() for keyword in ['날짜', 'date']):
-                try:
-                    # 날짜를 숫자로 변환 (타임스탬프 또는 순서 인덱스)
-                    if pd.api.types.is_datetime64_any_dtype(X_processed[col]):
-                        X_processed[col] = pd.to_numeric(X_processed[col], errors='coerce')
-                    else:
-                        # 문자열 날짜를 datetime으로 변환 후 타임스탬프로
-                        X_processed[col] = pd.to_datetime(X_processed[col], errors='coerce')
-                        X_processed[col] = pd.to_numeric(X_processed[col], errors='coerce')
-                except:
-                    # 변환 실패 시 라벨 인코딩
-                    from sklearn.preprocessing import LabelEncoder
-                    le = LabelEncoder()
-                    X_processed[col] = le.fit_transform(X_processed[col].astype(str).fillna(''))
-            
-            # 범주형/문자열 컬럼 처리
-            elif not pd.api.types.is_numeric_dtype(X_processed[col]):
-                try:
-                    # 숫자로 변환 시도
-                    X_processed[col] = pd.to_numeric(X_processed[col], errors='coerce')
-                    if X_processed[col].isna().sum() > len(X_processed) * 0.5:  # 50% 이상 NaN이면 라벨 인코딩
-                        from sklearn.preprocessing import LabelEncoder
-                        le = LabelEncoder()
-                        X_processed[col] = le.fit_transform(X_processed[col].astype(str).fillna(''))
-                except:
-                    # 라벨 인코딩
-                    from sklearn.preprocessing import LabelEncoder
-                    le = LabelEncoder()
-                    X_processed[col] = le.fit_transform(X_processed[col].astype(str).fillna(''))
-        
-        # NaN 값 처리
-        return X_processed.fillna(0)
+    def __init__(self):
+        self.interval_estimator = PredictionIntervalEstimator()
     
     async def generate_forecast(
         self,
@@ -53,27 +17,358 @@ class ForecastGenerator:
         data: List[Dict],
         target_column: str,
         features: List[str],
-        periods: int
+        periods: int,
+        date_column: Optional[str] = None,
+        group_by_columns: Optional[List[str]] = None,
+        transformer: Optional[FeatureTransformer] = None
     ) -> List[Dict]:
-        """예측 생성"""
+        """예측 생성 (전체 그룹 합계)
+        
+        그룹(상품)별 재귀 예측 결과를 기간별로 합산합니다.
+        """
+        forecast = self.forecast_groups(
+            model=model,
+            data=data,
+            target_column=target_column,
+            features=features,
+            periods=periods,
+            date_column=date_column,
+            group_by_columns=group_by_columns,
+            transformer=transformer
+        )
+        return self.to_forecast_data(forecast, periods)
+    
+    def to_forecast_data(self, forecast: Dict, periods: int) -> List[Dict]:
+        """그룹별 예측 결과를 기간별 합계 목록으로 변환"""
+        totals = forecast['values'].sum(axis=0) if len(forecast['group_keys']) else np.zeros(periods)
+        forecast_data = [
+            {
+                'period': step + 1,
+                'forecast': float(totals[step]),
+                'date': forecast['dates'][step]
+            }
+            for step in range(periods)
+        ]
+        # 예측 구간 (interval_coverage 지정 시)
+        if forecast.get('lower') is not None:
+            for step, item in enumerate(forecast_data):
+                item['lower'] = float(forecast['lower'][step])
+                item['upper'] = float(forecast['upper'][step])
+        return forecast_data
+    
+    def forecast_groups(
+        self,
+        model: object,
+        data: List[Dict],
+        target_column: str,
+        features: List[str],
+        periods: int,
+        date_column: Optional[str] = None,
+        group_by_columns: Optional[List[str]] = None,
+        transformer: Optional[FeatureTransformer] = None,
+        state: Optional[Dict] = None,
+        interval_coverage: Optional[float] = None,
+        interval_calibration: Optional[Dict] = None
+    ) -> Dict:
+        """그룹별 재귀 다단계 예측
+        
+        Args:
+            transformer: 학습 시 적합된 피처 변환기 (없으면 현재 데이터로 적합, 이전 버전 모델 호환용)
+            state: prepare_state() 결과 (있으면 데이터 변환을 건너뜀)
+            interval_coverage: 시점별 합계 예측 구간 포함 확률 (None이면 구간 계산 안 함)
+            interval_calibration: PredictionIntervalEstimator.calibrate()의 보정 정보 (모델 artifact 또는 레지스트리 메타데이터에 저장된 값)
+        
+        Returns:
+            {'group_keys': [그룹 키...], 'dates': [시점별 날짜...], 'values': (그룹 수 x periods) 예측값,
+             'lower', 'upper': 시점별 합계 예측 구간 (구간을 계산하지 않으면 None)}
+        """
+        if state is None:
+            state = self.prepare_state(data, target_column, features, date_column, group_by_columns, transformer)
+        num_rows = len(state['present_groups'])
+        members = self.interval_estimator.ensemble_members(model) if interval_coverage else None
+        member_totals = np.zeros((len(members), periods)) if members is not None else None
+        values = np.zeros((len(state['group_keys']), periods))
+        if num_rows:
+            values[state['present_groups']] = self.run_state(model, state, periods, member_totals=member_totals)
+        
+        bounds = None
+        if interval_coverage and num_rows:
+            bounds = self.interval_estimator.total_bounds(
+                interval_calibration, values.sum(axis=0), member_totals, num_rows, interval_coverage
+            )
+        return {
+            'group_keys': state['group_keys'],
+            'dates': self.future_dates(state, periods),
+            'values': values,
+            'lower': bounds[0] if bounds else None,
+            'upper': bounds[1] if bounds else None
+        }
+    
+    def prepare_state(
+        self,
+        data: List[Dict],
+        target_column: str,
+        features: List[str],
+        date_column: Optional[str] = None,
+        group_by_columns: Optional[List[str]] = None,
+        transformer: Optional[FeatureTransformer] = None,
+        matrix: Optional[np.ndarray] = None,
+        index: Optional[Tuple[np.ndarray, List[str], np.ndarray]] = None
+    ) -> Dict:
+        """재귀 예측 시작 상태 (그룹별 마지막 피처 행과 4주 합산 윈도우)
+        
+        데이터에만 의존하므로 모델 artifact에 함께 저장하여 같은 데이터 버전의 예측/시나리오 분석에서 재사용합니다.
+        
+        Args:
+            matrix: 미리 변환한 피처 행렬 (data와 같은 행 순서, 있으면 변환을 건너뜀)
+            index: 미리 계산한 series_index() 결과 (data와 같은 행 순서)
+        
+        Returns:
+            {'group_keys', 'present_groups', 'group_positions', 'X', 'rolling', 'date_feature_index', 'date_step', 'date_axis'}
+        """
         df = pd.DataFrame(data)
+        group_keys: List[str] = []
+        X = np.zeros((0, len(features)))
+        present_groups = np.zeros(0, dtype=np.int64)
+        rolling = []
+        date_feature_index = features.index(date_column) if date_column in features else None
+        date_step = 0.0
+        if not df.empty:
+            # 학습 시 적합된 변환기로 숫자 행렬 변환
+            if matrix is not None:
+                X_all = matrix
+            else:
+                if transformer is None:
+                    transformer = FeatureTransformer(features).fit(df)
+                X_all = transformer.transform(df)
+            
+            # 그룹/시간 순 정렬 (LagFeatureGenerator와 동일한 순서 기준)
+            group_codes, group_keys, order = index if index is not None else self.series_index(df, date_column, group_by_columns)
+            sort_index = np.lexsort((np.arange(len(df)), order, group_codes))
+            sorted_codes = group_codes[sort_index]
+            
+            # 그룹별 마지막 행 위치
+            last_positions = np.flatnonzero(np.append(sorted_codes[1:] != sorted_codes[:-1], True))
+            present_groups = sorted_codes[last_positions]
+            X = X_all[sort_index[last_positions]].astype(float)
+            
+            # 4주 합산 피처별 최근 값 윈도우 (그룹 수 x 윈도우 크기), 오래된 값 -> 최근 값 순서
+            window_size = LagFeatureGenerator.ROLLING_WINDOW
+            suffix = LagFeatureGenerator.ROLLING_SUFFIX
+            group_starts = np.concatenate([[0], last_positions[:-1] + 1])
+            for j, feature in enumerate(features):
+                base_col = feature[:-len(suffix)] if feature.endswith(suffix) else None
+                if not base_col or base_col not in df.columns:
+                    continue
+                base_values = pd.to_numeric(df[base_col], errors='coerce').fillna(0).to_numpy(dtype=float)[sort_index]
+                windows = np.zeros((len(present_groups), window_size))
+                for k in range(window_size):
+                    positions = last_positions - k
+                    valid = positions >= group_starts
+                    windows[valid, window_size - 1 - k] = base_values[positions[valid]]
+                rolling.append({'index': j, 'base_column': base_col, 'is_target': base_col == target_column, 'windows': windows})
+            
+            # 날짜 피처 전진 간격
+            if date_feature_index is not None:
+                date_step = self._median_step(X_all[sort_index, date_feature_index].astype(float), sorted_codes)
+        
+        return {
+            'features': list(features),
+            'group_keys': group_keys,
+            'present_groups': present_groups,
+            'group_positions': {group_keys[g]: i for i, g in enumerate(present_groups)},
+            'X': X,
+            'rolling': rolling,
+            'date_feature_index': date_feature_index,
+            'date_step': date_step,
+            'date_axis': self._date_axis(df, date_column)
+        }
+    
+    def run_state(
+        self,
+        model: object,
+        state: Dict,
+        periods: int,
+        rows: Optional[np.ndarray] = None,
+        overrides: Optional[List[Dict]] = None,
+        member_totals: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """시작 상태에서 다단계 예측
         
-        # 피처 전처리 (학습 시와 동일한 전처리 적용)
-        X_processed = self._preprocess_features(df, features)
+        매 시점마다
+        1) 4주 합산(rolling) 피처를 최근 4개 값 윈도우로 다시 계산
+        2) 날짜 피처를 한 주기 전진
+        3) 피처 변경(overrides) 적용
+        4) 예측값을 타겟 윈도우에 밀어 넣어 다음 시점의 Lag 피처로 사용
+        합니다. 타겟 외 컬럼은 마지막 관측값(변경 시 변경값)이 유지된다고 가정합니다.
+        타겟 Lag 피처가 없으면 모든 시점의 행을 쌓아 predict를 한 번만 호출하고,
+        있으면 시점마다 모든 행을 한 번에 예측합니다. rf_ar는 그룹별 잔차 AR 보정값을 더합니다.
         
-        # 마지막 데이터 포인트 사용 (DataFrame으로 유지하여 feature names 보존)
-        last_features = X_processed.iloc[-1:].copy()  # DataFrame으로 유지 (1행 DataFrame)
+        Args:
+            rows: 예측할 상태 행 위치 (present_groups 기준, 중복 가능). 없으면 전체
+            overrides: 피처 변경 목록 [{'feature_index', 'rolling_indices', 'operation', 'value', 'rows', 'steps'}]
+                rows/steps는 각각 (행 수,), (periods,) 불리언 마스크
+            member_totals: 앙상블 모델의 트리별 시점별 합계를 기록할 (트리 수 x periods) 배열.
+                지정하면 트리별 예측을 한 번에 쌓아 그 평균을 점 예측으로 사용
         
-        # 예측 생성
-        forecast_values = []
-        for i in range(periods):
-            # DataFrame을 그대로 전달하여 feature names 유지
-            pred = model.predict(last_features)[0]
-            forecast_values.append({
-                'period': i + 1,
-                'forecast': float(pred),
-                'date': None  # 실제로는 날짜 계산 필요
-            })
+        Returns:
+            (행 수 x periods) 예측값
+        """
+        rows = np.arange(len(state['present_groups'])) if rows is None else np.asarray(rows, dtype=np.int64)
+        overrides = overrides or []
+        features = state['features']
+        X = state['X'][rows].copy()
+        date_feature_index = state['date_feature_index']
+        # 윈도우는 상태를 변경하지 않도록 복사 (base: 변경 전 마지막 관측값)
+        rolling = [
+            {**item, 'windows': item['windows'][rows].copy(), 'base': item['windows'][rows, -1].copy()}
+            for item in state['rolling']
+        ]
+        recursive = any(item['is_target'] for item in rolling)
+        members = self.interval_estimator.ensemble_members(model) if member_totals is not None else None
         
-        return forecast_values
-
+        def predict(X_rows: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+            # (점 예측, 트리별 예측)
+            if members is None:
+                return self._predict(model, X_rows, features), None
+            stacked = self.interval_estimator.member_predictions(members, X_rows)
+            return stacked.mean(axis=0), stacked
+        
+        corrections = None
+        if hasattr(model, 'residual_forecast'):
+            group_keys = state['group_keys']
+            corrections = model.residual_forecast([group_keys[g] for g in state['present_groups'][rows]], periods)
+        
+        values = np.zeros((len(rows), periods))
+        step_matrices = []
+        for step in range(periods):
+            for item in rolling:
+                X[:, item['index']] = item['windows'].sum(axis=1)
+            if date_feature_index is not None:
+                X[:, date_feature_index] += state['date_step']
+            X_step = X
+            pushed = {i: item['base'] for i, item in enumerate(rolling) if not item['is_target']}
+            active = [o for o in overrides if o['steps'][step]]
+            if active:
+                X_step = X.copy()
+                for override in active:
+                    mask = override['rows']
+                    if override['feature_index'] is not None:
+                        j = override['feature_index']
+                        X_step[mask, j] = self._apply_override(X_step[mask, j], override)
+                    for i in override['rolling_indices']:
+                        pushed[i] = pushed[i].copy()
+                        pushed[i][mask] = self._apply_override(pushed[i][mask], override)
+            
+            if recursive:
+                predictions, stacked = predict(X_step)
+                if corrections is not None:
+                    predictions = predictions + corrections[:, step]
+                values[:, step] = predictions
+                if stacked is not None:
+                    member_totals[:, step] = stacked.sum(axis=1) + (corrections[:, step].sum() if corrections is not None else 0.0)
+            else:
+                step_matrices.append(X_step.copy() if X_step is X else X_step)
+            
+            for i, item in enumerate(rolling):
+                windows = item['windows']
+                windows[:, :-1] = windows[:, 1:]
+                windows[:, -1] = values[:, step] if item['is_target'] else pushed[i]
+        
+        if not recursive and periods and len(rows):
+            # 시점 간 의존성이 없으므로 (시점 x 행) 전체를 한 번에 예측
+            predictions, stacked = predict(np.vstack(step_matrices))
+            values = predictions.reshape(periods, len(rows)).T
+            if corrections is not None:
+                values = values + corrections
+            if stacked is not None:
+                member_totals[:] = stacked.reshape(len(members), periods, len(rows)).sum(axis=2)
+                if corrections is not None:
+                    member_totals += corrections.sum(axis=0)
+        return values
+    
+    def _apply_override(self, values: np.ndarray, override: Dict) -> np.ndarray:
+        """피처 변경 적용 (set: 값 지정, multiply: 배율, add: 가산)"""
+        if override['operation'] == 'multiply':
+            return values * override['value']
+        if override['operation'] == 'add':
+            return values + override['value']
+        return np.full_like(values, override['value'])
+    
+    def _predict(self, model: object, X: np.ndarray, features: List[str]) -> np.ndarray:
+        """numpy 행렬 예측 (DataFrame으로 학습된 모델은 컬럼명만 붙여 전달)"""
+        if hasattr(model, 'feature_names_in_'):
+            return np.asarray(model.predict(pd.DataFrame(X, columns=features, copy=False)), dtype=float)
+        return np.asarray(model.predict(X), dtype=float)
+    
+    def series_index(
+        self,
+        df: pd.DataFrame,
+        date_column: Optional[str],
+        group_by_columns: Optional[List[str]]
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """행별 (그룹 코드, 그룹 키 목록, 시간 순서 값)
+        
+        그룹화 컬럼이 없으면 전체를 '전체' 그룹 하나로 묶습니다.
+        """
+        group_by_columns = [col for col in (group_by_columns or []) if col in df.columns]
+        if group_by_columns:
+            group_codes, group_keys = self.group_codes(df, group_by_columns)
+        else:
+            group_codes, group_keys = np.zeros(len(df), dtype=np.int64), ['전체']
+        return group_codes, group_keys, self.order_values(df, date_column)
+    
+    def group_codes(self, df: pd.DataFrame, group_by_columns: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """그룹화 컬럼 조합을 그룹 코드로 변환"""
+        if len(group_by_columns) == 1:
+            keys = df[group_by_columns[0]].astype(str)
+        else:
+            keys = df[group_by_columns].astype(str).agg(' | '.join, axis=1)
+        codes, uniques = pd.factorize(keys)
+        return codes.astype(np.int64), [str(key) for key in uniques]
+    
+    def order_values(self, df: pd.DataFrame, date_column: Optional[str]) -> np.ndarray:
+        """시간 순서 값 (숫자 주차 -> 날짜 -> 원래 행 순서)"""
+        if not date_column or date_column not in df.columns:
+            return np.arange(len(df), dtype=float)
+        numeric = pd.to_numeric(df[date_column], errors='coerce')
+        if numeric.notna().sum() >= len(df) * 0.5:
+            return numeric.fillna(-np.inf).to_numpy(dtype=float)
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+        if dates.notna().sum() >= len(df) * 0.5:
+            return dates.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+        return pd.factorize(df[date_column].astype(str), sort=True)[0].astype(float)
+    
+    def _median_step(self, values: np.ndarray, codes: np.ndarray) -> float:
+        """그룹 내 연속 시점 간격의 중앙값 (정렬된 값 기준)"""
+        same_group = codes[1:] == codes[:-1]
+        diffs = np.diff(values)[same_group]
+        diffs = diffs[diffs > 0]
+        return float(np.median(diffs)) if len(diffs) else 0.0
+    
+    def future_dates(self, state: Dict, periods: int) -> List:
+        """예측 시점별 날짜 라벨 (마지막 날짜 + 간격 x 시점)"""
+        axis = state.get('date_axis')
+        if not axis:
+            return [None] * periods
+        if axis['kind'] == 'numeric':
+            labels = [axis['last'] + axis['step'] * (i + 1) for i in range(periods)]
+            return [int(v) if float(v).is_integer() else float(v) for v in labels]
+        last, step = pd.Timestamp(axis['last']), pd.Timedelta(axis['step'])
+        return [(last + step * (i + 1)).strftime('%Y-%m-%d') for i in range(periods)]
+    
+    def _date_axis(self, df: pd.DataFrame, date_column: Optional[str]) -> Optional[Dict]:
+        """날짜 라벨 기준 (마지막 날짜와 간격)"""
+        if not date_column or date_column not in df.columns:
+            return None
+        numeric = pd.to_numeric(df[date_column], errors='coerce')
+        if numeric.notna().sum() >= len(df) * 0.5:
+            unique_values = np.unique(numeric.dropna().to_numpy(dtype=float))
+            step = float(np.median(np.diff(unique_values))) if len(unique_values) > 1 else 1.0
+            return {'kind': 'numeric', 'last': float(unique_values[-1]), 'step': step}
+        dates = pd.to_datetime(df[date_column], errors='coerce').dropna()
+        if dates.empty:
+            return None
+        unique_dates = np.sort(dates.unique())
+        step = pd.Series(unique_dates).diff().median() if len(unique_dates) > 1 else pd.Timedelta(days=7)
+        return {'kind': 'date', 'last': pd.Timestamp(unique_dates[-1]).isoformat(), 'step': pd.Timedelta(step).isoformat()}
@@ -0,0 +1,201 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.linear_model import LinearRegression
+from app.core.config import settings
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.thread_budget import ThreadBudget
+
+# 그룹 인코딩 컬럼 (예측 모델 입력에 추가되는 내부 컬럼)
+GROUP_CODE_COLUMN = "__group_code__"  # 그룹별 모델 선택용 그룹 코드
+GROUP_LEVEL_COLUMN = "__group_level__"  # 전역 모델용 그룹 평균 타겟 (target encoding)
+
+def _fit_group_chunk(
+    X: np.ndarray,
+    y: np.ndarray,
+    group_ids: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    model_type: str,
+    hyperparameters: Dict
+) -> Dict[int, object]:
+    """joblib 워커: 연속 구간으로 정렬된 그룹들의 모델을 순서대로 학습"""
+    trainer = ModelTrainer()
+    models = {}
+    for group_id, start, end in zip(group_ids, starts, ends):
+        # 병렬화는 워커 단위로 하므로 그룹 모델은 단일 스레드로 학습
+        model = trainer.build_model(model_type, hyperparameters, n_jobs=1)
+        model.fit(X[start:end], y[start:end])
+        models[int(group_id)] = model
+    return models
+
+class PerGroupModel:
+    """그룹별 모델 묶음
+    
+    입력 행렬의 그룹 코드 컬럼으로 행마다 해당 그룹 모델을 선택해 예측합니다.
+    모든 그룹 모델이 선형 회귀면 계수를 쌓아 한 번의 행렬 연산으로 예측하고,
+    그 외에는 입력에 등장한 그룹마다 한 번씩 predict를 호출합니다.
+    학습 행이 부족한 그룹은 전체 데이터로 학습한 fallback 모델을 사용합니다.
+    """
+    
+    def __init__(self, models: Dict[int, object], fallback: object, group_index: int):
+        self.models = models
+        self.fallback = fallback
+        self.group_index = group_index
+        self._stack_linear()
+    
+    def _stack_linear(self):
+        """선형 모델 계수를 (그룹 수 x 피처 수) 배열로 정리"""
+        self.coef_ = None
+        self.intercept_ = None
+        members = list(self.models.values()) + [self.fallback]
+        if not members or not all(isinstance(m, LinearRegression) for m in members):
+            return
+        size = max(self.models.keys(), default=-1) + 1
+        coef = np.tile(np.ravel(self.fallback.coef_), (size + 1, 1))
+        intercept = np.full(size + 1, float(self.fallback.intercept_))
+        for group_id, model in self.models.items():
+            coef[group_id] = np.ravel(model.coef_)
+            intercept[group_id] = float(model.intercept_)
+        # 마지막 행은 알 수 없는 그룹용 fallback
+        self.coef_ = coef
+        self.intercept_ = intercept
+    
+    def predict(self, X) -> np.ndarray:
+        """그룹 코드 컬럼을 기준으로 그룹별 모델 예측"""
+        X = np.asarray(X, dtype=float)
+        codes = X[:, self.group_index].astype(np.int64)
+        features = np.delete(X, self.group_index, axis=1)
+        
+        if self.coef_ is not None:
+            fallback_row = len(self.coef_) - 1
+            rows = np.where((codes >= 0) & (codes < fallback_row), codes, fallback_row)
+            return np.einsum('ij,ij->i', features, self.coef_[rows]) + self.intercept_[rows]
+        
+        result = np.empty(len(X))
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+        for segment in np.split(order, bounds):
+            if len(segment) == 0:
+                continue
+            model = self.models.get(int(codes[segment[0]]), self.fallback)
+            result[segment] = model.predict(features[segment])
+        return result
+
+class GroupModelTrainer:
+    """그룹별 모델 병렬 학습기
+    
+    전처리는 전체 데이터에 한 번만 수행하고, 그룹 코드 순으로 정렬한 행렬을
+    연속 구간 단위로 잘라 joblib 워커에 나눠 학습합니다.
+    """
+    
+    def __init__(self):
+        self.model_trainer = ModelTrainer()
+    
+    async def train_per_group(
+        self,
+        data: List[Dict],
+        target_column: str,
+        features: List[str],
+        model_type: str = "linear",
+        hyperparameters: Optional[Dict] = None,
+        min_rows: Optional[int] = None,
+        n_jobs: Optional[int] = None
+    ) -> Tuple[PerGroupModel, Dict[str, float], FeatureTransformer]:
+        """그룹별 모델 학습
+        
+        Args:
+            data: GROUP_CODE_COLUMN이 추가된 데이터
+            features: 그룹 코드 컬럼을 제외한 피처 목록
+            min_rows: 그룹 최소 학습 행 수 (미만이면 fallback 모델 사용)
+            n_jobs: joblib 병렬 워커 수 (-1이면 전체 코어)
+        
+        Returns:
+            (PerGroupModel, metrics, transformer): 모델 입력은 features + [GROUP_CODE_COLUMN] 순서이며
+            transformer도 같은 순서로 변환
+        """
+        min_rows = min_rows if min_rows is not None else settings.PREDICTION_MIN_GROUP_ROWS
+        n_jobs = n_jobs if n_jobs is not None else settings.PREDICTION_N_JOBS
+        params = self.model_trainer.resolve_hyperparameters(model_type, hyperparameters)
+        
+        df = pd.DataFrame(data)
+        transformer = FeatureTransformer(features + [GROUP_CODE_COLUMN])
+        X_all = transformer.fit_transform(df)
+        X = np.ascontiguousarray(X_all[:, :-1])
+        codes = df[GROUP_CODE_COLUMN].to_numpy(dtype=np.int64)
+        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        
+        # 그룹 코드 순 정렬 후 그룹별 연속 구간 계산
+        order = np.argsort(codes, kind='stable')
+        X_sorted, y_sorted = X[order], y[order]
+        group_ids, starts, sizes = np.unique(codes[order], return_index=True, return_counts=True)
+        trainable = sizes >= min_rows
+        group_ids, starts, ends = group_ids[trainable], starts[trainable], (starts + sizes)[trainable]
+        
+        def fit_all() -> Tuple[Dict[int, object], object]:
+            # 워커 수만큼 학습 스레드 예산 예약 (동시 학습 작업과 코어를 나눠 사용)
+            with ThreadBudget.reserve(effective_n_jobs(n_jobs)) as threads:
+                return fit_reserved(threads)
+        
+        def fit_reserved(threads: int) -> Tuple[Dict[int, object], object]:
+            fallback = self.model_trainer.build_model(model_type, params, n_jobs=threads, n_samples=len(y))
+            fallback.fit(X, y)
+            if len(group_ids) == 0:
+                return {}, fallback
+            # 워커 수의 몇 배로 청크를 나눠 그룹 크기 편차에 따른 유휴 시간을 줄임
+            num_chunks = max(1, min(len(group_ids), 4 * threads))
+            chunks = np.array_split(np.arange(len(group_ids)), num_chunks)
+            results = Parallel(n_jobs=threads)(
+                delayed(_fit_group_chunk)(
+                    X_sorted[starts[c[0]]:ends[c[-1]]],
+                    y_sorted[starts[c[0]]:ends[c[-1]]],
+                    group_ids[c],
+                    starts[c] - starts[c[0]],
+                    ends[c] - starts[c[0]],
+                    model_type,
+                    params
+                )
+                for c in chunks if len(c)
+            )
+            models = {}
+            for chunk_models in results:
+                models.update(chunk_models)
+            return models, fallback
+        
+        # 학습은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        models, fallback = await asyncio.to_thread(fit_all)
+        model = PerGroupModel(models, fallback, group_index=len(features))
+        
+        y_pred = model.predict(X_all)
+        metrics = self.model_trainer.evaluate(y, y_pred)
+        print(f"✅ 그룹별 모델 학습 완료: {len(models)}개 그룹 (fallback 사용 그룹 {int((~trainable).sum())}개)")
+        return model, metrics, transformer
+
+def add_group_encoding(
+    data: List[Dict],
+    target_column: str,
+    group_codes: np.ndarray,
+    group_mode: str
+) -> Tuple[List[Dict], str]:
+    """그룹 인코딩 컬럼 추가
+    
+    Args:
+        group_codes: 행별 그룹 코드 (ForecastGenerator.group_codes 결과)
+        group_mode: "global" (그룹 평균 타겟 인코딩) 또는 "per_group" (그룹 코드)
+    
+    Returns:
+        (인코딩 컬럼이 추가된 데이터, 추가된 컬럼명)
+    """
+    df = pd.DataFrame(data)
+    if group_mode == "per_group":
+        df[GROUP_CODE_COLUMN] = group_codes
+        return df.to_dict('records'), GROUP_CODE_COLUMN
+    
+    target = pd.to_numeric(df[target_column], errors='coerce')
+    group_means = target.groupby(group_codes).mean()
+    df[GROUP_LEVEL_COLUMN] = group_means.reindex(group_codes).fillna(target.mean()).to_numpy()
+    return df.to_dict('records'), GROUP_LEVEL_COLUMN
@@ -0,0 +1,199 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# AR 계수 절댓값 합 상한 (다단계 예측 시 잔차 예측이 발산하지 않도록 정상성 유지)
+_MAX_AR_COEF_SUM = 0.95
+
+def fit_ar_batched(
+    series: np.ndarray,
+    order: int,
+    ridge: float = 1e-3,
+    min_obs: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """그룹별 AR(order) 계수를 한 번에 추정 (배치 최소제곱, 닫힌 해)
+    
+    r[t] = c + a1 * r[t-1] + ... + ap * r[t-p] 를 모든 그룹에 대해 정규방정식
+    (XᵀX + λI) β = Xᵀy 로 쌓아 np.linalg.solve 한 번으로 풉니다.
+    결측(NaN)이 포함된 시점은 제외하고, 관측이 min_obs 미만인 그룹은 계수를 0으로 둡니다.
+    
+    Args:
+        series: (그룹 수 x 시점 수) 잔차 시계열, 관측이 없는 시점은 NaN
+        order: AR 차수
+        ridge: 시차 계수 정규화 강도 (관측 수에 비례)
+    
+    Returns:
+        (coef, intercept): coef는 (그룹 수 x order) 배열이며 0번째가 lag 1 계수
+    """
+    num_groups, num_periods = series.shape
+    min_obs = min_obs if min_obs is not None else 2 * order + 1
+    coef = np.zeros((num_groups, order))
+    intercept = np.zeros(num_groups)
+    if num_groups == 0 or num_periods <= order:
+        return coef, intercept
+    
+    # (그룹 x 표본 x order) 시차 행렬과 (그룹 x 표본) 타겟
+    lags = np.stack([series[:, order - k:num_periods - k] for k in range(1, order + 1)], axis=-1)
+    target = series[:, order:]
+    valid = ~np.isnan(target) & ~np.isnan(lags).any(axis=-1)
+    design = np.concatenate([np.ones(target.shape + (1,)), np.nan_to_num(lags)], axis=-1)
+    design *= valid[..., None]
+    target = np.where(valid, target, 0.0)
+    
+    n_obs = valid.sum(axis=1)
+    xtx = np.einsum('gni,gnj->gij', design, design)
+    xty = np.einsum('gni,gn->gi', design, target)
+    # 절편은 제외하고 시차 계수만 정규화, 관측이 없는 그룹도 특이행렬이 되지 않도록 최소 1
+    penalty = ridge * np.maximum(n_obs, 1)
+    diagonal = np.arange(1, order + 1)
+    xtx[:, diagonal, diagonal] += penalty[:, None]
+    xtx[:, 0, 0] += (n_obs == 0)
+    beta = np.linalg.solve(xtx, xty[..., None])[..., 0]
+    
+    fitted = n_obs >= min_obs
+    intercept[fitted] = beta[fitted, 0]
+    coef[fitted] = beta[fitted, 1:]
+    
+    # 계수 절댓값 합이 상한을 넘으면 비율을 유지한 채 축소
+    coef_sum = np.abs(coef).sum(axis=1)
+    scale = np.where(coef_sum > _MAX_AR_COEF_SUM, _MAX_AR_COEF_SUM / np.maximum(coef_sum, 1e-12), 1.0)
+    coef *= scale[:, None]
+    return coef, intercept
+
+class RandomForestARModel:
+    """RandomForest + AR 잔차 하이브리드 모델
+    
+    랜덤 포레스트가 피처로 수요 수준을 예측하고, 그룹(상품)별 AR(p) 모델이
+    포레스트의 out-of-bag 잔차에 남은 자기상관을 보정합니다 (ARIMA(p, 0, 0) 잔차 모델).
+    AR 계수는 fit_ar_batched로 모든 그룹을 한 번에 추정하므로 추가 비용은 포레스트 학습에 비해 작습니다.
+    
+    predict()는 포레스트 예측만 반환하며, 다단계 예측 시 그룹별 잔차 보정값은
+    residual_forecast()로 구해 더합니다 (ForecastGenerator.forecast_groups).
+    """
+    
+    def __init__(self, ar_order: int = 3, **forest_params):
+        self.ar_order = ar_order
+        self.forest_params = forest_params
+        self.forest: Optional[RandomForestRegressor] = None
+        self.group_index_: Dict[str, int] = {}
+        self.ar_coef_ = np.zeros((0, ar_order))
+        self.ar_intercept_ = np.zeros(0)
+        self.last_residuals_ = np.zeros((0, ar_order))
+    
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        group_codes: Optional[np.ndarray] = None,
+        group_keys: Optional[List[str]] = None,
+        order: Optional[np.ndarray] = None
+    ) -> 'RandomForestARModel':
+        """포레스트 학습 후 그룹별 잔차 AR 계수 추정
+        
+        Args:
+            group_codes: 행별 그룹 코드 (없으면 전체를 하나의 시계열로 처리)
+            group_keys: 그룹 코드별 그룹 키 (residual_forecast 조회용)
+            order: 행별 시간 순서 값 (없으면 행 순서)
+        """
+        params = dict(self.forest_params)
+        # 학습 데이터 잔차는 과적합으로 0에 가까우므로 out-of-bag 예측으로 잔차 계산
+        use_oob = params.get('bootstrap', True)
+        if use_oob:
+            params['oob_score'] = True
+        self.forest = RandomForestRegressor(**params)
+        self.forest.fit(X, y)
+        fitted = self.forest.oob_prediction_ if use_oob else self.forest.predict(X)
+        residuals = np.asarray(y, dtype=float) - np.ravel(fitted)
+        
+        if group_codes is None:
+            group_codes = np.zeros(len(residuals), dtype=np.int64)
+            group_keys = ['전체']
+        if order is None:
+            order = np.arange(len(residuals), dtype=float)
+        
+        # (그룹, 시점) 평균 잔차 격자: 같은 시점의 여러 행(매장 등)은 평균
+        frame = pd.DataFrame({'group': group_codes, 'order': order, 'residual': residuals})
+        grid = frame.groupby(['group', 'order'])['residual'].mean().unstack('order')
+        grid = grid.reindex(range(len(group_keys)))
+        series = grid.to_numpy(dtype=float)
+        
+        self.ar_coef_, self.ar_intercept_ = fit_ar_batched(series, self.ar_order)
+        self.last_residuals_ = self._last_observed(series)
+        self.group_index_ = {str(key): i for i, key in enumerate(group_keys)}
+        return self
+    
+    def update_residual_state(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        group_codes: Optional[np.ndarray] = None,
+        group_keys: Optional[List[str]] = None,
+        order: Optional[np.ndarray] = None
+    ):
+        """새 기간 데이터의 잔차로 그룹별 최근 잔차 상태 갱신 (AR 계수는 유지)
+        
+        Args:
+            group_codes, group_keys: 새 데이터의 행별 그룹 코드와 코드별 그룹 키 (학습 시 없던 그룹은 무시)
+        """
+        if len(y) == 0:
+            return
+        residuals = np.asarray(y, dtype=float) - self.forest.predict(X)
+        if group_codes is None:
+            group_codes = np.zeros(len(residuals), dtype=np.int64)
+            group_keys = ['전체']
+        if order is None:
+            order = np.arange(len(residuals), dtype=float)
+        
+        # 새 데이터의 그룹 코드를 학습 시 그룹 행 번호로 변환
+        rows = np.array([self.group_index_.get(str(key), -1) for key in group_keys], dtype=np.int64)[group_codes]
+        known = rows >= 0
+        if not known.any():
+            return
+        frame = pd.DataFrame({'group': rows[known], 'order': order[known], 'residual': residuals[known]})
+        grid = frame.groupby(['group', 'order'])['residual'].mean().unstack('order')
+        
+        # 기존 최근 잔차 뒤에 새 잔차를 이어 붙인 뒤 마지막 ar_order개 선택
+        group_rows = grid.index.to_numpy(dtype=np.int64)
+        series = np.concatenate([self.last_residuals_[group_rows], grid.to_numpy(dtype=float)], axis=1)
+        self.last_residuals_[group_rows] = self._last_observed(series)
+    
+    def _last_observed(self, series: np.ndarray) -> np.ndarray:
+        """그룹별 마지막 ar_order개 관측 잔차 (오래된 값 -> 최근 값, 부족하면 앞을 0으로 채움)"""
+        observed = ~np.isnan(series)
+        # 각 행에서 관측값을 오른쪽 끝으로 모은 뒤 마지막 ar_order개 선택
+        shift_order = np.argsort(observed, axis=1, kind='stable')
+        packed = np.take_along_axis(np.nan_to_num(series), shift_order, axis=1)
+        packed_mask = np.take_along_axis(observed, shift_order, axis=1)
+        last = np.zeros((series.shape[0], self.ar_order))
+        width = min(self.ar_order, series.shape[1])
+        if width:
+            last[:, -width:] = np.where(packed_mask[:, -width:], packed[:, -width:], 0.0)
+        return last
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """포레스트 예측 (잔차 보정 제외)"""
+        return self.forest.predict(X)
+    
+    def residual_forecast(self, group_keys: List[str], periods: int) -> np.ndarray:
+        """그룹별 다단계 잔차 예측 (학습 시 없던 그룹은 0)
+        
+        Returns:
+            (len(group_keys) x periods) 잔차 보정값
+        """
+        rows = np.array([self.group_index_.get(str(key), -1) for key in group_keys], dtype=np.int64)
+        known = rows >= 0
+        forecast = np.zeros((len(group_keys), periods))
+        if not known.any():
+            return forecast
+        
+        coef = self.ar_coef_[rows[known]]
+        intercept = self.ar_intercept_[rows[known]]
+        # 상태는 (그룹 x order), 마지막 열이 가장 최근 잔차 / coef[:, 0]은 lag 1 계수
+        state = self.last_residuals_[rows[known]].copy()
+        for step in range(periods):
+            next_residual = intercept + np.einsum('gk,gk->g', coef, state[:, ::-1])
+            forecast[known, step] = next_residual
+            state[:, :-1] = state[:, 1:]
+            state[:, -1] = next_residual
+        return forecast
@@ -0,0 +1,219 @@
+from typing import Any, Dict, List, Optional, Tuple
+from multiprocessing import TimeoutError as WorkerTimeoutError
+import asyncio
+import hashlib
+import json
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.model_selection import ParameterSampler, TimeSeriesSplit
+from app.core.config import settings
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.design_matrix import DesignMatrixBuilder
+from app.services.prediction.thread_budget import ThreadBudget
+from app.services.prediction.tuned_hyperparameter_repository import TunedHyperparameterRepository
+
+# 모델 타입별 탐색 공간 (rf_ar는 포레스트 파라미터만 탐색)
+SEARCH_SPACES: Dict[str, Dict[str, List[Any]]] = {
+    'random_forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [None, 8, 12, 20],
+        'min_samples_leaf': [1, 2, 5, 10],
+        'max_features': [1.0, 0.5, 'sqrt'],
+    },
+    'hist_gradient_boosting': {
+        'max_iter': [100, 200, 400],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [10, 20, 50],
+        'l2_regularization': [0.0, 0.1, 1.0],
+    },
+    'xgboost': {
+        'n_estimators': [200, 400, 800],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'max_depth': [4, 6, 8],
+        'subsample': [0.7, 0.85, 1.0],
+        'colsample_bytree': [0.7, 0.85, 1.0],
+        'min_child_weight': [1, 5, 10],
+    },
+}
+SEARCH_SPACES['rf_ar'] = SEARCH_SPACES['random_forest']
+
+def _score_config(
+    index: int,
+    model_type: str,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    train_start: int,
+    train_end: int,
+    test_end: int
+) -> Tuple[int, float]:
+    """joblib 워커: 한 후보 설정을 한 fold의 최근 학습 행으로 학습 후 holdout RMSE 계산"""
+    # rf_ar는 잔차 AR 보정 없이 포레스트 성능으로 평가
+    model_type = 'random_forest' if model_type == 'rf_ar' else model_type
+    model = ModelTrainer().build_model(model_type, params, n_jobs=1, n_samples=train_end - train_start)
+    model.fit(X[train_start:train_end], y[train_start:train_end])
+    y_pred = np.ravel(model.predict(X[train_end:test_end]))
+    return index, float(np.sqrt(np.mean((y[train_end:test_end] - y_pred) ** 2)))
+
+class HyperparameterTuner:
+    """successive halving 하이퍼파라미터 탐색기
+    
+    탐색 공간에서 TUNING_CANDIDATES개 설정을 추출해 작은 자원(각 fold의 최근 학습 행 일부)으로 평가하고,
+    단계마다 holdout RMSE 상위 1/TUNING_HALVING_FACTOR만 더 큰 자원으로 승격하여
+    마지막 단계에서 전체 학습 행으로 평가합니다. fold는 TimeSeriesSplit(시간 순)이며,
+    시간 예산(TUNING_TIME_BUDGET)을 넘기면 지금까지 가장 높은 단계의 최고 설정을 사용합니다.
+    결과는 데이터셋 지문별로 tuned_hyperparameters 컬렉션에 저장하여 같은 데이터는 튜닝을 건너뜁니다.
+    """
+    
+    def __init__(self):
+        self.repository = TunedHyperparameterRepository()
+    
+    @staticmethod
+    def supports(model_type: str) -> bool:
+        """튜닝 가능한 모델 타입 여부"""
+        return model_type in SEARCH_SPACES
+    
+    def fingerprint(self, df: pd.DataFrame, target_column: str, features: List[str], model_type: str) -> str:
+        """데이터셋 지문 (데이터 내용, 피처, 모델 타입, 탐색 설정 기반 해시)"""
+        columns = [col for col in sorted(set(features) | {target_column}) if col in df.columns]
+        content_hash = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        key_source = {
+            'model_type': model_type,
+            'target_column': target_column,
+            'features': sorted(features),
+            'rows': len(df),
+            'content': hashlib.sha256(content_hash.tobytes()).hexdigest(),
+            'search_space': SEARCH_SPACES[model_type],
+            'candidates': settings.TUNING_CANDIDATES,
+            'factor': settings.TUNING_HALVING_FACTOR,
+            'splits': settings.TUNING_SPLITS
+        }
+        key_json = json.dumps(key_source, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+    
+    async def get_or_tune(
+        self,
+        data: List[Dict],
+        target_column: str,
+        features: List[str],
+        model_type: str,
+        order: np.ndarray,
+        time_budget: Optional[float] = None,
+        n_jobs: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """저장된 튜닝 결과 조회, 없으면 튜닝 후 저장
+        
+        Args:
+            order: 행별 시간 순서 값 (ForecastGenerator.order_values 결과)
+        
+        Returns:
+            (best_params, tuning): tuning은 {'fingerprint', 'cached', 'best_rmse', 'rungs', 'elapsed_seconds', ...}
+        """
+        if not self.supports(model_type):
+            raise ValueError(f"하이퍼파라미터 튜닝을 지원하지 않는 모델 타입입니다: {model_type} (지원: {', '.join(SEARCH_SPACES)})")
+        df = pd.DataFrame(data)
+        fingerprint = await asyncio.to_thread(self.fingerprint, df, target_column, features, model_type)
+        
+        cached = await self.repository.get(fingerprint)
+        if cached:
+            print(f"✅ 저장된 튜닝 결과 사용: {model_type} ({fingerprint[:12]})")
+            return cached['best_params'], {'fingerprint': fingerprint, 'cached': True, **cached['summary']}
+        
+        best_params, summary = await self.tune(df, target_column, features, model_type, order, time_budget, n_jobs)
+        await self.repository.save(fingerprint, model_type, best_params, summary)
+        return best_params, {'fingerprint': fingerprint, 'cached': False, **summary}
+    
+    async def tune(
+        self,
+        df: pd.DataFrame,
+        target_column: str,
+        features: List[str],
+        model_type: str,
+        order: np.ndarray,
+        time_budget: Optional[float] = None,
+        n_jobs: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """successive halving 탐색
+        
+        Returns:
+            (best_params, summary): summary는 {'best_rmse', 'candidates', 'rungs', 'completed', 'elapsed_seconds'}
+        """
+        time_budget = time_budget if time_budget is not None else settings.TUNING_TIME_BUDGET
+        n_jobs = n_jobs if n_jobs is not None else settings.PREDICTION_N_JOBS
+        factor = max(settings.TUNING_HALVING_FACTOR, 2)
+        
+        # 시간 순 정렬 후 변환 (fold는 항상 과거로 학습하고 이후 구간으로 평가)
+        sort_index = np.lexsort((np.arange(len(df)), order))
+        df = df.iloc[sort_index].reset_index(drop=True)
+        # 상수/중복 컬럼은 제외 (후보 비교 결과에 영향이 없고 학습 시간만 늘어남)
+        X = DesignMatrixBuilder(features).fit_transform(FeatureTransformer(features).fit_transform(df))
+        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        n_splits = min(settings.TUNING_SPLITS, len(df) - 1)
+        if n_splits < 2:
+            raise ValueError("하이퍼파라미터 튜닝을 위한 데이터가 부족합니다 (최소 3행 필요)")
+        folds = [(len(train), len(train) + len(test)) for train, test in TimeSeriesSplit(n_splits=n_splits).split(X)]
+        
+        configs = list(ParameterSampler(SEARCH_SPACES[model_type], n_iter=settings.TUNING_CANDIDATES, random_state=42))
+        # 단계 수: 후보가 1개가 될 때까지 factor로 나눈 횟수 + 1, 단계 k의 자원 비율은 factor^(k - 마지막 단계)
+        n_rungs = 1 + int(np.floor(np.log(len(configs)) / np.log(factor))) if len(configs) > 1 else 1
+        
+        def run_rungs() -> Tuple[List[Dict[str, Any]], bool]:
+            with ThreadBudget.reserve(effective_n_jobs(n_jobs)) as threads:
+                deadline = time.monotonic() + time_budget
+                alive = list(range(len(configs)))
+                rungs: List[Dict[str, Any]] = []
+                for rung in range(n_rungs):
+                    fraction = float(factor) ** (rung - (n_rungs - 1))
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 and rungs:
+                        return rungs, False
+                    # 첫 단계는 예산과 관계없이 끝까지 평가 (결과가 항상 존재하도록)
+                    timeout = remaining if rungs and threads > 1 else None
+                    jobs = []
+                    for index in alive:
+                        for train_end, test_end in folds:
+                            train_rows = min(train_end, max(int(train_end * fraction), settings.TUNING_MIN_ROWS))
+                            jobs.append(delayed(_score_config)(
+                                index, model_type, configs[index], X, y, train_end - train_rows, train_end, test_end
+                            ))
+                    try:
+                        results = Parallel(n_jobs=threads, timeout=timeout)(jobs)
+                    except WorkerTimeoutError:
+                        return rungs, False
+                    
+                    scores: Dict[int, List[float]] = {index: [] for index in alive}
+                    for index, rmse in results:
+                        scores[index].append(rmse)
+                    mean_rmse = {index: float(np.mean(values)) for index, values in scores.items()}
+                    ranked = sorted(alive, key=lambda index: mean_rmse[index])
+                    rungs.append({'resource_fraction': fraction, 'candidates': len(alive), 'scores': mean_rmse, 'ranked': ranked})
+                    print(f"🔎 하이퍼파라미터 튜닝: 단계 {rung + 1}/{n_rungs} (후보 {len(alive)}개, 학습 행 비율 {fraction:.3f}, 최고 RMSE {mean_rmse[ranked[0]]:.4f})")
+                    
+                    # 상위 1/factor만 다음 단계로 승격
+                    alive = ranked[:max(1, len(alive) // factor)]
+                    if time.monotonic() > deadline and rung < n_rungs - 1:
+                        return rungs, False
+                return rungs, True
+        
+        # 탐색은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        start = time.monotonic()
+        rungs, completed = await asyncio.to_thread(run_rungs)
+        last = rungs[-1]
+        best_index = last['ranked'][0]
+        best_params = configs[best_index]
+        summary = {
+            'best_rmse': last['scores'][best_index],
+            'candidates': len(configs),
+            'rungs': [
+                {'resource_fraction': r['resource_fraction'], 'candidates': r['candidates'], 'best_rmse': r['scores'][r['ranked'][0]]}
+                for r in rungs
+            ],
+            'completed': completed,
+            'elapsed_seconds': round(time.monotonic() - start, 3)
+        }
+        print(f"✅ 하이퍼파라미터 튜닝 완료: {model_type} {best_params} (holdout RMSE {summary['best_rmse']:.4f})")
+        return best_params, summary
@@ -0,0 +1,238 @@
+from typing import Any, Dict, List, Optional, Tuple
+import copy
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+from app.core.config import settings
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.hybrid_model import RandomForestARModel
+from app.services.prediction.prediction_intervals import PredictionIntervalEstimator
+from app.services.prediction.streaming_model import StreamingSGDModel
+from app.services.prediction.thread_budget import ThreadBudget
+
+class IncrementalUpdater:
+    """등록된 모델 증분 업데이트기
+    
+    새 기간 데이터가 추가되었을 때 전체 재학습 대신 기존 모델을 이어서 학습합니다.
+    - RandomForest / rf_ar: warm_start로 최근 데이터에 학습한 트리를 추가하고 오래된 트리부터 제거
+    - HistGradientBoosting: warm_start로 부스팅 반복 추가
+    - XGBoost: 기존 booster에서 이어서 부스팅
+    - SGD: 새 행으로 partial_fit (표준화 통계는 유지)
+    - LinearRegression: 학습 시 저장한 충분통계량(XᵀX, Xᵀy)에 새 행만 더해 닫힌 해로 다시 풀기
+      (학습에 사용한 행 + 이후 추가된 행 전체로 다시 학습한 것과 같은 최소제곱 해.
+      학습 행은 로드된 데이터 윈도우(최근 10000행, 그룹 모드는 전체 행)이며 그 이전 행은 포함하지 않습니다)
+    업데이트 전 모델은 레지스트리 캐시와 공유되므로 복사본을 수정합니다.
+    
+    드리프트 판단의 기준 오차는 전체 학습 직후(initial_state)에 학습에 쓰지 않은 행의 오차로 기록합니다.
+        - model_type=auto: 모델 선택 교차검증 RMSE
+        - LinearRegression: leave-one-out 잔차 RMSE (hat 행렬로 재학습 없이 계산)
+        - 랜덤 포레스트 / rf_ar: 최근 행의 out-of-bag RMSE (트리별 예측 한 번)
+        - 그 외: 시간 순 마지막 구간을 제외하고 학습한 복제 모델의 holdout RMSE
+    """
+    
+    def __init__(self):
+        self.model_trainer = ModelTrainer()
+        self.interval_estimator = PredictionIntervalEstimator()
+    
+    def supports(self, model: object, state: Optional[Dict[str, Any]] = None) -> bool:
+        """증분 업데이트 가능 여부 (선형 모델은 학습 시 저장한 충분통계량이 있어야 함)"""
+        if isinstance(model, LinearRegression):
+            return bool(state) and state.get('linear_stats') is not None
+        if isinstance(model, (RandomForestRegressor, RandomForestARModel, HistGradientBoostingRegressor, StreamingSGDModel)):
+            return True
+        return type(model).__name__ == 'XGBRegressor'
+    
+    def initial_state(
+        self,
+        model: object,
+        X: np.ndarray,
+        y: np.ndarray,
+        order: np.ndarray,
+        metrics: Optional[Dict[str, float]] = None,
+        model_selection: Optional[Dict] = None,
+        holdout: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> Dict[str, Any]:
+        """전체 학습 직후의 업데이트 상태 (학습에 포함된 마지막 시점, 기준 오차, 선형 모델 충분통계량)
+        
+        CPU 작업이므로 이벤트 루프 밖에서 호출합니다.
+        
+        Args:
+            X, y, order: 모델 학습에 사용한 행의 피처 행렬, 타겟, 시간 순서 값
+            metrics, model_selection: 학습 결과 (model_type=auto면 교차검증 지표)
+            holdout: 이미 계산한 holdout 잔차 (PredictionIntervalEstimator.holdout_residuals 결과, 있으면 재사용)
+        """
+        state: Dict[str, Any] = {
+            'trained_until': float(order.max()) if len(order) else None,
+            'reference_rmse': None,
+            'reference_source': None
+        }
+        if isinstance(model, LinearRegression):
+            state['linear_stats'] = self.linear_stats(X, y)
+        if not settings.PREDICTION_INCREMENTAL_UPDATE or state['trained_until'] is None or not self.supports(model, state):
+            return state
+        
+        if model_selection and metrics and metrics.get('rmse') is not None:
+            state['reference_rmse'], state['reference_source'] = float(metrics['rmse']), 'cross_validation'
+        elif isinstance(model, LinearRegression):
+            state['reference_rmse'], state['reference_source'] = self._leave_one_out_rmse(model, X, y), 'leave_one_out'
+        else:
+            forest = model.forest if isinstance(model, RandomForestARModel) else model
+            rmse = self._out_of_bag_rmse(forest, X, y, order) if isinstance(forest, RandomForestRegressor) else None
+            if rmse is not None:
+                state['reference_rmse'], state['reference_source'] = rmse, 'out_of_bag'
+            else:
+                if holdout is None:
+                    holdout = self.interval_estimator.holdout_residuals(model, X, y, order)
+                if holdout is not None:
+                    state['reference_rmse'] = float(np.sqrt(np.mean(holdout[0] ** 2)))
+                    state['reference_source'] = 'holdout'
+        return state
+    
+    @staticmethod
+    def linear_stats(X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+        """선형 모델 충분통계량 (절편 열을 포함한 XᵀX, Xᵀy, 반영된 행 수)"""
+        design = np.column_stack([np.ones(len(y)), np.asarray(X, dtype=float)])
+        return {'xtx': design.T @ design, 'xty': design.T @ np.asarray(y, dtype=float), 'rows': int(len(y))}
+    
+    @staticmethod
+    def _leave_one_out_rmse(model: LinearRegression, X: np.ndarray, y: np.ndarray) -> Optional[float]:
+        """선형 모델의 leave-one-out 잔차 RMSE (e_i / (1 - h_ii), 재학습 없이 계산)"""
+        design = np.asarray(X, dtype=float)
+        if model.fit_intercept:
+            design = np.column_stack([np.ones(len(y)), design])
+        leverage = np.einsum('ij,ij->i', design @ np.linalg.pinv(design.T @ design), design)
+        residuals = np.asarray(y, dtype=float) - np.ravel(model.predict(X))
+        # 레버리지가 1에 가까운 행(자기 자신만으로 결정되는 행)은 제외
+        valid = leverage < 1.0 - 1e-8
+        if not valid.any():
+            return None
+        return float(np.sqrt(np.mean((residuals[valid] / (1.0 - leverage[valid])) ** 2)))
+    
+    def _out_of_bag_rmse(
+        self,
+        forest: RandomForestRegressor,
+        X: np.ndarray,
+        y: np.ndarray,
+        order: np.ndarray
+    ) -> Optional[float]:
+        """최근 행(PREDICTION_UPDATE_RECENT_ROWS개)의 out-of-bag RMSE (각 행을 학습하지 않은 트리들의 평균 예측)"""
+        if not forest.bootstrap:
+            return None
+        rows = np.sort(np.argsort(order, kind='stable')[-settings.PREDICTION_UPDATE_RECENT_ROWS:])
+        position = np.full(len(y), -1, dtype=np.int64)
+        position[rows] = np.arange(len(rows))
+        predictions = self.interval_estimator.member_predictions(forest.estimators_, X[rows])
+        # 트리별 in-bag 여부 (트리 수 x 최근 행 수)
+        in_bag = np.zeros(predictions.shape, dtype=bool)
+        for t, samples in enumerate(forest.estimators_samples_):
+            sampled = position[samples]
+            in_bag[t, sampled[sampled >= 0]] = True
+        out_of_bag = ~in_bag
+        counts = out_of_bag.sum(axis=0)
+        valid = counts > 0
+        if not valid.any():
+            return None
+        oob_prediction = (predictions * out_of_bag).sum(axis=0)[valid] / counts[valid]
+        return float(np.sqrt(np.mean((y[rows][valid] - oob_prediction) ** 2)))
+    
+    def backtest(self, model: object, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+        """업데이트 전 모델의 새 데이터 오차 (학습에 쓰이지 않은 기간이므로 holdout 지표)"""
+        return self.model_trainer.evaluate(y, model.predict(X))
+    
+    def update(
+        self,
+        model: object,
+        state: Dict[str, Any],
+        X: np.ndarray,
+        y: np.ndarray,
+        new_rows: np.ndarray,
+        recent_rows: np.ndarray,
+        group_codes: Optional[np.ndarray] = None,
+        group_keys: Optional[List[str]] = None,
+        order: Optional[np.ndarray] = None
+    ) -> Tuple[object, Dict[str, Any]]:
+        """모델 증분 업데이트 (CPU 작업, 이벤트 루프 밖에서 호출)
+        
+        Args:
+            state: 이전 업데이트 상태 (artifact의 update_state)
+            new_rows: 새로 추가된 행 인덱스
+            recent_rows: 트리 추가 학습에 사용할 최근 행 인덱스 (새 행 포함)
+        
+        Returns:
+            (업데이트된 모델 복사본, 갱신된 상태)
+        """
+        model = copy.deepcopy(model)
+        state = dict(state)
+        with ThreadBudget.reserve() as threads:
+            if isinstance(model, RandomForestARModel):
+                self._add_trees(model.forest, state, X[recent_rows], y[recent_rows], threads)
+                model.update_residual_state(
+                    X[new_rows], y[new_rows],
+                    group_codes[new_rows] if group_codes is not None else None,
+                    group_keys,
+                    order[new_rows] if order is not None else None
+                )
+            elif isinstance(model, RandomForestRegressor):
+                self._add_trees(model, state, X[recent_rows], y[recent_rows], threads)
+            elif isinstance(model, HistGradientBoostingRegressor):
+                model.set_params(warm_start=True, max_iter=model.n_iter_ + settings.PREDICTION_UPDATE_ITERATIONS)
+                model.fit(X[recent_rows], y[recent_rows])
+            elif isinstance(model, LinearRegression):
+                self._update_linear(model, state, X, y, new_rows)
+            elif isinstance(model, StreamingSGDModel):
+                model.partial_fit(X[new_rows], y[new_rows])
+            else:
+                # XGBoost: 기존 booster에 부스팅 라운드 추가
+                booster = model.get_booster()
+                model.set_params(n_estimators=settings.PREDICTION_UPDATE_ITERATIONS, n_jobs=threads)
+                model.fit(X[recent_rows], y[recent_rows], xgb_model=booster)
+        return model, state
+    
+    def _add_trees(
+        self,
+        forest: RandomForestRegressor,
+        state: Dict[str, Any],
+        X: np.ndarray,
+        y: np.ndarray,
+        threads: int
+    ):
+        """최근 데이터로 학습한 트리 추가 후 최대 트리 수를 넘는 오래된 트리 제거"""
+        base_trees = state.setdefault('base_n_estimators', len(forest.estimators_))
+        params = {
+            'warm_start': True,
+            'n_estimators': len(forest.estimators_) + settings.PREDICTION_UPDATE_TREES,
+            'oob_score': False,
+            'n_jobs': threads
+        }
+        # 정수 max_samples가 최근 데이터 행 수보다 크면 학습할 수 없으므로 비율로 제한 해제
+        if isinstance(forest.max_samples, int) and forest.max_samples > len(y):
+            params['max_samples'] = None
+        forest.set_params(**params)
+        forest.fit(X, y)
+        
+        max_trees = int(base_trees * settings.PREDICTION_MAX_TREE_RATIO)
+        if len(forest.estimators_) > max_trees:
+            forest.estimators_ = forest.estimators_[-max_trees:]
+            forest.n_estimators = len(forest.estimators_)
+    
+    def _update_linear(
+        self,
+        model: LinearRegression,
+        state: Dict[str, Any],
+        X: np.ndarray,
+        y: np.ndarray,
+        new_rows: np.ndarray
+    ):
+        """학습 시 저장한 충분통계량에 새 행만 더한 뒤 최소제곱 해 갱신"""
+        stats = state['linear_stats']
+        added = self.linear_stats(X[new_rows], y[new_rows])
+        xtx = np.asarray(stats['xtx']) + added['xtx']
+        xty = np.asarray(stats['xty']) + added['xty']
+        state['linear_stats'] = {'xtx': xtx, 'xty': xty, 'rows': int(stats.get('rows', 0)) + added['rows']}
+        
+        if model.fit_intercept:
+            beta = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+            model.intercept_, model.coef_ = float(beta[0]), beta[1:]
+        else:
+            beta = np.linalg.lstsq(xtx[1:, 1:], xty[1:], rcond=None)[0]
+            model.coef_ = beta
@@ -0,0 +1,223 @@
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import joblib
+from app.core.config import settings
+from app.services.prediction.model_registry_repository import ModelRegistryRepository
+
+class ModelRegistry:
+    """학습된 모델 레지스트리
+    
+    학습된 모델(전처리 포함)을 joblib 파일로 MODEL_REGISTRY_DIR에 저장하고,
+    (file_id, 데이터 버전, 피처, 모델 타입, 하이퍼파라미터) 키로 MongoDB에 색인합니다.
+    로드한 모델은 프로세스 내 LRU 캐시(MODEL_CACHE_SIZE개)에 보관하여
+    같은 조건의 예측은 학습과 디스크 로드를 모두 건너뜁니다.
+    새 모델을 등록하면 같은 계보의 이전 모델은 최신 MODEL_REGISTRY_KEEP_VERSIONS개만 남기고 삭제합니다.
+    """
+    
+    # 프로세스 전역 LRU 캐시 {model_id: artifact}
+    _cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    def __init__(self):
+        self.repository = ModelRegistryRepository()
+        self.model_dir = settings.MODEL_REGISTRY_DIR
+    
+    @staticmethod
+    def build_key(
+        file_id: str,
+        data_version: Optional[int],
+        target_column: str,
+        features: List[str],
+        model_type: str,
+        hyperparameters: Optional[Dict] = None,
+        **extra: Any
+    ) -> str:
+        """레지스트리 키 생성 (데이터가 추가/변경되면 data_version이 바뀌어 새 키가 됨)
+        
+        data_version을 None으로 주면 데이터 버전과 관계없는 모델 계보(lineage) 키가 됩니다.
+        """
+        key_source = {
+            'file_id': file_id,
+            'data_version': data_version,
+            'target_column': target_column,
+            'features': sorted(features or []),
+            'model_type': model_type,
+            'hyperparameters': hyperparameters or {},
+            **extra
+        }
+        key_json = json.dumps(key_source, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+    
+    async def get(self, registry_key: str) -> Optional[Tuple[Dict, Dict[str, Any]]]:
+        """레지스트리 키로 모델 조회
+        
+        Returns:
+            (메타데이터, artifact) 또는 None. artifact는 {'model', 'preprocessor', 'features', ...}
+        """
+        meta = await self.repository.get_by_key(registry_key)
+        if not meta:
+            return None
+        artifact = await self.load(meta)
+        if artifact is None:
+            return None
+        return meta, artifact
+    
+    async def get_latest_by_lineage(self, lineage_key: str) -> Optional[Tuple[Dict, Dict[str, Any]]]:
+        """모델 계보의 최신 모델 조회 (증분 업데이트의 기준 모델)"""
+        meta = await self.repository.get_latest_by_lineage(lineage_key)
+        if not meta:
+            return None
+        artifact = await self.load(meta)
+        if artifact is None:
+            return None
+        return meta, artifact
+    
+    async def get_by_model_id(self, model_id: str) -> Optional[Tuple[Dict, Dict[str, Any]]]:
+        """모델 ID로 모델 조회"""
+        meta = await self.repository.get_by_model_id(model_id)
+        if not meta:
+            return None
+        artifact = await self.load(meta)
+        if artifact is None:
+            return None
+        return meta, artifact
+    
+    async def load(self, meta: Dict) -> Optional[Dict[str, Any]]:
+        """모델 artifact 로드 (캐시 우선, 없으면 디스크에서 로드 후 캐시)"""
+        model_id = meta['model_id']
+        artifact = self._cache_get(model_id)
+        if artifact is not None:
+            return artifact
+        
+        path = meta.get('artifact_path')
+        if not path or not os.path.exists(path):
+            print(f"⚠️ 모델 파일을 찾을 수 없습니다: {path}")
+            return None
+        try:
+            # 역직렬화는 CPU/디스크 작업이므로 이벤트 루프 밖에서 수행
+            artifact = await asyncio.to_thread(joblib.load, path)
+        except Exception as e:
+            print(f"⚠️ 모델 로드 실패 ({model_id}): {str(e)}")
+            return None
+        
+        self._cache_put(model_id, artifact)
+        await self.repository.touch(model_id)
+        return artifact
+    
+    async def register(
+        self,
+        registry_key: str,
+        file_id: str,
+        user_id: str,
+        target_column: str,
+        data_version: int,
+        features: List[str],
+        model_type: str,
+        hyperparameters: Dict,
+        metrics: Dict[str, float],
+        model: Any,
+        preprocessor: Any = None,
+        extra: Optional[Dict[str, Any]] = None,
+        lineage_key: Optional[str] = None
+    ) -> Dict:
+        """학습된 모델 저장 및 등록
+        
+        Args:
+            model: 학습된 추정기
+            preprocessor: 학습 시 적합된 전처리 객체 (추론 시 동일하게 사용)
+            extra: artifact에 함께 저장할 추가 상태 (예: 예측에 필요한 마지막 시점 정보)
+            lineage_key: 데이터 버전을 제외한 모델 계보 키 (build_key(data_version=None, ...))
+        """
+        model_id = f"model_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        artifact = {
+            'model': model,
+            'preprocessor': preprocessor,
+            'features': list(features),
+            'target_column': target_column,
+            'model_type': model_type,
+            'hyperparameters': hyperparameters,
+            **(extra or {})
+        }
+        
+        os.makedirs(self.model_dir, exist_ok=True)
+        artifact_path = os.path.join(self.model_dir, f"{model_id}.joblib")
+        await asyncio.to_thread(joblib.dump, artifact, artifact_path, compress=3)
+        
+        meta = await self.repository.save(
+            model_id=model_id,
+            registry_key=registry_key,
+            file_id=file_id,
+            user_id=user_id,
+            target_column=target_column,
+            data_version=data_version,
+            features=list(features),
+            model_type=model_type,
+            hyperparameters=hyperparameters,
+            metrics=metrics,
+            artifact_path=artifact_path,
+            lineage_key=lineage_key
+        )
+        self._cache_put(model_id, artifact)
+        print(f"✅ 모델 등록 완료: {model_id} ({model_type}, data_version={data_version})")
+        
+        # 재학습/증분 업데이트로 대체된 이전 모델 정리 (디스크 사용량 제한)
+        if lineage_key:
+            paths = await self.repository.delete_superseded(lineage_key, settings.MODEL_REGISTRY_KEEP_VERSIONS)
+            await asyncio.to_thread(self._remove_artifacts, paths)
+            if paths:
+                print(f"🗑️ 이전 모델 {len(paths)}개 삭제 (계보 {lineage_key[:8]})")
+        return meta
+    
+    def get_interval_calibration(self, meta: Dict, artifact: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """모델의 예측 구간 보정 정보 (학습 시 artifact에 저장했거나, 나중에 계산해 메타데이터에 저장한 값)"""
+        return artifact.get('interval_calibration') or meta.get('interval_calibration')
+    
+    async def save_interval_calibration(self, meta: Dict, artifact: Dict[str, Any], calibration: Dict[str, Any]):
+        """예측 구간 보정 정보 저장 (모델 파일은 다시 쓰지 않고 메타데이터와 캐시에만 기록)"""
+        stored = dict(calibration)
+        if 'residuals' in stored:
+            stored['residuals'] = [float(value) for value in stored['residuals']]
+        meta['interval_calibration'] = stored
+        artifact['interval_calibration'] = calibration
+        await self.repository.save_interval_calibration(meta['model_id'], stored)
+    
+    async def delete_file_models(self, file_id: str):
+        """파일의 모든 모델 메타데이터와 모델 파일 삭제"""
+        paths = await self.repository.delete_by_file_id(file_id)
+        self._remove_artifacts(paths)
+    
+    @classmethod
+    def _remove_artifacts(cls, paths: List[str]):
+        """모델 파일 삭제 (캐시에서도 제거)"""
+        for path in paths:
+            model_id = os.path.splitext(os.path.basename(path))[0]
+            with cls._cache_lock:
+                cls._cache.pop(model_id, None)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    @classmethod
+    def _cache_get(cls, model_id: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (조회된 항목은 가장 최근 사용으로 이동)"""
+        with cls._cache_lock:
+            artifact = cls._cache.get(model_id)
+            if artifact is not None:
+                cls._cache.move_to_end(model_id)
+            return artifact
+    
+    @classmethod
+    def _cache_put(cls, model_id: str, artifact: Dict[str, Any]):
+        """캐시 저장 (용량 초과 시 가장 오래 사용하지 않은 모델 제거)"""
+        with cls._cache_lock:
+            cls._cache[model_id] = artifact
+            cls._cache.move_to_end(model_id)
+            while len(cls._cache) > max(settings.MODEL_CACHE_SIZE, 0):
+                cls._cache.popitem(last=False)
@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from app.core.database import get_database
+
+class ModelRegistryRepository:
+    """모델 레지스트리 데이터 접근 레이어 (Model Registry Collection)"""
+    
+    async def save(
+        self,
+        model_id: str,
+        registry_key: str,
+        file_id: str,
+        user_id: str,
+        target_column: str,
+        data_version: int,
+        features: List[str],
+        model_type: str,
+        hyperparameters: Dict,
+        metrics: Dict[str, float],
+        artifact_path: str,
+        lineage_key: Optional[str] = None
+    ) -> Dict:
+        """학습된 모델 메타데이터 저장 (모델 파일은 artifact_path에 저장됨)"""
+        db = await get_database()
+        collection = db['model_registry']
+        
+        doc = {
+            'model_id': model_id,
+            'registry_key': registry_key,  # file_id, 데이터 버전, 피처, 모델 타입, 하이퍼파라미터 기반 해시
+            'lineage_key': lineage_key,  # 데이터 버전을 제외한 같은 설정의 모델 계보 (증분 업데이트 기준 모델 조회)
+            'file_id': file_id,
+            'user_id': user_id,
+            'target_column': target_column,
+            'data_version': data_version,
+            'features': features,
+            'model_type': model_type,
+            'hyperparameters': hyperparameters,
+            'metrics': metrics,
+            'artifact_path': artifact_path,  # joblib 모델 파일 경로
+            'created_at': datetime.now(),
+            'last_used_at': datetime.now()
+        }
+        
+        await collection.insert_one(doc)
+        doc.pop('_id', None)
+        return doc
+    
+    async def get_by_key(self, registry_key: str) -> Optional[Dict]:
+        """레지스트리 키로 최신 모델 조회"""
+        db = await get_database()
+        collection = db['model_registry']
+        result = await collection.find_one(
+            {'registry_key': registry_key},
+            sort=[('created_at', -1)]
+        )
+        if result:
+            result.pop('_id', None)
+        return result
+    
+    async def get_latest_by_lineage(self, lineage_key: str) -> Optional[Dict]:
+        """모델 계보의 최신 모델 조회 (데이터 버전과 관계없이 같은 설정으로 학습된 모델)"""
+        db = await get_database()
+        collection = db['model_registry']
+        result = await collection.find_one(
+            {'lineage_key': lineage_key},
+            sort=[('created_at', -1)]
+        )
+        if result:
+            result.pop('_id', None)
+        return result
+    
+    async def get_by_model_id(self, model_id: str) -> Optional[Dict]:
+        """모델 ID로 조회"""
+        db = await get_database()
+        collection = db['model_registry']
+        result = await collection.find_one({'model_id': model_id})
+        if result:
+            result.pop('_id', None)
+        return result
+    
+    async def save_interval_calibration(self, model_id: str, calibration: Dict):
+        """예측 구간 보정 정보 저장 (구간을 처음 요청했을 때 계산한 값)"""
+        db = await get_database()
+        collection = db['model_registry']
+        await collection.update_one(
+            {'model_id': model_id},
+            {'$set': {'interval_calibration': calibration}}
+        )
+    
+    async def touch(self, model_id: str):
+        """마지막 사용 시각 갱신"""
+        db = await get_database()
+        collection = db['model_registry']
+        await collection.update_one(
+            {'model_id': model_id},
+            {'$set': {'last_used_at': datetime.now()}}
+        )
+    
+    async def delete_by_file_id(self, file_id: str) -> List[str]:
+        """파일의 모든 모델 메타데이터 삭제 (삭제된 모델 파일 경로 반환)"""
+        db = await get_database()
+        collection = db['model_registry']
+        cursor = collection.find({'file_id': file_id}, {'artifact_path': 1})
+        paths = [doc['artifact_path'] async for doc in cursor if doc.get('artifact_path')]
+        await collection.delete_many({'file_id': file_id})
+        return paths
+    
+    async def delete_superseded(self, lineage_key: str, keep: int) -> List[str]:
+        """
+        모델 계보에서 최신 keep개를 제외한 이전 모델 메타데이터 삭제 (삭제된 모델 파일 경로 반환)
+        저장된 예측 결과가 참조하는 모델은 시나리오 분석에 계속 쓰이므로 삭제하지 않습니다.
+        """
+        db = await get_database()
+        collection = db['model_registry']
+        cursor = collection.find(
+            {'lineage_key': lineage_key},
+            {'model_id': 1, 'artifact_path': 1}
+        ).sort('created_at', -1).skip(max(keep, 1))
+        docs = await cursor.to_list(length=None)
+        if not docs:
+            return []
+        
+        # 예측 결과 문서(predictions.model_id)가 참조하는 모델 제외
+        referenced = set(await db['predictions'].distinct(
+            'model_id',
+            {'model_id': {'$in': [doc['model_id'] for doc in docs]}}
+        ))
+        docs = [doc for doc in docs if doc['model_id'] not in referenced]
+        if not docs:
+            return []
+        await collection.delete_many({'model_id': {'$in': [doc['model_id'] for doc in docs]}})
+        return [doc['artifact_path'] for doc in docs if doc.get('artifact_path')]
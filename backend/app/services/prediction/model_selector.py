@@ -0,0 +1,178 @@
+from typing import Any, Dict, List, Optional, Tuple
+from multiprocessing import TimeoutError as WorkerTimeoutError
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.model_selection import TimeSeriesSplit
+from app.core.config import settings
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.design_matrix import DesignMatrixBuilder
+from app.services.prediction.thread_budget import ThreadBudget
+from models.linear_models import get_linear_models
+from models.tree_models import get_tree_models
+
+def get_candidate_models() -> Dict[str, object]:
+    """모델 선택 후보 추정기 (models/ 의 후보 세트)"""
+    return {**get_linear_models(), **get_tree_models()}
+
+def _score_fold(
+    name: str,
+    estimator: object,
+    X: np.ndarray,
+    y: np.ndarray,
+    train_end: int,
+    test_end: int
+) -> Tuple[str, Dict[str, float]]:
+    """joblib 워커: 한 후보를 한 fold에서 학습 후 holdout 구간 평가"""
+    model = clone(estimator)
+    # 병렬화는 후보/워커 단위로 하므로 후보 모델은 단일 스레드로 학습
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+    model.fit(X[:train_end], y[:train_end])
+    y_pred = model.predict(X[train_end:test_end])
+    return name, ModelTrainer().evaluate(y[train_end:test_end], y_pred)
+
+class ModelSelector:
+    """시계열 교차검증 기반 모델 선택기
+    
+    시간 순으로 정렬한 데이터를 TimeSeriesSplit으로 나누고, fold 단위 라운드마다
+    살아남은 후보들을 joblib으로 병렬 평가합니다.
+    - 최소 fold 수(MODEL_SELECTION_PRUNE_AFTER) 이후 평균 RMSE가 최고 후보의
+      MODEL_SELECTION_PRUNE_RATIO 배를 넘는 후보는 제외 (조기 가지치기)
+    - 시간 예산(MODEL_SELECTION_TIME_BUDGET)을 넘기면 남은 fold는 평가하지 않음
+    최종 모델은 holdout 평균 RMSE가 가장 낮은 후보를 전체 데이터로 다시 학습한 모델입니다.
+    """
+    
+    async def select(
+        self,
+        data: List[Dict],
+        target_column: str,
+        features: List[str],
+        order: np.ndarray,
+        candidates: Optional[Dict[str, object]] = None,
+        n_splits: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        n_jobs: Optional[int] = None
+    ) -> Tuple[object, Dict[str, float], FeatureTransformer, Dict[str, Any]]:
+        """후보 모델 교차검증 후 최적 모델 학습
+        
+        Args:
+            order: 행별 시간 순서 값 (ForecastGenerator.order_values 결과)
+            candidates: {이름: 추정기}. 없으면 get_candidate_models()
+            time_budget: 교차검증 시간 예산 (초)
+        
+        Returns:
+            (model, metrics, transformer, selection): metrics는 선택된 모델의 holdout fold 평균 지표,
+            selection은 {'selected_model', 'n_splits', 'folds_evaluated', 'dropped_features', 'leaderboard'}
+        """
+        candidates = candidates or get_candidate_models()
+        n_splits = n_splits or settings.MODEL_SELECTION_SPLITS
+        time_budget = time_budget if time_budget is not None else settings.MODEL_SELECTION_TIME_BUDGET
+        n_jobs = n_jobs if n_jobs is not None else settings.PREDICTION_N_JOBS
+        
+        df = pd.DataFrame(data)
+        n_splits = min(n_splits, len(df) - 1)
+        if n_splits < 2:
+            raise ValueError("모델 선택을 위한 데이터가 부족합니다 (최소 3행 필요)")
+        
+        # 시간 순 정렬 후 변환 (fold는 항상 과거로 학습하고 이후 구간으로 평가)
+        sort_index = np.lexsort((np.arange(len(df)), order))
+        df = df.iloc[sort_index].reset_index(drop=True)
+        transformer = FeatureTransformer(features)
+        X = transformer.fit_transform(df)
+        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        # 교차검증은 상수/중복 컬럼을 제거한 행렬로 수행 (fold는 행 슬라이스 view)
+        design = DesignMatrixBuilder(features)
+        X_design = design.fit_transform(X)
+        if design.dropped_:
+            print(f"✂️ 모델 선택: 상수/중복 피처 {len(design.dropped_)}개 제외 ({', '.join(design.dropped_)})")
+        
+        # TimeSeriesSplit의 fold는 [0, train_end) 학습, [train_end, test_end) 평가 구간
+        folds = [(len(train), len(train) + len(test)) for train, test in TimeSeriesSplit(n_splits=n_splits).split(X)]
+        
+        def run_selection() -> Tuple[Dict[str, List[Dict[str, float]]], Dict[str, str], int]:
+            # 병렬 워커 수만큼 학습 스레드 예산 예약
+            with ThreadBudget.reserve(effective_n_jobs(n_jobs)) as threads:
+                return run_rounds(threads)
+        
+        def run_rounds(threads: int) -> Tuple[Dict[str, List[Dict[str, float]]], Dict[str, str], int]:
+            deadline = time.monotonic() + time_budget
+            scores: Dict[str, List[Dict[str, float]]] = {name: [] for name in candidates}
+            status = {name: 'completed' for name in candidates}
+            folds_evaluated = 0
+            for fold_index, (train_end, test_end) in enumerate(folds):
+                alive = [name for name in candidates if status[name] == 'completed']
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 and folds_evaluated > 0:
+                    break
+                # 첫 fold는 예산과 관계없이 끝까지 평가 (선택 결과가 항상 존재하도록)
+                # 순차 실행(워커 1개)은 작업 단위 timeout이 없으므로 라운드 사이에서만 예산 확인
+                timeout = remaining if folds_evaluated > 0 and threads > 1 else None
+                try:
+                    results = Parallel(n_jobs=threads, timeout=timeout)(
+                        delayed(_score_fold)(name, candidates[name], X_design, y, train_end, test_end)
+                        for name in alive
+                    )
+                except WorkerTimeoutError:
+                    break
+                for name, fold_metrics in results:
+                    scores[name].append(fold_metrics)
+                folds_evaluated = fold_index + 1
+                
+                # 조기 가지치기: 평균 RMSE가 현재 최고 후보보다 크게 나쁜 후보 제외
+                if folds_evaluated >= settings.MODEL_SELECTION_PRUNE_AFTER and fold_index < len(folds) - 1:
+                    mean_rmse = {name: np.mean([m['rmse'] for m in scores[name]]) for name in alive}
+                    best_rmse = min(mean_rmse.values())
+                    for name in alive:
+                        if mean_rmse[name] > best_rmse * settings.MODEL_SELECTION_PRUNE_RATIO:
+                            status[name] = 'pruned'
+                            print(f"✂️ 모델 선택: {name} 제외 (fold {folds_evaluated}, RMSE {mean_rmse[name]:.4f})")
+            
+            # 예산 초과로 끝까지 평가하지 못한 후보 표시
+            if folds_evaluated < len(folds):
+                for name in candidates:
+                    if status[name] == 'completed':
+                        status[name] = 'timeout'
+            return scores, status, folds_evaluated
+        
+        # 교차검증은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        scores, status, folds_evaluated = await asyncio.to_thread(run_selection)
+        
+        leaderboard = []
+        for name, fold_scores in scores.items():
+            if not fold_scores:
+                continue
+            leaderboard.append({
+                'model': name,
+                'status': status[name],
+                'folds': len(fold_scores),
+                **{metric: float(np.mean([m[metric] for m in fold_scores])) for metric in fold_scores[0]}
+            })
+        leaderboard.sort(key=lambda entry: (entry['status'] == 'pruned', entry['rmse']))
+        selected = leaderboard[0]
+        print(f"✅ 모델 선택 완료: {selected['model']} (holdout RMSE {selected['rmse']:.4f}, {folds_evaluated}/{len(folds)} fold)")
+        
+        # 선택된 후보를 전체 데이터로 다시 학습
+        model = clone(candidates[selected['model']])
+        
+        def refit():
+            with ThreadBudget.reserve() as threads:
+                if 'n_jobs' in model.get_params():
+                    model.set_params(n_jobs=threads)
+                model.fit(X, y)
+        
+        await asyncio.to_thread(refit)
+        
+        metrics = {metric: selected[metric] for metric in ('mse', 'rmse', 'mae', 'r2')}
+        selection = {
+            'selected_model': selected['model'],
+            'n_splits': len(folds),
+            'folds_evaluated': folds_evaluated,
+            'dropped_features': design.dropped_,
+            'leaderboard': leaderboard
+        }
+        return model, metrics, transformer, selection
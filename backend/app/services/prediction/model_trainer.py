@@ -1,84 +1,125 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
+import asyncio
 from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import numpy as np
+from app.core.config import settings
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.thread_budget import ThreadBudget
+from app.services.prediction.hybrid_model import RandomForestARModel
+from app.services.prediction.streaming_model import StreamingSGDModel
 
 class ModelTrainer:
     """모델 학습기"""
     
+    # 모델 타입별 기본 하이퍼파라미터
+    DEFAULT_HYPERPARAMETERS = {
+        'linear': {},
+        'random_forest': {'n_estimators': 100, 'random_state': 42},
+        'hist_gradient_boosting': {'max_iter': 200, 'learning_rate': 0.1, 'random_state': 42},
+        'xgboost': {'n_estimators': 300, 'learning_rate': 0.1, 'max_depth': 6, 'tree_method': 'hist', 'random_state': 42},
+        'rf_ar': {'n_estimators': 100, 'random_state': 42, 'ar_order': 3},
+        'sgd': {'alpha': 1e-4, 'max_iter': 5, 'random_state': 42},
+    }
+    
+    # n_jobs로 스레드 수를 지정하는 모델 타입 (그 외는 ThreadBudget의 OpenMP/BLAS 제한을 따름)
+    THREADED_MODEL_TYPES = ('random_forest', 'xgboost', 'rf_ar')
+    
+    def resolve_hyperparameters(self, model_type: str, hyperparameters: Optional[Dict] = None) -> Dict:
+        """기본 하이퍼파라미터에 사용자 지정 값을 덮어쓴 최종 하이퍼파라미터"""
+        defaults = self.DEFAULT_HYPERPARAMETERS.get(model_type, self.DEFAULT_HYPERPARAMETERS['linear'])
+        return {**defaults, **(hyperparameters or {})}
+    
     async def train_model(
         self,
         data: List[Dict],
         target_column: str,
         features: List[str],
-        model_type: str = "linear"
-    ) -> Tuple[object, Dict[str, float]]:
-        """모델 학습"""
+        model_type: str = "linear",
+        hyperparameters: Optional[Dict] = None,
+        group_codes: Optional[np.ndarray] = None,
+        group_keys: Optional[List[str]] = None,
+        order: Optional[np.ndarray] = None
+    ) -> Tuple[object, Dict[str, float], FeatureTransformer]:
+        """모델 학습
+        
+        Args:
+            group_codes, group_keys, order: 행별 그룹 코드/그룹 키/시간 순서 값
+                (rf_ar 모델의 그룹별 잔차 시계열 구성에 사용, 다른 모델 타입은 무시)
+        
+        Returns:
+            (model, metrics, transformer): 학습된 모델, 평가 지표, 학습 데이터로 적합된 피처 변환기
+            (예측 시 같은 transformer로 변환해야 함)
+        """
         df = pd.DataFrame(data)
         
-        # 피처 전처리: 날짜 및 범주형 컬럼 처리
-        X_processed = df[features].copy()
+        # 피처 전처리: 변환 규칙을 한 번 학습하여 float32 행렬로 변환
+        transformer = FeatureTransformer(features)
+        X = transformer.fit_transform(df)
+        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
         
-        for col in features:
-            if col not in X_processed.columns:
-                continue
-            
-            # 날짜 컬럼 처리
-            if pd.api.types.is_datetime64_any_dtype(X_processed[col]) or any(keyword in col.lower() for keyword in ['날짜', 'date']):
-                try:
-                    # 날짜를 숫자로 변환 (타임스탬프 또는 순서 인덱스)
-                    if pd.api.types.is_datetime64_any_dtype(X_processed[col]):
-                        X_processed[col] = pd.to_numeric(X_processed[col], errors='coerce')
-                    else:
-                        # 문자열 날짜를 datetime으로 변환 후 타임스탬프로
-                        X_processed[col] = pd.to_datetime(X_processed[col], errors='coerce')
-                        X_processed[col] = pd.to_numeric(X_processed[col], errors='coerce')
-                except:
-                    # 변환 실패 시 라벨 인코딩
-                    from sklearn.preprocessing import LabelEncoder
-                    le = LabelEncoder()
-                    X_processed[col] = le.fit_transform(X_processed[col].astype(str).fillna(''))
-            
-            # 범주형/문자열 컬럼 처리
-            elif not pd.api.types.is_numeric_dtype(X_processed[col]):
-                try:
-                    # 숫자로 변환 시도
-                    X_processed[col] = pd.to_numeric(X_processed[col], errors='coerce')
-                    if X_processed[col].isna().sum() > len(X_processed) * 0.5:  # 50% 이상 NaN이면 라벨 인코딩
-                        from sklearn.preprocessing import LabelEncoder
-                        le = LabelEncoder()
-                        X_processed[col] = le.fit_transform(X_processed[col].astype(str).fillna(''))
-                except:
-                    # 라벨 인코딩
-                    from sklearn.preprocessing import LabelEncoder
-                    le = LabelEncoder()
-                    X_processed[col] = le.fit_transform(X_processed[col].astype(str).fillna(''))
+        def fit() -> Tuple[object, np.ndarray]:
+            # 스레드 예산을 예약한 범위 안에서 모델 생성/학습/예측
+            with ThreadBudget.reserve() as threads:
+                model = self.build_model(model_type, hyperparameters, n_jobs=threads, n_samples=len(y))
+                if isinstance(model, RandomForestARModel):
+                    model.fit(X, y, group_codes=group_codes, group_keys=group_keys, order=order)
+                else:
+                    model.fit(X, y)
+                return model, model.predict(X)
         
-        # NaN 값 처리
-        X = X_processed.fillna(0)
-        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0)
+        # 학습은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        model, y_pred = await asyncio.to_thread(fit)
+        metrics = self.evaluate(y, y_pred)
         
-        # 모델 선택
-        if model_type == "linear":
-            model = LinearRegression()
-        elif model_type == "random_forest":
-            model = RandomForestRegressor(n_estimators=100, random_state=42)
-        else:
-            model = LinearRegression()
+        return model, metrics, transformer
+    
+    def build_model(
+        self,
+        model_type: str,
+        hyperparameters: Optional[Dict] = None,
+        n_jobs: Optional[int] = None,
+        n_samples: Optional[int] = None
+    ) -> object:
+        """모델 타입과 하이퍼파라미터로 추정기 생성
         
-        # 학습
-        model.fit(X, y)
+        Args:
+            n_jobs: 학습 스레드 수 (random_forest, xgboost, rf_ar에 적용, ThreadBudget에서 예약한 값)
+            n_samples: 학습 행 수 (random_forest/rf_ar는 RANDOM_FOREST_MAX_SAMPLES를 넘으면 트리당 부트스트랩 표본 제한)
+        """
+        params = self.resolve_hyperparameters(model_type, hyperparameters)
+        if model_type in self.THREADED_MODEL_TYPES and n_jobs is not None:
+            params.setdefault('n_jobs', n_jobs)
         
-        # 예측 및 평가
-        y_pred = model.predict(X)
-        metrics = {
-            'mse': float(mean_squared_error(y, y_pred)),
-            'rmse': float(np.sqrt(mean_squared_error(y, y_pred))),
-            'mae': float(mean_absolute_error(y, y_pred)),
-            'r2': float(r2_score(y, y_pred))
+        if model_type == "linear":
+            return LinearRegression(**params)
+        elif model_type in ("random_forest", "rf_ar"):
+            max_samples = settings.RANDOM_FOREST_MAX_SAMPLES
+            if max_samples and n_samples and n_samples > max_samples and params.get('bootstrap', True):
+                params.setdefault('max_samples', max_samples)
+            if model_type == "rf_ar":
+                return RandomForestARModel(**params)
+            return RandomForestRegressor(**params)
+        elif model_type == "hist_gradient_boosting":
+            return HistGradientBoostingRegressor(**params)
+        elif model_type == "xgboost":
+            try:
+                from xgboost import XGBRegressor
+            except ImportError:
+                raise ValueError("xgboost 모델을 사용하려면 xgboost 패키지를 설치해야 합니다")
+            return XGBRegressor(**params)
+        elif model_type == "sgd":
+            return StreamingSGDModel(**params)
+        else:
+            return LinearRegression(**params)
+    
+    def evaluate(self, y_true, y_pred) -> Dict[str, float]:
+        """평가 지표 계산"""
+        return {
+            'mse': float(mean_squared_error(y_true, y_pred)),
+            'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+            'mae': float(mean_absolute_error(y_true, y_pred)),
+            'r2': float(r2_score(y_true, y_pred))
         }
-        
-        return model, metrics
-
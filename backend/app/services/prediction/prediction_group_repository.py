@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import numpy as np
+from app.core.database import get_database
+
+class PredictionGroupRepository:
+    """그룹별 예측 결과 데이터 접근 레이어 (Prediction Groups Collection)"""
+    
+    async def save_many(
+        self,
+        prediction_id: str,
+        file_id: str,
+        user_id: str,
+        group_keys: List[str],
+        values: np.ndarray,
+        batch_size: int = 1000
+    ):
+        """그룹별 예측값 저장 (그룹당 한 문서, 날짜는 predictions 문서에 한 번만 저장)"""
+        db = await get_database()
+        collection = db['prediction_groups']
+        
+        created_at = datetime.now()
+        docs = [
+            {
+                'prediction_id': prediction_id,
+                'file_id': file_id,
+                'user_id': user_id,
+                'group_index': group_index,
+                'group_key': group_key,
+                'forecast': [round(float(v), 4) for v in values[group_index]],
+                'total': float(values[group_index].sum()),
+                'created_at': created_at
+            }
+            for group_index, group_key in enumerate(group_keys)
+        ]
+        for start in range(0, len(docs), batch_size):
+            await collection.insert_many(docs[start:start + batch_size], ordered=False)
+    
+    async def get_page(
+        self,
+        prediction_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        group_key: Optional[str] = None
+    ) -> List[Dict]:
+        """그룹별 예측값 페이지 조회 (그룹 순서대로)"""
+        db = await get_database()
+        collection = db['prediction_groups']
+        query = {'prediction_id': prediction_id}
+        if group_key is not None:
+            query['group_key'] = group_key
+        cursor = collection.find(query, {'_id': 0}).sort('group_index', 1).skip(skip).limit(limit)
+        return await cursor.to_list(length=limit)
+    
+    async def count(self, prediction_id: str, group_key: Optional[str] = None) -> int:
+        """그룹 수 조회"""
+        db = await get_database()
+        collection = db['prediction_groups']
+        query = {'prediction_id': prediction_id}
+        if group_key is not None:
+            query['group_key'] = group_key
+        return await collection.count_documents(query)
@@ -0,0 +1,136 @@
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from app.core.config import settings
+from app.services.prediction.hybrid_model import RandomForestARModel
+from app.services.prediction.thread_budget import ThreadBudget
+
+class PredictionIntervalEstimator:
+    """예측 구간 추정기
+    
+    - ensemble: 랜덤 포레스트(rf_ar 포함)는 트리별 예측을 (트리 수 x 행 수) 배열로 한 번에 쌓아
+      시점별 합계의 트리 간 분위수를 구간으로 사용합니다. 점 예측은 같은 배열의 평균이므로
+      predict 한 번과 비슷한 비용입니다.
+    - conformal: 그 외 모델은 학습 시 시간 순 마지막 구간(PREDICTION_INTERVAL_CALIBRATION_FRACTION)을
+      제외하고 학습한 복제 모델의 holdout 잔차로 구간 폭을 정합니다 (split conformal).
+      복제 모델 학습 비용이 있으므로 구간을 요청한 모델에 대해서만 (학습 시 또는 처음 요청 시) 계산합니다.
+      잔차는 시점별 합계 잔차를 행 수의 제곱근으로 나눈 값이며, 예측 시 그룹 수의 제곱근을 곱합니다.
+    구간은 1단계 예측 오차 기준이며 재귀 예측의 누적 오차는 반영하지 않습니다.
+    """
+    
+    def ensemble_members(self, model: object) -> Optional[list]:
+        """트리별 예측에 사용할 추정기 목록 (앙상블 모델이 아니면 None)"""
+        if isinstance(model, RandomForestARModel):
+            model = model.forest
+        if isinstance(model, RandomForestRegressor):
+            return model.estimators_
+        return None
+    
+    def member_predictions(self, members: list, X: np.ndarray) -> np.ndarray:
+        """트리별 예측 (트리 수 x 행 수), 입력 검증은 한 번만 수행"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        out = np.empty((len(members), len(X)))
+        for t, tree in enumerate(members):
+            out[t] = tree.predict(X, check_input=False)
+        return out
+    
+    def holdout_residuals(
+        self,
+        model: object,
+        X: np.ndarray,
+        y: np.ndarray,
+        order: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """시간 순 마지막 시점들(PREDICTION_INTERVAL_CALIBRATION_FRACTION)을 제외하고 학습한 복제 모델의 holdout 잔차
+        
+        같은 시점의 행은 같은 쪽에 배치합니다. (CPU 작업, 이벤트 루프 밖에서 호출)
+        
+        Returns:
+            (holdout 행 잔차, holdout 행 시간 순서 값) 또는 None (복제 학습이 불가능한 모델, 데이터 부족)
+        """
+        try:
+            holdout_model = clone(model)
+        except TypeError:
+            return None
+        
+        periods = np.unique(order)
+        holdout_periods = int(len(periods) * settings.PREDICTION_INTERVAL_CALIBRATION_FRACTION)
+        if holdout_periods < 1 or holdout_periods >= len(periods):
+            return None
+        holdout = order >= periods[-holdout_periods]
+        
+        with ThreadBudget.reserve() as threads:
+            if 'n_jobs' in holdout_model.get_params():
+                holdout_model.set_params(n_jobs=threads)
+            holdout_model.fit(X[~holdout], y[~holdout])
+            residuals = y[holdout] - np.ravel(holdout_model.predict(X[holdout]))
+        return residuals, order[holdout]
+    
+    def calibrate(
+        self,
+        model: object,
+        X: np.ndarray,
+        y: np.ndarray,
+        order: np.ndarray
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """예측 구간 보정 정보 계산 (CPU 작업, 이벤트 루프 밖에서 호출)
+        
+        Args:
+            order: 행별 시간 순서 값 (ForecastGenerator.order_values 결과)
+        
+        Returns:
+            (보정 정보, holdout 잔차)
+            보정 정보는 {'method': 'ensemble'} / {'method': 'conformal', 'residuals': 정렬된 정규화 절대 잔차}
+            또는 None (복제 학습이 불가능한 모델, 데이터 부족).
+            holdout 잔차는 conformal 보정에서 계산한 경우만 반환합니다 (증분 업데이트 기준 오차에 재사용).
+        """
+        if self.ensemble_members(model) is not None:
+            return {'method': 'ensemble'}, None
+        holdout = self.holdout_residuals(model, X, y, order)
+        if holdout is None:
+            return None, None
+        return self.conformal(*holdout), holdout
+    
+    def conformal(self, residuals: np.ndarray, holdout_order: np.ndarray) -> Dict[str, Any]:
+        """holdout 잔차로 conformal 보정 정보 생성"""
+        # 시점별 합계 잔차 / sqrt(행 수): 그룹 간 공통 오차를 반영한 합계 구간용
+        frame = pd.DataFrame({'order': holdout_order, 'residual': residuals})
+        per_period = frame.groupby('order')['residual'].agg(['sum', 'count'])
+        normalized = per_period['sum'].to_numpy() / np.sqrt(per_period['count'].to_numpy())
+        if len(normalized) < settings.PREDICTION_INTERVAL_MIN_PERIODS:
+            # 시점 수가 적으면 행 단위 잔차 사용 (그룹 간 오차 독립 가정)
+            normalized = residuals
+        return {'method': 'conformal', 'residuals': np.sort(np.abs(normalized))}
+    
+    def total_bounds(
+        self,
+        calibration: Optional[Dict[str, Any]],
+        totals: np.ndarray,
+        member_totals: Optional[np.ndarray],
+        rows: int,
+        coverage: float
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """시점별 합계 예측의 (하한, 상한)
+        
+        Args:
+            totals: 시점별 합계 점 예측 (periods,)
+            member_totals: 트리별 시점별 합계 (트리 수 x periods), ensemble일 때
+            rows: 시점별 합산한 행(그룹) 수
+            coverage: 구간 포함 확률 (예: 0.9)
+        """
+        if not calibration:
+            return None
+        alpha = 1.0 - coverage
+        if calibration['method'] == 'ensemble' and member_totals is not None:
+            lower, upper = np.quantile(member_totals, [alpha / 2, 1 - alpha / 2], axis=0)
+            return np.minimum(lower, totals), np.maximum(upper, totals)
+        if calibration['method'] == 'conformal':
+            residuals = calibration['residuals']
+            n = len(residuals)
+            # split conformal 분위수: ceil((n + 1) * coverage)번째 잔차
+            rank = min(int(np.ceil((n + 1) * coverage)), n) - 1
+            width = float(residuals[rank]) * np.sqrt(max(rows, 1))
+            return totals - width, totals + width
+        return None
@@ -1,11 +1,26 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
-from app.models.prediction import PredictionResponse
+import asyncio
+import numpy as np
+import pandas as pd
+from app.models.prediction import PredictionResponse, PredictionGroupsResponse, BacktestResponse
 from app.services.prediction.model_trainer import ModelTrainer
 from app.services.prediction.forecast_generator import ForecastGenerator
+from app.services.prediction.model_registry import ModelRegistry
+from app.services.prediction.group_forecaster import GroupModelTrainer, add_group_encoding
+from app.services.prediction.model_selector import ModelSelector, get_candidate_models
+from app.services.prediction.incremental_updater import IncrementalUpdater
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.backtester import Backtester
+from app.services.prediction.hyperparameter_tuner import HyperparameterTuner
+from app.services.prediction.streaming_trainer import StreamingTrainer
+from app.services.prediction.prediction_group_repository import PredictionGroupRepository
 from app.services.file.file_repository import FileRepository
+from app.services.visualization.chart_formatter import ChartFormatter
+from app.services.visualization.downsampling import lttb_indices
 from app.services.file.file_analysis_config_repository import FileAnalysisConfigRepository
 from app.core.database import get_database
+from app.core.config import settings
 
 class PredictionService:
     """예측 서비스"""
@@ -15,6 +30,15 @@ class PredictionService:
         self.forecast_generator = ForecastGenerator()
         self.file_repository = FileRepository()
         self.config_repository = FileAnalysisConfigRepository()
+        self.model_registry = ModelRegistry()
+        self.group_model_trainer = GroupModelTrainer()
+        self.model_selector = ModelSelector()
+        self.incremental_updater = IncrementalUpdater()
+        self.backtester = Backtester()
+        self.hyperparameter_tuner = HyperparameterTuner()
+        self.streaming_trainer = StreamingTrainer()
+        self.group_repository = PredictionGroupRepository()
+        self.chart_formatter = ChartFormatter()
     
     async def create_prediction(
         self,
@@ -22,9 +46,326 @@ class PredictionService:
         features: List[str],
         model_type: str,
         forecast_periods: int,
-        user_id: str
+        user_id: str,
+        group_mode: Optional[str] = None,
+        interval_coverage: Optional[float] = None,
+        tune: bool = False,
+        chart_format: str = 'png'
     ) -> PredictionResponse:
-        """예측 생성"""
+        """예측 생성
+        
+        Args:
+            model_type: "auto"이면 후보 모델을 시계열 교차검증으로 비교해 가장 좋은 모델 사용
+            group_mode: None이면 전체 합계 예측, "global"이면 그룹 인코딩을 포함한 하나의 모델,
+                "per_group"이면 그룹(grouping_columns 값)마다 별도 모델을 병렬 학습하여 그룹별 예측
+            interval_coverage: 예측 구간 포함 확률 (예: 0.9). 지정하면 forecast_data에 lower/upper 추가
+            tune: True면 successive halving으로 하이퍼파라미터를 탐색해 사용 (같은 데이터의 결과는 재사용)
+            chart_format: 응답 차트 형식 (png, plotly, data). 저장은 항상 figure 스펙으로 합니다.
+        """
+        self.chart_formatter.validate(chart_format)
+        if model_type == "auto" and group_mode == "per_group":
+            raise ValueError("model_type=auto는 per_group 모드를 지원하지 않습니다. global 모드 또는 모델 타입을 지정해주세요.")
+        if tune and (model_type == "auto" or group_mode == "per_group"):
+            raise ValueError("하이퍼파라미터 튜닝은 model_type=auto와 per_group 모드를 지원하지 않습니다.")
+        
+        data, target_column, features, date_column, grouping_columns, config = await self._load_model_data(
+            file_id=file_id,
+            user_id=user_id,
+            features=features,
+            load_all=bool(group_mode)
+        )
+        
+        # 그룹별 예측 모드: 그룹 인코딩 컬럼 추가 (전역 모델은 그룹 평균 타겟, 그룹별 모델은 그룹 코드)
+        group_keys: List[str] = []
+        model_features = list(features)
+        if group_mode:
+            if not grouping_columns:
+                raise ValueError("그룹별 예측을 하려면 컬럼 추천 설정에 grouping_columns가 있어야 합니다")
+            group_codes, group_keys = self.forecast_generator.group_codes(pd.DataFrame(data), grouping_columns)
+            data, group_column = add_group_encoding(data, target_column, group_codes, group_mode)
+            model_features = features + [group_column]
+        
+        # 모델 레지스트리 조회: 같은 데이터 버전/피처/모델 설정으로 학습된 모델이 있으면 재사용
+        data_version = await self.file_repository.get_data_version(file_id)
+        if model_type == "auto":
+            # 모델 선택은 후보 세트와 교차검증 설정이 같으면 같은 결과이므로 이를 키에 포함
+            hyperparameters = {
+                'candidates': sorted(get_candidate_models().keys()),
+                'n_splits': settings.MODEL_SELECTION_SPLITS
+            }
+        else:
+            hyperparameters = self.model_trainer.resolve_hyperparameters(model_type)
+        tuning = None
+        if tune:
+            # 튜닝 결과는 기본값 위에 덮어쓰므로 레지스트리 키도 튜닝된 설정 기준
+            tuned_params, tuning = await self.hyperparameter_tuner.get_or_tune(
+                data=data,
+                target_column=target_column,
+                features=model_features,
+                model_type=model_type,
+                order=self.forecast_generator.order_values(pd.DataFrame(data), date_column)
+            )
+            hyperparameters = self.model_trainer.resolve_hyperparameters(model_type, tuned_params)
+            tuning = {'best_params': tuned_params, **tuning}
+        key_params = dict(
+            file_id=file_id,
+            target_column=target_column,
+            features=model_features,
+            model_type=model_type,
+            hyperparameters=hyperparameters,
+            config_version=config.get('config_version', 0) if config else 0,
+            group_mode=group_mode
+        )
+        registry_key = ModelRegistry.build_key(data_version=data_version, **key_params)
+        # 데이터 버전만 다른 같은 설정의 모델 계보 (증분 업데이트 기준 모델 조회용)
+        lineage_key = ModelRegistry.build_key(data_version=None, **key_params)
+        model_update = None
+        registered = await self.model_registry.get(registry_key)
+        if registered:
+            model_meta, artifact = registered
+            model = artifact['model']
+            transformer = artifact.get('preprocessor')
+            model_selection = artifact.get('model_selection')
+            forecast_state = artifact.get('forecast_state')
+            interval_calibration = self.model_registry.get_interval_calibration(model_meta, artifact)
+            metrics = model_meta.get('metrics', {})
+            print(f"✅ 등록된 모델 재사용: {model_meta['model_id']} (학습 생략)")
+        else:
+            # 데이터가 추가된 경우 이전 버전 모델을 증분 업데이트 (불가능하거나 오차 드리프트 시 전체 재학습)
+            updated = None
+            if settings.PREDICTION_INCREMENTAL_UPDATE and date_column:
+                updated, model_update = await self._update_registered_model(
+                    lineage_key=lineage_key,
+                    data=data,
+                    target_column=target_column,
+                    date_column=date_column,
+                    grouping_columns=grouping_columns
+                )
+            
+            if updated:
+                model = updated['model']
+                transformer = updated['transformer']
+                metrics = updated['metrics']
+                model_selection = updated['model_selection']
+                update_state = updated['update_state']
+                interval_calibration = updated['interval_calibration']
+            else:
+                streamed = None
+                if model_type == "sgd" and not group_mode:
+                    # 파일 전체를 배치 단위로 순회하며 학습 (data는 예측 시작 상태에만 사용)
+                    streamed = await self.streaming_trainer.train(
+                        file_id=file_id,
+                        target_column=target_column,
+                        features=model_features,
+                        lag_feature_columns=config.get('lag_feature_columns', []) if config else [],
+                        hyperparameters=hyperparameters
+                    )
+                    if streamed is None:
+                        print("⚠️ 전체 행의 전처리 데이터가 없어 로드된 데이터로 SGD 학습")
+                if streamed:
+                    model, metrics, transformer = streamed
+                    model_selection = None
+                else:
+                    model, metrics, transformer, model_selection = await self._train_model(
+                        data=data,
+                        target_column=target_column,
+                        features=features,
+                        model_features=model_features,
+                        model_type=model_type,
+                        hyperparameters=hyperparameters,
+                        date_column=date_column,
+                        grouping_columns=grouping_columns,
+                        group_mode=group_mode
+                    )
+                df = pd.DataFrame(data)
+                _, _, order = self.forecast_generator.series_index(df, date_column, grouping_columns)
+                X_train = transformer.transform(df)
+                y_train = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+                # 예측 구간 보정은 구간을 요청했을 때만 (랜덤 포레스트는 트리별 예측, 그 외는 시간 순 holdout 잔차)
+                interval_calibration = None
+                holdout = None
+                if interval_coverage:
+                    interval_calibration, holdout = await asyncio.to_thread(
+                        self.forecast_generator.interval_estimator.calibrate, model, X_train, y_train, order
+                    )
+                # 증분 업데이트 기준: 학습에 포함된 마지막 시점, 학습 시점의 기준 오차, 선형 모델 충분통계량
+                if date_column:
+                    update_state = await asyncio.to_thread(
+                        self.incremental_updater.initial_state,
+                        model, X_train, y_train, order, metrics, model_selection, holdout
+                    )
+                else:
+                    update_state = {'trained_until': None, 'reference_rmse': None}
+            
+            # 재귀 예측 시작 상태 (같은 데이터 버전의 예측/시나리오 분석에서 재사용)
+            forecast_state = self.forecast_generator.prepare_state(
+                data=data,
+                target_column=target_column,
+                features=model_features,
+                date_column=date_column,
+                group_by_columns=grouping_columns,
+                transformer=transformer
+            )
+            model_meta = await self.model_registry.register(
+                registry_key=registry_key,
+                file_id=file_id,
+                user_id=user_id,
+                target_column=target_column,
+                data_version=data_version,
+                features=model_features,
+                model_type=model_type,
+                hyperparameters=hyperparameters,
+                metrics=metrics,
+                model=model,
+                preprocessor=transformer,
+                extra={
+                    'group_mode': group_mode,
+                    'model_selection': model_selection,
+                    'update_state': update_state,
+                    'forecast_state': forecast_state,
+                    'interval_calibration': interval_calibration
+                },
+                lineage_key=lineage_key
+            )
+        
+        # 구간을 처음 요청한 모델은 이때 보정 정보를 계산해 저장 (이후 요청은 재사용)
+        if interval_coverage and interval_calibration is None:
+            df = pd.DataFrame(data)
+            _, _, order = self.forecast_generator.series_index(df, date_column, grouping_columns)
+            interval_calibration, _ = await asyncio.to_thread(
+                self.forecast_generator.interval_estimator.calibrate,
+                model,
+                transformer.transform(df),
+                pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float),
+                order
+            )
+            if interval_calibration:
+                registered = await self.model_registry.get_by_model_id(model_meta['model_id'])
+                if registered:
+                    await self.model_registry.save_interval_calibration(*registered, interval_calibration)
+        
+        # 예측 생성 (그룹별 재귀 예측 후 기간별 합계)
+        forecast = self.forecast_generator.forecast_groups(
+            model=model,
+            data=data,
+            target_column=target_column,
+            features=model_features,
+            periods=forecast_periods,
+            date_column=date_column,
+            group_by_columns=grouping_columns,
+            transformer=transformer,
+            state=forecast_state,
+            interval_coverage=interval_coverage,
+            interval_calibration=interval_calibration
+        )
+        forecast_data = self.forecast_generator.to_forecast_data(forecast, forecast_periods)
+        
+        # 차트 생성 (figure 스펙)
+        chart_spec = self._create_chart(data, forecast_data, target_column, date_column)
+        
+        # 결과 저장
+        prediction_id = f"pred_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        await self._save_prediction(
+            prediction_id=prediction_id,
+            file_id=file_id,
+            target_column=target_column,
+            forecast_data=forecast_data,
+            model_metrics=metrics,
+            chart_spec=chart_spec,
+            user_id=user_id,
+            model_id=model_meta['model_id'],
+            group_mode=group_mode,
+            group_count=len(forecast['group_keys']) if group_mode else None,
+            forecast_dates=forecast['dates'] if group_mode else None,
+            model_selection=model_selection,
+            model_update=model_update,
+            interval_coverage=interval_coverage if forecast.get('lower') is not None else None,
+            tuning=tuning
+        )
+        if group_mode:
+            # 그룹별 예측값은 그룹당 한 문서로 저장 (페이지 조회용)
+            await self.group_repository.save_many(
+                prediction_id=prediction_id,
+                file_id=file_id,
+                user_id=user_id,
+                group_keys=forecast['group_keys'],
+                values=forecast['values']
+            )
+        
+        return PredictionResponse(
+            prediction_id=prediction_id,
+            file_id=file_id,
+            target_column=target_column,
+            forecast_data=forecast_data,
+            model_metrics=metrics,
+            chart=await self.chart_formatter.format(chart_spec, chart_format),
+            model_id=model_meta['model_id'],
+            group_mode=group_mode,
+            group_count=len(forecast['group_keys']) if group_mode else None,
+            model_selection=model_selection,
+            model_update=model_update,
+            interval_coverage=interval_coverage if forecast.get('lower') is not None else None,
+            tuning=tuning,
+            created_at=datetime.now()
+        )
+    
+    async def backtest(
+        self,
+        file_id: str,
+        features: List[str],
+        model_type: str,
+        user_id: str,
+        horizon: int = 4,
+        n_origins: Optional[int] = None,
+        fast: bool = False,
+        group_limit: int = 100
+    ) -> BacktestResponse:
+        """rolling-origin 백테스트 (학습 데이터 지표 대신 origin 이후 기간의 out-of-sample 오차)"""
+        if model_type == "auto":
+            raise ValueError("백테스트는 model_type=auto를 지원하지 않습니다. 모델 타입을 지정해주세요.")
+        
+        data, target_column, features, date_column, grouping_columns, _ = await self._load_model_data(
+            file_id=file_id,
+            user_id=user_id,
+            features=features,
+            load_all=True
+        )
+        result = await self.backtester.run(
+            data=data,
+            target_column=target_column,
+            features=features,
+            model_type=model_type,
+            date_column=date_column,
+            grouping_columns=grouping_columns,
+            horizon=horizon,
+            n_origins=n_origins,
+            fast=fast,
+            group_limit=group_limit
+        )
+        return BacktestResponse(
+            file_id=file_id,
+            target_column=target_column,
+            model_type=model_type,
+            horizon=horizon,
+            fast=fast,
+            **result
+        )
+    
+    async def _load_model_data(
+        self,
+        file_id: str,
+        user_id: str,
+        features: List[str],
+        load_all: bool = False
+    ) -> Tuple[List[dict], str, List[str], Optional[str], List[str], Optional[dict]]:
+        """학습/백테스트용 데이터 로드 (Lag 피처 생성, valid_columns 피처 적용)
+        
+        Args:
+            load_all: True면 전체 행, False면 최근 10000행
+        
+        Returns:
+            (data, target_column, features, date_column, grouping_columns, config)
+        """
         # 파일 소유권 확인 및 target_column 가져오기
         file_info = await self.file_repository.get_sales_info(file_id, user_id)
         if not file_info:
@@ -34,8 +375,14 @@ class PredictionService:
         if not target_column:
             raise ValueError("파일 업로드 시 target_column을 지정하지 않았습니다. 파일을 다시 업로드하거나 target_column을 지정해주세요.")
         
-        # 데이터 로드
-        raw_data = await self.file_repository.get_csv_data(file_id, 0, 10000)
+        # 데이터 로드 (그룹별 예측은 모든 그룹이 포함되도록 전체 행 로드)
+        if load_all:
+            row_count = await self.file_repository.get_csv_row_count(file_id)
+            raw_data = await self.file_repository.get_csv_data(file_id, 0, max(row_count, 1))
+        else:
+            # 최근 10000행 사용 (데이터 추가 시 새 기간이 포함되도록 마지막 행 기준)
+            row_count = await self.file_repository.get_csv_row_count(file_id)
+            raw_data = await self.file_repository.get_csv_data(file_id, max(row_count - 10000, 0), 10000)
         # CSV Collection에서 가져온 데이터는 data 필드 안에 있을 수 있음
         if raw_data and len(raw_data) > 0 and 'data' in raw_data[0]:
             data = [row['data'] for row in raw_data]
@@ -89,74 +436,216 @@ class PredictionService:
                 features = features_for_prediction
                 print(f"✅ 예측 모델링: valid_columns 사용 ({len(features)}개 피처)")
         
-        # 모델 학습
-        model, metrics = await self.model_trainer.train_model(
-            data=data,
-            target_column=target_column,
-            features=features,
-            model_type=model_type
-        )
+        return data, target_column, features, date_column, grouping_columns, config
+    
+    async def _train_model(
+        self,
+        data: List[dict],
+        target_column: str,
+        features: List[str],
+        model_features: List[str],
+        model_type: str,
+        hyperparameters: dict,
+        date_column: Optional[str],
+        grouping_columns: Optional[List[str]],
+        group_mode: Optional[str]
+    ) -> Tuple[object, dict, FeatureTransformer, Optional[dict]]:
+        """전체 데이터로 모델 학습 (그룹별 모델은 joblib으로 병렬 학습)
         
-        # 예측 생성
-        forecast_data = await self.forecast_generator.generate_forecast(
-            model=model,
+        Returns:
+            (model, metrics, transformer, model_selection)
+        """
+        if model_type == "auto":
+            # 후보 모델 시계열 교차검증 후 최적 모델 학습 (metrics는 holdout 지표)
+            return await self.model_selector.select(
+                data=data,
+                target_column=target_column,
+                features=model_features,
+                order=self.forecast_generator.order_values(pd.DataFrame(data), date_column)
+            )
+        if group_mode == "per_group":
+            model, metrics, transformer = await self.group_model_trainer.train_per_group(
+                data=data,
+                target_column=target_column,
+                features=features,
+                model_type=model_type,
+                hyperparameters=hyperparameters
+            )
+            return model, metrics, transformer, None
+        
+        # rf_ar는 그룹별 잔차 시계열을 구성하기 위해 예측과 같은 그룹/시간 기준 전달
+        series_codes, series_keys, series_order = self.forecast_generator.series_index(
+            pd.DataFrame(data), date_column, grouping_columns
+        )
+        model, metrics, transformer = await self.model_trainer.train_model(
             data=data,
             target_column=target_column,
-            features=features,
-            periods=forecast_periods
+            features=model_features,
+            model_type=model_type,
+            hyperparameters=hyperparameters,
+            group_codes=series_codes,
+            group_keys=series_keys,
+            order=series_order
         )
+        return model, metrics, transformer, None
+    
+    async def _update_registered_model(
+        self,
+        lineage_key: str,
+        data: List[dict],
+        target_column: str,
+        date_column: str,
+        grouping_columns: Optional[List[str]]
+    ) -> Tuple[Optional[dict], dict]:
+        """같은 계보의 최신 모델을 새 기간 데이터로 증분 업데이트
         
-        # 차트 생성
-        chart = await self._create_chart(data, forecast_data, target_column)
+        업데이트 전 모델로 새 기간을 예측한 오차(backtest)를 기준 오차와 비교하여,
+        PREDICTION_DRIFT_THRESHOLD 배를 넘으면 업데이트하지 않고 전체 재학습하도록 None을 반환합니다.
+        기준 오차는 전체 학습 시 기록한 학습에 쓰지 않은 행의 오차입니다 (IncrementalUpdater.initial_state).
+        기준 오차가 없는 이전 버전 모델은 첫 업데이트의 backtest 오차를 기준으로 사용합니다.
         
-        # 결과 저장
-        prediction_id = f"pred_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-        await self._save_prediction(
-            prediction_id=prediction_id,
-            file_id=file_id,
-            target_column=target_column,
-            forecast_data=forecast_data,
-            model_metrics=metrics,
-            chart=chart,
-            user_id=user_id
-        )
+        Returns:
+            (업데이트 결과 또는 None, 업데이트 정보 {'mode', 'reason', ...})
+        """
+        previous = await self.model_registry.get_latest_by_lineage(lineage_key)
+        if not previous:
+            return None, {'mode': 'full', 'reason': 'no_base_model'}
+        base_meta, artifact = previous
+        model = artifact['model']
+        state = artifact.get('update_state') or {}
+        trained_until = state.get('trained_until')
+        if trained_until is None or not self.incremental_updater.supports(model, state):
+            return None, {'mode': 'full', 'reason': 'unsupported_model', 'base_model_id': base_meta['model_id']}
         
-        return PredictionResponse(
-            prediction_id=prediction_id,
-            file_id=file_id,
-            target_column=target_column,
-            forecast_data=forecast_data,
-            model_metrics=metrics,
-            chart=chart,
-            created_at=datetime.now()
+        df = pd.DataFrame(data)
+        group_codes, group_keys, order = self.forecast_generator.series_index(df, date_column, grouping_columns)
+        new_rows = np.flatnonzero(order > trained_until)
+        if len(new_rows) == 0:
+            return None, {'mode': 'full', 'reason': 'no_new_rows', 'base_model_id': base_meta['model_id']}
+        
+        transformer = artifact.get('preprocessor') or FeatureTransformer(artifact['features']).fit(df)
+        X = transformer.transform(df)
+        y = pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        
+        # 드리프트 확인: 업데이트 전 모델의 새 기간 오차
+        backtest = self.incremental_updater.backtest(model, X[new_rows], y[new_rows])
+        reference_rmse = state.get('reference_rmse')
+        update_info = {
+            'base_model_id': base_meta['model_id'],
+            'new_rows': int(len(new_rows)),
+            'backtest_rmse': backtest['rmse'],
+            'reference_rmse': reference_rmse
+        }
+        if reference_rmse is not None and backtest['rmse'] > reference_rmse * settings.PREDICTION_DRIFT_THRESHOLD:
+            print(f"⚠️ 오차 드리프트 감지: RMSE {backtest['rmse']:.4f} > 기준 {reference_rmse:.4f} x {settings.PREDICTION_DRIFT_THRESHOLD} (전체 재학습)")
+            return None, {'mode': 'full', 'reason': 'drift', **update_info}
+        
+        # 최근 행 (새 행 포함) 으로 트리/부스팅 추가 학습
+        recent_count = max(settings.PREDICTION_UPDATE_RECENT_ROWS, len(new_rows))
+        recent_rows = np.sort(np.argsort(order, kind='stable')[-recent_count:])
+        updated_model, updated_state = await asyncio.to_thread(
+            self.incremental_updater.update,
+            model, state, X, y, new_rows, recent_rows, group_codes, group_keys, order
         )
+        updated_state['trained_until'] = float(order.max())
+        updated_state['reference_rmse'] = reference_rmse if reference_rmse is not None else backtest['rmse']
+        print(f"✅ 모델 증분 업데이트: {base_meta['model_id']} (+{len(new_rows)}행, backtest RMSE {backtest['rmse']:.4f})")
+        
+        return {
+            'model': updated_model,
+            'transformer': transformer,
+            'metrics': backtest,  # 업데이트 전 모델의 새 기간 holdout 지표
+            'model_selection': artifact.get('model_selection'),
+            'update_state': updated_state,
+            'interval_calibration': self.model_registry.get_interval_calibration(base_meta, artifact)
+        }, {'mode': 'incremental', **update_info, 'reference_rmse': updated_state['reference_rmse']}
     
-    async def get_prediction(self, prediction_id: str) -> Optional[PredictionResponse]:
-        """예측 결과 조회"""
+    async def get_prediction(self, prediction_id: str, chart_format: str = 'png') -> Optional[PredictionResponse]:
+        """예측 결과 조회 (차트는 요청한 형식으로 변환, 스펙이 없는 이전 버전 결과는 저장된 PNG 사용)"""
         db = await get_database()
         collection = db['predictions']
         pred = await collection.find_one({'prediction_id': prediction_id})
         
         if pred:
             pred.pop('_id', None)
+            pred['chart'] = await self.chart_formatter.format(pred.pop('chart_spec', None), chart_format, pred.get('chart'))
             return PredictionResponse(**pred)
         return None
     
-    async def _create_chart(self, data: List[dict], forecast_data: List[dict], target_column: str) -> str:
-        """예측 차트 생성"""
-        import plotly.graph_objects as go
-        import base64
+    async def get_prediction_groups(
+        self,
+        prediction_id: str,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        group_key: Optional[str] = None
+    ) -> Optional[PredictionGroupsResponse]:
+        """그룹별 예측 결과 페이지 조회"""
+        db = await get_database()
+        collection = db['predictions']
+        pred = await collection.find_one(
+            {'prediction_id': prediction_id, 'user_id': user_id},
+            {'_id': 0, 'group_mode': 1, 'forecast_dates': 1}
+        )
+        if not pred:
+            return None
+        if not pred.get('group_mode'):
+            raise ValueError("그룹별 예측 결과가 아닙니다. group_mode를 지정하여 예측을 생성해주세요.")
         
-        # 실제 데이터
-        actual_values = [d[target_column] for d in data if target_column in d]
-        actual_dates = list(range(len(actual_values)))
+        groups = await self.group_repository.get_page(prediction_id, skip, limit, group_key)
+        total = await self.group_repository.count(prediction_id, group_key)
+        return PredictionGroupsResponse(
+            prediction_id=prediction_id,
+            group_mode=pred['group_mode'],
+            dates=pred.get('forecast_dates') or [],
+            total=total,
+            skip=skip,
+            limit=limit,
+            groups=groups
+        )
+    
+    def _create_chart(
+        self,
+        data: List[dict],
+        forecast_data: List[dict],
+        target_column: str,
+        date_column: Optional[str] = None
+    ) -> str:
+        """예측 차트 생성 (figure 스펙 반환)"""
+        import plotly.graph_objects as go
         
-        # 예측 데이터
+        df = pd.DataFrame(data)
         forecast_values = [d['forecast'] for d in forecast_data]
-        forecast_dates = list(range(len(actual_values), len(actual_values) + len(forecast_values)))
+        if date_column and date_column in df.columns and target_column in df.columns and all(d.get('date') is not None for d in forecast_data):
+            # 예측값은 기간별 전체 그룹 합계이므로 실제값도 기간별 합계로 표시
+            actual = pd.to_numeric(df[target_column], errors='coerce').groupby(df[date_column]).sum()
+            order = pd.to_numeric(actual.index.to_series(), errors='coerce')
+            if order.isna().any():
+                order = pd.to_datetime(actual.index.to_series(), errors='coerce')
+            actual = actual.iloc[np.argsort(order.to_numpy(), kind='stable')]
+            actual_dates = [str(v) for v in actual.index]
+            actual_values = actual.tolist()
+            forecast_dates = [str(d['date']) for d in forecast_data]
+        else:
+            # 실제 데이터
+            actual_values = [d[target_column] for d in data if target_column in d]
+            actual_dates = list(range(len(actual_values)))
+            
+            # 예측 데이터
+            forecast_dates = list(range(len(actual_values), len(actual_values) + len(forecast_values)))
+        
+        # 실제값 점 수가 많으면 LTTB 다운샘플링 (봉우리/골짜기 유지)
+        keep = lttb_indices(actual_dates, actual_values)
+        if len(keep) < len(actual_values):
+            actual_dates = [actual_dates[i] for i in keep]
+            actual_values = [actual_values[i] for i in keep]
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=actual_dates, y=actual_values, name='실제값', mode='lines'))
+        if forecast_data and 'lower' in forecast_data[0]:
+            # 예측 구간 (하한 -> 상한 순으로 채움)
+            fig.add_trace(go.Scatter(x=forecast_dates, y=[d['lower'] for d in forecast_data], mode='lines', line=dict(width=0), showlegend=False))
+            fig.add_trace(go.Scatter(x=forecast_dates, y=[d['upper'] for d in forecast_data], name='예측 구간', mode='lines', line=dict(width=0), fill='tonexty'))
         fig.add_trace(go.Scatter(x=forecast_dates, y=forecast_values, name='예측값', mode='lines', line=dict(dash='dash')))
         
         fig.update_layout(
@@ -165,9 +654,7 @@ class PredictionService:
             yaxis_title="값"
         )
         
-        img_bytes = fig.to_image(format="png")
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-        return img_base64
+        return self.chart_formatter.to_spec(fig)
     
     async def _save_prediction(
         self,
@@ -176,8 +663,16 @@ class PredictionService:
         target_column: str,
         forecast_data: List[dict],
         model_metrics: dict,
-        chart: str,
-        user_id: str
+        chart_spec: str,
+        user_id: str,
+        model_id: Optional[str] = None,
+        group_mode: Optional[str] = None,
+        group_count: Optional[int] = None,
+        forecast_dates: Optional[List] = None,
+        model_selection: Optional[dict] = None,
+        model_update: Optional[dict] = None,
+        interval_coverage: Optional[float] = None,
+        tuning: Optional[dict] = None
     ):
         """예측 결과 저장"""
         db = await get_database()
@@ -188,8 +683,16 @@ class PredictionService:
             'target_column': target_column,
             'forecast_data': forecast_data,
             'model_metrics': model_metrics,
-            'chart': chart,
+            'chart_spec': chart_spec,  # plotly figure 스펙 (JSON 문자열, 이전 버전 문서는 'chart'에 Base64 PNG)
             'user_id': user_id,
+            'model_id': model_id,  # 모델 레지스트리 ID (재예측/시나리오 분석 시 모델 재사용)
+            'group_mode': group_mode,  # 그룹별 예측 모드 (None, global, per_group)
+            'group_count': group_count,  # 그룹 수 (그룹별 예측값은 prediction_groups 컬렉션)
+            'forecast_dates': forecast_dates,  # 그룹별 예측값의 시점별 날짜
+            'model_selection': model_selection,  # model_type=auto 교차검증 결과 (선택된 모델, 후보별 holdout 지표)
+            'model_update': model_update,  # 모델 학습 방식 (incremental: 증분 업데이트, full: 전체 재학습 사유)
+            'interval_coverage': interval_coverage,  # forecast_data lower/upper 예측 구간 포함 확률
+            'tuning': tuning,  # 하이퍼파라미터 튜닝 결과 (best_params, 단계별 holdout RMSE, 저장된 결과 사용 여부)
             'created_at': datetime.now()
         })
 
@@ -0,0 +1,153 @@
+from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import threading
+import numpy as np
+from app.core.config import settings
+from app.models.prediction import ScenarioRequest, ScenarioResponse, ScenarioGroupItem
+from app.services.prediction.forecast_generator import ForecastGenerator
+from app.services.prediction.model_registry import ModelRegistry
+from app.services.prediction.group_forecaster import GROUP_CODE_COLUMN, GROUP_LEVEL_COLUMN
+
+class ScenarioService:
+    """what-if 시나리오 예측 서비스
+    
+    등록된 모델과 학습 시 적합된 변환기, 예측 시작 상태(forecast_state)를 레지스트리 캐시에서 불러와
+    재학습 없이 피처 변경(가격 인하 등)에 따른 그룹별 예측을 계산합니다.
+    변경 전(baseline)과 변경 후(scenario) 행을 쌓아 한 번의 예측으로 계산하고,
+    결과는 입력 해시 기준 프로세스 내 LRU 캐시(SCENARIO_CACHE_SIZE개)에 보관합니다.
+    """
+    
+    # 프로세스 전역 LRU 캐시 {입력 해시: 응답 dict}
+    _cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    def __init__(self):
+        self.model_registry = ModelRegistry()
+        self.forecast_generator = ForecastGenerator()
+    
+    async def run_scenario(self, request: ScenarioRequest, user_id: str) -> Optional[ScenarioResponse]:
+        """시나리오 예측
+        
+        Returns:
+            ScenarioResponse 또는 None (모델이 없거나 다른 사용자의 모델)
+        """
+        # 등록된 모델은 변경되지 않으므로 model_id와 요청 내용으로 결과를 식별
+        cache_key = hashlib.sha256(
+            json.dumps({'user_id': user_id, **request.model_dump()}, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return ScenarioResponse(**cached, cached=True)
+        
+        registered = await self.model_registry.get_by_model_id(request.model_id)
+        if not registered or registered[0].get('user_id') != user_id:
+            return None
+        _, artifact = registered
+        state = artifact.get('forecast_state')
+        if state is None:
+            raise ValueError("시나리오 예측을 지원하지 않는 이전 버전 모델입니다. 예측을 다시 생성해주세요.")
+        
+        # 요청 그룹을 시작 상태 행 위치로 변환
+        positions = state['group_positions']
+        if request.group_keys is None:
+            group_keys = [state['group_keys'][g] for g in state['present_groups']]
+            unknown_keys = []
+        else:
+            group_keys = [key for key in request.group_keys if key in positions]
+            unknown_keys = [key for key in request.group_keys if key not in positions]
+        rows = np.array([positions[key] for key in group_keys], dtype=np.int64)
+        
+        overrides = self._resolve_overrides(request, artifact, group_keys)
+        if overrides:
+            # 변경 전/후 행을 쌓아 한 번에 예측 (변경은 뒤쪽 절반 행에만 적용)
+            for override in overrides:
+                override['rows'] = np.concatenate([np.zeros(len(rows), dtype=bool), override['rows']])
+            values = await asyncio.to_thread(
+                self.forecast_generator.run_state,
+                artifact['model'], state, request.periods, np.concatenate([rows, rows]), overrides
+            )
+            baseline, scenario = values[:len(rows)], values[len(rows):]
+        else:
+            baseline = await asyncio.to_thread(
+                self.forecast_generator.run_state, artifact['model'], state, request.periods, rows
+            )
+            scenario = baseline
+        
+        result = {
+            'model_id': request.model_id,
+            'dates': self.forecast_generator.future_dates(state, request.periods),
+            'groups': [
+                ScenarioGroupItem(group_key=key, baseline=baseline[i].tolist(), scenario=scenario[i].tolist())
+                for i, key in enumerate(group_keys)
+            ],
+            'baseline_total': baseline.sum(axis=0).tolist(),
+            'scenario_total': scenario.sum(axis=0).tolist(),
+            'unknown_group_keys': unknown_keys
+        }
+        self._cache_put(cache_key, result)
+        return ScenarioResponse(**result)
+    
+    def _resolve_overrides(self, request: ScenarioRequest, artifact: Dict[str, Any], group_keys: List[str]) -> List[Dict]:
+        """피처 변경 요청을 피처 위치와 행/시점 마스크로 변환"""
+        state = artifact['forecast_state']
+        features = state['features']
+        transformer = artifact.get('preprocessor')
+        overrides = []
+        for override in request.overrides:
+            column = override.column
+            if column == artifact.get('target_column') or column in (GROUP_CODE_COLUMN, GROUP_LEVEL_COLUMN):
+                raise ValueError(f"변경할 수 없는 컬럼입니다: {column}")
+            # 4주 합산 피처의 원본 컬럼이면 이후 시점의 합산값에도 반영
+            rolling_indices = [
+                i for i, item in enumerate(state['rolling'])
+                if item['base_column'] == column and not item['is_target']
+            ]
+            feature_index = features.index(column) if column in features else None
+            if feature_index is None and not rolling_indices:
+                raise ValueError(f"모델 피처가 아닌 컬럼입니다: {column}")
+            if feature_index is not None and transformer is not None and transformer.kinds_.get(column) != 'numeric':
+                raise ValueError(f"숫자형 피처만 변경할 수 있습니다: {column}")
+            
+            if override.group_keys is None:
+                rows = np.ones(len(group_keys), dtype=bool)
+            else:
+                targets = set(override.group_keys)
+                rows = np.array([key in targets for key in group_keys], dtype=bool)
+            steps = np.ones(request.periods, dtype=bool)
+            if override.periods is not None:
+                invalid = [p for p in override.periods if p < 1 or p > request.periods]
+                if invalid:
+                    raise ValueError(f"예측 시점은 1~{request.periods} 범위여야 합니다: {invalid}")
+                steps[:] = False
+                steps[np.asarray(override.periods, dtype=np.int64) - 1] = True
+            
+            overrides.append({
+                'feature_index': feature_index,
+                'rolling_indices': rolling_indices,
+                'operation': override.operation,
+                'value': override.value,
+                'rows': rows,
+                'steps': steps
+            })
+        return overrides
+    
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (조회된 항목은 가장 최근 사용으로 이동)"""
+        with cls._cache_lock:
+            result = cls._cache.get(key)
+            if result is not None:
+                cls._cache.move_to_end(key)
+            return result
+    
+    @classmethod
+    def _cache_put(cls, key: str, result: Dict[str, Any]):
+        """캐시 저장 (용량 초과 시 가장 오래 사용하지 않은 결과 제거)"""
+        with cls._cache_lock:
+            cls._cache[key] = result
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > max(settings.SCENARIO_CACHE_SIZE, 0):
+                cls._cache.popitem(last=False)
@@ -0,0 +1,87 @@
+from typing import Optional
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.linear_model import SGDRegressor
+from sklearn.preprocessing import StandardScaler
+
+class StreamingSGDModel(BaseEstimator, RegressorMixin):
+    """배치 단위로 학습하는 표준화 SGD 선형 회귀 모델
+    
+    피처는 StandardScaler로, 타겟은 평균/표준편차로 표준화한 뒤 SGDRegressor로 학습합니다.
+    스케일 통계(partial_fit_scaler)와 회귀 계수(partial_fit)를 모두 배치 단위로 누적할 수 있어
+    전체 데이터를 메모리에 올리지 않고 학습할 수 있습니다 (StreamingTrainer).
+    메모리 내 데이터는 fit()으로 max_iter 에폭 학습합니다.
+    """
+    
+    def __init__(
+        self,
+        alpha: float = 1e-4,
+        penalty: str = 'l2',
+        learning_rate: str = 'invscaling',
+        eta0: float = 0.01,
+        max_iter: int = 5,
+        random_state: Optional[int] = 42
+    ):
+        self.alpha = alpha
+        self.penalty = penalty
+        self.learning_rate = learning_rate
+        self.eta0 = eta0
+        self.max_iter = max_iter
+        self.random_state = random_state
+    
+    def _reset(self):
+        """스케일 통계와 회귀 계수 초기화"""
+        self.scaler_ = StandardScaler()
+        self.regressor_ = SGDRegressor(
+            alpha=self.alpha,
+            penalty=self.penalty,
+            learning_rate=self.learning_rate,
+            eta0=self.eta0,
+            max_iter=self.max_iter,
+            random_state=self.random_state
+        )
+        self.y_count_ = 0
+        self.y_sum_ = 0.0
+        self.y_sum_sq_ = 0.0
+    
+    def partial_fit_scaler(self, X: np.ndarray, y: np.ndarray) -> 'StreamingSGDModel':
+        """피처/타겟 표준화 통계 누적 (회귀 계수 학습 전 전체 배치를 한 번 순회)"""
+        if not hasattr(self, 'scaler_'):
+            self._reset()
+        y = np.asarray(y, dtype=float)
+        self.scaler_.partial_fit(X)
+        self.y_count_ += len(y)
+        self.y_sum_ += float(y.sum())
+        self.y_sum_sq_ += float(np.dot(y, y))
+        return self
+    
+    @property
+    def y_mean_(self) -> float:
+        return self.y_sum_ / max(self.y_count_, 1)
+    
+    @property
+    def y_scale_(self) -> float:
+        variance = self.y_sum_sq_ / max(self.y_count_, 1) - self.y_mean_ ** 2
+        return float(np.sqrt(variance)) if variance > 1e-12 else 1.0
+    
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> 'StreamingSGDModel':
+        """한 배치로 회귀 계수 갱신 (표준화 통계는 partial_fit_scaler로 미리 누적)"""
+        if not hasattr(self, 'scaler_') or self.y_count_ == 0:
+            self.partial_fit_scaler(X, y)
+        target = (np.asarray(y, dtype=float) - self.y_mean_) / self.y_scale_
+        self.regressor_.partial_fit(self.scaler_.transform(X), target)
+        return self
+    
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'StreamingSGDModel':
+        """메모리 내 데이터로 학습 (max_iter 에폭, 에폭마다 행 순서 섞기)"""
+        self._reset()
+        self.partial_fit_scaler(X, y)
+        rng = np.random.default_rng(self.random_state)
+        for _ in range(max(self.max_iter, 1)):
+            rows = rng.permutation(len(y))
+            self.partial_fit(X[rows], np.asarray(y)[rows])
+        return self
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """원래 타겟 단위 예측"""
+        return self.regressor_.predict(self.scaler_.transform(X)) * self.y_scale_ + self.y_mean_
@@ -0,0 +1,126 @@
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.services.file.file_repository import FileRepository
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.streaming_model import StreamingSGDModel
+
+class StreamingTrainer:
+    """저장소 스트리밍 학습기 (out-of-core)
+    
+    MongoDB 커서를 PREDICTION_STREAMING_BATCH_SIZE 행 단위로 순회하며 StreamingSGDModel을 학습하므로
+    최대 메모리 사용량은 데이터 크기가 아니라 배치 크기에 비례합니다.
+        1. 피처 변환기 적합 (변환 방식은 첫 배치, 범주 목록은 전체 배치의 합집합)
+        2. 피처/타겟 표준화 통계 누적
+        3. max_iter 에폭 동안 배치별 partial_fit (배치 안 행 순서는 섞음)
+    평가 지표는 마지막 에폭에서 각 배치를 학습하기 전에 예측한 오차(prequential)로 계산합니다.
+    """
+    
+    def __init__(self):
+        self.file_repository = FileRepository()
+        self.model_trainer = ModelTrainer()
+    
+    async def train(
+        self,
+        file_id: str,
+        target_column: str,
+        features: List[str],
+        lag_feature_columns: Optional[List[str]] = None,
+        hyperparameters: Optional[Dict] = None,
+        batch_size: Optional[int] = None
+    ) -> Optional[Tuple[StreamingSGDModel, Dict[str, float], FeatureTransformer]]:
+        """파일 전체를 배치 단위로 순회하며 학습
+        
+        Returns:
+            (model, metrics, transformer) 또는 None
+            (Lag 피처가 필요한데 전체 행의 전처리 데이터가 없어 저장소에서 피처를 읽을 수 없는 경우)
+        """
+        batch_size = batch_size or settings.PREDICTION_STREAMING_BATCH_SIZE
+        batches = await self._batch_source(file_id, target_column, lag_feature_columns or [], batch_size)
+        if batches is None:
+            return None
+        
+        model = self.model_trainer.build_model('sgd', hyperparameters)
+        transformer = FeatureTransformer(features)
+        rng = np.random.default_rng(model.random_state)
+        
+        def prepare(batch: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+            df = pd.DataFrame(batch)
+            X = transformer.transform(df)
+            if target_column not in df.columns:
+                return X, np.zeros(len(df))
+            return X, pd.to_numeric(df[target_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        
+        def scale_batch(batch: List[Dict]):
+            model.partial_fit_scaler(*prepare(batch))
+        
+        def fit_batch(batch: List[Dict], errors: Optional[Dict[str, float]]):
+            X, y = prepare(batch)
+            rows = rng.permutation(len(y))
+            X, y = X[rows], y[rows]
+            if errors is not None and hasattr(model.regressor_, 'coef_'):
+                # 학습 전 예측 오차 누적 (prequential 평가)
+                residuals = y - model.predict(X)
+                errors['count'] += len(y)
+                errors['squared'] += float(np.dot(residuals, residuals))
+                errors['absolute'] += float(np.abs(residuals).sum())
+                errors['y_sum'] += float(y.sum())
+                errors['y_sum_sq'] += float(np.dot(y, y))
+            model.partial_fit(X, y)
+        
+        # 1. 변환기 적합
+        async for batch in batches():
+            await asyncio.to_thread(transformer.partial_fit, batch)
+        if not transformer.fitted_:
+            raise ValueError("학습할 데이터가 없습니다")
+        
+        # 2. 표준화 통계
+        async for batch in batches():
+            await asyncio.to_thread(scale_batch, batch)
+        
+        # 3. 에폭별 배치 학습
+        epochs = max(model.max_iter, 1)
+        errors = {'count': 0, 'squared': 0.0, 'absolute': 0.0, 'y_sum': 0.0, 'y_sum_sq': 0.0}
+        for epoch in range(epochs):
+            last_epoch = epoch == epochs - 1
+            async for batch in batches():
+                await asyncio.to_thread(fit_batch, batch, errors if last_epoch else None)
+        
+        print(f"📊 스트리밍 학습 완료: {errors['count']}행, {epochs} 에폭 (배치 크기 {batch_size})")
+        return model, self._metrics(errors), transformer
+    
+    async def _batch_source(
+        self,
+        file_id: str,
+        target_column: str,
+        lag_feature_columns: List[str],
+        batch_size: int
+    ) -> Optional[Callable[[], AsyncIterator[List[Dict]]]]:
+        """배치 순회 함수 (호출할 때마다 처음부터 다시 순회)
+        
+        Lag 피처가 필요하면 전체 행을 포함한 전처리 데이터를 순회하고, 없으면 None을 반환합니다.
+        """
+        if not lag_feature_columns:
+            return lambda: self.file_repository.iter_csv_batches(file_id, batch_size)
+        preprocessed_info = await self.file_repository.get_preprocessed_info(file_id, target_column)
+        if not preprocessed_info:
+            return None
+        csv_row_count = await self.file_repository.get_csv_row_count(file_id)
+        if preprocessed_info['row_count'] < csv_row_count:
+            return None
+        return lambda: self.file_repository.iter_preprocessed_batches(file_id, target_column, batch_size)
+    
+    def _metrics(self, errors: Dict[str, float]) -> Dict[str, float]:
+        """누적 오차 합계로 평가 지표 계산 (ModelTrainer.evaluate와 같은 키)"""
+        count = max(errors['count'], 1)
+        mse = errors['squared'] / count
+        total = errors['y_sum_sq'] - errors['y_sum'] ** 2 / count
+        return {
+            'mse': float(mse),
+            'rmse': float(np.sqrt(mse)),
+            'mae': float(errors['absolute'] / count),
+            'r2': float(1.0 - errors['squared'] / total) if total > 0 else 0.0
+        }
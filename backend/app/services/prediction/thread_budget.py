@@ -0,0 +1,46 @@
+from typing import Iterator, Optional
+from contextlib import contextmanager
+import os
+import threading
+from threadpoolctl import threadpool_limits
+from app.core.config import settings
+
+class ThreadBudget:
+    """프로세스 전역 학습 스레드 예산
+    
+    같은 워커 프로세스에서 여러 학습 작업이 동시에 실행될 때 CPU 코어를 초과 구독하지 않도록
+    작업마다 스레드 수를 예약합니다. 예산이 부족하면 다른 작업이 반환할 때까지 대기하고,
+    예약한 스레드 안에서는 BLAS/OpenMP 스레드 수도 같은 값으로 제한합니다.
+    """
+    
+    _lock = threading.Condition()
+    _in_use = 0
+    
+    @classmethod
+    def total(cls) -> int:
+        """전체 스레드 예산 (TRAINING_THREAD_BUDGET, 없으면 CPU 코어 수)"""
+        return max(1, settings.TRAINING_THREAD_BUDGET or os.cpu_count() or 1)
+    
+    @classmethod
+    @contextmanager
+    def reserve(cls, threads: Optional[int] = None) -> Iterator[int]:
+        """스레드 예약 (블로킹, 이벤트 루프 밖의 학습 스레드에서 사용)
+        
+        Args:
+            threads: 요청 스레드 수 (None 또는 -1이면 전체 예산, 예산보다 크면 예산으로 제한)
+        
+        Yields:
+            실제로 예약된 스레드 수 (추정기의 n_jobs로 사용)
+        """
+        total = cls.total()
+        granted = total if threads is None or threads < 1 else min(threads, total)
+        with cls._lock:
+            cls._lock.wait_for(lambda: cls._in_use + granted <= total)
+            cls._in_use += granted
+        try:
+            with threadpool_limits(limits=granted):
+                yield granted
+        finally:
+            with cls._lock:
+                cls._in_use -= granted
+                cls._lock.notify_all()
@@ -0,0 +1,36 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from app.core.database import get_database
+
+class TunedHyperparameterRepository:
+    """튜닝된 하이퍼파라미터 데이터 접근 레이어 (Tuned Hyperparameters Collection)"""
+    
+    async def get(self, fingerprint: str) -> Optional[Dict]:
+        """데이터셋 지문으로 튜닝 결과 조회"""
+        db = await get_database()
+        collection = db['tuned_hyperparameters']
+        result = await collection.find_one({'fingerprint': fingerprint})
+        if result:
+            result.pop('_id', None)
+        return result
+    
+    async def save(
+        self,
+        fingerprint: str,
+        model_type: str,
+        best_params: Dict[str, Any],
+        summary: Dict[str, Any]
+    ) -> Dict:
+        """튜닝 결과 저장 (같은 지문이면 덮어씀)"""
+        db = await get_database()
+        collection = db['tuned_hyperparameters']
+        
+        doc = {
+            'fingerprint': fingerprint,  # 데이터 내용, 피처, 모델 타입, 탐색 설정 기반 해시
+            'model_type': model_type,
+            'best_params': best_params,
+            'summary': summary,  # 최고 holdout RMSE, 단계별 후보 수, 소요 시간 등
+            'created_at': datetime.now()
+        }
+        await collection.replace_one({'fingerprint': fingerprint}, doc, upsert=True)
+        return doc
@@ -31,7 +31,8 @@ class SolutionService:
             correlation_data = await self.correlation_repo.get_by_file_id(file_id)
         
         if prediction_id:
-            prediction_data = await self.prediction_service.get_prediction(prediction_id)
+            # 인사이트 생성에는 차트 이미지가 필요 없으므로 렌더링하지 않는 형식으로 조회
+            prediction_data = await self.prediction_service.get_prediction(prediction_id, chart_format='data')
         
         # LLM으로 인사이트 및 추천사항 생성
         result = await self.llm_service.generate_insights(
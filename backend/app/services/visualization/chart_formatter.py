@@ -0,0 +1,97 @@
+from typing import Any, Dict, Optional, Union
+import base64
+import json
+import numpy as np
+from app.utils.constants import CHART_FORMATS
+from app.services.visualization.chart_renderer import ChartRenderer
+
+# 데이터 시리즈로 내보낼 trace 값 키
+SERIES_KEYS = ('x', 'y', 'z', 'labels', 'values', 'text')
+
+class ChartFormatter:
+    """차트 응답 형식 변환기
+    
+    차트는 PNG 대신 plotly figure 스펙(JSON 문자열)으로 저장하고, 응답 시 요청한 형식으로 변환합니다.
+        - png: 렌더링 프로세스 풀(ChartRenderer)에서 PNG로 렌더링한 Base64 문자열
+        - plotly: plotly figure JSON ({'data': [...], 'layout': {...}}, 프런트엔드에서 Plotly.react로 바로 렌더링)
+        - data: 제목/축 이름과 trace별 값만 담은 간단한 데이터 시리즈
+    스펙이 저장되기 전의 (이전 버전) 결과는 Base64 PNG만 있으므로 png 형식만 지원합니다.
+    """
+    
+    def __init__(self):
+        self.chart_renderer = ChartRenderer()
+    
+    @staticmethod
+    def to_spec(fig) -> str:
+        """plotly figure를 저장용 스펙(JSON 문자열)으로 변환"""
+        return fig.to_json()
+    
+    @staticmethod
+    def validate(chart_format: str):
+        """차트 형식 검증"""
+        if chart_format not in CHART_FORMATS:
+            raise ValueError(f"지원하지 않는 차트 형식입니다: {chart_format} (지원: {', '.join(CHART_FORMATS)})")
+    
+    async def format(
+        self,
+        chart_spec: Optional[str],
+        chart_format: str = 'png',
+        legacy_png: Optional[str] = None
+    ) -> Union[str, Dict[str, Any]]:
+        """저장된 차트를 요청한 형식으로 변환
+        
+        Args:
+            chart_spec: 저장된 figure 스펙 (JSON 문자열)
+            chart_format: png, plotly, data 중 하나
+            legacy_png: 스펙이 없는 (이전 버전) 결과의 Base64 PNG
+        """
+        self.validate(chart_format)
+        if not chart_spec:
+            if chart_format != 'png' and legacy_png:
+                raise ValueError("이전 버전의 분석 결과는 png 형식으로만 조회할 수 있습니다")
+            return legacy_png or ''
+        if chart_format == 'png':
+            return await self.chart_renderer.render_spec(chart_spec)
+        spec = json.loads(chart_spec)
+        if chart_format == 'plotly':
+            return spec
+        return self.to_series(spec)
+    
+    def to_series(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """figure 스펙에서 데이터 시리즈 추출
+        
+        Returns:
+            {'title', 'x_title', 'y_title', 'series': [{'name', 'type', 'x', 'y', ...}]}
+        """
+        layout = spec.get('layout', {})
+        series = []
+        for trace in spec.get('data', []):
+            item = {'name': trace.get('name'), 'type': trace.get('type', 'scatter')}
+            for key in SERIES_KEYS:
+                if key in trace:
+                    item[key] = self._decode(trace[key])
+            series.append(item)
+        return {
+            'title': self._title(layout.get('title')),
+            'x_title': self._title(layout.get('xaxis', {}).get('title')),
+            'y_title': self._title(layout.get('yaxis', {}).get('title')),
+            'series': series
+        }
+    
+    @staticmethod
+    def _title(title: Any) -> Optional[str]:
+        """레이아웃 제목 ({'text': ...} 또는 문자열)"""
+        if isinstance(title, dict):
+            return title.get('text')
+        return title
+    
+    @staticmethod
+    def _decode(values: Any) -> Any:
+        """plotly 배열 값 디코딩 (typed array {'dtype', 'bdata', 'shape'}는 리스트로 변환)"""
+        if isinstance(values, dict) and 'bdata' in values:
+            array = np.frombuffer(base64.b64decode(values['bdata']), dtype=values.get('dtype', 'f8'))
+            shape = values.get('shape')
+            if shape:
+                array = array.reshape([int(n) for n in str(shape).split(',')])
+            return array.tolist()
+        return values
@@ -2,8 +2,7 @@ from typing import Optional, List, Dict
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-import base64
-import io
+from app.services.visualization.chart_formatter import ChartFormatter
 
 class ChartGenerator:
     """차트 생성기"""
@@ -16,7 +15,7 @@ class ChartGenerator:
         y_column: Optional[str] = None,
         columns: Optional[List[str]] = None
     ) -> str:
-        """차트 생성 및 Base64 인코딩"""
+        """차트 생성 후 figure 스펙(JSON 문자열) 반환 (PNG 렌더링은 응답 형식이 png일 때만 수행)"""
         df = pd.DataFrame(data)
         
         if chart_type == "line":
@@ -34,10 +33,7 @@ class ChartGenerator:
         else:
             chart = self._create_line_chart(df, x_column, y_column)
         
-        # Base64 인코딩
-        img_bytes = chart.to_image(format="png")
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-        return img_base64
+        return ChartFormatter.to_spec(chart)
     
     def _create_line_chart(self, df: pd.DataFrame, x: Optional[str], y: Optional[str]):
         """라인 차트 생성"""
@@ -0,0 +1,78 @@
+from typing import Optional
+import asyncio
+import base64
+import hashlib
+import os
+from app.core.config import settings
+from app.services.visualization.chart_renderer import ChartRenderer
+
+class ChartImageStore:
+    """차트 이미지 blob 저장소 (내용 주소 기반)
+    
+    렌더링한 PNG를 CHART_IMAGE_DIR 아래 {sha256 앞 2자리}/{sha256}.png 파일로 저장하고,
+    시각화 문서에는 이미지 키(PNG 내용의 sha256)만 기록합니다.
+    같은 내용의 이미지는 한 번만 저장되며, 이미지 키는 내용이 바뀌지 않는 한 그대로이므로 HTTP ETag로 사용합니다.
+    """
+    
+    def __init__(self):
+        self.image_dir = settings.CHART_IMAGE_DIR
+        self.chart_renderer = ChartRenderer()
+    
+    def path(self, image_key: str) -> str:
+        """이미지 키의 파일 경로"""
+        return os.path.join(self.image_dir, image_key[:2], f"{image_key}.png")
+    
+    def exists(self, image_key: Optional[str]) -> bool:
+        """이미지 파일 존재 여부"""
+        return bool(image_key) and os.path.exists(self.path(image_key))
+    
+    async def save(self, image_bytes: bytes) -> str:
+        """PNG 바이트 저장 후 이미지 키 반환 (같은 내용이 이미 있으면 쓰지 않음)"""
+        image_key = hashlib.sha256(image_bytes).hexdigest()
+        if not self.exists(image_key):
+            await asyncio.to_thread(self._write, self.path(image_key), image_bytes)
+        return image_key
+    
+    async def save_spec(self, chart_spec: str) -> str:
+        """figure 스펙을 PNG로 렌더링하여 저장 후 이미지 키 반환"""
+        img_base64 = await self.chart_renderer.render_spec(chart_spec)
+        return await self.save(base64.b64decode(img_base64))
+    
+    async def read(self, image_key: str) -> bytes:
+        """이미지 바이트 조회"""
+        return await asyncio.to_thread(self._read, self.path(image_key))
+    
+    @staticmethod
+    def etag(image_key: str) -> str:
+        """이미지 키의 ETag 헤더 값"""
+        return f'"{image_key}"'
+    
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], image_key: str) -> bool:
+        """If-None-Match 헤더가 이미지 키와 일치하는지 확인 (약한 비교, '*' 포함)"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag == '*':
+                return True
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag.strip('"') == image_key:
+                return True
+        return False
+    
+    @staticmethod
+    def _write(path: str, image_bytes: bytes):
+        """임시 파일에 쓴 뒤 이름 변경 (동시 요청이 쓰는 중인 파일을 읽지 않도록)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{id(image_bytes)}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(image_bytes)
+        os.replace(temp_path, path)
+    
+    @staticmethod
+    def _read(path: str) -> bytes:
+        """이미지 파일 읽기"""
+        with open(path, 'rb') as f:
+            return f.read()
@@ -0,0 +1,125 @@
+from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import base64
+import hashlib
+import multiprocessing
+import threading
+from app.core.config import settings
+
+def _render_png(spec: str) -> bytes:
+    """워커 프로세스: plotly figure JSON을 PNG로 렌더링 (kaleido)"""
+    import plotly.io as pio
+    return pio.from_json(spec, skip_invalid=True).to_image(format="png")
+
+def _warm_up() -> bool:
+    """워커 프로세스: 작은 차트를 한 번 렌더링해 kaleido 렌더러를 미리 띄움"""
+    import plotly.graph_objects as go
+    try:
+        go.Figure(go.Scatter(x=[0, 1], y=[0, 1])).to_image(format="png")
+        return True
+    except Exception as e:
+        print(f"⚠️ 차트 렌더러 준비 실패: {str(e)}")
+        return False
+
+class ChartRenderer:
+    """차트 PNG 렌더링 서비스
+    
+    fig.to_image는 kaleido 렌더러 프로세스를 거치는 동기 호출이라 이벤트 루프를 수백 ms~수 초 막으므로,
+    렌더링은 미리 띄워 둔(warm) 워커 프로세스 풀(CHART_RENDER_WORKERS개)에서 실행합니다.
+    같은 figure 스펙(JSON)은 내용 해시로 식별하여
+    - 렌더링이 끝난 결과는 프로세스 내 LRU 캐시(CHART_CACHE_SIZE개)에서 바로 반환하고
+    - 렌더링 중인 같은 스펙은 진행 중인 작업 결과를 함께 기다립니다.
+    프로세스 풀은 한 번 생성 후 재사용합니다 (앱 시작 시 start, 종료 시 shutdown).
+    """
+    
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    # {스펙 해시: Base64 PNG}
+    _cache: "OrderedDict[str, str]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    # {스펙 해시: 렌더링 중인 작업} (이벤트 루프 스레드에서만 접근)
+    _pending: Dict[str, asyncio.Future] = {}
+    
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        """렌더링 프로세스 풀 반환 (최초 호출 시 생성 후 워커마다 렌더러 준비)"""
+        with cls._executor_lock:
+            if cls._executor is None:
+                workers = max(settings.CHART_RENDER_WORKERS, 1)
+                # 이벤트 루프/DB 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                for _ in range(workers):
+                    cls._executor.submit(_warm_up)
+            return cls._executor
+    
+    @classmethod
+    def start(cls):
+        """프로세스 풀 생성 및 렌더러 준비 (앱 시작 시 호출, 첫 요청의 지연 제거)"""
+        cls.get_executor()
+    
+    @classmethod
+    def shutdown(cls):
+        """프로세스 풀 종료"""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
+    
+    async def render(self, fig) -> str:
+        """figure를 PNG로 렌더링하여 Base64 문자열로 반환"""
+        return await self.render_spec(fig.to_json())
+    
+    async def render_spec(self, spec: str) -> str:
+        """저장된 figure 스펙(JSON)을 PNG로 렌더링하여 Base64 문자열로 반환"""
+        key = hashlib.sha256(spec.encode('utf-8')).hexdigest()
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        # 같은 스펙을 렌더링 중이면 그 결과를 함께 기다림
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        try:
+            img_bytes = await loop.run_in_executor(self.get_executor(), _render_png, spec)
+            img_base64 = base64.b64encode(img_bytes).decode('utf-8')
+            self._cache_put(key, img_base64)
+            future.set_result(img_base64)
+            return img_base64
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 작업이 없으면 예외를 조회한 것으로 표시 (미조회 예외 경고 방지)
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+    
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[str]:
+        """캐시 조회 (조회된 항목은 가장 최근 사용으로 이동)"""
+        with cls._cache_lock:
+            result = cls._cache.get(key)
+            if result is not None:
+                cls._cache.move_to_end(key)
+            return result
+    
+    @classmethod
+    def _cache_put(cls, key: str, result: str):
+        """캐시 저장 (용량 초과 시 가장 오래 사용하지 않은 결과 제거)"""
+        with cls._cache_lock:
+            cls._cache[key] = result
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > max(settings.CHART_CACHE_SIZE, 0):
+                cls._cache.popitem(last=False)
@@ -0,0 +1,76 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+
+def x_positions(x) -> np.ndarray:
+    """LTTB 면적 계산용 x 좌표 (숫자는 값, 날짜는 나노초, 그 외는 순서 위치)"""
+    series = pd.Series(x).reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=float)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        dates = series
+    else:
+        dates = pd.to_datetime(series, errors='coerce', format='mixed')
+    if dates.notna().all():
+        return dates.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    return np.arange(len(series), dtype=float)
+
+def lttb_indices(x, y, max_points: Optional[int] = None) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 다운샘플링으로 남길 점의 위치 반환
+    
+    첫 점과 마지막 점은 유지하고, 나머지 점을 (max_points - 2)개 구간으로 나눠
+    구간마다 직전에 선택한 점, 다음 구간 평균점과 만드는 삼각형 면적이 가장 큰 점 하나를 고릅니다.
+    면적이 큰 점은 추세에서 벗어난 점이므로 봉우리와 골짜기가 유지됩니다.
+    구간 평균은 누적합으로 한 번에 계산하고, 구간 안의 면적 비교는 numpy 배열 연산으로 수행합니다.
+    
+    Args:
+        x: x 값 (숫자, 날짜 또는 정렬된 범주)
+        y: 숫자 값 (x 순서로 정렬되어 있어야 함, 결측은 호출 전에 제거)
+        max_points: 최대 점 수 (None이면 CHART_MAX_POINTS)
+    
+    Returns:
+        원래 순서를 유지한 위치 배열 (점 수가 max_points 이하이면 전체)
+    """
+    max_points = max_points or settings.CHART_MAX_POINTS
+    n = len(y)
+    if max_points < 3 or n <= max_points:
+        return np.arange(n)
+    x = x_positions(x)
+    y = np.asarray(y, dtype=float)
+    
+    # 첫/마지막 점을 제외한 점을 (max_points - 2)개 구간으로 분할 (n > max_points이므로 구간은 비지 않음)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    counts = np.diff(edges)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    mean_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts
+    mean_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts
+    # 구간 i의 세 번째 꼭짓점: 다음 구간 평균 (마지막 구간은 마지막 점)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+    
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def downsample_frame(df: pd.DataFrame, x_column: str, y_column: str, max_points: Optional[int] = None) -> pd.DataFrame:
+    """x 순서로 정렬된 DataFrame을 y 컬럼 기준 LTTB로 다운샘플링 (y 결측 행은 제외)"""
+    y = pd.to_numeric(df[y_column], errors='coerce')
+    if y.isna().any():
+        df = df[y.notna()]
+        y = y[y.notna()]
+    indices = lttb_indices(df[x_column], y.to_numpy(), max_points)
+    if len(indices) == len(df):
+        return df
+    return df.iloc[indices]
@@ -1,12 +1,17 @@
 from typing import Optional, List, Dict
 from datetime import datetime
+import base64
 import pandas as pd
 import numpy as np
 from app.core.database import get_database
 from app.models.visualization import VisualizationResponse
 from app.services.visualization.chart_generator import ChartGenerator
+from app.services.visualization.chart_formatter import ChartFormatter
+from app.services.visualization.chart_image_store import ChartImageStore
+from app.services.visualization.downsampling import downsample_frame
 from app.services.file.file_repository import FileRepository
 from app.services.file.file_analysis_config_repository import FileAnalysisConfigRepository
+from app.services.file.product_aggregator import ProductAggregator
 from app.services.correlation.correlation_repository import CorrelationRepository
 from app.services.solution.llm_service import LLMService
 
@@ -15,8 +20,11 @@ class VisualizationService:
     
     def __init__(self):
         self.chart_generator = ChartGenerator()
+        self.chart_formatter = ChartFormatter()
+        self.chart_image_store = ChartImageStore()
         self.file_repository = FileRepository()
         self.config_repository = FileAnalysisConfigRepository()
+        self.product_aggregator = ProductAggregator()
         self.correlation_repository = CorrelationRepository()
         self.llm_service = LLMService()
     
@@ -28,9 +36,15 @@ class VisualizationService:
         x_column: Optional[str],
         y_column: Optional[str],
         columns: Optional[List[str]],
-        user_id: str
+        user_id: str,
+        chart_format: str = 'png'
     ) -> VisualizationResponse:
-        """시각화 생성"""
+        """시각화 생성
+        
+        Args:
+            chart_format: 응답 차트 형식 (png, plotly, data). 저장은 항상 figure 스펙으로 합니다.
+        """
+        self.chart_formatter.validate(chart_format)
         # 파일 정보 조회 및 컬럼명 검증
         file_info = await self.file_repository.get_sales_info(file_id, user_id)
         if not file_info:
@@ -81,8 +95,8 @@ class VisualizationService:
         # 데이터 로드
         data = await self._load_data(file_id, user_id)
         
-        # 차트 생성
-        chart_data = await self.chart_generator.generate_chart(
+        # 차트 생성 (figure 스펙)
+        chart_spec = await self.chart_generator.generate_chart(
             data=data,
             chart_type=chart_type,
             x_column=x_column,
@@ -96,7 +110,7 @@ class VisualizationService:
             visualization_id=visualization_id,
             file_id=file_id,
             chart_type=chart_type,
-            chart_data=chart_data,
+            chart_spec=chart_spec,
             user_id=user_id
         )
         
@@ -104,21 +118,50 @@ class VisualizationService:
             visualization_id=visualization_id,
             file_id=file_id,
             chart_type=chart_type,
-            chart_data=chart_data,
+            chart_data=await self.chart_formatter.format(chart_spec, chart_format),
             created_at=datetime.now()
         )
     
-    async def get_visualization(self, visualization_id: str) -> Optional[VisualizationResponse]:
-        """시각화 조회"""
+    async def get_visualization(self, visualization_id: str, chart_format: str = 'png') -> Optional[VisualizationResponse]:
+        """시각화 조회 (차트는 요청한 형식으로 변환)"""
         db = await get_database()
         collection = db['visualizations']
         viz = await collection.find_one({'visualization_id': visualization_id})
         
         if viz:
-            viz.pop('_id', None)
-            return VisualizationResponse(**viz)
+            return VisualizationResponse(
+                visualization_id=viz['visualization_id'],
+                file_id=viz['file_id'],
+                chart_type=viz['chart_type'],
+                chart_data=await self.chart_formatter.format(viz.get('chart_spec'), chart_format, viz.get('chart_data')),
+                created_at=viz['created_at']
+            )
         return None
     
+    async def get_image_key(self, viz: Dict) -> str:
+        """시각화 이미지 키 조회
+        
+        문서에 기록된 이미지가 없으면 figure 스펙을 렌더링(이전 버전 문서는 Base64 PNG 디코딩)하여
+        이미지 저장소에 저장하고 문서에 이미지 키를 기록합니다. 이후 요청은 렌더링 없이 파일을 바로 사용합니다.
+        """
+        image_key = viz.get('image_key')
+        if self.chart_image_store.exists(image_key):
+            return image_key
+        
+        if viz.get('chart_spec'):
+            image_key = await self.chart_image_store.save_spec(viz['chart_spec'])
+        elif viz.get('chart_data'):
+            image_key = await self.chart_image_store.save(base64.b64decode(viz['chart_data']))
+        else:
+            raise ValueError("이미지 데이터가 없습니다")
+        
+        db = await get_database()
+        await db['visualizations'].update_one(
+            {'visualization_id': viz['visualization_id']},
+            {'$set': {'image_key': image_key}}
+        )
+        return image_key
+    
     async def _load_data(self, file_id: str, user_id: str) -> List[dict]:
         """데이터 로드"""
         # 파일 소유권 확인 (이미 create_visualization에서 확인했지만, 재확인)
@@ -135,29 +178,40 @@ class VisualizationService:
         visualization_id: str,
         file_id: str,
         chart_type: str,
-        chart_data: str,
+        chart_spec: str,
         user_id: str
     ):
-        """시각화 저장"""
+        """시각화 저장 (PNG 대신 figure 스펙 저장)"""
         db = await get_database()
         collection = db['visualizations']
         await collection.insert_one({
             'visualization_id': visualization_id,
             'file_id': file_id,
             'chart_type': chart_type,
-            'chart_data': chart_data,
+            'chart_spec': chart_spec,
             'user_id': user_id,
             'created_at': datetime.now()
         })
     
+    @staticmethod
+    def _check_columns(file_info: Dict, *columns: str):
+        """파일에 컬럼이 있는지 확인"""
+        columns_list = file_info.get('columns_list') or []
+        labels = ['그룹화', '타겟', '날짜']
+        for label, column in zip(labels, columns):
+            if columns_list and column not in columns_list:
+                raise ValueError(f"{label} 컬럼 '{column}'을 찾을 수 없습니다")
+    
     async def get_product_count_bar_chart(
         self,
         file_id: str,
         user_id: str,
         top_n: Optional[int] = None,
-        use_sum: bool = False
+        use_sum: bool = False,
+        chart_format: str = 'png'
     ) -> Dict:
         """상품명별 count 또는 sum 막대그래프 생성"""
+        self.chart_formatter.validate(chart_format)
         # 파일 정보 조회
         file_info = await self.file_repository.get_sales_info(file_id, user_id)
         if not file_info:
@@ -178,32 +232,26 @@ class VisualizationService:
         
         # 첫 번째 그룹화 컬럼 사용 (보통 상품명)
         group_column = grouping_columns[0]
-        
-        # 데이터 로드
-        data = await self.file_repository.get_csv_data(file_id, 0, 10000)
-        if not data:
+        self._check_columns(file_info, group_column, target_column)
+        
+        # 업로드 시 계산해 둔 상품별 요약에서 count/sum 상위 N개 조회 (원본 행을 읽지 않음)
+        await self.product_aggregator.ensure(file_id, target_column, group_column, config.get('date_column'))
+        summaries = await self.product_aggregator.get_summaries(
+            file_id, target_column, group_column,
+            sort_by='sum' if use_sum else 'count',
+            limit=top_n
+        )
+        if not summaries:
             raise ValueError("데이터를 찾을 수 없습니다")
         
-        df = pd.DataFrame(data)
-        
-        # 그룹별 계산
-        if group_column not in df.columns:
-            raise ValueError(f"그룹화 컬럼 '{group_column}'을 찾을 수 없습니다")
-        
-        if target_column not in df.columns:
-            raise ValueError(f"타겟 컬럼 '{target_column}'을 찾을 수 없습니다")
-        
-        # use_sum이 True이면 sum 계산, False이면 count 계산
+        # use_sum이 True이면 sum, False이면 count
         if use_sum:
-            # 상품별 합계 계산
-            df[target_column] = pd.to_numeric(df[target_column], errors='coerce')
-            sum_df = df.groupby(group_column)[target_column].sum().reset_index()
-            sum_df.columns = [group_column, 'sum']
-            sum_df = sum_df.sort_values('sum', ascending=False)
+            sum_df = pd.DataFrame({
+                group_column: [summary['product'] for summary in summaries],
+                'sum': [summary['sum'] for summary in summaries]
+            })
             
-            # top_n이 있으면 상위 N개만 선택
             if top_n:
-                sum_df = sum_df.head(top_n)
                 title = f"상위 {top_n}개 상품별 {target_column} 합계"
             else:
                 title = f"전체 상품별 {target_column} 합계"
@@ -218,13 +266,12 @@ class VisualizationService:
                 labels={group_column: '상품명', 'sum': target_column}
             )
         else:
-            # 전체 count 계산
-            count_df = df[group_column].value_counts().reset_index()
-            count_df.columns = [group_column, 'count']
+            count_df = pd.DataFrame({
+                group_column: [summary['product'] for summary in summaries],
+                'count': [summary['count'] for summary in summaries]
+            })
             
-            # top_n이 있으면 상위 N개만 선택
             if top_n:
-                count_df = count_df.head(top_n)
                 title = f"상위 {top_n}개 상품별 데이터 개수"
             else:
                 title = "전체 상품별 데이터 개수"
@@ -240,10 +287,8 @@ class VisualizationService:
             )
         fig.update_xaxes(tickangle=-45)
         
-        # Base64 인코딩
-        import base64
-        img_bytes = fig.to_image(format="png")
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
+        # figure 스펙 (PNG 렌더링은 응답 형식이 png일 때만)
+        chart_spec = self.chart_formatter.to_spec(fig)
         
         # visualization_id 생성 및 저장
         visualization_id = f"viz_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -252,13 +297,13 @@ class VisualizationService:
             visualization_id=visualization_id,
             file_id=file_id,
             chart_type=chart_type,
-            chart_data=img_base64,
+            chart_spec=chart_spec,
             user_id=user_id
         )
         
         return {
             "visualization_id": visualization_id,
-            "chart_data": img_base64
+            "chart_data": await self.chart_formatter.format(chart_spec, chart_format)
         }
     
     async def get_product_list(self, file_id: str, user_id: str) -> List[str]:
@@ -283,28 +328,24 @@ class VisualizationService:
         
         # 첫 번째 그룹화 컬럼 사용
         group_column = grouping_columns[0]
+        self._check_columns(file_info, group_column)
         
-        # 데이터 로드
-        data = await self.file_repository.get_csv_data(file_id, 0, 10000)
-        if not data:
+        # 상품별 요약에서 고유한 상품명 목록 조회 (정렬)
+        await self.product_aggregator.ensure(file_id, target_column, group_column, config.get('date_column'))
+        product_list = await self.product_aggregator.get_products(file_id, target_column, group_column)
+        if not product_list:
             raise ValueError("데이터를 찾을 수 없습니다")
-        
-        df = pd.DataFrame(data)
-        
-        if group_column not in df.columns:
-            raise ValueError(f"그룹화 컬럼 '{group_column}'을 찾을 수 없습니다")
-        
-        # 고유한 상품명 목록 반환 (정렬)
-        product_list = sorted(df[group_column].unique().tolist())
         return product_list
     
     async def get_product_quantity_trend(
         self,
         file_id: str,
         product_name: str,
-        user_id: str
+        user_id: str,
+        chart_format: str = 'png'
     ) -> Dict:
         """특정 상품명의 수량 추세 선그래프 생성"""
+        self.chart_formatter.validate(chart_format)
         # 파일 정보 조회
         file_info = await self.file_repository.get_sales_info(file_id, user_id)
         if not file_info:
@@ -328,29 +369,22 @@ class VisualizationService:
             raise ValueError("날짜 컬럼이 설정되지 않았습니다")
         
         group_column = grouping_columns[0]
+        self._check_columns(file_info, group_column, target_column, date_column)
         
-        # 데이터 로드
-        data = await self.file_repository.get_csv_data(file_id, 0, 10000)
-        if not data:
-            raise ValueError("데이터를 찾을 수 없습니다")
-        
-        df = pd.DataFrame(data)
-        
-        # 필터링 (특정 상품명만)
-        if group_column not in df.columns:
-            raise ValueError(f"그룹화 컬럼 '{group_column}'을 찾을 수 없습니다")
-        if target_column not in df.columns:
-            raise ValueError(f"타겟 컬럼 '{target_column}'을 찾을 수 없습니다")
-        if date_column not in df.columns:
-            raise ValueError(f"날짜 컬럼 '{date_column}'을 찾을 수 없습니다")
-        
-        filtered_df = df[df[group_column] == product_name].copy()
-        
-        if len(filtered_df) == 0:
+        # 상품-기간 시계열에서 특정 상품명의 기간별 합계 조회 (인덱스 조회, 기간 순)
+        await self.product_aggregator.ensure(file_id, target_column, group_column, date_column)
+        series = await self.product_aggregator.get_series(file_id, target_column, group_column, [product_name])
+        points = series.get(product_name)
+        if not points:
             raise ValueError(f"상품명 '{product_name}'에 대한 데이터를 찾을 수 없습니다")
         
-        # 날짜 컬럼 정렬
-        filtered_df = filtered_df.sort_values(date_column)
+        filtered_df = pd.DataFrame({
+            date_column: pd.to_datetime([point['period'] for point in points]),
+            target_column: [point['sum'] for point in points]
+        })
+        
+        # 점 수가 많으면 LTTB 다운샘플링 (봉우리/골짜기 유지)
+        filtered_df = downsample_frame(filtered_df, date_column, target_column)
         
         # 선그래프 생성
         import plotly.express as px
@@ -362,10 +396,8 @@ class VisualizationService:
             labels={date_column: '날짜', target_column: target_column}
         )
         
-        # Base64 인코딩
-        import base64
-        img_bytes = fig.to_image(format="png")
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
+        # figure 스펙 (PNG 렌더링은 응답 형식이 png일 때만)
+        chart_spec = self.chart_formatter.to_spec(fig)
         
         # visualization_id 생성 및 저장
         visualization_id = f"viz_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -374,21 +406,23 @@ class VisualizationService:
             visualization_id=visualization_id,
             file_id=file_id,
             chart_type=chart_type,
-            chart_data=img_base64,
+            chart_spec=chart_spec,
             user_id=user_id
         )
         
         return {
             "visualization_id": visualization_id,
-            "chart_data": img_base64
+            "chart_data": await self.chart_formatter.format(chart_spec, chart_format)
         }
     
     async def get_correlation_heatmap(
         self,
         file_id: str,
-        user_id: str
+        user_id: str,
+        chart_format: str = 'png'
     ) -> Dict:
         """상관관계 분석 결과 기반 히트맵 생성"""
+        self.chart_formatter.validate(chart_format)
         # 파일 정보 조회
         file_info = await self.file_repository.get_sales_info(file_id, user_id)
         if not file_info:
@@ -403,10 +437,64 @@ class VisualizationService:
         if not correlation_result:
             raise ValueError("상관관계 분석 결과를 찾을 수 없습니다. 먼저 상관관계 분석을 수행해주세요.")
         
-        correlation_matrix = correlation_result.get('correlation_matrix', {})
-        if not correlation_matrix:
-            raise ValueError("상관관계 행렬 데이터가 없습니다")
+        # 상관관계 분석 시 저장된 전체 행렬 사용 (데이터 재로드/재계산 없음)
+        feature_matrix = correlation_result.get('feature_matrix')
+        if feature_matrix and len(feature_matrix.get('columns', [])) >= 2:
+            corr_matrix = pd.DataFrame(
+                feature_matrix['values'],
+                index=feature_matrix['columns'],
+                columns=feature_matrix['columns'],
+                dtype=float
+            )
+        else:
+            # 전체 행렬이 저장되기 전의 분석 결과: 데이터에서 직접 계산
+            correlation_matrix = correlation_result.get('correlation_matrix', {})
+            if not correlation_matrix:
+                raise ValueError("상관관계 행렬 데이터가 없습니다")
+            corr_matrix = await self._compute_heatmap_matrix(file_id, target_column)
+            feature_matrix = {
+                'columns': list(corr_matrix.columns),
+                'values': [
+                    [None if pd.isna(v) else float(v) for v in row]
+                    for row in corr_matrix.to_numpy()
+                ]
+            }
         
+        # 히트맵 생성
+        import plotly.express as px
+        fig = px.imshow(
+            corr_matrix,
+            text_auto='.2f',
+            aspect="auto",
+            title=f"상관관계 히트맵 ({target_column} 포함)",
+            labels=dict(x="변수", y="변수", color="상관계수"),
+            color_continuous_scale="RdBu",
+            color_continuous_midpoint=0
+        )
+        fig.update_xaxes(side="bottom")
+        
+        # figure 스펙 (PNG 렌더링은 응답 형식이 png일 때만)
+        chart_spec = self.chart_formatter.to_spec(fig)
+        
+        # visualization_id 생성 및 저장
+        visualization_id = f"viz_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        chart_type = "heatmap"
+        await self._save_visualization(
+            visualization_id=visualization_id,
+            file_id=file_id,
+            chart_type=chart_type,
+            chart_spec=chart_spec,
+            user_id=user_id
+        )
+        
+        return {
+            "visualization_id": visualization_id,
+            "chart_data": await self.chart_formatter.format(chart_spec, chart_format),
+            "matrix": feature_matrix
+        }
+    
+    async def _compute_heatmap_matrix(self, file_id: str, target_column: str) -> pd.DataFrame:
+        """저장된 전체 행렬이 없는 (이전 버전) 분석 결과용: 데이터를 로드하여 상관관계 행렬 계산"""
         # 설정 조회 (valid_columns 확인)
         config = await self.config_repository.get_config(file_id, target_column)
         if not config:
@@ -457,39 +545,5 @@ class VisualizationService:
         )
         
         # 정규화된 데이터로 상관관계 행렬 계산
-        corr_matrix = numeric_df_normalized.corr()
-        
-        # 히트맵 생성
-        import plotly.express as px
-        fig = px.imshow(
-            corr_matrix,
-            text_auto='.2f',
-            aspect="auto",
-            title=f"상관관계 히트맵 ({target_column} 포함)",
-            labels=dict(x="변수", y="변수", color="상관계수"),
-            color_continuous_scale="RdBu",
-            color_continuous_midpoint=0
-        )
-        fig.update_xaxes(side="bottom")
-        
-        # Base64 인코딩
-        import base64
-        img_bytes = fig.to_image(format="png")
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-        
-        # visualization_id 생성 및 저장
-        visualization_id = f"viz_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-        chart_type = "heatmap"
-        await self._save_visualization(
-            visualization_id=visualization_id,
-            file_id=file_id,
-            chart_type=chart_type,
-            chart_data=img_base64,
-            user_id=user_id
-        )
-        
-        return {
-            "visualization_id": visualization_id,
-            "chart_data": img_base64
-        }
+        return numeric_df_normalized.corr()
 
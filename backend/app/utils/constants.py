@@ -10,6 +10,13 @@ CHART_TYPES = [
     "area"
 ]
 
+# 차트 응답 형식 (png: Base64 이미지, plotly: figure JSON, data: 데이터 시리즈)
+CHART_FORMATS = [
+    "png",
+    "plotly",
+    "data"
+]
+
 # 모델 타입
 MODEL_TYPES = [
     "linear",
@@ -1,9 +1,28 @@
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 
 def get_tree_models():
-    return {
+    models = {
         "RandomForest": RandomForestRegressor(
             n_estimators=200,
             random_state=42
+        ),
+        "HistGradientBoosting": HistGradientBoostingRegressor(
+            max_iter=200,
+            random_state=42
         )
-    }
\ No newline at end of file
+    }
+
+    # xgboost가 설치되어 있으면 histogram 기반 XGBoost 추가
+    try:
+        from xgboost import XGBRegressor
+        models["XGBoost"] = XGBRegressor(
+            n_estimators=300,
+            learning_rate=0.1,
+            max_depth=6,
+            tree_method="hist",
+            random_state=42
+        )
+    except ImportError:
+        pass
+
+    return models
@@ -0,0 +1,95 @@
+"""
+트리 모델 학습 속도 벤치마크 스크립트
+Blinkit master 데이터로 모델 타입별 학습 시간과 holdout 오차를 비교합니다.
+
+사용 예:
+    python scripts/benchmark_tree_models.py
+    python scripts/benchmark_tree_models.py --csv path/to/data.csv --rows 200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.prediction.model_trainer import ModelTrainer
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.thread_budget import ThreadBudget
+
+DEFAULT_CSV = project_root.parent / "data" / "blinkit-dataset" / "blinkit_master_data_eda_mk_251224.csv"
+
+# (표시 이름, model_type, n_jobs 지정 여부) - 기준선은 기존 방식의 단일 코어 랜덤 포레스트
+BENCHMARK_MODELS = [
+    ("random_forest (기존, 1코어)", "random_forest", False),
+    ("random_forest (n_jobs, max_samples)", "random_forest", True),
+    ("hist_gradient_boosting", "hist_gradient_boosting", True),
+    ("xgboost (hist)", "xgboost", True),
+    ("linear", "linear", True),
+]
+
+def load_dataset(csv_path: Path, target: str, date_column: str, rows: int):
+    """CSV 로드 후 시간 순 정렬, 날짜 파생 피처 추가"""
+    df = pd.read_csv(csv_path)
+    if rows and len(df) > rows:
+        df = df.sample(n=rows, random_state=42)
+    
+    dates = pd.to_datetime(df[date_column], errors='coerce')
+    df = df.assign(
+        day_of_week=dates.dt.dayofweek,
+        month=dates.dt.month,
+        day_of_month=dates.dt.day
+    )
+    df = df.iloc[np.argsort(dates.to_numpy(), kind='stable')].reset_index(drop=True)
+    
+    features = [col for col in df.columns if col != target]
+    y = pd.to_numeric(df[target], errors='coerce').fillna(0).to_numpy(dtype=float)
+    return df, features, y
+
+def main():
+    parser = argparse.ArgumentParser(description="트리 모델 학습 속도 벤치마크")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV), help="Blinkit master 데이터 CSV 경로")
+    parser.add_argument("--target", default="quantity", help="타겟 컬럼")
+    parser.add_argument("--date-column", default="order_date", help="날짜 컬럼")
+    parser.add_argument("--rows", type=int, default=0, help="샘플링할 행 수 (0이면 전체)")
+    parser.add_argument("--test-size", type=float, default=0.2, help="시간 순 holdout 비율")
+    args = parser.parse_args()
+    
+    df, features, y = load_dataset(Path(args.csv), args.target, args.date_column, args.rows)
+    split = int(len(df) * (1 - args.test_size))
+    transformer = FeatureTransformer(features).fit(df.iloc[:split])
+    X = transformer.transform(df)
+    X_train, X_test, y_train, y_test = X[:split], X[split:], y[:split], y[split:]
+    
+    trainer = ModelTrainer()
+    print(f"📊 데이터: 학습 {len(X_train):,}행 / 평가 {len(X_test):,}행, 피처 {len(features)}개, 스레드 예산 {ThreadBudget.total()}")
+    print(f"{'모델':<40}{'학습(초)':>10}{'RMSE':>12}{'MAE':>12}")
+    
+    baseline_time = None
+    for label, model_type, threaded in BENCHMARK_MODELS:
+        try:
+            with ThreadBudget.reserve(None if threaded else 1) as threads:
+                if threaded:
+                    model = trainer.build_model(model_type, n_jobs=threads, n_samples=len(y_train))
+                else:
+                    model = trainer.build_model(model_type)
+                start = time.perf_counter()
+                model.fit(X_train, y_train)
+                elapsed = time.perf_counter() - start
+                y_pred = model.predict(X_test)
+        except ValueError as e:
+            print(f"{label:<40}건너뜀: {str(e)}")
+            continue
+        
+        metrics = trainer.evaluate(y_test, y_pred)
+        baseline_time = baseline_time or elapsed
+        speedup = baseline_time / elapsed if elapsed > 0 else float('inf')
+        print(f"{label:<40}{elapsed:>10.2f}{metrics['rmse']:>12.4f}{metrics['mae']:>12.4f}  (x{speedup:.1f})")
+
+if __name__ == "__main__":
+    main()
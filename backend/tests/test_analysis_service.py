@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from app.services.analysis.analysis_service import AnalysisService
+
+def _reference_series(df, group_by_column, date_column, target_column, product_names):
+    """상품마다 전체 행을 필터링/날짜 변환/정렬하는 루프 (날짜 또는 값이 없는 행 제외)"""
+    result = []
+    for name in product_names:
+        product_df = df[df[group_by_column].astype(str) == name]
+        frame = pd.DataFrame({
+            'date': pd.to_datetime(product_df[date_column], errors='coerce', format='mixed'),
+            'value': pd.to_numeric(product_df[target_column], errors='coerce')
+        }).dropna().sort_values('date', kind='stable')
+        if len(frame):
+            result.append((name, frame['date'].reset_index(drop=True), frame['value'].reset_index(drop=True)))
+    return result
+
+def test_product_trend_series_matches_per_product_loop():
+    """한 번에 준비한 상품별 시계열 = 상품별 루프 결과 (상품 순서, 결측 행 정렬 포함)"""
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        'product': rng.choice(['p1', 'p2', 'p3', 'p4', 'p5'], n),
+        'date': pd.date_range('2024-01-01', periods=200, freq='D')[rng.integers(0, 200, n)].strftime('%Y-%m-%d'),
+        'sales': rng.integers(0, 50, n).astype(object)
+    })
+    df.loc[rng.choice(n, 100, replace=False), 'date'] = 'unknown'
+    df.loc[rng.choice(n, 100, replace=False), 'sales'] = 'n/a'
+    names = ['p3', 'p1', 'missing', 'p5']
+    
+    actual = AnalysisService._prepare_product_trend_series(df, 'product', 'date', 'sales', names)
+    expected = _reference_series(df, 'product', 'date', 'sales', names)
+    assert [name for name, _, _ in actual] == ['p3', 'p1', 'p5']
+    for (name, dates, values), (_, expected_dates, expected_values) in zip(actual, expected):
+        pd.testing.assert_series_equal(dates, expected_dates, check_names=False)
+        pd.testing.assert_series_equal(values, expected_values, check_names=False, check_dtype=False)
@@ -0,0 +1,69 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from app.services.prediction import backtester as backtester_module
+from app.services.prediction.backtester import Backtester
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.forecast_generator import ForecastGenerator
+
+def _weekly_data():
+    """주차 20개 x 매장(마지막 origin 이후 새 매장 등장), 범주 'a'는 마지막 origin 이후 주차에만 등장"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for week in range(1, 21):
+        for store in ['s2', 's1'] + (['s3'] if week > 17 else []):
+            channel = 'a' if week > 17 else ('c' if week % 2 else 'b')
+            price = float(rng.uniform(1, 5))
+            rows.append({
+                'week': week,
+                'store': store,
+                'channel': channel,
+                'price': price,
+                'sales': 10.0 + 2.0 * price + rng.normal()
+            })
+    return rows
+
+def test_origin_slices_match_prefix_fit(monkeypatch):
+    """한 번 변환한 행렬의 origin 슬라이스 = origin 이전 행만으로 적합/변환한 결과 (이후 등장 범주/그룹 없음)"""
+    data = _weekly_data()
+    features = ['channel', 'price']
+    fitted = []
+    states = []
+    
+    fit_origin = backtester_module._fit_origin
+    def record_fit(model_type, hyperparameters, X, y, group_codes, group_keys, order):
+        fitted.append((np.array(X), group_codes, group_keys, order))
+        return fit_origin(model_type, hyperparameters, X, y, group_codes, group_keys, order)
+    monkeypatch.setattr(backtester_module, '_fit_origin', record_fit)
+    
+    backtester = Backtester()
+    prepare_state = backtester.forecast_generator.prepare_state
+    def record_state(*args, **kwargs):
+        state = prepare_state(*args, **kwargs)
+        states.append(state)
+        return state
+    monkeypatch.setattr(backtester.forecast_generator, 'prepare_state', record_state)
+    
+    result = asyncio.run(backtester.run(
+        data, 'sales', features, 'rf_ar', 'week', ['store'],
+        hyperparameters={'n_estimators': 10}, horizon=3, n_origins=2, n_jobs=1
+    ))
+    
+    assert result['origins'] == ['17', '18']
+    df = pd.DataFrame(data)
+    generator = ForecastGenerator()
+    for (X, codes, keys, order), state, weeks in zip(fitted, states, [16, 17]):
+        train = df[df['week'] <= weeks].sort_values('week', kind='stable').reset_index(drop=True)
+        transformer = FeatureTransformer(features).fit(train, category_order='appearance')
+        np.testing.assert_array_equal(X, transformer.transform(train))
+        assert list(transformer.categories_['channel']) == ['c', 'b']
+        
+        expected_codes, expected_keys, expected_order = generator.series_index(train, 'week', ['store'])
+        np.testing.assert_array_equal(codes, expected_codes)
+        assert list(keys) == expected_keys == ['s2', 's1']
+        np.testing.assert_array_equal(order, expected_order)
+        
+        # 예측 시작 상태도 origin 이전 행만으로 만든 상태와 동일
+        expected = generator.prepare_state(train, 'sales', features, 'week', ['store'], transformer=transformer)
+        np.testing.assert_array_equal(state['X'], expected['X'])
+        assert state['group_positions'] == expected['group_positions']
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from app.main import app
+from app.dependencies import get_current_user
+from app.core.config import settings
+from app.api.v1 import analysis as analysis_api
+from app.api.v1 import visualizations as visualizations_api
+from app.services.visualization.chart_image_store import ChartImageStore
+from app.services.visualization.visualization_service import VisualizationService
+
+IMAGE_BYTES = b'\x89PNG\r\n\x1a\n' + b'chart' * 10
+
+class _Visualizations:
+    def __init__(self, docs):
+        self.docs = docs
+    
+    async def find_one(self, query):
+        return next((doc for doc in self.docs if doc['visualization_id'] == query['visualization_id']), None)
+
+class _AnalysisService:
+    """분석 작업 소유권 확인과 시각화 서비스만 사용"""
+    
+    def __init__(self, visualization_service):
+        self.visualization_service = visualization_service
+    
+    async def get_task_status(self, task_id, user_id):
+        return {'task_id': task_id} if user_id == 'user_test' else None
+
+@pytest.fixture
+def image_client(client, tmp_path, monkeypatch):
+    """이미지 저장소에 저장된 차트 이미지가 있는 시각화 문서 1개"""
+    service = VisualizationService()
+    service.chart_image_store.image_dir = str(tmp_path)
+    image_key = asyncio.run(service.chart_image_store.save(IMAGE_BYTES))
+    db = {'visualizations': _Visualizations([
+        {'visualization_id': 'viz_1', 'user_id': 'user_test', 'image_key': image_key}
+    ])}
+    
+    async def get_database():
+        return db
+    
+    monkeypatch.setattr(visualizations_api, 'get_database', get_database)
+    monkeypatch.setattr(analysis_api, 'get_database', get_database)
+    app.dependency_overrides[get_current_user] = lambda: {'user_id': 'user_test'}
+    app.dependency_overrides[visualizations_api.get_visualization_service] = lambda: service
+    app.dependency_overrides[analysis_api.get_analysis_service] = lambda: _AnalysisService(service)
+    yield client, image_key
+    app.dependency_overrides.clear()
+
+IMAGE_URLS = ['/visualizations/viz_1/image', '/analysis/task_1/visualizations/viz_1/image']
+
+def test_etag_matches():
+    """If-None-Match 비교 (강한/약한 태그, 목록, '*')"""
+    assert ChartImageStore.etag('abc') == '"abc"'
+    assert ChartImageStore.etag_matches('"abc"', 'abc')
+    assert ChartImageStore.etag_matches('W/"abc"', 'abc')
+    assert ChartImageStore.etag_matches('"other", W/"abc"', 'abc')
+    assert ChartImageStore.etag_matches('*', 'abc')
+    assert not ChartImageStore.etag_matches('"other"', 'abc')
+    assert not ChartImageStore.etag_matches('"abcd", W/"ab"', 'abc')
+    assert not ChartImageStore.etag_matches(None, 'abc')
+    assert not ChartImageStore.etag_matches('', 'abc')
+
+@pytest.mark.parametrize('url', IMAGE_URLS)
+def test_image_response_has_cache_headers(image_client, url):
+    """저장된 이미지 바이트와 ETag(이미지 키), Cache-Control 헤더 반환"""
+    client, image_key = image_client
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == IMAGE_BYTES
+    assert response.headers['content-type'] == 'image/png'
+    assert response.headers['etag'] == f'"{image_key}"'
+    assert response.headers['cache-control'] == f'private, max-age={settings.CHART_IMAGE_MAX_AGE}'
+
+@pytest.mark.parametrize('url', IMAGE_URLS)
+@pytest.mark.parametrize('if_none_match', ['"{key}"', 'W/"{key}"', '"stale", W/"{key}"'])
+def test_matching_if_none_match_returns_304(image_client, url, if_none_match):
+    """클라이언트 캐시와 같은 이미지면 본문 없이 304 (ETag 헤더 유지)"""
+    client, image_key = image_client
+    response = client.get(url, headers={'If-None-Match': if_none_match.format(key=image_key)})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == f'"{image_key}"'
+    assert response.headers['cache-control'] == f'private, max-age={settings.CHART_IMAGE_MAX_AGE}'
+
+@pytest.mark.parametrize('url', IMAGE_URLS)
+def test_mismatching_if_none_match_returns_image(image_client, url):
+    """다른 ETag면 이미지 바이트 반환"""
+    client, image_key = image_client
+    response = client.get(url, headers={'If-None-Match': '"stale", W/"other"'})
+    assert response.status_code == 200
+    assert response.content == IMAGE_BYTES
+    assert response.headers['etag'] == f'"{image_key}"'
@@ -0,0 +1,47 @@
+import math
+import numpy as np
+import pandas as pd
+from app.services.visualization.downsampling import downsample_frame, lttb_indices
+
+def _reference_lttb(x, y, threshold):
+    """원 논문(Steinarsson) 방식의 점 단위 LTTB 루프"""
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+def test_lttb_matches_reference_loop():
+    """구간 평균 누적합 + 배열 연산 결과 = 점 단위 루프 결과"""
+    rng = np.random.default_rng(0)
+    for n, threshold in [(1000, 100), (997, 37), (50, 49)]:
+        x = np.sort(rng.uniform(0, 100, n))
+        y = np.cumsum(rng.normal(size=n))
+        np.testing.assert_array_equal(lttb_indices(x, y, threshold), _reference_lttb(list(x), list(y), threshold))
+
+def test_short_series_and_dates():
+    """점 수가 max_points 이하면 전체 유지, 날짜 x는 시간 간격 기준"""
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), np.arange(10.0), 20), np.arange(10))
+    
+    dates = pd.date_range('2024-01-01', periods=500, freq='D')
+    y = np.sin(np.arange(500) / 20.0)
+    df = pd.DataFrame({'date': dates, 'sales': y})
+    df.loc[3, 'sales'] = np.nan
+    sampled = downsample_frame(df, 'date', 'sales', 60)
+    valid = df.dropna()
+    positions = (valid['date'] - dates[0]).dt.days.to_numpy(dtype=float)
+    expected = _reference_lttb(list(positions), list(valid['sales']), 60)
+    assert list(sampled.index) == list(valid.index[expected])
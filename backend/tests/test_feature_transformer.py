@@ -0,0 +1,60 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.streaming_trainer import StreamingTrainer
+
+def _rows(channels, seed):
+    """범주(channel) + 숫자(price) 피처와 선형 타겟"""
+    rng = np.random.default_rng(seed)
+    effect = {'b': 1.0, 'c': -1.0, 'a': 3.0, 'd': 0.5}
+    return [
+        {'channel': channel, 'price': float(price), 'sales': 5.0 + 2.0 * price + effect[channel] + float(noise)}
+        for channel, price, noise in zip(channels, rng.uniform(1, 5, len(channels)), rng.normal(scale=0.1, size=len(channels)))
+    ]
+
+def test_partial_fit_keeps_existing_codes():
+    """이후 배치의 새 범주는 끝에 추가 (기존 범주 코드는 그대로)"""
+    first = pd.DataFrame(_rows(['c', 'b', 'c'], 0))
+    second = pd.DataFrame(_rows(['d', 'a', 'b', 'a'], 1))
+    transformer = FeatureTransformer(['channel', 'price']).partial_fit(first)
+    before = transformer.transform(first)
+    
+    transformer.partial_fit(second)
+    assert list(transformer.categories_['channel']) == ['b', 'c', 'd', 'a']
+    np.testing.assert_array_equal(transformer.transform(first), before)
+    np.testing.assert_array_equal(transformer.transform(second)[:, 0], [2, 3, 0, 3])
+
+class _BatchRepository:
+    """저장된 CSV 배치를 순서대로 돌려주는 저장소"""
+    
+    def __init__(self, rows, batch_size):
+        self.batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    
+    async def iter_csv_batches(self, file_id, batch_size=5000):
+        for batch in self.batches:
+            yield batch
+
+def test_streaming_matches_full_refit():
+    """배치 스트리밍 학습 결과가 전체 데이터로 다시 학습한 선형 회귀와 거의 같음 (배치마다 새 범주 등장)"""
+    rng = np.random.default_rng(2)
+    channels = ['b', 'c'] * 150 + list(rng.choice(['a', 'b', 'c', 'd'], 600))
+    rows = _rows(channels, 3)
+    trainer = StreamingTrainer()
+    trainer.file_repository = _BatchRepository(rows, 300)
+    
+    model, metrics, transformer = asyncio.run(trainer.train(
+        'file', 'sales', ['channel', 'price'], hyperparameters={'max_iter': 30}, batch_size=300
+    ))
+    
+    # 범주 목록 = 전체 범주, 첫 배치 범주 코드는 유지
+    assert list(transformer.categories_['channel'][:2]) == ['b', 'c']
+    assert set(transformer.categories_['channel']) == {'a', 'b', 'c', 'd'}
+    
+    # 같은 인코딩으로 전체 재학습한 결과와 비교 (범주 코드는 선형 피처이므로 같은 설계 행렬 기준)
+    df = pd.DataFrame(rows)
+    X = transformer.transform(df)
+    refit = LinearRegression().fit(X, df['sales'])
+    np.testing.assert_allclose(model.predict(X), refit.predict(X), atol=0.1 * df['sales'].std())
+    assert metrics['r2'] > 0.5
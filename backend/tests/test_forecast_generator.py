@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.feature.lag_feature_generator import LagFeatureGenerator
+from app.services.prediction.forecast_generator import ForecastGenerator
+
+SUFFIX = LagFeatureGenerator.ROLLING_SUFFIX
+WINDOW = LagFeatureGenerator.ROLLING_WINDOW
+
+class _LinearModel:
+    """고정 계수 선형 모델 (피처별 계수가 모두 달라 피처 갱신 오류가 예측값에 드러남)"""
+    
+    def __init__(self, num_features):
+        self.coef = np.linspace(0.3, -0.2, num_features) + 0.05
+    
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef + 1.5
+
+def _weekly_data():
+    """격주(주차 간격 2) x 매장별 길이가 다른 시계열 (s2는 윈도우보다 짧음), 행 순서는 섞음"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for store, length in [('s1', 10), ('s2', 3), ('s3', 6)]:
+        for i in range(length):
+            rows.append({
+                'week': 2 * (i + 1),
+                'store': store,
+                'price': float(rng.uniform(1, 5)),
+                'sales': float(rng.uniform(5, 15))
+            })
+    df = pd.DataFrame(rows)
+    # LagFeatureGenerator와 같은 방식의 4주 합산 피처 (이전 1~4개 관측값 합, 없으면 0)
+    for col in ['price', 'sales']:
+        grouped = df.groupby('store', sort=False)[col]
+        df[f'{col}{SUFFIX}'] = sum(grouped.shift(k).fillna(0.0) for k in range(1, WINDOW + 1))
+    return df.sample(frac=1.0, random_state=1).reset_index(drop=True)
+
+def _step_by_step(model, df, features, target_column, periods, date_step):
+    """그룹별로 한 시점씩 예측하는 기준 구현"""
+    results = {}
+    for store, group in df.sort_values('week', kind='stable').groupby('store', sort=False):
+        last = group.iloc[-1]
+        history = {
+            feature[:-len(SUFFIX)]: list(group[feature[:-len(SUFFIX)]])
+            for feature in features if feature.endswith(SUFFIX)
+        }
+        predictions = []
+        for step in range(periods):
+            # 마지막 행 피처는 FeatureTransformer와 같이 float32로 변환된 값
+            x = last[features].to_numpy(dtype=np.float32).astype(float)
+            for j, feature in enumerate(features):
+                if feature.endswith(SUFFIX):
+                    x[j] = sum(history[feature[:-len(SUFFIX)]][-WINDOW:])
+                elif feature == 'week':
+                    x[j] = last['week'] + date_step * (step + 1)
+            prediction = float(model.predict(x[None, :])[0])
+            predictions.append(prediction)
+            for base, values in history.items():
+                values.append(prediction if base == target_column else float(last[base]))
+        results[store] = predictions
+    return results
+
+@pytest.mark.parametrize('features', [
+    ['week', 'price', f'price{SUFFIX}', f'sales{SUFFIX}'],  # 타겟 Lag 피처 있음: 시점별 재귀 예측
+    ['week', 'price', f'price{SUFFIX}']                      # 타겟 Lag 피처 없음: 전체 시점을 쌓아 한 번에 예측
+])
+def test_run_state_matches_step_by_step_loop(features):
+    """run_state = 그룹별 단계 예측 (4주 합산 윈도우 갱신, 날짜 전진, 타겟 예측값 피드백)"""
+    df = _weekly_data()
+    model = _LinearModel(len(features))
+    periods = 6
+    generator = ForecastGenerator()
+    
+    state = generator.prepare_state(df.to_dict('records'), 'sales', features, 'week', ['store'])
+    values = generator.run_state(model, state, periods)
+    
+    assert state['date_step'] == 2.0
+    expected = _step_by_step(model, df, features, 'sales', periods, date_step=2.0)
+    keys = [state['group_keys'][g] for g in state['present_groups']]
+    assert sorted(keys) == ['s1', 's2', 's3']
+    np.testing.assert_allclose(values, np.array([expected[key] for key in keys]), rtol=1e-9, atol=1e-9)
+
+def test_run_state_rows_select_and_repeat_groups():
+    """rows로 고른(중복 포함) 행의 예측 = 전체 예측의 해당 행"""
+    df = _weekly_data()
+    features = ['week', 'price', f'price{SUFFIX}', f'sales{SUFFIX}']
+    model = _LinearModel(len(features))
+    generator = ForecastGenerator()
+    state = generator.prepare_state(df.to_dict('records'), 'sales', features, 'week', ['store'])
+    
+    full = generator.run_state(model, state, 4)
+    rows = np.array([2, 0, 2])
+    np.testing.assert_allclose(generator.run_state(model, state, 4, rows=rows), full[rows])
+    # 상태(윈도우, 마지막 피처 행)는 예측 후에도 변하지 않음
+    np.testing.assert_allclose(generator.run_state(model, state, 4), full)
@@ -0,0 +1,85 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.correlation.group_correlation import GroupCorrelationPool, segment_correlations
+
+def _group_data():
+    """그룹 코드가 섞인 (타겟 + 피처 2개) 배열, 결측값/작은 그룹/빈 그룹 포함"""
+    rng = np.random.default_rng(0)
+    n = 2000
+    codes = rng.integers(0, 40, n)
+    codes[codes == 7] = 8
+    codes[np.flatnonzero(codes == 3)[2:]] = 4
+    values = rng.normal(size=(n, 3))
+    values[:, 0] += codes * 0.1 * values[:, 1]
+    values[rng.random((n, 3)) < 0.05] = np.nan
+    return values, codes
+
+def _expected(values, codes, num_groups, min_rows=3):
+    """그룹별 pandas 상관계수 (그룹 행 수 min_rows 미만은 NaN)"""
+    expected = np.full((num_groups, values.shape[1] - 1), np.nan)
+    df = pd.DataFrame(values)
+    for code, group in df.groupby(codes):
+        if len(group) < min_rows:
+            continue
+        for j in range(1, values.shape[1]):
+            expected[code, j - 1] = group[0].corr(group[j])
+    return expected
+
+def test_segment_correlations_match_groupby():
+    """reduceat 구간 계산 = 그룹별 pandas 상관계수"""
+    values, codes = _group_data()
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes, minlength=40)
+    present = np.flatnonzero(sizes)
+    starts = np.concatenate([[0], np.cumsum(sizes[present])[:-1]])
+    result = segment_correlations(values[order], starts)
+    np.testing.assert_allclose(result, _expected(values, codes, 40)[present], rtol=1e-10, equal_nan=True)
+
+@pytest.mark.parametrize('parallel_min_rows', [10 ** 9, 0])
+def test_pool_matches_groupby(parallel_min_rows):
+    """현재 프로세스 계산/공유 메모리 프로세스 풀 계산 모두 그룹별 pandas 상관계수와 동일"""
+    values, codes = _group_data()
+    try:
+        result = asyncio.run(GroupCorrelationPool().correlate(
+            values, codes, 40, parallel_min_rows=parallel_min_rows, max_workers=2
+        ))
+    finally:
+        GroupCorrelationPool.shutdown()
+    np.testing.assert_allclose(result, _expected(values, codes, 40), rtol=1e-10, equal_nan=True)
+
+def test_service_uses_pool_with_default_settings(monkeypatch):
+    """기본 설정에서 메모리 경로가 로드할 수 있는 행 수(스트리밍 기준 이하)로 프로세스 풀 경로에 도달"""
+    from app.core.config import settings
+    from app.services.correlation.correlation_service import CorrelationService
+    
+    rng = np.random.default_rng(3)
+    n = settings.CORRELATION_STREAMING_ROW_THRESHOLD
+    data = pd.DataFrame({
+        'product': rng.choice([f'p{i}' for i in range(30)], n),
+        'price': rng.normal(size=n),
+        'channel': rng.choice(['online', 'offline'], n)
+    })
+    data['sales'] = 2.0 * data['price'] + rng.normal(size=n)
+    
+    used_pool = []
+    get_executor = GroupCorrelationPool.get_executor.__func__
+    def record_executor(cls, max_workers=None):
+        used_pool.append(max_workers)
+        return get_executor(cls, 2)
+    monkeypatch.setattr(GroupCorrelationPool, 'get_executor', classmethod(record_executor))
+    
+    service = CorrelationService()
+    try:
+        result = asyncio.run(service._calculate_correlations_by_group(
+            data.to_dict('records'), 'sales', ['price', 'channel'], 'product'
+        ))
+    finally:
+        GroupCorrelationPool.shutdown()
+    
+    assert used_pool
+    channel = pd.Series(pd.factorize(data['channel'], sort=True)[0], index=data.index)
+    for product, group in data.groupby('product'):
+        assert np.isclose(result[product]['price'], group['sales'].corr(group['price']), rtol=1e-10)
+        assert np.isclose(result[product]['channel'], group['sales'].corr(channel[group.index]), rtol=1e-10)
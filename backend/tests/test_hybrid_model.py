@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from app.services.prediction.hybrid_model import RandomForestARModel, fit_ar_batched
+
+def _reference_ar(series, order, ridge=1e-3):
+    """그룹별 루프 ridge 최소제곱 (결측 시점 제외, 절편은 정규화하지 않음)"""
+    coef = np.zeros((len(series), order))
+    intercept = np.zeros(len(series))
+    for g, values in enumerate(series):
+        rows, targets = [], []
+        for t in range(order, len(values)):
+            window = values[t - order:t][::-1]
+            if not np.isnan(values[t]) and not np.isnan(window).any():
+                rows.append(np.concatenate([[1.0], window]))
+                targets.append(values[t])
+        if len(rows) < 2 * order + 1:
+            continue
+        design = np.array(rows)
+        penalty = np.diag([0.0] + [ridge * len(rows)] * order)
+        beta = np.linalg.solve(design.T @ design + penalty, design.T @ np.array(targets))
+        intercept[g], coef[g] = beta[0], beta[1:]
+        if np.abs(coef[g]).sum() > 0.95:
+            coef[g] *= 0.95 / np.abs(coef[g]).sum()
+    return coef, intercept
+
+def test_batched_ar_matches_group_loop():
+    """배치 정규방정식 해 = 그룹별 ridge 최소제곱 해 (결측/짧은 그룹/발산 계수 축소 포함)"""
+    rng = np.random.default_rng(0)
+    series = np.zeros((5, 60))
+    for g, phi in enumerate([0.6, -0.4, 0.2, 0.99, 0.0]):
+        noise = rng.normal(size=60)
+        for t in range(1, 60):
+            series[g, t] = phi * series[g, t - 1] + noise[t]
+    series[rng.random(series.shape) < 0.1] = np.nan
+    series[4, 5:] = np.nan
+    
+    coef, intercept = fit_ar_batched(series, 2)
+    expected_coef, expected_intercept = _reference_ar(series, 2)
+    np.testing.assert_allclose(coef, expected_coef, atol=1e-10)
+    np.testing.assert_allclose(intercept, expected_intercept, atol=1e-10)
+    assert coef[0, 0] > 0.3 and coef[1, 0] < -0.2
+    assert not coef[4].any()
+
+def test_residual_state_and_forecast():
+    """새 기간 잔차로 최근 잔차 상태 갱신 후, 잔차 예측 = AR 점화식 직접 계산"""
+    rng = np.random.default_rng(1)
+    n_weeks, groups = 30, ['a', 'b']
+    codes = np.repeat([0, 1], n_weeks)
+    order = np.tile(np.arange(n_weeks, dtype=float), 2)
+    X = rng.normal(size=(len(codes), 3))
+    y = 3.0 * X[:, 0] + np.sin(order / 3.0) * (codes + 1) + rng.normal(scale=0.1, size=len(codes))
+    train = order < 25
+    
+    model = RandomForestARModel(ar_order=2, n_estimators=30, random_state=0)
+    model.fit(X[train], y[train], group_codes=codes[train], group_keys=groups, order=order[train])
+    # 새 기간 데이터: 그룹 코드 순서가 학습 때와 다르고, 학습 때 없던 그룹 포함
+    new = ~train
+    new_keys = ['b', 'a', 'z']
+    new_codes = np.where(codes[new] == 0, 1, 0)
+    new_codes[:2] = 2
+    model.update_residual_state(X[new], y[new], group_codes=new_codes, group_keys=new_keys, order=order[new])
+    
+    residuals = pd.Series(y[new] - model.predict(X[new]))
+    for key, row in model.group_index_.items():
+        last = residuals[(np.array(new_keys)[new_codes] == key)].to_numpy()[-2:]
+        np.testing.assert_allclose(model.last_residuals_[row], last)
+    
+    forecast = model.residual_forecast(['b', 'z', 'a'], 4)
+    assert not forecast[1].any()
+    for i, key in [(0, 'b'), (2, 'a')]:
+        row = model.group_index_[key]
+        state = list(model.last_residuals_[row])
+        for step in range(4):
+            value = model.ar_intercept_[row] + model.ar_coef_[row, 0] * state[-1] + model.ar_coef_[row, 1] * state[-2]
+            assert np.isclose(forecast[i, step], value)
+            state.append(value)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from app.core.config import settings
+from app.services.prediction.incremental_updater import IncrementalUpdater
+from app.services.prediction.streaming_model import StreamingSGDModel
+
+@pytest.fixture
+def linear_data():
+    """선형 관계 + 잡음 데이터 (시간 순서 포함)"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = X @ np.array([1.5, -2.0, 0.5, 3.0]) + 4.0 + rng.normal(scale=0.3, size=300)
+    order = np.arange(300, dtype=float)
+    return X, y, order
+
+def test_linear_update_matches_full_refit(linear_data):
+    """학습 시 저장한 충분통계량 + 새 행 업데이트 = 학습 행과 새 행 전체로 다시 학습한 해"""
+    X, y, order = linear_data
+    updater = IncrementalUpdater()
+    model = LinearRegression().fit(X[:200], y[:200])
+    state = updater.initial_state(model, X[:200], y[:200], order[:200])
+    
+    # 두 번 나눠 추가 (두 번째 업데이트는 첫 업데이트 결과를 기준으로 함)
+    model, state = updater.update(model, state, X[:250], y[:250], np.arange(200, 250), np.arange(250))
+    model, state = updater.update(model, state, X, y, np.arange(250, 300), np.arange(300))
+    
+    refit = LinearRegression().fit(X, y)
+    np.testing.assert_allclose(model.coef_, refit.coef_, rtol=1e-8)
+    assert model.intercept_ == pytest.approx(refit.intercept_, rel=1e-8)
+    assert state['linear_stats']['rows'] == 300
+
+def test_linear_update_requires_training_stats(linear_data):
+    """학습 시 충분통계량이 없는 선형 모델은 증분 업데이트하지 않음 (전체 재학습)"""
+    X, y, _ = linear_data
+    model = LinearRegression().fit(X, y)
+    assert not IncrementalUpdater().supports(model, {'trained_until': 1.0})
+
+def test_reference_rmse_recorded_at_training(linear_data):
+    """기준 오차는 학습 직후 leave-one-out 잔차로 기록 (직접 한 행씩 빼고 학습한 결과와 동일)"""
+    X, y, order = linear_data
+    X, y, order = X[:60], y[:60], order[:60]
+    model = LinearRegression().fit(X, y)
+    state = IncrementalUpdater().initial_state(model, X, y, order)
+    
+    errors = []
+    for i in range(len(y)):
+        keep = np.arange(len(y)) != i
+        errors.append(y[i] - LinearRegression().fit(X[keep], y[keep]).predict(X[i:i + 1])[0])
+    assert state['reference_source'] == 'leave_one_out'
+    assert state['reference_rmse'] == pytest.approx(np.sqrt(np.mean(np.square(errors))), rel=1e-8)
+
+def test_out_of_bag_reference_matches_sklearn(linear_data):
+    """랜덤 포레스트 기준 오차는 sklearn out-of-bag 예측의 RMSE와 동일"""
+    X, y, order = linear_data
+    forest = RandomForestRegressor(n_estimators=30, oob_score=True, random_state=0).fit(X, y)
+    state = IncrementalUpdater().initial_state(forest, X, y, order)
+    
+    expected = np.sqrt(np.mean((y - forest.oob_prediction_) ** 2))
+    assert state['reference_source'] == 'out_of_bag'
+    assert state['reference_rmse'] == pytest.approx(expected, rel=1e-6)
+
+def _holdout_rmse(model, X, y):
+    return float(np.sqrt(np.mean((y - model.predict(X)) ** 2)))
+
+def test_forest_update_tracks_level_shift(linear_data):
+    """수준이 바뀐 뒤 트리 추가 업데이트는 기존 모델보다 낫고 전체 재학습보다 나쁘지 않음 (트리 수 상한/원본 모델 유지)"""
+    X, y, order = linear_data
+    y = y + np.where(order >= 150, 5.0, 0.0)
+    test = slice(250, 300)
+    forest = RandomForestRegressor(n_estimators=20, random_state=0).fit(X[:150], y[:150])
+    updater = IncrementalUpdater()
+    state = updater.initial_state(forest, X[:150], y[:150], order[:150])
+    
+    updated = forest
+    for end in [200, 250]:
+        updated, state = updater.update(updated, state, X, y, np.arange(end - 50, end), np.arange(end - 100, end))
+    
+    refit = RandomForestRegressor(n_estimators=20, random_state=0).fit(X[:250], y[:250])
+    assert len(forest.estimators_) == 20
+    assert len(updated.estimators_) <= int(20 * settings.PREDICTION_MAX_TREE_RATIO)
+    assert _holdout_rmse(updated, X[test], y[test]) < _holdout_rmse(forest, X[test], y[test])
+    assert _holdout_rmse(updated, X[test], y[test]) <= _holdout_rmse(refit, X[test], y[test])
+
+def test_sgd_update_close_to_full_refit(linear_data):
+    """SGD partial_fit 업데이트의 평가 오차가 전체 재학습과 비슷함"""
+    X, y, order = linear_data
+    test = slice(250, 300)
+    model = StreamingSGDModel(max_iter=20).fit(X[:200], y[:200])
+    updated, _ = IncrementalUpdater().update(model, {}, X, y, np.arange(200, 250), np.arange(250))
+    
+    refit = StreamingSGDModel(max_iter=20).fit(X[:250], y[:250])
+    assert _holdout_rmse(updated, X[test], y[test]) < 1.2 * _holdout_rmse(refit, X[test], y[test])
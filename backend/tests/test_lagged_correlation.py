@@ -0,0 +1,46 @@
+import numpy as np
+from app.services.correlation.lagged_correlation import lagged_cross_correlations, peak_lags
+
+def _weekly_values():
+    """(그룹 3 x 주 40 x (타겟 + 피처 2)) 배열, 피처 0은 타겟보다 3주 먼저 움직임"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(3, 40, 3))
+    values[:, 3:, 0] += 2.0 * values[:, :-3, 1]
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return values
+
+def _reference(values, max_lag, min_periods):
+    """시차별 직접 합산 (시계열 평균으로 중심화, 겹치는 관측 주만 사용)"""
+    num_groups, num_weeks, num_channels = values.shape
+    sums = np.zeros((num_groups, num_channels - 1, max_lag + 1, 4))
+    for g in range(num_groups):
+        centered = values[g] - np.nanmean(values[g], axis=0)
+        for j in range(1, num_channels):
+            for k in range(max_lag + 1):
+                x, y = centered[:num_weeks - k, j], centered[k:, 0]
+                pairs = ~np.isnan(x) & ~np.isnan(y)
+                sums[g, j - 1, k] = [(x * y)[pairs].sum(), (x * x)[pairs].sum(), (y * y)[pairs].sum(), pairs.sum()]
+    valid = sums[..., 3] >= min_periods
+    group_corr = np.where(valid, sums[..., 0] / np.sqrt(sums[..., 1] * sums[..., 2]), np.nan)
+    pooled = np.where(valid[..., None], sums, 0.0).sum(axis=0)
+    pooled_corr = np.where(pooled[..., 3] >= min_periods, pooled[..., 0] / np.sqrt(pooled[..., 1] * pooled[..., 2]), np.nan)
+    return group_corr, pooled_corr
+
+def test_fft_matches_direct_sums():
+    """FFT 일괄 계산 = 시차별 직접 합산 (그룹 청크 분할과 무관)"""
+    values = _weekly_values()
+    expected_group, expected_pooled = _reference(values, 8, 4)
+    for max_chunk_bytes in [64 * 1024 * 1024, 1]:
+        group_corr, pooled_corr = lagged_cross_correlations(values, max_lag=8, min_periods=4, max_chunk_bytes=max_chunk_bytes)
+        np.testing.assert_allclose(group_corr, expected_group, atol=1e-10, equal_nan=True)
+        np.testing.assert_allclose(pooled_corr, expected_pooled, atol=1e-10, equal_nan=True)
+    
+    # 선행 관계가 있는 피처의 최대 시차
+    assert peak_lags(pooled_corr, ['lead', 'noise'])['lead']['peak_lag'] == 3
+
+def test_lag_zero_without_missing_is_pearson():
+    """결측이 없으면 lag 0 값은 피어슨 상관계수"""
+    values = np.random.default_rng(1).normal(size=(2, 30, 2))
+    group_corr, _ = lagged_cross_correlations(values, max_lag=2)
+    for g in range(2):
+        assert np.isclose(group_corr[g, 0, 0], np.corrcoef(values[g, :, 0], values[g, :, 1])[0, 1])
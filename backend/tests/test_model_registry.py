@@ -0,0 +1,103 @@
+import asyncio
+from app.core.config import settings
+from app.services.prediction import model_registry_repository as repository_module
+from app.services.prediction.model_registry import ModelRegistry
+
+def _matches(doc, query):
+    """MongoDB 조회 조건 일부 ($in)"""
+    for field, condition in query.items():
+        value = doc.get(field)
+        if isinstance(condition, dict):
+            if value not in condition['$in']:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+    
+    def skip(self, count):
+        self.docs = self.docs[count:]
+        return self
+    
+    async def to_list(self, length=None):
+        return [dict(doc) for doc in self.docs]
+
+class _Collection:
+    def __init__(self):
+        self.docs = []
+    
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+    
+    async def find_one(self, query, sort=None):
+        docs = _Cursor([doc for doc in self.docs if _matches(doc, query)])
+        for field, direction in sort or []:
+            docs.sort(field, direction)
+        return dict(docs.docs[0]) if docs.docs else None
+    
+    def find(self, query, projection=None):
+        return _Cursor([doc for doc in self.docs if _matches(doc, query)])
+    
+    async def update_one(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                doc.update(update['$set'])
+                return
+    
+    async def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if not _matches(doc, query)]
+    
+    async def distinct(self, field, query):
+        return list({doc.get(field) for doc in self.docs if _matches(doc, query)})
+
+class _Database(dict):
+    def __missing__(self, name):
+        self[name] = _Collection()
+        return self[name]
+
+def test_register_keeps_models_referenced_by_predictions(tmp_path, monkeypatch):
+    """이전 모델 정리 시 예측 결과가 참조하는 모델은 시나리오 분석에 쓸 수 있도록 남긴다"""
+    db = _Database()
+    
+    async def get_database():
+        return db
+    
+    monkeypatch.setattr(repository_module, 'get_database', get_database)
+    monkeypatch.setattr(settings, 'MODEL_REGISTRY_KEEP_VERSIONS', 2)
+    registry = ModelRegistry()
+    registry.model_dir = str(tmp_path)
+    
+    async def run():
+        model_ids = []
+        for version in range(4):
+            meta = await registry.register(
+                registry_key=f'key_{version}', file_id='file_1', user_id='user_test',
+                target_column='sales', data_version=version, features=['price'],
+                model_type='linear', hyperparameters={}, metrics={},
+                model={'coef': version}, lineage_key='lineage_1'
+            )
+            model_ids.append(meta['model_id'])
+            if version == 0:
+                # 첫 모델로 만든 예측 결과 (이후 재학습으로 대체됨)
+                await db['predictions'].insert_one({'prediction_id': 'pred_1', 'model_id': meta['model_id']})
+        
+        ModelRegistry._cache.clear()
+        return model_ids, [await registry.get_by_model_id(model_id) for model_id in model_ids]
+    
+    model_ids, loaded = asyncio.run(run())
+    
+    assert [entry is not None for entry in loaded] == [True, False, True, True]
+    assert loaded[0][1]['model'] == {'coef': 0}
+    assert sorted(doc['model_id'] for doc in db['model_registry'].docs) == sorted(
+        [model_ids[0], model_ids[2], model_ids[3]]
+    )
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f'{model_id}.joblib' for model_id in [model_ids[0], model_ids[2], model_ids[3]]
+    )
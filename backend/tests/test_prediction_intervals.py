@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from app.core.config import settings
+from app.services.prediction.incremental_updater import IncrementalUpdater
+from app.services.prediction.prediction_intervals import PredictionIntervalEstimator
+
+@pytest.fixture
+def series_data():
+    """시점당 3행(그룹)인 40개 시점 데이터"""
+    rng = np.random.default_rng(1)
+    order = np.repeat(np.arange(40, dtype=float), 3)
+    X = rng.normal(size=(len(order), 3))
+    y = X @ np.array([2.0, -1.0, 0.5]) + rng.normal(scale=0.2, size=len(order))
+    return X, y, order
+
+def test_forest_calibration_needs_no_refit(series_data):
+    """랜덤 포레스트는 트리별 예측을 쓰므로 복제 학습(holdout)을 하지 않음"""
+    X, y, order = series_data
+    forest = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    calibration, holdout = PredictionIntervalEstimator().calibrate(forest, X, y, order)
+    assert calibration == {'method': 'ensemble'}
+    assert holdout is None
+
+def test_conformal_calibration_uses_time_ordered_holdout(series_data):
+    """conformal 잔차는 마지막 시점들을 제외하고 학습한 모델의 holdout 잔차"""
+    X, y, order = series_data
+    calibration, (residuals, holdout_order) = PredictionIntervalEstimator().calibrate(LinearRegression(), X, y, order)
+    
+    holdout_periods = int(40 * settings.PREDICTION_INTERVAL_CALIBRATION_FRACTION)
+    holdout = order >= 40 - holdout_periods
+    expected = y[holdout] - LinearRegression().fit(X[~holdout], y[~holdout]).predict(X[holdout])
+    np.testing.assert_allclose(residuals, expected)
+    np.testing.assert_array_equal(holdout_order, order[holdout])
+    assert calibration['method'] == 'conformal'
+    assert np.all(np.diff(calibration['residuals']) >= 0)
+
+def test_reference_error_reuses_calibration_holdout(series_data, monkeypatch):
+    """구간 보정에서 계산한 holdout 잔차가 있으면 기준 오차 계산 시 다시 학습하지 않음"""
+    X, y, order = series_data
+    model = HistGradientBoostingRegressor(max_iter=10).fit(X, y)
+    holdout = (np.array([1.0, -2.0, 2.0]), np.array([39.0, 39.0, 39.0]))
+    updater = IncrementalUpdater()
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("holdout을 다시 계산하면 안 됩니다")
+    
+    monkeypatch.setattr(updater.interval_estimator, 'holdout_residuals', fail)
+    state = updater.initial_state(model, X, y, order, holdout=holdout)
+    assert state['reference_source'] == 'holdout'
+    assert state['reference_rmse'] == pytest.approx(np.sqrt(3.0))
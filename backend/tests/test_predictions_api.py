@@ -0,0 +1,62 @@
+import sys
+import pytest
+from app.main import app
+from app.dependencies import get_current_user
+from app.api.v1.predictions import get_prediction_service
+from app.services.prediction.prediction_service import PredictionService
+
+@pytest.fixture
+def auth_client(client):
+    """인증을 통과한 테스트 클라이언트"""
+    app.dependency_overrides[get_current_user] = lambda: {'user_id': 'user_test'}
+    yield client
+    app.dependency_overrides.clear()
+
+def test_create_prediction_invalid_group_mode_returns_400(auth_client):
+    """잘못된 요청 조합(auto + per_group)은 500이 아니라 400"""
+    app.dependency_overrides[get_prediction_service] = PredictionService
+    response = auth_client.post("/predictions/predict", json={
+        "file_id": "file_test",
+        "features": ["price"],
+        "model_type": "auto",
+        "forecast_periods": 7,
+        "group_mode": "per_group"
+    })
+    assert response.status_code == 400
+    assert "per_group" in response.json()["detail"]
+
+def test_create_prediction_unexpected_error_returns_500(auth_client):
+    """서비스 내부 오류는 500"""
+    class FailingService:
+        async def create_prediction(self, **kwargs):
+            raise RuntimeError("boom")
+    
+    app.dependency_overrides[get_prediction_service] = FailingService
+    response = auth_client.post("/predictions/predict", json={
+        "file_id": "file_test",
+        "features": ["price"],
+        "model_type": "linear",
+        "forecast_periods": 7
+    })
+    assert response.status_code == 500
+
+def test_create_prediction_xgboost_not_installed_returns_400(auth_client, monkeypatch):
+    """xgboost 패키지가 없을 때 model_type=xgboost는 400"""
+    from app.services.prediction.model_trainer import ModelTrainer
+    
+    # None으로 등록된 모듈은 import 시 ImportError 발생
+    monkeypatch.setitem(sys.modules, 'xgboost', None)
+    
+    class TrainingService:
+        async def create_prediction(self, model_type, **kwargs):
+            ModelTrainer().build_model(model_type)
+    
+    app.dependency_overrides[get_prediction_service] = TrainingService
+    response = auth_client.post("/predictions/predict", json={
+        "file_id": "file_test",
+        "features": ["price"],
+        "model_type": "xgboost",
+        "forecast_periods": 7
+    })
+    assert response.status_code == 400
+    assert "xgboost" in response.json()["detail"]
@@ -0,0 +1,179 @@
+import asyncio
+import pandas as pd
+import pytest
+from pymongo.errors import DuplicateKeyError
+from app.services.file import product_aggregate_repository as repository_module
+from app.services.file.product_aggregate_repository import ProductAggregateRepository
+from app.services.file.product_aggregator import ProductAggregator
+
+KEY_FIELDS = ['file_id', 'group_column', 'target_column']
+UNIQUE = {
+    'product_aggregates': KEY_FIELDS,
+    'product_summaries': KEY_FIELDS + ['generation', 'product'],
+    'product_series': KEY_FIELDS + ['generation', 'product', 'period']
+}
+
+def _matches(doc, query):
+    """MongoDB 조회 조건 일부 ($or, $lt, $in, None = 필드 없음)"""
+    for field, condition in query.items():
+        if field == '$or':
+            if not any(_matches(doc, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            if '$lt' in condition and not (value is not None and value < condition['$lt']):
+                return False
+            if '$in' in condition and value not in condition['$in']:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def sort(self, spec, direction=None):
+        spec = [(spec, direction)] if isinstance(spec, str) else spec
+        for field, order in reversed(spec):
+            self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=order < 0)
+        return self
+    
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+    
+    async def to_list(self, length=None):
+        await asyncio.sleep(0)
+        return [dict(doc) for doc in self.docs]
+
+class _Collection:
+    """비동기 호출마다 다른 작업에 양보하는 메모리 컬렉션 (고유 인덱스 검사 포함)"""
+    
+    def __init__(self, name):
+        self.unique = UNIQUE[name]
+        self.docs = []
+    
+    def _check_unique(self, doc):
+        key = [doc.get(field) for field in self.unique]
+        if any([other.get(field) for field in self.unique] == key for other in self.docs):
+            raise DuplicateKeyError('duplicate key')
+    
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)
+        return next((dict(doc) for doc in self.docs if _matches(doc, query)), None)
+    
+    def find(self, query, projection=None):
+        return _Cursor([doc for doc in self.docs if _matches(doc, query)])
+    
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(0)
+        for doc in docs:
+            self._check_unique(doc)
+            self.docs.append(dict(doc))
+    
+    async def delete_many(self, query):
+        await asyncio.sleep(0)
+        self.docs = [doc for doc in self.docs if not _matches(doc, query)]
+    
+    async def update_one(self, query, update, upsert=False):
+        await asyncio.sleep(0)
+        doc = next((doc for doc in self.docs if _matches(doc, query)), None)
+        if doc is None:
+            if not upsert:
+                return
+            doc = {field: value for field, value in query.items() if not field.startswith('$')}
+            self._check_unique(doc)
+            self.docs.append(doc)
+        doc.update(update.get('$set', {}))
+        for field, value in update.get('$inc', {}).items():
+            doc[field] = doc.get(field, 0) + value
+    
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            await self.update_one(op._filter, op._doc, upsert=op._upsert)
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = {name: _Collection(name) for name in UNIQUE}
+    async def get_database():
+        return db
+    monkeypatch.setattr(repository_module, 'get_database', get_database)
+    return db
+
+def _aggregator(version=1):
+    aggregator = ProductAggregator()
+    class _FileRepository:
+        async def get_data_version(self, file_id):
+            return version
+    aggregator.file_repository = _FileRepository()
+    return aggregator
+
+def _frame(scale=1.0):
+    return pd.DataFrame({
+        'product': ['p1', 'p2', 'p1', 'p3'],
+        'date': ['2024-01-01', '2024-01-02', '2024-01-09', '2024-01-03'],
+        'sales': [1.0 * scale, 2.0 * scale, 3.0 * scale, 4.0 * scale]
+    })
+
+def test_concurrent_rebuilds_keep_one_generation(fake_db):
+    """같은 집계를 동시에 다시 계산해도 고유 키 충돌 없이 한 세대만 남음 (이전 버전 문서 포함 정리)"""
+    key = {'file_id': 'f', 'group_column': 'product', 'target_column': 'sales'}
+    fake_db['product_aggregates'].docs.append({**key, 'date_column': 'date', 'period': 'D', 'data_version': 0})
+    fake_db['product_summaries'].docs.append({**key, 'product': 'old', 'count': 1, 'sum': 1.0})
+    
+    async def rebuild_twice():
+        await asyncio.gather(*[
+            _aggregator().build('f', 'sales', 'product', 'date', _frame()) for _ in range(2)
+        ])
+    asyncio.run(rebuild_twice())
+    
+    state = fake_db['product_aggregates'].docs
+    assert len(state) == 1 and state[0]['data_version'] == 1
+    generations = {doc['generation'] for name in ('product_summaries', 'product_series') for doc in fake_db[name].docs}
+    assert generations == {state[0]['generation']}
+    summaries = asyncio.run(ProductAggregateRepository().get_summaries('f', 'product', 'sales'))
+    assert [(doc['product'], doc['count']) for doc in summaries] == [('p1', 2), ('p2', 1), ('p3', 1)]
+
+def test_readers_see_previous_generation_during_rebuild(fake_db):
+    """재계산 중 (새 세대 저장 후 전환 전) 조회는 이전 세대 전체를 읽음"""
+    asyncio.run(_aggregator(1).build('f', 'sales', 'product', 'date', _frame()))
+    repository = ProductAggregateRepository()
+    seen = []
+    insert_many = fake_db['product_series'].insert_many
+    async def read_while_inserting(docs, ordered=True):
+        await insert_many(docs, ordered)
+        seen.append(await repository.get_summaries('f', 'product', 'sales'))
+    fake_db['product_series'].insert_many = read_while_inserting
+    
+    asyncio.run(_aggregator(2).build('f', 'sales', 'product', 'date', _frame(10.0)))
+    assert [doc['sum'] for doc in seen[0]] == [4.0, 2.0, 4.0]
+    assert [doc['sum'] for doc in asyncio.run(repository.get_summaries('f', 'product', 'sales'))] == [40.0, 20.0, 40.0]
+
+def test_older_rebuild_does_not_replace_newer(fake_db, monkeypatch):
+    """먼저 시작했지만 늦게 끝난 재계산은 버리고 새 세대를 유지"""
+    repository = ProductAggregateRepository()
+    clock = iter([100, 200])
+    monkeypatch.setattr(repository_module.time, 'time_ns', lambda: next(clock))
+    docs = [{'product': 'p1', 'count': 1, 'sum': 1.0, 'first_period': None, 'last_period': None}]
+    
+    insert_many = fake_db['product_summaries'].insert_many
+    async def run():
+        newer_done = asyncio.Event()
+        async def insert_after_newer(docs, ordered=True):
+            # 먼저 시작한 세대(100)는 새 세대가 전환될 때까지 저장이 끝나지 않음
+            if docs[0]['generation'] == 100:
+                await newer_done.wait()
+            await insert_many(docs, ordered)
+        fake_db['product_summaries'].insert_many = insert_after_newer
+        
+        older_task = asyncio.ensure_future(repository.replace('f', 'product', 'sales', docs, [], None, 'D', 1))
+        await asyncio.sleep(0)
+        published_newer = await repository.replace('f', 'product', 'sales', [{**docs[0], 'count': 5}], [], None, 'D', 2)
+        newer_done.set()
+        return await older_task, published_newer
+    published_older, published_newer = asyncio.run(run())
+    
+    assert (published_older, published_newer) == (False, True)
+    assert fake_db['product_aggregates'].docs[0]['generation'] == 200
+    assert [doc['count'] for doc in fake_db['product_summaries'].docs] == [5]
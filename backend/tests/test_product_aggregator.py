@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from app.services.file.product_aggregator import ProductAggregator
+
+def _sales_frame():
+    """상품/날짜/판매량 데이터 (해석되지 않는 날짜, 숫자가 아닌 값, 상품 결측 포함)"""
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'product': rng.choice(['p1', 'p2', 'p3', 'p4'], n).astype(object),
+        'date': pd.date_range('2024-01-01', periods=60, freq='D')[rng.integers(0, 60, n)].strftime('%Y-%m-%d'),
+        'sales': rng.integers(0, 100, n).astype(float)
+    })
+    df.loc[:9, 'date'] = 'unknown'
+    df.loc[10:14, 'sales'] = np.nan
+    df.loc[15:19, 'product'] = None
+    return df
+
+def _documents(df, batch_size=None):
+    """배치별 집계를 합쳐 문서로 변환 (batch_size가 없으면 전체 한 번에 집계)"""
+    batch_size = batch_size or len(df)
+    parts = [
+        ProductAggregator.aggregate(df.iloc[start:start + batch_size], 'product', 'sales', 'date', 'W')
+        for start in range(0, len(df), batch_size)
+    ]
+    return ProductAggregator.to_documents(ProductAggregator.combine(parts), True)
+
+def test_documents_match_direct_groupby():
+    """배치 집계 병합 결과 = 전체 데이터의 상품/주 단위 groupby (배치 크기와 무관)"""
+    df = _sales_frame()
+    rows = df[df['product'].notna()]
+    dates = pd.to_datetime(rows['date'], errors='coerce', format='%Y-%m-%d')
+    values = pd.to_numeric(rows['sales'], errors='coerce')
+    
+    for batch_size in [None, 64]:
+        summaries, series = _documents(df, batch_size)
+        summaries = {doc['product']: doc for doc in summaries}
+        assert set(summaries) == set(rows['product'])
+        for product, group in rows.groupby('product'):
+            product_dates = dates[group.index].dropna()
+            summary = summaries[product]
+            assert summary['count'] == len(group)
+            assert summary['sum'] == values[group.index].sum()
+            week_start = product_dates.dt.to_period('W').dt.start_time
+            assert summary['first_period'] == week_start.min().strftime('%Y-%m-%d')
+            assert summary['last_period'] == week_start.max().strftime('%Y-%m-%d')
+        
+        # 시계열: 날짜가 해석된 행만 (상품, 주 시작일)별 행 수/합계
+        dated = rows[dates.notna()]
+        expected = dated.groupby([
+            dated['product'],
+            dates[dates.notna()].dt.to_period('W').dt.start_time.dt.strftime('%Y-%m-%d').rename('period')
+        ])['sales'].agg(['size', 'sum'])
+        actual = {(doc['product'], doc['period']): (doc['count'], doc['sum']) for doc in series}
+        assert actual == {key: (int(row['size']), float(row['sum'])) for key, row in expected.iterrows()}
+
+def test_without_dates_counts_all_rows():
+    """날짜 컬럼이 없으면 요약만 만들고 시계열/기간은 비움"""
+    df = _sales_frame()
+    summaries, series = ProductAggregator.to_documents(ProductAggregator.aggregate(df, 'product', 'sales'), False)
+    assert series == []
+    assert sum(doc['count'] for doc in summaries) == df['product'].notna().sum()
+    assert all(doc['first_period'] is None for doc in summaries)
@@ -0,0 +1,189 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from app.models.prediction import FeatureOverride, ScenarioRequest
+from app.services.feature.lag_feature_generator import LagFeatureGenerator
+from app.services.prediction.feature_transformer import FeatureTransformer
+from app.services.prediction.forecast_generator import ForecastGenerator
+from app.services.prediction.scenario_service import ScenarioService
+
+SUFFIX = LagFeatureGenerator.ROLLING_SUFFIX
+WINDOW = LagFeatureGenerator.ROLLING_WINDOW
+ROLLING_FEATURES = ['week', 'price', f'price{SUFFIX}', f'sales{SUFFIX}']
+
+class _LinearModel:
+    """고정 계수 선형 모델"""
+    
+    def __init__(self, num_features):
+        self.coef = np.linspace(0.3, -0.2, num_features) + 0.05
+    
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef + 1.5
+
+class _Registry:
+    """모델 레지스트리 대체 (조회 횟수 기록)"""
+    
+    def __init__(self, registered):
+        self.registered = registered
+        self.calls = 0
+    
+    async def get_by_model_id(self, model_id):
+        self.calls += 1
+        return self.registered.get(model_id)
+
+def _weekly_data():
+    """매장 3개 x 주차별 가격/판매량과 4주 합산 피처"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for store, length in [('s1', 8), ('s2', 3), ('s3', 6)]:
+        for week in range(1, length + 1):
+            rows.append({'week': week, 'store': store, 'price': float(rng.uniform(1, 5)), 'sales': float(rng.uniform(5, 15))})
+    df = pd.DataFrame(rows)
+    for col in ['price', 'sales']:
+        grouped = df.groupby('store', sort=False)[col]
+        df[f'{col}{SUFFIX}'] = sum(grouped.shift(k).fillna(0.0) for k in range(1, WINDOW + 1))
+    return df
+
+def _service(features, user_id='user_test'):
+    """학습 시와 같은 방식으로 시작 상태를 저장한 모델을 등록한 서비스"""
+    df = _weekly_data()
+    transformer = FeatureTransformer(features).fit(df)
+    model = _LinearModel(len(features))
+    state = ForecastGenerator().prepare_state(df.to_dict('records'), 'sales', features, 'week', ['store'], transformer)
+    artifact = {'model': model, 'preprocessor': transformer, 'target_column': 'sales', 'forecast_state': state}
+    service = ScenarioService()
+    service.model_registry = _Registry({'model_1': ({'model_id': 'model_1', 'user_id': user_id}, artifact)})
+    return service, df, model
+
+def _step_by_step(model, df, features, periods, price_at=None):
+    """그룹별 단계 예측 기준 구현 (price_at(store, step, price): 시점별 변경된 가격)"""
+    price_at = price_at or (lambda store, step, price: price)
+    results = {}
+    for store, group in df.groupby('store', sort=False):
+        last = group.iloc[-1]
+        history = {'price': list(group['price']), 'sales': list(group['sales'])}
+        predictions = []
+        for step in range(periods):
+            x = last[features].to_numpy(dtype=np.float32).astype(float)
+            price = price_at(store, step + 1, float(last['price']))
+            for j, feature in enumerate(features):
+                if feature == 'price':
+                    x[j] = price
+                elif feature == 'week':
+                    x[j] = last['week'] + step + 1
+                elif feature.endswith(SUFFIX):
+                    x[j] = sum(history[feature[:-len(SUFFIX)]][-WINDOW:])
+            prediction = float(model.predict(x[None, :])[0])
+            predictions.append(prediction)
+            history['price'].append(price)
+            history['sales'].append(prediction)
+        results[store] = predictions
+    return results
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    ScenarioService._cache.clear()
+    yield
+    ScenarioService._cache.clear()
+
+@pytest.mark.parametrize('operation, value, apply', [
+    ('set', 2.0, lambda price: 2.0),
+    ('multiply', 0.8, lambda price: price * 0.8),
+    ('add', -0.5, lambda price: price - 0.5)
+])
+def test_override_matches_step_by_step(operation, value, apply):
+    """그룹/시점 범위 변경이 해당 피처와 이후 시점의 4주 합산값(타겟 예측 피드백 포함)에 반영"""
+    service, df, model = _service(ROLLING_FEATURES)
+    request = ScenarioRequest(model_id='model_1', periods=6, overrides=[
+        FeatureOverride(column='price', operation=operation, value=value, group_keys=['s1', 's3'], periods=[2, 3])
+    ])
+    
+    response = asyncio.run(service.run_scenario(request, 'user_test'))
+    
+    baseline = _step_by_step(model, df, ROLLING_FEATURES, 6)
+    scenario = _step_by_step(
+        model, df, ROLLING_FEATURES, 6,
+        lambda store, step, price: apply(price) if store in ('s1', 's3') and step in (2, 3) else price
+    )
+    groups = {item.group_key: item for item in response.groups}
+    assert sorted(groups) == ['s1', 's2', 's3']
+    for store in groups:
+        np.testing.assert_allclose(groups[store].baseline, baseline[store], rtol=1e-6)
+        np.testing.assert_allclose(groups[store].scenario, scenario[store], rtol=1e-6)
+    # 범위 밖 그룹은 그대로, 범위 안 그룹은 변경 시점 이후(4주 합산 피드백)까지 달라짐
+    assert groups['s2'].scenario == groups['s2'].baseline
+    assert groups['s1'].scenario[0] == groups['s1'].baseline[0]
+    assert all(a != b for a, b in zip(groups['s1'].scenario[1:], groups['s1'].baseline[1:]))
+    np.testing.assert_allclose(response.scenario_total, np.sum([groups[s].scenario for s in groups], axis=0))
+    assert response.dates == [9, 10, 11, 12, 13, 14]
+
+def test_period_limited_override_without_rolling_changes_only_those_periods():
+    """4주 합산 피처가 없으면 시점 지정 변경은 그 시점의 예측만 바꿈"""
+    service, _, _ = _service(['week', 'price'])
+    request = ScenarioRequest(model_id='model_1', group_keys=['s3', 's1'], periods=5, overrides=[
+        FeatureOverride(column='price', operation='add', value=1.0, periods=[2, 4])
+    ])
+    
+    response = asyncio.run(service.run_scenario(request, 'user_test'))
+    
+    assert [item.group_key for item in response.groups] == ['s3', 's1']
+    for item in response.groups:
+        changed = [a != b for a, b in zip(item.scenario, item.baseline)]
+        assert changed == [False, True, False, True, False]
+
+def test_multiply_by_one_equals_baseline():
+    """배율 1.0 변경 결과 = 변경 전 예측"""
+    service, _, _ = _service(ROLLING_FEATURES)
+    request = ScenarioRequest(model_id='model_1', periods=4, overrides=[
+        FeatureOverride(column='price', operation='multiply', value=1.0)
+    ])
+    
+    response = asyncio.run(service.run_scenario(request, 'user_test'))
+    
+    for item in response.groups:
+        assert item.scenario == item.baseline
+    assert response.scenario_total == response.baseline_total
+
+def test_unknown_groups_and_invalid_overrides():
+    """학습 데이터에 없는 그룹은 제외하고, 타겟/범위 밖 시점 변경은 거부"""
+    service, _, _ = _service(ROLLING_FEATURES)
+    response = asyncio.run(service.run_scenario(
+        ScenarioRequest(model_id='model_1', group_keys=['s2', 's9'], periods=2), 'user_test'
+    ))
+    assert [item.group_key for item in response.groups] == ['s2']
+    assert response.unknown_group_keys == ['s9']
+    
+    for override in [
+        FeatureOverride(column='sales', value=2.0),
+        FeatureOverride(column='price', value=2.0, periods=[3])
+    ]:
+        with pytest.raises(ValueError):
+            asyncio.run(service.run_scenario(
+                ScenarioRequest(model_id='model_1', periods=2, overrides=[override]), 'user_test'
+            ))
+
+def test_owner_check_and_cache_key():
+    """다른 사용자의 모델은 거부하고, 같은 사용자/요청의 결과만 캐시에서 반환"""
+    service, _, _ = _service(ROLLING_FEATURES)
+    registry = service.model_registry
+    request = ScenarioRequest(model_id='model_1', periods=3, overrides=[
+        FeatureOverride(column='price', operation='multiply', value=0.9)
+    ])
+    
+    first = asyncio.run(service.run_scenario(request, 'user_test'))
+    second = asyncio.run(service.run_scenario(request, 'user_test'))
+    assert (first.cached, second.cached) == (False, True)
+    assert second.model_dump(exclude={'cached'}) == first.model_dump(exclude={'cached'})
+    assert registry.calls == 1
+    
+    # 다른 사용자의 같은 요청은 캐시를 쓰지 않고 소유자 검사에서 거부
+    assert asyncio.run(service.run_scenario(request, 'user_other')) is None
+    assert registry.calls == 2
+    
+    # 요청 내용이 다르면 다시 계산
+    changed = request.model_copy(update={'overrides': [FeatureOverride(column='price', operation='multiply', value=0.8)]})
+    assert asyncio.run(service.run_scenario(changed, 'user_test')).cached is False
+    assert registry.calls == 3
+    
+    assert asyncio.run(service.run_scenario(ScenarioRequest(model_id='model_missing'), 'user_test')) is None
@@ -0,0 +1,92 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from app.services.correlation.correlation_service import CorrelationService
+from app.services.correlation.streaming_correlation import StreamingCorrelationAccumulator
+
+def _frame():
+    """결측값과 그룹이 섞인 데이터 (값의 크기가 커도 안정적인지 확인하도록 큰 오프셋 포함)"""
+    rng = np.random.default_rng(0)
+    n = 600
+    x1 = rng.normal(size=n) + 1e6
+    x2 = rng.normal(size=n)
+    sales = 2.0 * (x1 - 1e6) - x2 + rng.normal(scale=0.5, size=n)
+    df = pd.DataFrame({'sales': sales, 'x1': x1, 'x2': x2, 'store': rng.choice(['a', 'b', 'c', 'd'], n)})
+    df.loc[rng.choice(n, 60, replace=False), 'x1'] = np.nan
+    df.loc[rng.choice(n, 60, replace=False), 'sales'] = np.nan
+    # 'd' 그룹은 첫 배치 이후에만 등장
+    df.loc[:199, 'store'] = df.loc[:199, 'store'].replace('d', 'a')
+    return df
+
+def test_merged_batches_match_full_correlation():
+    """배치 누적 + 워커 병합 결과 = 전체 데이터의 쌍별 피어슨 상관계수 (전체/그룹별)"""
+    df = _frame()
+    features = ['x1', 'x2']
+    first = StreamingCorrelationAccumulator('sales', features, ['store'])
+    second = StreamingCorrelationAccumulator('sales', features, ['store'])
+    for start in range(0, 600, 150):
+        batch = df.iloc[start:start + 150].to_dict('records')
+        (first if start < 300 else second).update(batch)
+    second.merge(first)
+    overall, group_correlations = second.finalize()
+    
+    expected = df[['sales'] + features].corr()
+    assert second.row_count == len(df)
+    for feature in features:
+        assert np.isclose(overall[feature], expected.loc['sales', feature], rtol=1e-9)
+    
+    by_store = group_correlations['by_store']
+    assert set(by_store) == {'a', 'b', 'c', 'd'}
+    for store, group in df.groupby('store'):
+        for feature in features:
+            pairs = group[['sales', feature]].dropna()
+            assert np.isclose(by_store[store][feature], pairs['sales'].corr(pairs[feature]), rtol=1e-9)
+
+def test_categorical_features_kept_in_streaming():
+    """범주형 피처도 라벨 코드로 누적 (배치마다 새 범주가 등장해도 기존 코드 유지)"""
+    rng = np.random.default_rng(1)
+    n = 400
+    channel = np.where(np.arange(n) < 200, rng.choice(['web', 'store'], n), rng.choice(['web', 'store', 'app'], n))
+    df = pd.DataFrame({
+        'sales': rng.normal(size=n) + (channel == 'store') * 2.0,
+        'channel': channel,
+        'price': rng.normal(size=n)
+    })
+    accumulator = StreamingCorrelationAccumulator('sales', ['channel', 'price'])
+    for start in range(0, n, 100):
+        accumulator.update(df.iloc[start:start + 100].to_dict('records'))
+    overall, _ = accumulator.finalize()
+    
+    assert accumulator.kinds == {'sales': 'numeric', 'channel': 'categorical', 'price': 'numeric'}
+    assert accumulator.category_index['channel'] == dict(zip(pd.unique(channel), range(3)))
+    codes = pd.Series(channel).map(accumulator.category_index['channel'])
+    assert np.isclose(overall['channel'], df['sales'].corr(codes), rtol=1e-9)
+    assert np.isclose(overall['price'], df['sales'].corr(df['price']), rtol=1e-9)
+
+class _BatchRepository:
+    """저장된 CSV 배치를 순서대로 돌려주는 저장소"""
+    
+    def __init__(self, rows, batch_size):
+        self.batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    
+    async def iter_csv_batches(self, file_id, batch_size=5000):
+        for batch in self.batches:
+            yield batch
+
+def test_streaming_and_in_memory_analyze_same_features():
+    """스트리밍으로 바뀌어도 범주형 피처가 빠지지 않음 (숫자형 피처 상관계수는 메모리 경로와 동일)"""
+    rng = np.random.default_rng(2)
+    n = 600
+    rows = pd.DataFrame({
+        'sales': rng.normal(size=n),
+        'channel': rng.choice(['web', 'store', 'app'], n),
+        'price': rng.normal(size=n)
+    }).to_dict('records')
+    service = CorrelationService()
+    service.file_repository = _BatchRepository(rows, 150)
+    
+    streaming, _, matrix, _ = asyncio.run(service._calculate_correlations_streaming('file', 'sales', ['channel', 'price'], [], []))
+    in_memory = asyncio.run(service._calculate_correlations(rows, 'sales', ['channel', 'price']))
+    assert set(streaming) == set(in_memory) == {'channel', 'price'}
+    assert np.isclose(streaming['price'], in_memory['price'], rtol=1e-9)
+    assert matrix['columns'] == ['sales', 'channel', 'price']